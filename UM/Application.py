@@ -7,6 +7,7 @@ import sys
 import threading
 
 from UM.Controller import Controller
+from UM.Mesh.MeshCache import MeshCache
 from UM.Message import Message #For typing.
 from UM.PackageManager import PackageManager
 from UM.PluginRegistry import PluginRegistry
@@ -180,6 +181,8 @@ class Application:
         self._preferences.addPreference("general/plugins_to_remove", "")
         self._preferences.addPreference("general/disabled_plugins", "")
 
+        MeshCache.setInstance(MeshCache(Resources.getStoragePath(Resources.Cache, "meshes")))
+
         self._controller = Controller(self)
         self._output_device_manager = OutputDeviceManager()
 
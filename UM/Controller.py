@@ -1,6 +1,6 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
-from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.Scene.Iterator.LazyDepthFirstIterator import LazyDepthFirstIterator
 from UM.Scene.Scene import Scene
 from UM.Event import Event, KeyEvent, MouseEvent, ToolEvent, ViewEvent
 from UM.Scene.SceneNode import SceneNode
@@ -470,7 +470,7 @@ class Controller:
             return
 
         nodes = []
-        for node in DepthFirstIterator(self.getScene().getRoot()):
+        for node in LazyDepthFirstIterator(self.getScene().getRoot()):
             if not node.isEnabled():
                 continue
             if not node.getMeshData() and not node.callDecoration("isGroup"):
@@ -4,6 +4,7 @@ from typing import Optional
 
 from UM.FileHandler.FileHandler import FileHandler
 from UM.Job import Job
+from UM.JobQueue import JobQueue
 from UM.Message import Message
 from UM.Logger import Logger
 
@@ -19,6 +20,7 @@ class ReadFileJob(Job):
 
     def __init__(self, filename: str, handler: Optional[FileHandler] = None) -> None:
         super().__init__()
+        self.setPriority(JobQueue.Priority.Low)  # Loading big files shouldn't hold up interactive work.
         self._filename = filename
         self._handler = handler
         self._loading_message = None  # type: Optional[Message]
@@ -2,10 +2,11 @@
 # Uranium is released under the terms of the LGPLv3 or higher.
 
 import time
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from UM.Decorators import deprecated
 from UM.JobQueue import JobQueue
+from UM.ProcessPool import ProcessPool
 from UM.Signal import Signal, signalemitter
 
 
@@ -26,6 +27,11 @@ class Job:
         self._result = None     # type: Any
         self._message = None    # type: Any
         self._error = None      # type: Optional[Exception]
+        self._priority = JobQueue.Priority.Normal  # type: int
+        self._cancelled = False  # type: bool
+        self._queued_time = None    # type: Optional[float]
+        self._start_time = None     # type: Optional[float]
+        self._finish_time = None    # type: Optional[float]
 
     def run(self) -> None:
         """Perform the actual task of this job. Should be reimplemented by subclasses.
@@ -72,6 +78,21 @@ class Job:
 
         self._error = error
 
+    def getPriority(self) -> int:
+        """Get the priority with which the job is processed, one of the constants in JobQueue.Priority."""
+
+        return self._priority
+
+    def setPriority(self, priority: int) -> None:
+        """Set the priority with which the job is processed.
+
+        This has no effect on a job that is already in the JobQueue.
+
+        :param priority: One of the constants in JobQueue.Priority.
+        """
+
+        self._priority = priority
+
     def start(self) -> None:
         """Start the job.
 
@@ -80,17 +101,44 @@ class Job:
         :sa JobQueue::add()
         """
 
+        self._cancelled = False
         JobQueue.getInstance().add(self)
 
     def cancel(self) -> None:
         """Cancel the job.
 
-        This will remove the Job from the JobQueue. If the run() function has already been called,
-        this will do nothing.
+        This will remove the Job from the JobQueue. If the run() function has already been called, the job is only
+        marked as cancelled. Jobs that take long can check isCancelled() while running, to stop early.
         """
 
+        self._cancelled = True
         JobQueue.getInstance().remove(self)
 
+    def isCancelled(self) -> bool:
+        """Check whether the job was cancelled since it was started."""
+
+        return self._cancelled
+
+    def getQueueWaitTime(self) -> Optional[float]:
+        """Get how long the job waited in the JobQueue before it started processing.
+
+        :return: The time in seconds, or None if the job hasn't started processing.
+        """
+
+        if self._queued_time is None or self._start_time is None:
+            return None
+        return self._start_time - self._queued_time
+
+    def getRunTime(self) -> Optional[float]:
+        """Get how long the job took to process.
+
+        :return: The time in seconds, or None if the job hasn't finished processing.
+        """
+
+        if self._start_time is None or self._finish_time is None:
+            return None
+        return self._finish_time - self._start_time
+
     def isRunning(self) -> bool:
         """Check whether the job is currently running.
 
@@ -120,6 +168,22 @@ class Job:
 
         return self._error
 
+    def runInProcess(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a part of the job that takes a lot of processing in a worker process of the ProcessPool.
+
+        Python code in a thread holds up the other threads, including the one that draws the interface. In a worker
+        process it can run on another processor core instead. The function, its arguments and its result need to be
+        picklable. Large NumPy arrays in them are transferred through shared memory.
+
+        Progress that the function reports with ProcessPool.reportProgress is emitted as the progress of this job.
+
+        :param function: The function to run.
+        :param args: The arguments to call the function with.
+        :return: The result of the function. Exceptions that the function raises are raised again here.
+        """
+
+        return ProcessPool.getInstance().run(function, *args, progress_callback = lambda amount: self.progress.emit(self, amount))
+
     finished = Signal()
     """Emitted when the job has finished processing.
 
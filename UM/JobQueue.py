@@ -1,13 +1,15 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import collections
 import multiprocessing
 import threading
+import time
 
 from UM.Logger import Logger
 from UM.Signal import Signal, signalemitter
 
-from typing import cast, List, Optional, TYPE_CHECKING, Union
+from typing import Any, cast, Deque, Dict, List, Optional, Set, Tuple, Type, TYPE_CHECKING, Union
 if TYPE_CHECKING:
     from UM.Job import Job
 
@@ -17,9 +19,20 @@ class JobQueue:
 
     The JobQueue class manages a queue of Job objects and a set of threads that
     can take things from this queue to process them.
+
+    Jobs are processed in order of their priority, and in the order they were added within the same priority. The
+    number of threads that process jobs of a certain type at the same time can be limited, for instance for jobs that
+    use a lot of memory or that use all processor cores by themselves.
     :sa Job
     """
 
+    class Priority:
+        """The priorities that jobs can have. Jobs with a lower number are processed first."""
+
+        High = 0 #Work that the user is waiting for, like updating what is shown in the scene.
+        Normal = 1
+        Low = 2 #Work that can take a long time, like loading big files.
+
     def __init__(self, thread_count: Union[str, int] = "auto") -> None: #pylint: disable=bad-whitespace
         """Initialize.
 
@@ -45,9 +58,14 @@ class JobQueue:
 
         self._threads = [_Worker(self) for t in range(thread_count)]
 
-        self._semaphore = threading.Semaphore(0)    # type: threading.Semaphore
-        self._jobs = []                             # type: List[Job]
         self._jobs_lock = threading.Lock()          # type: threading.Lock
+        self._job_available = threading.Condition(self._jobs_lock)  # type: threading.Condition
+        # One queue per priority. Removed jobs are left in there and skipped when they come up.
+        self._queues = [collections.deque() for _ in range(JobQueue.Priority.Low + 1)]  # type: List[Deque[Tuple[object, Job]]]
+        self._jobs = {}                             # type: Dict[Job, object]  # The waiting jobs, with the token of their place in the queue.
+        self._worker_limits = {}                    # type: Dict[Type[Job], int]
+        self._running_jobs = set()                  # type: Set[Job]  # To count them per type when there are limits.
+        self._statistics = {}                       # type: Dict[str, Dict[str, Any]]
 
         for thread in self._threads:
             thread.daemon = True
@@ -59,9 +77,15 @@ class JobQueue:
         :param job: The Job to add.
         """
 
+        priority = min(max(job.getPriority(), JobQueue.Priority.High), JobQueue.Priority.Low)
         with self._jobs_lock:
-            self._jobs.append(job)
-            self._semaphore.release()
+            token = object()
+            self._jobs[job] = token
+            self._queues[priority].append((token, job))
+            job._queued_time = time.monotonic()
+            job._start_time = None
+            job._finish_time = None
+            self._job_available.notify()
 
     def remove(self, job: "Job") -> None:
         """Remove a waiting Job from the queue.
@@ -73,18 +97,52 @@ class JobQueue:
         """
 
         with self._jobs_lock:
-            if job in self._jobs:
-                self._jobs.remove(job)
+            self._jobs.pop(job, None)
+
+    def setWorkerLimit(self, job_type: Type["Job"], limit: Optional[int]) -> None:
+        """Limit how many threads may process jobs of a certain type at the same time.
+
+        Waiting jobs of that type are skipped while the limit is reached, so that jobs of other types can go first.
+
+        :param job_type: The class of the jobs to limit. Subclasses of it are limited as well.
+        :param limit: The maximum number of threads, or None to remove the limit.
+        """
+
+        with self._jobs_lock:
+            if limit is None:
+                self._worker_limits.pop(job_type, None)
+            else:
+                self._worker_limits[job_type] = max(1, limit)
+            self._job_available.notify_all()  # Jobs that were skipped may be allowed now.
+
+    def getStatistics(self) -> Dict[str, Dict[str, Any]]:
+        """Get how long the jobs that were processed had to wait in the queue, and how long they ran.
+
+        :return: For the name of every job class, the number of processed jobs as ``count``, and the total and the
+        largest ``wait_time`` and ``run_time`` in seconds, as ``wait_time``, ``max_wait_time``, ``run_time`` and
+        ``max_run_time``.
+        """
+
+        with self._jobs_lock:
+            return {name: dict(statistics) for name, statistics in self._statistics.items()}
+
+    def resetStatistics(self) -> None:
+        with self._jobs_lock:
+            self._statistics.clear()
 
     jobStarted = Signal()
     """Emitted whenever a job starts processing.
 
+    The time that the job had to wait in the queue is known by then, through ``Job.getQueueWaitTime``.
+
     :param job: :type{Job} The job that has started processing.
     """
 
     jobFinished = Signal()
     """Emitted whenever a job has finished processing.
 
+    The time that the job ran is known by then, through ``Job.getRunTime``.
+
     :param job: :type{Job} The job that has finished processing.
     """
 
@@ -95,13 +153,63 @@ class JobQueue:
         Note that this will block until a job is available.
         """
 
-        self._semaphore.acquire()
         with self._jobs_lock:
-            # Semaphore release() can apparently cause all waiting threads to continue.
-            # So to prevent issues, double check whether we actually have waiting jobs.
-            if not self._jobs:
-                return None
-            return self._jobs.pop(0)
+            while True:
+                job = self._takeJob()
+                if job is not None:
+                    job._start_time = time.monotonic()
+                    return job
+                self._job_available.wait()
+
+    def _takeJob(self) -> Optional["Job"]:
+        """Take the first job of the highest priority that may be processed now. The lock must be held for this."""
+
+        for queue in self._queues:
+            if not self._worker_limits:
+                while queue:
+                    token, job = queue.popleft()
+                    if self._jobs.get(job) is token:
+                        del self._jobs[job]
+                        self._running_jobs.add(job)
+                        return job
+                continue
+
+            index = 0
+            while index < len(queue):
+                token, job = queue[index]
+                if self._jobs.get(job) is not token:  # Removed from the queue, or added again later.
+                    del queue[index]
+                    continue
+                if any(isinstance(job, job_type) and self._countRunningJobs(job_type) >= limit for job_type, limit in self._worker_limits.items()):
+                    index += 1
+                    continue
+                del queue[index]
+                del self._jobs[job]
+                self._running_jobs.add(job)
+                return job
+        return None
+
+    def _jobDone(self, job: "Job") -> None:
+        """Record the statistics of a processed job, and let other threads process jobs that had to wait for it."""
+
+        with self._jobs_lock:
+            statistics = self._statistics.setdefault(type(job).__name__, {"count": 0, "wait_time": 0.0, "max_wait_time": 0.0, "run_time": 0.0, "max_run_time": 0.0})
+            wait_time = job.getQueueWaitTime() or 0.0
+            run_time = job.getRunTime() or 0.0
+            statistics["count"] += 1
+            statistics["wait_time"] += wait_time
+            statistics["max_wait_time"] = max(statistics["max_wait_time"], wait_time)
+            statistics["run_time"] += run_time
+            statistics["max_run_time"] = max(statistics["max_run_time"], run_time)
+
+            self._running_jobs.discard(job)
+            if any(isinstance(job, job_type) for job_type in self._worker_limits):
+                self._job_available.notify_all()
+
+    def _countRunningJobs(self, job_type: Type["Job"]) -> int:
+        """Count the jobs of a type that are being processed. The lock must be held for this."""
+
+        return sum(1 for job in self._running_jobs if isinstance(job, job_type))
 
     __instance = None   # type: JobQueue
 
@@ -134,6 +242,8 @@ class _Worker(threading.Thread):
                 Logger.logException("e", "Job %s caused an exception", str(job))
                 job.setError(e)
 
+            job._finish_time = time.monotonic()
+            self._queue._jobDone(job)
             job._running = False
             job._finished = True
             job.finished.emit(job)
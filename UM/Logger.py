@@ -1,30 +1,58 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import atexit
+import logging
+import os
+import queue
+import sys
 import threading
+import time
 import traceback
-import inspect
-from typing import List
+from types import FrameType
+from typing import List, Optional, Set, Tuple
 
 from UM.PluginObject import PluginObject
 
+# The number of messages that can be waiting to be written. Logging blocks while the queue is full.
+QUEUE_SIZE = 10000
+# The maximum number of messages that are written before the outputs are flushed.
+BATCH_SIZE = 1000
+
 
 class Logger:
-    """Static class used for logging purposes. This class is only meant to be used as a static class."""
+    """Static class used for logging purposes. This class is only meant to be used as a static class.
+
+    Messages are written to the log outputs by a background thread, so that logging doesn't wait for files to be
+    written. Call flush() to wait until all messages have been written. Errors and critical messages are an exception:
+    those are written before logging them returns, so that they're not lost if the application crashes right after.
+    """
 
-    __loggers = []  # type: List[Logger]
+    __loggers = []  # type: List[LogOutput]
+
+    __queue = None  # type: Optional[queue.Queue]
+    __writer = None  # type: Optional[threading.Thread]
+    __writer_lock = threading.Lock()
 
     def __init__(self):
         raise Exception("This class is static only")
 
     @classmethod
-    def addLogger(cls, logger: "Logger"):
+    def addLogger(cls, logger: "LogOutput"):
         """Add a logger to the list."""
 
         cls.__loggers.append(logger)
 
     @classmethod
-    def getLoggers(cls) -> List["Logger"]:
+    def removeLogger(cls, logger: "LogOutput"):
+        """Remove a logger from the list. Messages that are still waiting to be written are written to it first."""
+
+        cls.flush()
+        if logger in cls.__loggers:
+            cls.__loggers.remove(logger)
+
+    @classmethod
+    def getLoggers(cls) -> List["LogOutput"]:
         """Get all loggers
 
         :returns: List of Loggers
@@ -42,6 +70,9 @@ class Logger:
         Note that only str.format() supports keyword argument placeholders. Additionally, if str.format()
         makes any changes, % formatting will not be applied.
 
+        The message is only formatted if a logger accepts messages of its type, and then written by a background thread.
+        The loggers get the time at which it was logged, not the time at which it was written.
+
         :param log_type: Values must be; 'e' (error) , 'i'(info), 'd'(debug) or 'w'(warning).
         :param message: containing message to be logged
 
@@ -49,23 +80,20 @@ class Logger:
         :param kwargs: List of placeholder replacements that will be passed to str.format().
         """
 
-        caller_frame = inspect.currentframe()
-        frame_info = None
-
-        while caller_frame is not None:  # Avoid crash if the inspect module returns None
-            caller_frame = caller_frame.f_back
-            if caller_frame is None:
-                return
-            frame_info = inspect.getframeinfo(caller_frame)
-
-            if frame_info.filename != __file__:  # Backtrack the stack until we found the entry point into this file
-                break
+        loggers = cls.__loggers
+        if loggers and not any(logger.isEnabledFor(log_type) for logger in loggers):
+            return
+        created = time.time()
 
+        # Backtrack the stack until we found the entry point into this file. Only the code objects of the frames are
+        # used, which is much cheaper than the frame info of the inspect module.
         try:
-            assert caller_frame is not None
-            assert frame_info is not None
-        except AssertionError:
-            print("FAILED TO LOG (Frame not found): ", log_type, message)
+            caller_frame = sys._getframe(1)  # type: Optional[FrameType]
+        except ValueError:
+            return
+        while caller_frame is not None and caller_frame.f_code.co_filename == __file__:
+            caller_frame = caller_frame.f_back
+        if caller_frame is None:
             return
 
         try:
@@ -77,20 +105,81 @@ class Logger:
 
                 message = new_message
 
-            current_thread = threading.current_thread()
-            message = "[{thread}] {class_name}.{function} [{line}]: {message}".format(thread = current_thread.name,
-                                                                                      class_name = caller_frame.f_globals["__name__"],
-                                                                                      function = frame_info.function,
-                                                                                      line = frame_info.lineno,
+            message = "[{thread}] {class_name}.{function} [{line}]: {message}".format(thread = threading.current_thread().name,
+                                                                                      class_name = caller_frame.f_globals.get("__name__"),
+                                                                                      function = caller_frame.f_code.co_name,
+                                                                                      line = caller_frame.f_lineno,
                                                                                       message = message)
-
-            for logger in cls.__loggers:
-                logger.log(log_type, message)
         except Exception as e:
             print("FAILED TO LOG: ", log_type, message, e)
+            return
 
-        if not cls.__loggers:
+        if not loggers:
             print(message)
+            return
+
+        cls.__getQueue().put((log_type, message, created))
+        if log_type[:1] in ("e", "c"):
+            cls.flush()  # Make sure that errors end up in the log, even if the application crashes.
+
+    @classmethod
+    def flush(cls) -> None:
+        """Wait until all messages that were logged so far have been written by the loggers."""
+
+        message_queue = cls.__queue
+        if message_queue is None or threading.current_thread() is cls.__writer:
+            return
+        message_queue.join()
+
+    @classmethod
+    def __getQueue(cls) -> queue.Queue:
+        """Get the queue of messages to write, and start the thread that writes them if it wasn't started yet."""
+
+        message_queue = cls.__queue
+        if message_queue is not None:
+            return message_queue
+        with cls.__writer_lock:
+            if cls.__queue is None:
+                cls.__queue = queue.Queue(maxsize = QUEUE_SIZE)
+                cls.__writer = threading.Thread(target = cls.__writeMessages, args = (cls.__queue, ), name = "LogWriter", daemon = True)
+                cls.__writer.start()
+            return cls.__queue
+
+    @classmethod
+    def __writeMessages(cls, message_queue: queue.Queue) -> None:
+        """Write the logged messages to the loggers, flushing them after every batch of messages."""
+
+        while True:
+            batch = [message_queue.get()]  # type: List[Tuple[str, str, float]]
+            try:
+                while len(batch) < BATCH_SIZE:
+                    batch.append(message_queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            loggers = list(cls.__loggers)
+            for log_type, message, created in batch:
+                for logger in loggers:
+                    try:
+                        logger.logAt(log_type, message, created)
+                    except Exception as e:
+                        print("FAILED TO LOG: ", log_type, message, e)
+            for logger in loggers:
+                try:
+                    logger.flush()
+                except Exception as e:
+                    print("FAILED TO FLUSH LOG: ", logger, e)
+
+            for _ in batch:
+                message_queue.task_done()
+
+    @classmethod
+    def _resetAfterFork(cls) -> None:
+        """A forked process only has the thread that forked it, so it needs to start its own writer thread."""
+
+        cls.__queue = None
+        cls.__writer = None
+        cls.__writer_lock = threading.Lock()
 
     @classmethod
     def logException(cls, log_type: str, message: str, *args):
@@ -168,3 +257,86 @@ class LogOutput(PluginObject):
         """
 
         raise NotImplementedError("Logger was not correctly implemented")
+
+    def logAt(self, log_type: str, message: str, created: float) -> None:
+        """Log a message that was logged at a certain time.
+
+        Messages are written by a background thread, some time after they were logged. This is what that thread calls.
+        By default the time is ignored, and the message is passed to log().
+
+        :param log_type: A value describing the type of message, see log().
+        :param message: The message to log.
+        :param created: The time at which the message was logged, in seconds since the epoch, like time.time().
+        """
+
+        self.log(log_type, message)
+
+    def isEnabledFor(self, log_type: str) -> bool:
+        """Check whether messages of a certain type are logged.
+
+        Messages that no output logs are not formatted at all.
+
+        :param log_type: A value describing the type of message, see log().
+        :return: Whether messages of that type are logged.
+        """
+
+        return True
+
+    def flush(self) -> None:
+        """Write the messages that were logged so far.
+
+        The messages are logged by a background thread, in batches. This is called after every batch.
+        """
+
+        pass
+
+
+class PythonLogOutput(LogOutput):
+    """Base class for log outputs that write their messages through Python's logging module.
+
+    Subclasses add the handlers that write the messages somewhere to ``self._logger``.
+    """
+
+    _log_levels = {"d": logging.DEBUG, "i": logging.INFO, "w": logging.WARNING, "e": logging.ERROR, "c": logging.CRITICAL}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._logger = logging.getLogger(self._name)  # Create python logger
+        self._logger.setLevel(logging.DEBUG)
+        self._show_once = set()  # type: Set[str]
+
+    def log(self, log_type: str, message: str) -> None:
+        """Log a message.
+
+        :param log_type: "e" (error), "i"(info), "d"(debug), "w"(warning) or "c"(critical) (can postfix with "_once")
+        :param message: String containing message to be logged
+        """
+
+        self.logAt(log_type, message, time.time())
+
+    def logAt(self, log_type: str, message: str, created: float) -> None:
+        if log_type.endswith("_once"):
+            if message in self._show_once:
+                return
+            self._show_once.add(message)
+            log_type = log_type[0]
+
+        level = self._log_levels.get(log_type)
+        if level is None:
+            print("Unable to log. Received unknown type %s" % log_type)
+            return
+        if self._logger.isEnabledFor(level):
+            # The record gets the time at which the message was logged, rather than the time at which it's written.
+            record = self._logger.makeRecord(self._logger.name, level, "(unknown file)", 0, message, (), None)
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            self._logger.handle(record)
+
+    def isEnabledFor(self, log_type: str) -> bool:
+        level = self._log_levels.get(log_type[:1])
+        return level is None or self._logger.isEnabledFor(level)
+
+
+atexit.register(Logger.flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child = Logger._resetAfterFork)
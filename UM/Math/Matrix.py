@@ -22,6 +22,8 @@ class Matrix:
     'library' Transformations.py created by Christoph Gohlke.
     """
 
+    __slots__ = ("_data", )
+
     # epsilon for testing whether a number is close to zero
     _EPS = numpy.finfo(float).eps * 4.0
 
@@ -57,14 +59,25 @@ class Matrix:
         else:
             self._data = numpy.array(data, copy=True, dtype = numpy.float64)
 
+    @classmethod
+    def _fromArray(cls, data: numpy.ndarray) -> "Matrix":
+        """Create a matrix that takes over an array, without copying it.
+
+        Only use this for new float64 arrays that nothing else refers to, since the matrix changes them in place.
+        """
+
+        result = cls.__new__(cls)
+        result._data = data
+        return result
+
     def __deepcopy__(self, memo):
         # So, you must be asking yourself, why not let python handle this simple case on it's own? Well, that's because
         # we found out that this is about 3x faster.
         # Note that actually using Matrix(self._data) (without the deepcopy) is another factor 3 faster.
-        return Matrix(self._data)
+        return Matrix._fromArray(self._data.copy())
 
     def copy(self) -> "Matrix":
-        return Matrix(self._data)
+        return Matrix._fromArray(self._data.copy())
 
     def __eq__(self, other: object) -> bool:
         if self is other:
@@ -110,24 +123,32 @@ class Matrix:
 
     def multiply(self, other: Union[Vector, "Matrix"], copy: bool = False) -> "Matrix":
         if not copy:
-            self._data = numpy.dot(self._data, other.getData())
+            self._data = numpy.dot(self._data, other.getData(copy = False))
             return self
         else:
-            return Matrix(data = numpy.dot(self._data, other.getData()))
+            return Matrix._fromArray(numpy.dot(self._data, other.getData(copy = False)))
 
     def preMultiply(self, other: Union[Vector, "Matrix"], copy: bool = False) -> "Matrix":
         if not copy:
-            self._data = numpy.dot(other.getData(), self._data)
+            self._data = numpy.dot(other.getData(copy = False), self._data)
             return self
         else:
-            return Matrix(data = numpy.dot(other.getData(), self._data))
+            return Matrix._fromArray(numpy.dot(other.getData(copy = False), self._data))
 
-    def getData(self) -> numpy.ndarray:
+    def getData(self, copy: bool = True) -> numpy.ndarray:
         """Get raw data.
+
+        :param copy: Whether to return a single precision copy of the data. If False, a view on the double precision
+        data itself is returned, which can't be modified. It follows changes made to the matrix in place, so only use
+        it while the matrix doesn't change.
         :returns: 4x4 numpy array
         """
 
-        return self._data.astype(numpy.float32)
+        if copy:
+            return self._data.astype(numpy.float32)
+        view = self._data.view()
+        view.flags.writeable = False
+        return view
 
     def setToIdentity(self) -> None:
         """Create a 4x4 identity matrix. This overwrites any existing data."""
@@ -145,7 +166,7 @@ class Matrix:
         """
 
         try:
-            return Matrix(numpy.linalg.inv(self._data))
+            return Matrix._fromArray(numpy.linalg.inv(self._data))
         except:
             return Matrix(self._data)
 
@@ -175,11 +196,11 @@ class Matrix:
         """
 
         M = numpy.identity(4, dtype = numpy.float64)
-        M[:3, 3] = direction.getData()[:3]
+        M[:3, 3] = direction.getData(copy = False)[:3]
         self._data = M
 
     def setTranslation(self, translation: Union[Vector, "Matrix"]) -> None:
-        self._data[:3, 3] = translation.getData()
+        self._data[:3, 3] = translation.getData(copy = False)
 
     def getTranslation(self) -> Vector:
         return Vector(data = self._data[:3, 3])
@@ -204,7 +225,7 @@ class Matrix:
 
         sina = math.sin(angle)
         cosa = math.cos(angle)
-        direction_data = self._unitVector(direction.getData())
+        direction_data = self._unitVector(direction.getData(copy = False))
         # rotation matrix around unit vector
         R = numpy.diag([cosa, cosa, cosa])
         R += numpy.outer(direction_data, direction_data) * (1.0 - cosa)
@@ -234,16 +255,16 @@ class Matrix:
         M = numpy.identity(4)
         if perspective is not None:
             P = numpy.identity(4)
-            P[3, :] = perspective.getData()[:4]
+            P[3, :] = perspective.getData(copy = False)[:4]
             M = numpy.dot(M, P)
         if translate is not None:
             T = numpy.identity(4)
-            T[:3, 3] = translate.getData()[:3]
+            T[:3, 3] = translate.getData(copy = False)[:3]
             M = numpy.dot(M, T)
         if angles is not None:
             R = Matrix()
             R.setByEuler(angles.x, angles.y, angles.z, "sxyz")
-            M = numpy.dot(M, R.getData())
+            M = numpy.dot(M, R.getData(copy = False))
         if shear is not None:
             Z = numpy.identity(4)
             Z[1, 2] = shear.x
@@ -380,7 +401,7 @@ class Matrix:
                 M[:3, 3] *= 1.0 - factor
         else:
             # nonuniform scaling
-            direction_data = direction.getData()
+            direction_data = direction.getData(copy = False)
             factor = 1.0 - factor
             M = numpy.identity(4, dtype = numpy.float64)
             M[:3, :3] -= factor * numpy.outer(direction_data, direction_data)
@@ -502,7 +523,7 @@ class Matrix:
         #    sx *= -1
         #    Rmat[:, 0] *= -1
 
-        return Vector(data = T), Matrix(data=Rmat), Vector(data = numpy.array([sx, sy, sz])), Vector(data=numpy.array([sxy, sxz, syz]))
+        return Vector(data = T), Matrix._fromArray(Rmat), Vector(sx, sy, sz), Vector(sxy, sxz, syz)
 
     def _unitVector(self, data: numpy.array, axis: Optional[int] = None, out: Optional[numpy.array] = None) -> numpy.array:
         """Return ndarray normalized by length, i.e. Euclidean norm, along axis.
@@ -556,11 +577,11 @@ class Matrix:
         s[1, 1] = scale.y
         s[2, 2] = scale.z
 
-        r = orientation.toMatrix().getData()
+        r = orientation.toMatrix().getData(copy = False)
 
         t = numpy.identity(4, dtype = numpy.float64)
         t[0, 3] = position.x
         t[1, 3] = position.y
         t[2, 3] = position.z
 
-        return Matrix(data = numpy.dot(numpy.dot(t, r), s))
+        return Matrix._fromArray(numpy.dot(numpy.dot(t, r), s))
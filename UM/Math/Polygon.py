@@ -7,6 +7,7 @@ import scipy.spatial
 
 from UM.Logger import Logger
 from UM.Math import NumPyUtil
+from UM.Math import SeparatingAxis
 from UM.Math import ShapelyUtil
 
 class Polygon:
@@ -35,6 +36,8 @@ class Polygon:
 
     def __init__(self, points: Optional[Union[numpy.ndarray, List]] = None):
         self._points = NumPyUtil.immutableNDArray(points)
+        self._is_convex = None  # type: Optional[bool] # Computed when it's first needed.
+        self._bounds = None  # type: Optional[Tuple[float, float, float, float]] # Computed when it's first needed.
 
     def __eq__(self, other):
         if self is other:
@@ -74,15 +77,8 @@ class Polygon:
         The first element is the minimum value, the second the maximum.
         """
 
-        projection_min = numpy.dot(normal, self._points[0])
-
-        projection_max = projection_min
-        for point in self._points:
-            projection = numpy.dot(normal, point)
-            projection_min = min(projection_min, projection)
-            projection_max = max(projection_max, projection)
-
-        return projection_min, projection_max
+        projections = numpy.dot(self._points, normal)
+        return projections.min(), projections.max()
 
     def translate(self, x: float = 0, y: float = 0) -> "Polygon":
         """Moves the polygon by a fixed offset.
@@ -216,6 +212,13 @@ class Polygon:
         if not self.isValid() or not other.isValid():
             return None
 
+        # Polygons that are far apart are common, and much cheaper to rule out than to construct Shapely polygons for.
+        # PolygonCollider intersects many polygons at once much faster.
+        min_x, min_y, max_x, max_y = self._getBounds()
+        other_min_x, other_min_y, other_max_x, other_max_y = other._getBounds()
+        if max_x <= other_min_x or other_max_x <= min_x or max_y <= other_min_y or other_max_y <= min_y:
+            return None
+
         polygon_me = ShapelyUtil.polygon2ShapelyPolygon(self)
         polygon_other = ShapelyUtil.polygon2ShapelyPolygon(other)
         if polygon_other.is_empty or polygon_me.is_empty:
@@ -231,6 +234,63 @@ class Polygon:
                         )
         return ret_size
 
+    def _getBounds(self) -> Tuple[float, float, float, float]:
+        """Get the axis-aligned bounding box of this polygon, as minimum x, minimum y, maximum x and maximum y."""
+
+        if self._bounds is None:
+            minimum = self._points.min(axis = 0)
+            maximum = self._points.max(axis = 0)
+            self._bounds = (float(minimum[0]), float(minimum[1]), float(maximum[0]), float(maximum[1]))
+        return self._bounds
+
+    def getPenetration(self, other: "Polygon") -> Optional[Tuple[float, float]]:
+        """Find the shortest distance to move this polygon by to no longer overlap another polygon.
+
+        This is computed for the convex hulls of the polygons.
+
+        :param other: The polygon to move away from.
+        :return: The x and y distance to move this polygon by, or None if they don't overlap.
+        """
+
+        me = self if self.isConvex() else self.getConvexHull()
+        him = other if other.isConvex() else other.getConvexHull()
+        if not me.isValid() or not him.isValid():
+            return None
+
+        penetration = SeparatingAxis.penetrations(SeparatingAxis.stackPolygons([me._points]), SeparatingAxis.stackPolygons([him._points]))[0]
+        if numpy.isnan(penetration[0]):
+            return None
+        return float(penetration[0]), float(penetration[1])
+
+    def isConvex(self) -> bool:
+        """Whether this polygon is convex and has a surface area.
+
+        Consecutive duplicate and collinear points are allowed.
+
+        :return: True if the polygon is convex, or False if it's concave, self-intersecting or degenerate.
+        """
+
+        if self._is_convex is None:
+            self._is_convex = self._computeIsConvex()
+        return self._is_convex
+
+    def _computeIsConvex(self) -> bool:
+        if not self.isValid():
+            return False
+        points = numpy.asarray(self._points, dtype = numpy.float64)
+        edges = numpy.roll(points, -1, axis = 0) - points
+        edges = edges[numpy.any(edges != 0, axis = 1)]  # Duplicate points don't turn.
+        next_edges = numpy.roll(edges, -1, axis = 0)
+        crosses = edges[:, 0] * next_edges[:, 1] - edges[:, 1] * next_edges[:, 0]
+        turns = crosses[crosses != 0]
+        if len(turns) == 0:  # All points are on a line.
+            return False
+        if not (numpy.all(turns > 0) or numpy.all(turns < 0)):
+            return False
+        # All turns are in the same direction, but it could still go around more than once, like a pentagram.
+        total_turn = numpy.arctan2(crosses, numpy.einsum("ij,ij->i", edges, next_edges)).sum()
+        return bool(abs(total_turn) < 2 * numpy.pi + 1e-6)
+
     def getConvexHull(self) -> "Polygon":
         """Calculate the convex hull around the set of points of this polygon.
 
@@ -0,0 +1,199 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy
+import shapely.prepared
+
+from UM.Math import SeparatingAxis
+from UM.Math import ShapelyUtil
+from UM.Math.Polygon import Polygon
+
+
+class _PreparedPolygon:
+    """A polygon with its bounding box and, for concave polygons, its Shapely geometry prepared for repeated
+    intersection tests.
+    """
+
+    __slots__ = ("polygon", "is_convex", "bounds", "_geometry", "_prepared")
+
+    def __init__(self, polygon: Polygon) -> None:
+        self.polygon = polygon  # Keep it alive, since the cache is indexed by its id().
+        self.is_convex = polygon.isConvex()
+        self.bounds = (numpy.nan, numpy.nan, numpy.nan, numpy.nan)  # type: Tuple[float, float, float, float]
+        self._geometry = None  # type: Any
+        self._prepared = None  # type: Any
+
+        if self.is_convex:
+            points = polygon.getPoints()
+            self.bounds = tuple(numpy.concatenate((points.min(axis = 0), points.max(axis = 0))).tolist())
+        elif polygon.isValid():
+            geometry = self.getGeometry()
+            if not geometry.is_empty and geometry.is_valid:
+                self.bounds = geometry.bounds
+
+    def isUsable(self) -> bool:
+        return not numpy.isnan(self.bounds[0])
+
+    def getGeometry(self) -> Any:
+        """Gets the Shapely geometry of the polygon, which is only created when it's needed."""
+
+        if self._geometry is None:
+            self._geometry = ShapelyUtil.polygon2ShapelyPolygon(self.polygon)
+        return self._geometry
+
+    def getPrepared(self) -> Any:
+        if self._prepared is None:
+            self._prepared = shapely.prepared.prep(self.getGeometry())
+        return self._prepared
+
+
+class PolygonCollider:
+    """Finds which of a set of polygons overlap each other, like ``Polygon.intersectsPolygon`` does for two polygons.
+
+    What is computed for each polygon is kept between calls, so when only a few of the polygons change, only those
+    are prepared again. Pairs whose bounding boxes don't overlap are pruned with a sweep over the bounding boxes before
+    the polygons themselves are intersected. Pairs of convex polygons are intersected all at once with the separating
+    axis theorem, and only the other pairs are intersected with Shapely.
+    """
+
+    def __init__(self, polygons: Optional[Sequence[Polygon]] = None) -> None:
+        self._prepared = []  # type: List[_PreparedPolygon]
+        self._bounds = numpy.zeros((0, 4), dtype = numpy.float64)  # min x, min y, max x and max y of every polygon.
+        self._convex = numpy.zeros((0, ), dtype = numpy.bool_)
+        self._stacked = numpy.zeros((0, 1, 2), dtype = numpy.float64)  # The points of the convex polygons. See SeparatingAxis.
+        if polygons is not None:
+            self.setPolygons(polygons)
+
+    def setPolygons(self, polygons: Sequence[Polygon]) -> None:
+        """Changes the polygons to find collisions between.
+
+        Polygons that were already in the collider (the same objects) don't need to be prepared again.
+
+        :param polygons: The polygons. Collisions are reported by their index in this sequence.
+        """
+
+        cache = {id(prepared.polygon): prepared for prepared in self._prepared}  # type: Dict[int, _PreparedPolygon]
+        self._prepared = [cache.get(id(polygon)) or _PreparedPolygon(polygon) for polygon in polygons]
+        self._bounds = numpy.array([prepared.bounds for prepared in self._prepared], dtype = numpy.float64).reshape((-1, 4))
+        self._convex = numpy.array([prepared.is_convex for prepared in self._prepared], dtype = numpy.bool_)
+        self._stacked = SeparatingAxis.stackPolygons([prepared.polygon.getPoints() if prepared.is_convex else numpy.zeros((1, 2)) for prepared in self._prepared], vertex_count = 1)
+
+    def setPolygon(self, index: int, polygon: Polygon) -> None:
+        """Replaces one of the polygons, e.g. when an object was moved.
+
+        :param index: The index of the polygon to replace.
+        :param polygon: The new polygon.
+        """
+
+        if self._prepared[index].polygon is polygon:
+            return
+        prepared = _PreparedPolygon(polygon)
+        if prepared.is_convex and len(polygon.getPoints()) > self._stacked.shape[1]:
+            self._prepared[index] = prepared
+            self.setPolygons(self.getPolygons())  # Needs a larger stack.
+            return
+        self._prepared[index] = prepared
+        self._bounds[index] = prepared.bounds
+        self._convex[index] = prepared.is_convex
+        if prepared.is_convex:
+            self._stacked[index] = SeparatingAxis.padPolygon(polygon.getPoints(), self._stacked.shape[1])
+
+    def getPolygons(self) -> List[Polygon]:
+        return [prepared.polygon for prepared in self._prepared]
+
+    def findCollisions(self) -> List[Tuple[int, int, Tuple[float, float]]]:
+        """Finds all pairs of polygons that overlap each other.
+
+        :return: For every overlapping pair, the indices of both polygons, lowest first, and the x and y size of the
+        area where they overlap. The pairs are sorted by their indices.
+        """
+
+        first, second = self._findCandidatePairs()
+        result = []
+
+        convex = self._convex[first] & self._convex[second]
+        convex_first, convex_second = first[convex], second[convex]
+        extents = SeparatingAxis.intersectionExtents(self._stacked[convex_first], self._stacked[convex_second])
+        overlapping = ~numpy.isnan(extents[:, 0])
+        for index_a, index_b, (width, depth) in zip(convex_first[overlapping].tolist(), convex_second[overlapping].tolist(), extents[overlapping].tolist()):
+            result.append((min(index_a, index_b), max(index_a, index_b), (width, depth)))
+
+        for index_a, index_b in zip(first[~convex].tolist(), second[~convex].tolist()):
+            pair_extents = self._intersect(self._prepared[index_a], self._prepared[index_b])
+            if pair_extents is not None:
+                result.append((min(index_a, index_b), max(index_a, index_b), pair_extents))
+        result.sort(key = lambda collision: (collision[0], collision[1]))
+        return result
+
+    def findCollisionsWith(self, polygon: Polygon) -> List[Tuple[int, Tuple[float, float]]]:
+        """Finds all polygons that overlap another polygon, which doesn't need to be in the collider.
+
+        :param polygon: The polygon to check for collisions.
+        :return: For every polygon that overlaps it, its index and the x and y size of the area where they overlap,
+        sorted by index.
+        """
+
+        other = _PreparedPolygon(polygon)
+        if not other.isUsable() or len(self._bounds) == 0:
+            return []
+        min_x, min_y, max_x, max_y = other.bounds
+        with numpy.errstate(invalid = "ignore"):  # Invalid polygons have NaN bounds, which never overlap.
+            candidates = numpy.flatnonzero((self._bounds[:, 0] < max_x) & (self._bounds[:, 2] > min_x) & (self._bounds[:, 1] < max_y) & (self._bounds[:, 3] > min_y))
+        result = []
+
+        if other.is_convex:
+            convex_candidates = candidates[self._convex[candidates]]
+            candidates = candidates[~self._convex[candidates]]
+            other_stacked = SeparatingAxis.stackPolygons([polygon.getPoints()])
+            extents = SeparatingAxis.intersectionExtents(numpy.repeat(other_stacked, len(convex_candidates), axis = 0), self._stacked[convex_candidates])
+            for index, (width, depth) in zip(convex_candidates.tolist(), extents.tolist()):
+                if not numpy.isnan(width):
+                    result.append((index, (width, depth)))
+
+        for index in candidates.tolist():
+            pair_extents = self._intersect(other, self._prepared[index])
+            if pair_extents is not None:
+                result.append((index, pair_extents))
+        result.sort(key = lambda collision: collision[0])
+        return result
+
+    def _findCandidatePairs(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Finds the pairs of polygons of which the bounding boxes overlap, with a sweep along the X axis.
+
+        :return: Two arrays with the indices of the first and second polygon of each pair.
+        """
+
+        valid = numpy.flatnonzero(~numpy.isnan(self._bounds[:, 0]))
+        bounds = self._bounds[valid]
+        order = numpy.argsort(bounds[:, 0], kind = "stable")
+        bounds = bounds[order]
+        indices = valid[order]
+
+        # Every box can only overlap the boxes after it in this order that start before it ends.
+        # Boxes that only touch can't overlap with a positive area, so those are excluded.
+        sweep_end = numpy.searchsorted(bounds[:, 0], bounds[:, 2], side = "left")
+        start = numpy.arange(len(bounds)) + 1
+        counts = numpy.maximum(sweep_end - start, 0)
+        first = numpy.repeat(numpy.arange(len(bounds)), counts)
+        offsets = numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        second = numpy.arange(counts.sum()) - offsets + numpy.repeat(start, counts)
+
+        overlaps_y = (bounds[first, 1] < bounds[second, 3]) & (bounds[second, 1] < bounds[first, 3])
+        return indices[first[overlaps_y]], indices[second[overlaps_y]]
+
+    @staticmethod
+    def _intersect(a: _PreparedPolygon, b: _PreparedPolygon) -> Optional[Tuple[float, float]]:
+        """Intersects two prepared polygons the same way ``Polygon.intersectsPolygon`` does.
+
+        :return: The x and y size of the overlapping area, or None if they don't overlap.
+        """
+
+        if not a.getPrepared().intersects(b.getGeometry()):
+            return None
+        intersection = a.getGeometry().intersection(b.getGeometry())
+        if not intersection or intersection.area <= 0:
+            return None
+        bounds = intersection.bounds
+        return bounds[2] - bounds[0], bounds[3] - bounds[1]
@@ -4,7 +4,6 @@
 import numpy
 import numpy.linalg
 import math
-import copy
 
 from UM.Math.Vector import Vector
 from UM.Math.Float import Float
@@ -23,10 +22,31 @@ class Quaternion:
 
     EPS = numpy.finfo(float).eps * 4.0
 
+    __slots__ = ("_data", )
+
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0, w: float = 1.0) -> None:
         # Components are stored as XYZW
         self._data = numpy.array([x, y, z, w], dtype=numpy.float64)
 
+    @classmethod
+    def _fromArray(cls, data: numpy.ndarray) -> "Quaternion":
+        """Create a quaternion that takes over an array, without copying it.
+
+        Only use this for new float64 arrays of length 4 that nothing else refers to, since the quaternion changes
+        them in place.
+        """
+
+        result = cls.__new__(cls)
+        result._data = data
+        return result
+
+    def __deepcopy__(self, memo):
+        # Much faster than letting Python copy every attribute.
+        return Quaternion._fromArray(self._data.copy())
+
+    def copy(self) -> "Quaternion":
+        return Quaternion._fromArray(self._data.copy())
+
     def getData(self):
         return self._data
 
@@ -53,29 +73,28 @@ class Quaternion:
         :param axis: :type{Vector} Axis of rotation
         """
 
-        a = axis.normalized().getData()
+        a = axis.normalized().getData(copy = False)
         halfAngle = angle / 2.0
         self._data[3] = math.cos(halfAngle)
         self._data[0:3] = a * math.sin(halfAngle)
         self.normalize()
 
     def __mul__(self, other):
-        result = copy.deepcopy(self)
+        result = self.copy()
         result *= other
         return result
 
     def __imul__(self, other):
         if type(other) is Quaternion:
-            v1 = Vector(other.x, other.y, other.z)
-            v2 = Vector(self.x, self.y, self.z)
-
-            w = other.w * self.w - v1.dot(v2)
-            v = v2 * other.w + v1 * self.w + v2.cross(v1)
-
-            self._data[0] = v.x
-            self._data[1] = v.y
-            self._data[2] = v.z
-            self._data[3] = w
+            # The same as with vectors: w = w1 * w2 - v1 . v2 and v = v2 * w1 + v1 * w2 + v2 x v1, but written out
+            # since creating the vectors is slow.
+            x1, y1, z1, w1 = other._data.tolist()
+            x2, y2, z2, w2 = self._data.tolist()
+
+            self._data[0] = x2 * w1 + x1 * w2 + (y2 * z1 - z2 * y1)
+            self._data[1] = y2 * w1 + y1 * w2 + (z2 * x1 - x2 * z1)
+            self._data[2] = z2 * w1 + z1 * w2 + (x2 * y1 - y2 * x1)
+            self._data[3] = w1 * w2 - (x1 * x2 + y1 * y2 + z1 * z2)
         elif type(other) is float or type(other) is int:
             self._data *= other
         else:
@@ -84,7 +103,7 @@ class Quaternion:
         return self
 
     def __add__(self, other):
-        result = copy.deepcopy(self)
+        result = self.copy()
         result += other
         return result
 
@@ -100,7 +119,7 @@ class Quaternion:
         return self
 
     def __truediv__(self, other):
-        result = copy.deepcopy(self)
+        result = self.copy()
         result /= other
         return result
 
@@ -116,12 +135,10 @@ class Quaternion:
         return Float.fuzzyCompare(self.x, other.x, 1e-6) and Float.fuzzyCompare(self.y, other.y, 1e-6) and Float.fuzzyCompare(self.z, other.z, 1e-6) and Float.fuzzyCompare(self.w, other.w, 1e-6)
 
     def __neg__(self):
-        q = copy.deepcopy(self)
-        q._data = -q._data
-        return q
+        return Quaternion._fromArray(-self._data)
 
     def getInverse(self) -> "Quaternion":
-        result = copy.deepcopy(self)
+        result = self.copy()
         result.invert()
         return result
 
@@ -223,7 +240,7 @@ class Quaternion:
 
         m[3, 3] = 1.0
 
-        return Matrix(m)
+        return Matrix._fromArray(m)
 
     @staticmethod
     def slerp(start, end, amount):
@@ -0,0 +1,147 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+"""Intersection tests for many pairs of convex polygons at once, using the separating axis theorem.
+
+The polygons are stored as stacked arrays of shape (N, V, 2): N polygons with V vertices each, in counter-clockwise
+order. Polygons with fewer vertices are padded by repeating their last vertex, see ``stackPolygons``. The functions
+take two such stacks of equal length and test the polygons at the same index against each other.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy
+
+_depth_epsilon = 1e-9  # Overlaps that are less deep than this are only touching.
+_cross_epsilon = 1e-9  # Cross products smaller than this are considered to be zero.
+
+
+def stackPolygons(polygons: Sequence[numpy.ndarray], vertex_count: int = 0) -> numpy.ndarray:
+    """Stacks the points of convex polygons into one array, in counter-clockwise order.
+
+    :param polygons: The points of every polygon, as arrays of shape (V, 2). Each needs at least one point.
+    :param vertex_count: The minimum number of vertices in the result, to be able to add polygons with more vertices
+    later.
+    :return: An array of shape (N, V, 2) with the points of all polygons.
+    """
+
+    vertex_count = max([vertex_count] + [len(points) for points in polygons])
+    result = numpy.empty((len(polygons), vertex_count, 2), dtype = numpy.float64)
+    for index, points in enumerate(polygons):
+        result[index] = padPolygon(points, vertex_count)
+    return result
+
+
+def padPolygon(points: numpy.ndarray, vertex_count: int) -> numpy.ndarray:
+    """Orders the points of a convex polygon counter-clockwise and repeats its last point up to a number of vertices.
+
+    :param points: The points of the polygon, as an array of shape (V, 2).
+    :param vertex_count: The number of vertices of the result. Must be at least V.
+    :return: An array of shape (vertex_count, 2).
+    """
+
+    points = numpy.asarray(points, dtype = numpy.float64)
+    if _signedAreas(points[numpy.newaxis])[0] < 0:
+        points = points[::-1]
+    padding = numpy.repeat(points[-1:], vertex_count - len(points), axis = 0)
+    return numpy.concatenate((points, padding))
+
+
+def penetrations(polygons_a: numpy.ndarray, polygons_b: numpy.ndarray) -> numpy.ndarray:
+    """Finds the shortest vector to move each polygon of A by so that it no longer overlaps the polygon of B.
+
+    :param polygons_a: Stacked polygons, of shape (N, V, 2).
+    :param polygons_b: Stacked polygons, of shape (N, W, 2).
+    :return: An array of shape (N, 2) with the vector for every pair, or NaN for pairs that don't overlap.
+    """
+
+    depths, axes = _overlapDepths(polygons_a, polygons_b)
+    shallowest = numpy.argmin(depths, axis = 1)
+    rows = numpy.arange(len(depths))
+    depth = depths[rows, shallowest]
+    axis = axes[rows, shallowest]
+
+    # Push A away from B.
+    direction = numpy.einsum("nk,nk->n", polygons_a.mean(axis = 1) - polygons_b.mean(axis = 1), axis)
+    axis[direction < 0] *= -1
+    result = axis * depth[:, numpy.newaxis]
+    result[~(depth > _depth_epsilon)] = numpy.nan
+    return result
+
+
+def intersectionExtents(polygons_a: numpy.ndarray, polygons_b: numpy.ndarray) -> numpy.ndarray:
+    """Finds the size of the area where the polygons of each pair overlap.
+
+    :param polygons_a: Stacked polygons, of shape (N, V, 2).
+    :param polygons_b: Stacked polygons, of shape (N, W, 2).
+    :return: An array of shape (N, 2) with the width and depth of the bounding box of the intersection of every pair,
+    or NaN for pairs that don't overlap.
+    """
+
+    depths, _ = _overlapDepths(polygons_a, polygons_b)
+    overlapping = depths.min(axis = 1) > _depth_epsilon
+
+    # The corners of the intersection are the corners of either polygon that are inside the other, and the points
+    # where their edges cross.
+    a_inside_b = _insideMask(polygons_a, polygons_b)
+    b_inside_a = _insideMask(polygons_b, polygons_a)
+
+    edges_a = numpy.roll(polygons_a, -1, axis = 1) - polygons_a
+    edges_b = numpy.roll(polygons_b, -1, axis = 1) - polygons_b
+    offsets = polygons_b[:, numpy.newaxis, :, :] - polygons_a[:, :, numpy.newaxis, :]  # (N, V, W, 2)
+    denominators = _cross(edges_a[:, :, numpy.newaxis, :], edges_b[:, numpy.newaxis, :, :])
+    parallel = numpy.abs(denominators) <= _cross_epsilon  # Parallel edges don't cross.
+    denominators[parallel] = 1  # Keeps the results finite, to be discarded.
+    t = _cross(offsets, edges_b[:, numpy.newaxis, :, :]) / denominators
+    u = _cross(offsets, edges_a[:, :, numpy.newaxis, :]) / denominators
+    crossing = ~parallel & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    crossings = polygons_a[:, :, numpy.newaxis, :] + t[..., numpy.newaxis] * edges_a[:, :, numpy.newaxis, :]
+
+    pair_count, vertex_count_a, vertex_count_b = crossing.shape
+    candidates = numpy.concatenate((polygons_a, polygons_b, crossings.reshape((pair_count, vertex_count_a * vertex_count_b, 2))), axis = 1)
+    mask = numpy.concatenate((a_inside_b, b_inside_a, crossing.reshape((pair_count, vertex_count_a * vertex_count_b))), axis = 1)
+    lowest = numpy.where(mask[..., numpy.newaxis], candidates, numpy.inf).min(axis = 1)
+    highest = numpy.where(mask[..., numpy.newaxis], candidates, -numpy.inf).max(axis = 1)
+
+    result = highest - lowest
+    result[~overlapping] = numpy.nan
+    return result
+
+
+def _overlapDepths(polygons_a: numpy.ndarray, polygons_b: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Projects both polygons of every pair on the normals of all their edges.
+
+    :return: For every pair and every axis how far the projections overlap (negative if they are apart, infinite for
+    the axes of padded edges), of shape (N, V + W), and the unit normals used as axes, of shape (N, V + W, 2).
+    """
+
+    edges = numpy.concatenate((numpy.roll(polygons_a, -1, axis = 1) - polygons_a, numpy.roll(polygons_b, -1, axis = 1) - polygons_b), axis = 1)
+    axes = numpy.stack((edges[..., 1], -edges[..., 0]), axis = -1)
+    lengths = numpy.linalg.norm(axes, axis = -1)
+    valid = lengths > 0
+    axes[valid] /= lengths[valid][:, numpy.newaxis]
+
+    projections_a = numpy.einsum("nvk,nak->nva", polygons_a, axes)
+    projections_b = numpy.einsum("nwk,nak->nwa", polygons_b, axes)
+    depths = numpy.minimum(projections_a.max(axis = 1), projections_b.max(axis = 1)) - numpy.maximum(projections_a.min(axis = 1), projections_b.min(axis = 1))
+    depths[~valid] = numpy.inf
+    return depths, axes
+
+
+def _insideMask(points: numpy.ndarray, polygons: numpy.ndarray) -> numpy.ndarray:
+    """Finds which points are inside or on the border of the counter-clockwise polygon at the same index.
+
+    :return: A boolean array of shape (N, V) for points of shape (N, V, 2).
+    """
+
+    edges = numpy.roll(polygons, -1, axis = 1) - polygons
+    relative = points[:, :, numpy.newaxis, :] - polygons[:, numpy.newaxis, :, :]
+    return numpy.all(_cross(edges[:, numpy.newaxis, :, :], relative) >= -_cross_epsilon, axis = 2)
+
+
+def _cross(a: numpy.ndarray, b: numpy.ndarray) -> numpy.ndarray:
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _signedAreas(polygons: numpy.ndarray) -> numpy.ndarray:
+    return _cross(polygons, numpy.roll(polygons, -1, axis = 1)).sum(axis = 1) / 2
@@ -21,6 +21,8 @@ class Vector:
     This class represents an immutable 3-dimensional vector.
     """
 
+    __slots__ = ("_data", "round_digits")
+
     # These fields are filled in below. This is needed to help static analysis tools (read: PyCharm)
     Null = None     # type: Vector
     Unit_X = None   # type: Vector
@@ -37,17 +39,36 @@ class Vector:
         if x is not None and y is not None and z is not None:
             self._data = numpy.array([x, y, z], dtype = numpy.float64)
         elif data is not None:
-            self._data = data.copy()
+            self._data = numpy.array(data, dtype = numpy.float64)
         else:
             self._data = numpy.zeros(3, dtype = numpy.float64)
         self.round_digits = round_digits  # for comparisons
 
-    def getData(self) -> numpy.ndarray:
+    @classmethod
+    def _fromArray(cls, data: numpy.ndarray) -> "Vector":
+        """Create a vector that takes over an array, without copying it.
+
+        Only use this for new float64 arrays of length 3 that nothing else refers to, since the vector must not change.
+        """
+
+        result = cls.__new__(cls)
+        result._data = data
+        result.round_digits = None
+        return result
+
+    def getData(self, copy: bool = True) -> numpy.ndarray:
         """Get numpy array with the data
+
+        :param copy: Whether to return a copy of the data. If False, the data itself is returned, which can't be
+        modified. This is faster if the data is only read.
         :returns: numpy array of length 3 holding xyz data.
         """
 
-        return self._data.astype(numpy.float64)
+        if copy:
+            return self._data.copy()
+        if self._data.flags.writeable:
+            self._data.flags.writeable = False  # The vector never changes its data, so this only has to be done once.
+        return self._data
 
     def setRoundDigits(self, digits: int) -> None:
         self.round_digits = digits
@@ -56,19 +77,19 @@ class Vector:
     def x(self):
         """Return the x component of this vector"""
 
-        return numpy.float64(self._data[0])
+        return self._data[0]
 
     @property
     def y(self):
         """Return the y component of this vector"""
 
-        return numpy.float64(self._data[1])
+        return self._data[1]
 
     @property
     def z(self):
         """Return the z component of this vector"""
 
-        return numpy.float64(self._data[2])
+        return self._data[2]
 
     def set(self, x: Optional[float] = None, y: Optional[float] = None, z: Optional[float] = None) -> "Vector":
         new_x = self._data[0] if x is None else x
@@ -79,8 +100,8 @@ class Vector:
     def angleToVector(self, vector: "Vector") -> float:
         """Get the angle from this vector to another"""
 
-        v0 = numpy.array(self._data, dtype = numpy.float64, copy = False)
-        v1 = numpy.array(vector.getData(), dtype = numpy.float64, copy = False)
+        v0 = self._data
+        v1 = vector._data
         dot = numpy.sum(v0 * v1)
         dot /= self._normalizeVector(v0) * self._normalizeVector(v1)
         return numpy.arccos(numpy.fabs(dot))
@@ -88,8 +109,7 @@ class Vector:
     def normalized(self) -> "Vector":
         l = self.length()
         if l != 0:
-            new_data = self._data / l
-            return Vector(data=new_data)
+            return Vector._fromArray(self._data / l)
         else:
             return self
 
@@ -111,30 +131,18 @@ class Vector:
         return numpy.dot(self._data, other._data)
 
     def cross(self, other) -> "Vector":
-        result = numpy.cross(self._data, other._data)
-        return Vector(result[0], result[1], result[2])
+        a = self._data
+        b = other._data
+        # Written out, since numpy.cross has a lot of overhead for a single pair of vectors.
+        return Vector(a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
 
     def multiply(self, matrix: "Matrix") -> "Vector":
-        d = numpy.empty(4, dtype = numpy.float64)
-        d[0] = self._data[0]
-        d[1] = self._data[1]
-        d[2] = self._data[2]
-        d[3] = 1.0
-
-        d = d.dot(matrix.getData())
-
-        return Vector(d[0], d[1], d[2])
+        matrix_data = matrix.getData(copy = False)
+        return Vector._fromArray(self._data.dot(matrix_data[0:3, 0:3]) + matrix_data[3, 0:3])
 
     def preMultiply(self, matrix: "Matrix") -> "Vector":
-        d = numpy.empty(4, dtype = numpy.float64)
-        d[0] = self._data[0]
-        d[1] = self._data[1]
-        d[2] = self._data[2]
-        d[3] = 1.0
-
-        d = matrix.getData().dot(d)
-
-        return Vector(d[0], d[1], d[2])
+        matrix_data = matrix.getData(copy = False)
+        return Vector._fromArray(matrix_data[0:3, 0:3].dot(self._data) + matrix_data[0:3, 3])
 
     def scale(self, other: "Vector") -> "Vector":
         """Scale a vector by another vector.
@@ -164,7 +172,7 @@ class Vector:
 
     def __add__(self, other):
         if type(other) is Vector:
-            return Vector(data = self._data + other._data)
+            return Vector._fromArray(self._data + other._data)
         else:
             return Vector(data = self._data + other)
 
@@ -173,7 +181,7 @@ class Vector:
 
     def __sub__(self, other):
         if type(other) is Vector:
-            return Vector(data = self._data - other._data)
+            return Vector._fromArray(self._data - other._data)
         else:
             return Vector(data = self._data - other)
 
@@ -187,7 +195,7 @@ class Vector:
             new_data = self._data * other._data
         else:
             raise NotImplementedError()
-        return Vector(data=new_data)
+        return Vector._fromArray(new_data)
 
     def __imul__(self, other):
         return self * other
@@ -202,7 +210,7 @@ class Vector:
             new_data = self._data / other._data
         else:
             raise NotImplementedError()
-        return Vector(data = new_data)
+        return Vector._fromArray(new_data)
 
     def __itruediv__(self, other):
         return self / other
@@ -214,10 +222,10 @@ class Vector:
             new_data = other._data / self._data
         else:
             raise NotImplementedError()
-        return Vector(data=new_data)
+        return Vector._fromArray(new_data)
 
     def __neg__(self):
-        return Vector(data = -1 * self._data)
+        return Vector._fromArray(-self._data)
 
     def __repr__(self):
         return "Vector({0:.3}, {1:.3}, {2:.3})".format(self._data[0], self._data[1], self._data[2])
@@ -5,6 +5,8 @@ from UM.Mesh.MeshData import MeshData
 from UM.Mesh.MeshData import MeshType
 from UM.Mesh.MeshData import calculateNormalsFromVertices
 from UM.Mesh.MeshData import calculateNormalsFromIndexedVertices
+from UM.Mesh.MeshData import hashVertices
+from UM.Mesh.MeshCache import MeshCache
 from UM.Math.Vector import Vector
 from UM.Math.Matrix import Matrix
 from UM.Logger import Logger
@@ -13,7 +15,7 @@ import numpy
 import math
 import numbers
 
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
 
 class MeshBuilder:
@@ -37,6 +39,8 @@ class MeshBuilder:
         self._face_count = 0
         self._type = MeshType.faces
         self._file_name = None  # type: Optional[str]
+        # The vertices array and count that were last hashed to cache the normals, and their hash.
+        self._vertices_hash = None  # type: Optional[Tuple[numpy.ndarray, int, str]]
         # original center position
         self._center_position = None  # type: Optional[Vector]
 
@@ -46,9 +50,12 @@ class MeshBuilder:
         :return: A Mesh data.
         """
 
+        vertices_hash = None
+        if self._vertices_hash is not None and self._vertices_hash[0] is self._vertices and self._vertices_hash[1] == self._vertex_count:
+            vertices_hash = self._vertices_hash[2]  # Computed for the normals. Changing the vertices in place would make those invalid too.
         return MeshData(vertices = self.getVertices(), normals = self.getNormals(), indices = self.getIndices(),
                         colors = self.getColors(), uvs = self.getUVCoordinates(), file_name = self.getFileName(),
-                        center_position = self.getCenterPosition())
+                        center_position = self.getCenterPosition(), vertices_hash = vertices_hash)
 
     def setCenterPosition(self, position: Optional[Vector]) -> None:
         self._center_position = position
@@ -111,6 +118,13 @@ class MeshBuilder:
     def resetNormals(self):
         self._normals = None
 
+    def setNormals(self, normals):
+        """
+        :param normals: is a vertexCount by 3 numpy array with a normal per vertex.
+        """
+
+        self._normals = normals
+
     def hasNormals(self):
         """Return whether this mesh has vertex normals."""
 
@@ -160,6 +174,13 @@ class MeshBuilder:
             return None
         return self._uvs[0: self._vertex_count]
 
+    def setUVCoordinates(self, uvs):
+        """
+        :param uvs: is a vertexCount by 2 numpy array with a texture coordinate per vertex.
+        """
+
+        self._uvs = uvs
+
     def getFileName(self) -> Optional[str]:
         return self._file_name
 
@@ -429,22 +450,65 @@ class MeshBuilder:
 
         self._colors = colors
 
-    def calculateNormals(self, fast=False):
+    def calculateNormals(self, fast=False, flat=False):
         """Calculate the normals of this mesh, assuming it was created by using addFace (eg; the verts are connected)
 
         Keyword arguments:
         - fast: A boolean indicating whether or not to use a fast method of normal calculation that assumes each triangle
         is stored as a set of three unique vertices.
+        - flat: A boolean indicating whether every face should get its own normal, instead of smoothing the normals of
+        vertices that are shared between faces. This gives every face its own vertices and removes the indices.
         """
 
         if self._vertices is None:
             return
 
         if self.hasIndices() and not fast:
-            self._normals = calculateNormalsFromIndexedVertices(self._vertices, self._indices, self._face_count)
+            self._normals = self._calculateIndexedNormals(flat)
+            if flat:
+                self._unshareVertices()
         else:
             self._normals = calculateNormalsFromVertices(self._vertices, self._vertex_count)
 
+    def _calculateIndexedNormals(self, flat: bool) -> numpy.ndarray:
+        """Calculate the normals of an indexed mesh, or get them from the mesh cache if they were calculated before.
+
+        Only the normals of large meshes from files are cached. The cache is keyed by the same hash as
+        MeshData.getHash, which is passed on to the mesh data when it is built.
+        """
+
+        vertices = self.getVertices()
+        indices = self.getIndices()
+        cache = MeshCache.getInstance()
+        if cache is None or not MeshCache.isWorthCaching(self._file_name, self._face_count):
+            return calculateNormalsFromIndexedVertices(vertices, indices, self._face_count, flat = flat)
+
+        key = hashVertices(vertices)
+        self._vertices_hash = (self._vertices, self._vertex_count, key)
+        # The normals also depend on how the vertices are connected.
+        kind = "{kind}-{indices_hash}".format(kind = "flat_normals" if flat else "normals", indices_hash = MeshCache.hashArrays(indices)[:16])
+        entry = cache.get(key, kind)
+        if entry is not None:
+            return entry["normals"]
+        normals = calculateNormalsFromIndexedVertices(vertices, indices, self._face_count, flat = flat)
+        cache.put(key, kind, {"normals": normals})
+        return normals
+
+    def _unshareVertices(self) -> None:
+        """Give every face its own three vertices, so that the mesh no longer needs indices."""
+
+        if self._vertices is None or self._indices is None:
+            return
+        corners = self._indices[0: self._face_count].reshape(-1)
+        self._vertices = self._vertices[corners]
+        if self._colors is not None:
+            self._colors = self._colors[corners]
+        if self._uvs is not None:
+            self._uvs = self._uvs[corners]
+        self._indices = None
+        self._vertex_count = len(corners)
+        self._face_count = 0
+
     def addLine(self, v0, v1, color = None):
         """Adds a 3-dimensional line to the mesh of this mesh builder.
 
@@ -0,0 +1,237 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import collections
+import hashlib
+import os
+import tempfile
+import threading
+import zipfile
+from typing import Dict, Optional
+
+import numpy
+
+from UM.Logger import Logger
+
+DEFAULT_MAXIMUM_SIZE = 256 * 1024 * 1024  # In bytes.
+# Only the data of meshes from files with at least this many faces is cached. For smaller meshes it is computed about as
+# fast as it is looked up, and storing it would only slow down loading them.
+MINIMUM_FACE_COUNT = 50000
+FILE_EXTENSION = ".npz"
+
+
+class MeshCache:
+    """A persistent cache for data that is expensive to compute from a mesh, such as its convex hull or its normals.
+
+    Entries are stored as files in a directory, one for every kind of data of every mesh. They are identified by a hash
+    of the mesh data that they were computed from, so a cached entry is valid for as long as that data doesn't change.
+    When the total size of the files exceeds the maximum size, the least recently used entries are removed.
+
+    The cache is safe to use from multiple threads.
+    """
+
+    def __init__(self, path: str, maximum_size: int = DEFAULT_MAXIMUM_SIZE) -> None:
+        """Create a cache that stores its entries in a directory.
+
+        :param path: The directory to store the entries in. It is created when the first entry is stored.
+        :param maximum_size: The maximum total size of the entries, in bytes.
+        """
+
+        self._path = path
+        self._maximum_size = maximum_size
+
+        self._lock = threading.Lock()
+        # The size of every entry file, ordered from least to most recently used. Filled in on first use.
+        self._entries = None  # type: Optional[collections.OrderedDict]
+        self._total_size = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def getPath(self) -> str:
+        return self._path
+
+    def getMaximumSize(self) -> int:
+        return self._maximum_size
+
+    def get(self, key: str, kind: str) -> Optional[Dict[str, numpy.ndarray]]:
+        """Get a cached entry.
+
+        :param key: The hash of the mesh data that the entry was computed from.
+        :param kind: The kind of data to get, e.g. ``"hull"``.
+        :return: The arrays that were stored for this entry, or ``None`` if nothing was stored.
+        """
+
+        file_name = self._fileName(key, kind)
+        with self._lock:
+            entries = self._getEntries()
+            if file_name not in entries:
+                self._misses += 1
+                return None
+
+            file_path = os.path.join(self._path, file_name)
+            try:
+                with numpy.load(file_path, allow_pickle = False) as data:
+                    result = {name: data[name] for name in data.files}
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+                Logger.log("w", "Failed to load cached mesh data from {file_path}: {err}".format(file_path = file_path, err = str(e)))
+                self._removeEntry(file_name)
+                self._misses += 1
+                return None
+
+            entries.move_to_end(file_name)
+            try:
+                os.utime(file_path)  # So that the order of use is known again the next time the application starts.
+            except OSError:
+                pass
+            self._hits += 1
+            return result
+
+    def put(self, key: str, kind: str, arrays: Dict[str, numpy.ndarray]) -> None:
+        """Store an entry in the cache, replacing any previous entry with the same key and kind.
+
+        :param key: The hash of the mesh data that the entry was computed from.
+        :param kind: The kind of data to store, e.g. ``"hull"``.
+        :param arrays: The arrays to store, by name.
+        """
+
+        file_name = self._fileName(key, kind)
+        with self._lock:
+            entries = self._getEntries()
+            try:
+                os.makedirs(self._path, exist_ok = True)
+                # Write to a temporary file first, so that other instances of the application never read half an entry.
+                handle, temporary_path = tempfile.mkstemp(dir = self._path, suffix = ".tmp")
+                try:
+                    with os.fdopen(handle, "wb") as f:
+                        numpy.savez(f, **arrays)
+                    os.replace(temporary_path, os.path.join(self._path, file_name))
+                except:
+                    os.remove(temporary_path)
+                    raise
+                size = os.path.getsize(os.path.join(self._path, file_name))
+            except OSError as e:
+                Logger.log("w", "Failed to store mesh data in the cache at {path}: {err}".format(path = self._path, err = str(e)))
+                return
+
+            self._total_size += size - entries.pop(file_name, 0)
+            entries[file_name] = size
+            self._stores += 1
+
+            while self._total_size > self._maximum_size and len(entries) > 1:
+                self._removeEntry(next(iter(entries)))
+                self._evictions += 1
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Remove entries from the cache.
+
+        :param key: The hash of the mesh data to remove all entries for. If ``None``, the whole cache is cleared.
+        """
+
+        with self._lock:
+            entries = self._getEntries()
+            prefix = key + "." if key is not None else ""
+            for file_name in [file_name for file_name in entries if file_name.startswith(prefix)]:
+                self._removeEntry(file_name)
+
+    def getStatistics(self) -> Dict[str, int]:
+        """Get how well the cache has performed since it was created.
+
+        :return: The number of hits, misses, stores and evictions, and the current number of entries and their total
+        size in bytes.
+        """
+
+        with self._lock:
+            entries = self._getEntries()
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "evictions": self._evictions,
+                "entries": len(entries),
+                "size": self._total_size
+            }
+
+    @staticmethod
+    def isWorthCaching(file_name: Optional[str], face_count: int) -> bool:
+        """Whether the data of a mesh should be cached.
+
+        :param file_name: The file that the mesh was loaded from, or ``None`` if it was generated.
+        :param face_count: The number of faces of the mesh.
+        """
+
+        return file_name is not None and face_count >= MINIMUM_FACE_COUNT
+
+    @staticmethod
+    def hashArrays(*arrays: Optional[numpy.ndarray]) -> str:
+        """Compute a key for mesh data, from the contents of the arrays it consists of.
+
+        :param arrays: The arrays to hash. Missing arrays (``None``) are hashed as well, so they are not mixed up with
+        empty ones.
+        :return: A hexadecimal string that identifies the data.
+        """
+
+        m = hashlib.sha256()
+        for array in arrays:
+            if array is None:
+                m.update(b"None")
+                continue
+            m.update("{dtype}{shape}".format(dtype = array.dtype.str, shape = array.shape).encode("utf-8"))
+            m.update(numpy.ascontiguousarray(array).data)
+        return m.hexdigest()
+
+    @staticmethod
+    def _fileName(key: str, kind: str) -> str:
+        return "{key}.{kind}{extension}".format(key = key, kind = kind, extension = FILE_EXTENSION)
+
+    def _getEntries(self) -> collections.OrderedDict:
+        """Get the sizes of the entries in the cache, finding the entries on disk if that wasn't done yet.
+
+        The lock must be held when calling this.
+        """
+
+        if self._entries is not None:
+            return self._entries
+
+        found = []
+        try:
+            with os.scandir(self._path) as directory:
+                for entry in directory:
+                    if not entry.name.endswith(FILE_EXTENSION):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    found.append((stat.st_mtime, entry.name, stat.st_size))
+        except OSError:  # The cache directory doesn't exist yet.
+            pass
+        found.sort()
+
+        self._entries = collections.OrderedDict((file_name, size) for _, file_name, size in found)
+        self._total_size = sum(self._entries.values())
+        return self._entries
+
+    def _removeEntry(self, file_name: str) -> None:
+        """Remove an entry from disk and from the administration. The lock must be held when calling this."""
+
+        if self._entries is not None:
+            self._total_size -= self._entries.pop(file_name, 0)
+        try:
+            os.remove(os.path.join(self._path, file_name))
+        except OSError:
+            pass  # Was already removed, or another instance of the application is using it. It'll be removed later.
+
+    __instance = None  # type: Optional[MeshCache]
+
+    @classmethod
+    def getInstance(cls) -> Optional["MeshCache"]:
+        """Get the cache that meshes use, or ``None`` if the application didn't set up a cache."""
+
+        return cls.__instance
+
+    @classmethod
+    def setInstance(cls, instance: Optional["MeshCache"]) -> None:
+        cls.__instance = instance
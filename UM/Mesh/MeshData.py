@@ -6,6 +6,9 @@ from UM.Math.AxisAlignedBox import AxisAlignedBox
 from UM.Logger import Logger
 from UM.Math import NumPyUtil
 from UM.Math.Matrix import Matrix
+from UM.Math.Ray import Ray
+from UM.Mesh.MeshCache import MeshCache
+from UM.Mesh.TriangleHierarchy import RayHits, TriangleHierarchy
 
 from enum import Enum
 from typing import List, Optional, Tuple, Dict, Any
@@ -48,7 +51,7 @@ class MeshData:
     """
 
     def __init__(self, vertices=None, normals=None, indices=None, colors=None, uvs=None, file_name=None,
-                 center_position=None, zero_position=None, type = MeshType.faces, attributes=None) -> None:
+                 center_position=None, zero_position=None, type = MeshType.faces, attributes=None, vertices_hash=None) -> None:
         self._application = None  # Initialize this later otherwise unit tests break
 
         self._vertices = NumPyUtil.immutableNDArray(vertices)
@@ -69,7 +72,12 @@ class MeshData:
             self._zero_position = Vector(0, 0, 0)
         self._convex_hull = None    # type: Optional[scipy.spatial.ConvexHull]
         self._convex_hull_vertices = None  # type: Optional[numpy.ndarray]
+        self._convex_hull_extents = None  # type: Optional[numpy.ndarray]
+        self._convex_hull_cache_checked = False
         self._convex_hull_lock = threading.Lock()
+        self._triangle_hierarchy = None  # type: Optional[TriangleHierarchy]
+        self._triangle_hierarchy_lock = threading.Lock()
+        self._hash = vertices_hash  # type: Optional[str]  # If the creator already knew the result of hashVertices.
 
         self._attributes = {}  # type: Dict[str, Any]
         if attributes is not None:
@@ -113,9 +121,14 @@ class MeshData:
                         file_name=file_name, center_position=center_position, zero_position=zero_position, attributes=attributes)
 
     def getHash(self):
-        m = hashlib.sha256()
-        m.update(self.getVerticesAsByteArray())
-        return m.hexdigest()
+        """Get a hash of the vertices of this mesh.
+
+        Since the vertices can't change, the hash is only computed the first time.
+        """
+
+        if self._hash is None:
+            self._hash = hashVertices(self._vertices)
+        return self._hash
 
     def getCenterPosition(self) -> Vector:
         return self._center_position
@@ -181,6 +194,9 @@ class MeshData:
     def hasUVCoordinates(self) -> bool:
         return self._uvs is not None
 
+    def getUVCoordinates(self) -> numpy.ndarray:
+        return self._uvs
+
     def getFileName(self) -> Optional[str]:
         return self._file_name
 
@@ -211,21 +227,46 @@ class MeshData:
         :param matrix: The transformation matrix from model to world coordinates.
         """
 
+        extents = self.getExtentsData(matrix)
+        if extents is None:
+            return None
+        min, max = extents
+        return AxisAlignedBox(minimum=Vector(min[0], min[1], min[2]), maximum=Vector(max[0], max[1], max[2]))
+
+    def getExtentsData(self, matrix: Optional[Matrix] = None) -> Optional[numpy.ndarray]:
+        """Get the extents of this mesh as an array, without creating an AxisAlignedBox.
+
+        If the matrix only scales and translates, the extents are derived from the extents of the convex hull in model
+        coordinates, without transforming all vertices of the hull.
+
+        :param matrix: The transformation matrix from model to world coordinates.
+        :return: :type{numpy.ndarray} A 2x3 array with the minimum and the maximum corner, or None if there is no hull.
+        """
+
         if self._vertices is None:
             return None
 
-        if matrix is not None:
-            data = self.getConvexHullTransformedVertices(matrix)
-        else:
+        if self._convex_hull_extents is None:
             data = self.getConvexHullVertices()
+            if data is None:
+                return None
+            if self._convex_hull_extents is None:
+                self._convex_hull_extents = numpy.array([data.min(axis=0), data.max(axis=0)])
 
-        if data is None:
-            return None
+        if matrix is None:
+            return self._convex_hull_extents.copy()
 
-        min = data.min(axis=0)
-        max = data.max(axis=0)
+        matrix_data = matrix.getData()
+        linear = matrix_data[0:3, 0:3]
+        if numpy.count_nonzero(linear - numpy.diag(numpy.diagonal(linear))) == 0:
+            # Without rotation or shear, the corners of the box stay the corners of the box.
+            corners = self._convex_hull_extents * numpy.diagonal(linear) + matrix_data[0:3, 3]
+            return numpy.array([corners.min(axis=0), corners.max(axis=0)])
 
-        return AxisAlignedBox(minimum=Vector(min[0], min[1], min[2]), maximum=Vector(max[0], max[1], max[2]))
+        data = self.getConvexHullTransformedVertices(matrix)
+        if data is None:
+            return None
+        return numpy.array([data.min(axis=0), data.max(axis=0)])
 
     def getVerticesAsByteArray(self) -> Optional[bytes]:
         """Get all vertices of this mesh as a bytearray
@@ -273,7 +314,45 @@ class MeshData:
         points = self.getVertices()
         if points is None:
             return
+
+        self._loadCachedConvexHull()
+        if self._convex_hull_vertices is not None:
+            # Only the vertices of the hull are cached, so the hull of those is the same hull.
+            self._convex_hull = createConvexHull(self._convex_hull_vertices)
+            return
+
         self._convex_hull = approximateConvexHull(points, MAXIMUM_HULL_VERTICES_COUNT)
+        if self._convex_hull is None:
+            return
+        self._convex_hull_vertices = numpy.take(self._convex_hull.points, self._convex_hull.vertices, axis=0)
+        self._convex_hull_extents = numpy.array([self._convex_hull_vertices.min(axis=0), self._convex_hull_vertices.max(axis=0)])
+
+        cache = MeshCache.getInstance()
+        if cache is not None and self._isWorthCaching():
+            cache.put(self.getHash(), "hull", {"vertices": self._convex_hull_vertices, "extents": self._convex_hull_extents})
+
+    def _loadCachedConvexHull(self) -> None:
+        """Get the vertices and extents of the convex hull from the mesh cache, if they were computed before.
+
+        The convex hull lock must be held when calling this.
+        """
+
+        if self._convex_hull_cache_checked:
+            return
+        self._convex_hull_cache_checked = True
+
+        cache = MeshCache.getInstance()
+        if cache is None or self._vertices is None or not self._isWorthCaching():
+            return
+        entry = cache.get(self.getHash(), "hull")
+        if entry is None:
+            return
+        self._convex_hull_vertices = entry["vertices"]
+        self._convex_hull_extents = entry["extents"]
+
+    def _isWorthCaching(self) -> bool:
+        face_count = self._face_count if self._indices is not None else self.getVertexCount() // 3
+        return MeshCache.isWorthCaching(self._file_name, face_count)
 
     def getConvexHull(self) -> Optional[scipy.spatial.ConvexHull]:
         """Gets the Convex Hull of this mesh
@@ -293,10 +372,12 @@ class MeshData:
         """
 
         if self._convex_hull_vertices is None:
-            convex_hull = self.getConvexHull()
-            if convex_hull is None:
-                return None
-            self._convex_hull_vertices = numpy.take(convex_hull.points, convex_hull.vertices, axis=0)
+            with self._convex_hull_lock:
+                self._loadCachedConvexHull()
+            if self._convex_hull_vertices is None:
+                # Computing the convex hull also fills in its vertices.
+                if self.getConvexHull() is None:
+                    return None
         return self._convex_hull_vertices
 
     def getConvexHullTransformedVertices(self, transformation: Matrix) -> Optional[numpy.ndarray]:
@@ -311,6 +392,52 @@ class MeshData:
         else:
             return None
 
+    def getTriangleHierarchy(self) -> TriangleHierarchy:
+        """Gets a bounding volume hierarchy over the faces of this mesh, to intersect rays with it.
+
+        It's only built the first time it's needed.
+        """
+
+        with self._triangle_hierarchy_lock:
+            if self._triangle_hierarchy is None:
+                if self._vertices is None or self._type != MeshType.faces:
+                    self._triangle_hierarchy = TriangleHierarchy(numpy.zeros((0, 3), dtype = numpy.float32))
+                else:
+                    self._triangle_hierarchy = TriangleHierarchy(self._vertices, self._indices)
+            return self._triangle_hierarchy
+
+    def intersectRays(self, origins: numpy.ndarray, directions: numpy.ndarray, transformation: Optional[Matrix] = None) -> RayHits:
+        """Finds where each of a batch of rays hits this mesh first, e.g. to drop many points onto its surface.
+
+        :param origins: The start points of the rays, of shape (N, 3).
+        :param directions: The directions of the rays, of shape (N, 3).
+        :param transformation: The transformation from the coordinates of this mesh to the coordinates of the rays,
+        like the world transformation of the node that holds it. If not given, the rays are in mesh coordinates.
+        :return: The nearest hit of every ray. The distances are in units of the directions of the rays.
+        """
+
+        origins = numpy.asarray(origins, dtype = numpy.float64).reshape((-1, 3))
+        directions = numpy.asarray(directions, dtype = numpy.float64).reshape((-1, 3))
+        if transformation is not None:
+            inverse = numpy.linalg.inv(transformation.getData())
+            origins = origins.dot(inverse[:3, :3].T) + inverse[:3, 3]
+            directions = directions.dot(inverse[:3, :3].T)
+        return self.getTriangleHierarchy().intersectRays(origins, directions)
+
+    def intersectRay(self, ray: Ray, transformation: Optional[Matrix] = None) -> Optional[Tuple[float, int, numpy.ndarray]]:
+        """Finds where a ray, like the one from ``Camera.getRay``, hits this mesh first.
+
+        :param ray: The ray to cast.
+        :param transformation: The transformation from the coordinates of this mesh to the coordinates of the ray.
+        :return: The distance along the ray, the index of the face that was hit and the weights of the three corners of
+        that face for the point that was hit, or None if the ray doesn't hit this mesh.
+        """
+
+        hits = self.intersectRays(ray.origin.getData(), ray.direction.getData(), transformation)
+        if hits.face_ids[0] < 0:
+            return None
+        return float(hits.distances[0]), int(hits.face_ids[0]), hits.barycentrics[0]
+
     def getFacePlane(self, face_id: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
         """Gets the plane the supplied face lies in. The resultant plane is specified by a point and a normal.
 
@@ -368,19 +495,21 @@ class MeshData:
             mirror.scaleByFactor(-1.0)
             self._normals = transformNormals(self._normals, mirror)
         if self._indices is not None:
-            new_indices = []
-            for face in self._indices:
-                new_indices.append([face[1], face[0], face[2]])
-            self._indices = NumPyUtil.immutableNDArray(new_indices)
+            # Swapping the first two corners of every face reverses its winding order.
+            self._indices = NumPyUtil.immutableNDArray(self._indices[:, [1, 0, 2]])
             self._indices_byte_array = None
-        else:
-            new_vertices = []
-            num_vertices = len(self._vertices)
-            for i in range(0, num_vertices, 3):
-                new_vertices.append(self._vertices[i + 1])
-                new_vertices.append(self._vertices[i])
-                new_vertices.append(self._vertices[i + 2])
-            self._vertices = NumPyUtil.immutableNDArray(new_vertices)
+            self._triangle_hierarchy = None
+        elif self._vertices is not None:
+            # Without indices every three vertices form a face, so their attributes have to be swapped along.
+            self._vertices = NumPyUtil.immutableNDArray(_swapFirstCorners(self._vertices))
+            self._hash = None
+            if self._normals is not None:
+                self._normals = NumPyUtil.immutableNDArray(_swapFirstCorners(self._normals))
+            if self._colors is not None:
+                self._colors = NumPyUtil.immutableNDArray(_swapFirstCorners(self._colors))
+            if self._uvs is not None:
+                self._uvs = NumPyUtil.immutableNDArray(_swapFirstCorners(self._uvs))
+            self._triangle_hierarchy = None
 
     def toString(self) -> str:
         return "MeshData(_vertices=" + str(self._vertices) + ", _normals=" + str(self._normals) + ", _indices=" + \
@@ -388,6 +517,18 @@ class MeshData:
                str(self._attributes.keys()) + ") "
 
 
+def hashVertices(vertices: Optional[numpy.ndarray]) -> str:
+    """Compute the hash of the vertices of a mesh, as returned by MeshData.getHash.
+
+    :param vertices: :type{numpy.ndarray} The vertices of the mesh.
+    :return: A hexadecimal string that identifies the vertices.
+    """
+
+    m = hashlib.sha256()
+    m.update(numpy.ascontiguousarray(vertices).data)
+    return m.hexdigest()
+
+
 def transformVertices(vertices: numpy.ndarray, transformation: Matrix) -> numpy.ndarray:
     """Transform an array of vertices using a matrix
 
@@ -396,10 +537,9 @@ def transformVertices(vertices: numpy.ndarray, transformation: Matrix) -> numpy.
     :return: :type{numpy.ndarray} the transformed vertices
     """
 
-    data = numpy.pad(vertices, ((0, 0), (0, 1)), "constant", constant_values=(0.0, 0.0))
-    data = data.dot(transformation.getTransposed().getData())
-    data += transformation.getData()[:, 3]
-    data = data[:, 0:3]
+    matrix = transformation.getData()
+    data = vertices.dot(matrix[0:3, 0:3].T)
+    data += matrix[0:3, 3]
     return data
 
 
@@ -553,26 +693,56 @@ def calculateNormalsFromVertices(vertices: numpy.ndarray, vertex_count: int) ->
     return normals
 
 
-def calculateNormalsFromIndexedVertices(vertices: numpy.ndarray, indices: numpy.ndarray, face_count: int) -> numpy.ndarray:
+def calculateNormalsFromIndexedVertices(vertices: numpy.ndarray, indices: numpy.ndarray, face_count: int, flat: bool = False) -> numpy.ndarray:
     """Calculate the normals of this mesh of triagles using indexes.
 
+    The normal of a vertex is the average of the normals of the faces around it, weighed by the area of these faces.
+
     :param vertices: :type{narray} list of vertices as a 1D list of float triples
     :param indices: :type{narray} list of indices as a 1D list of integers
     :param face_count: :type{integer} the number of triangles defined by the indices array
+    :param flat: :type{bool} whether to calculate a normal per corner of every face instead, where each face normal
+    is repeated three times. These match the vertices of the faces as if they were not indexed.
     :return: :type{narray} list normals as a 1D array of floats, each group of 3 floats is a vector
     """
 
     start_time = time()
-    # Numpy magic!
-    # First, reset the normals
-    normals = numpy.zeros((face_count*3, 3), dtype=numpy.float32)
-
-    for face in indices[0:face_count]:
-        normals[face[0]] = numpy.cross(vertices[face[0]] - vertices[face[1]], vertices[face[0]] - vertices[face[2]])
-        length = numpy.linalg.norm(normals[face[0]])
-        normals[face[0]] /= length
-        normals[face[1]] = normals[face[0]]
-        normals[face[2]] = normals[face[0]]
+    faces = indices[0:face_count]
+    first_corners = vertices[faces[:, 0]]
+    # The length of the cross product is twice the area of the face, so summing these weighs the faces by their area.
+    face_normals = numpy.cross(vertices[faces[:, 1]] - first_corners, vertices[faces[:, 2]] - first_corners)
+    del first_corners
+
+    if flat:
+        normals = _normalized(face_normals).repeat(3, axis = 0)
+    else:
+        vertex_count = len(vertices)
+        corners = faces.reshape(-1)
+        normals = numpy.empty((vertex_count, 3), dtype = numpy.float32)
+        for axis in range(3):
+            normals[:, axis] = numpy.bincount(corners, weights = face_normals[:, axis].repeat(3), minlength = vertex_count)
+        normals = _normalized(normals)
+
     end_time = time()
     Logger.log("d", "Calculating normals took %s seconds", end_time - start_time)
     return normals
+
+
+def _normalized(vectors: numpy.ndarray) -> numpy.ndarray:
+    """Scale vectors to unit length, as 32-bit floats.
+
+    Vectors with a length of 0 are kept as they are. If the normal of a face is 0-length, it won't be visible anyway.
+    """
+
+    lengths = numpy.linalg.norm(vectors, axis = 1)
+    lengths[lengths == 0] = 1
+    return (vectors / lengths[:, numpy.newaxis]).astype(numpy.float32, copy = False)
+
+
+def _swapFirstCorners(data: numpy.ndarray) -> numpy.ndarray:
+    """Swap the data of the first and second corner of every face, for meshes where every three rows form a face."""
+
+    face_rows = len(data) // 3 * 3
+    result = numpy.array(data)
+    result[0:face_rows] = data[0:face_rows].reshape((-1, 3) + data.shape[1:])[:, [1, 0, 2]].reshape((face_rows, ) + data.shape[1:])
+    return result
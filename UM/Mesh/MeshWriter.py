@@ -1,7 +1,10 @@
 # Copyright (c) 2016 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import numpy
+
 from UM.FileHandler.FileWriter import FileWriter
+from UM.Mesh.MeshData import transformVertices
 from UM.Scene.Iterator.BreadthFirstIterator import BreadthFirstIterator
 from UM.Scene.SceneNode import SceneNode
 
@@ -41,4 +44,41 @@ class MeshWriter(FileWriter):
             yield from filter(
                 lambda child: isinstance(child, SceneNode) and child.isSelectable() and child.getMeshData(),
                 BreadthFirstIterator(root)
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    def _transformedFaces(node: SceneNode) -> numpy.ndarray:
+        """Gets the vertices of each face of the mesh of a node, in world coordinates.
+
+        :param node: The node to get the faces of.
+        :return: An array with three rows of vertex coordinates per face.
+        """
+
+        mesh_data = node.getMeshData()
+        vertices = mesh_data.getVertices() if mesh_data is not None else None
+        if mesh_data is None or vertices is None:
+            return numpy.zeros((0, 3, 3), dtype = numpy.float32)
+
+        vertices = transformVertices(vertices, node.getWorldTransformation())
+        if mesh_data.hasIndices():
+            return vertices[mesh_data.getIndices()]
+        face_count = len(vertices) // 3
+        return vertices[:face_count * 3].reshape((face_count, 3, 3))
+
+    @staticmethod
+    def _writeRows(stream, row_format: str, rows: numpy.ndarray, rows_per_block: int = 10000) -> None:
+        """Writes an array as text, formatting a block of rows at a time.
+
+        Formatting a whole block with a single string operation is much faster than formatting the values one by one,
+        while the size of the text in memory stays limited to one block.
+
+        :param stream: The text stream to write to.
+        :param row_format: The %-style format of a single row. It should have a placeholder for every column.
+        :param rows: The values to write, as an array with one row per repetition of the format.
+        :param rows_per_block: The number of rows to format at once.
+        """
+
+        rows = rows.reshape((len(rows), -1))
+        for start in range(0, len(rows), rows_per_block):
+            block = rows[start:start + rows_per_block]
+            stream.write((row_format * len(block)) % tuple(block.ravel().tolist()))
@@ -0,0 +1,228 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Copyright (c) 2013 David Braam
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+import platform
+import re
+import struct
+from typing import IO, Optional, Tuple
+
+import numpy
+
+from UM.Job import Job
+from UM.Logger import Logger
+from UM.Mesh.MeshBuilder import MeshBuilder
+
+# The functions that parse STL files live here rather than in the STLReader plugin, because they are run in the
+# worker processes of the ProcessPool. Those have to be able to import them, which they can't do with plugins.
+
+use_numpystl = False
+
+try:
+    # Work around for CURA-7154. Some models crash with a segfault, but only when packed.
+    if platform.system() != "Linux":
+        import stl  # numpy-stl lib
+        import stl.mesh
+
+        # Increase max count. (100 million should be okay-ish)
+        stl.stl.MAX_COUNT = 100000000
+        use_numpystl = True
+    else:
+        Logger.log("w", "Not loading numpy-stl due to linux issue")
+except ImportError:
+    Logger.log("w", "Could not find numpy-stl, falling back to slower code.")
+    # We have our own fallback code.
+
+# Layout of a single facet in a binary STL file: the face normal, three vertices and the attribute byte count.
+# NumPy packs structured types without padding by default, so this is exactly the 50 bytes of the file format.
+BINARY_FACET_DTYPE = numpy.dtype([
+    ("normal", "<f4", (3, )),
+    ("vertices", "<f4", (3, 3)),
+    ("attribute", "<u2")
+])
+
+# Number of facets that are converted at once before yielding the thread, to keep the GUI responsive.
+BINARY_CHUNK_FACE_COUNT = 1 << 20
+
+# Number of characters of an ASCII STL file that are parsed at once.
+ASCII_CHUNK_SIZE = 1 << 22
+# Number of vertices to reserve space for initially when parsing an ASCII STL file. The buffer grows as needed.
+ASCII_INITIAL_VERTEX_COUNT = 3 * 1024
+
+# Matches a vertex line in an ASCII STL file, capturing its three coordinates.
+_ascii_vertex_regex = re.compile(r"\bvertex[ \t]+(\S+[ \t]+\S+[ \t]+\S+)")
+
+
+def loadArrays(file_name: str) -> Tuple[Optional[numpy.ndarray], Optional[numpy.ndarray]]:
+    """Load the vertices of a file and calculate their normals.
+
+    :param file_name: The path of the STL file.
+    :return: The vertices and the normals, or None for both if the file contained no valid data.
+    """
+
+    mesh_builder = MeshBuilder()
+    loadFile(file_name, mesh_builder, _use_numpystl = use_numpystl)
+
+    if use_numpystl and mesh_builder.getVertexCount() > 0:
+        verts = mesh_builder.getVertices()
+        # In some cases numpy stl reads incorrectly and the result is that the Z values are all 0
+        # Add new error cases if you find them.
+        if numpy.amin(verts[:, 1]) == numpy.amax(verts[:, 1]):
+            # Something may have gone wrong in numpy stl, start over without numpy stl
+            Logger.log("w", "All Z coordinates are the same using numpystl, trying again without numpy stl.")
+            mesh_builder = MeshBuilder()
+            loadFile(file_name, mesh_builder, _use_numpystl = False)
+
+            verts = mesh_builder.getVertices()
+            if verts is not None and numpy.amin(verts[:, 1]) == numpy.amax(verts[:, 1]):
+                Logger.log("e", "All Z coordinates are still the same without numpy stl... let's hope for the best")
+
+    return mesh_builder.getVertices(), mesh_builder.getNormals()
+
+
+def loadFile(file_name: str, mesh_builder: MeshBuilder, _use_numpystl: bool = False) -> None:
+    """Load the STL data of a file into a mesh builder, and calculate the normals.
+
+    :param file_name: The path of the STL file.
+    :param mesh_builder: The MeshBuilder where the data is written to.
+    :param _use_numpystl: Whether to try reading the file with numpy-stl first.
+    """
+
+    file_read = False
+    if _use_numpystl:
+        Logger.log("i", "Using NumPy-STL to load STL data.")
+        try:
+            loadWithNumpySTL(file_name, mesh_builder)
+            file_read = True
+        except:
+            Logger.logException("e", "Reading file failed with Numpy-STL!")
+
+    if not file_read:
+        Logger.log("i", "Using legacy code to load STL data.")
+        f = open(file_name, "rb")
+        if not loadBinary(mesh_builder, f):
+            f.close()
+            f = open(file_name, "rt", encoding = "utf-8")
+            try:
+                loadAscii(mesh_builder, f)
+            except UnicodeDecodeError:
+                return None
+            f.close()
+        Job.yieldThread()  # Yield somewhat to ensure the GUI has time to update a bit.
+
+    mesh_builder.calculateNormals(fast = True)
+    mesh_builder.setFileName(file_name)
+
+
+def _swapColumns(array: numpy.ndarray, frm: int, to: int) -> None:
+    array[:, [frm, to]] = array[:, [to, frm]]
+
+
+def loadWithNumpySTL(file_name: str, mesh_builder: MeshBuilder) -> None:
+    for loaded_data in stl.mesh.Mesh.from_multi_file(file_name, mode=stl.stl.Mode.AUTOMATIC):
+        vertices = numpy.resize(loaded_data.points.flatten(), (int(loaded_data.points.size / 3), 3))
+
+        # Invert values of second column
+        vertices[:, 1] *= -1
+
+        # Swap column 1 and 2 (We have a different coordinate system)
+        _swapColumns(vertices, 1, 2)
+
+        mesh_builder.addVertices(vertices)
+
+
+def loadAscii(mesh_builder: MeshBuilder, f: IO[str]) -> None:
+    """Load the STL data from file by considering the data as ascii.
+
+    The file is read in a single pass, in chunks of text. The coordinates of all vertex lines in a chunk are
+    converted at once and appended to a buffer that grows geometrically, so the memory used is bounded by the
+    resulting mesh plus one chunk. Facets are not bound to a solid, so files with multiple solids simply end up
+    as one mesh.
+
+    :param mesh_builder: The MeshData object where the data is written to.
+    :param f: The file handle
+    """
+
+    vertices = numpy.empty((ASCII_INITIAL_VERTEX_COUNT, 3), dtype = numpy.float32)
+    vertex_count = 0
+    remainder = ""
+    while True:
+        chunk = f.read(ASCII_CHUNK_SIZE)
+        text = remainder + chunk
+        if chunk:
+            # Keep the last (possibly incomplete) line for the next chunk.
+            line_end = max(text.rfind("\n"), text.rfind("\r")) + 1
+            remainder = text[line_end:]
+            text = text[:line_end]
+
+        coordinates = _ascii_vertex_regex.findall(text)
+        if coordinates:
+            values = numpy.fromstring(" ".join(coordinates), dtype = numpy.float32, sep = " ")
+            if len(values) != len(coordinates) * 3:
+                raise ValueError("Unable to parse the vertex coordinates in the STL file.")
+            values = values.reshape((-1, 3))
+
+            if vertex_count + len(values) > len(vertices):
+                vertices.resize((max(len(vertices) * 2, vertex_count + len(values)), 3), refcheck = False)  # Disabling refcheck allows PyCharm's debugger to use this array.
+
+            # Swap the Y and Z axis and invert the new Z axis (We have a different coordinate system)
+            target = vertices[vertex_count: vertex_count + len(values)]
+            target[:, 0] = values[:, 0]
+            target[:, 1] = values[:, 2]
+            numpy.negative(values[:, 1], out = target[:, 2])
+            vertex_count += len(values)
+
+        Job.yieldThread()
+        if not chunk:
+            break
+
+    vertex_count -= vertex_count % 3  # Drop incomplete faces.
+    vertices.resize((vertex_count, 3), refcheck = False)
+    mesh_builder.addVertices(vertices)
+
+
+def loadBinary(mesh_builder: MeshBuilder, f: IO[bytes]) -> bool:
+    """Load the STL data from file by consdering the data as Binary.
+    :param mesh: The MeshData object where the data is written to.
+    :param f: The file handle
+    :return: Whether the file was a binary STL file.
+    """
+
+    f.read(80)  # Skip the header
+
+    try:
+        num_faces = struct.unpack("<I", f.read(4))[0]
+    except struct.error:  # Can't unpack it if the file didn't have 4 bytes in it.
+        return False
+    # On ascii files, the num_faces will be big, due to 4 ascii bytes being seen as an unsigned int.
+    if num_faces < 1 or num_faces > 1000000000:
+        return False
+    f.seek(0, os.SEEK_END)
+    file_size = f.tell()
+    f.seek(84, os.SEEK_SET)
+    if file_size < num_faces * 50 + 84:
+        return False
+
+    # Map the file into memory and view it as an array of facets. This way we never copy the raw data into Python
+    # objects, and the OS only needs to page in the part of the file we are currently converting.
+    facets = numpy.memmap(f, dtype = BINARY_FACET_DTYPE, mode = "r", offset = 84, shape = (num_faces, ))
+    vertices = numpy.empty((num_faces * 3, 3), dtype = numpy.float32)
+    faces = vertices.reshape((num_faces, 3, 3))  # A view on the same data, one row per face.
+
+    for start in range(0, num_faces, BINARY_CHUNK_FACE_COUNT):
+        end = min(start + BINARY_CHUNK_FACE_COUNT, num_faces)
+        source = facets["vertices"][start:end]
+        target = faces[start:end]
+
+        # Swap the Y and Z axis and invert the new Z axis (We have a different coordinate system)
+        target[:, :, 0] = source[:, :, 0]
+        target[:, :, 1] = source[:, :, 2]
+        numpy.negative(source[:, :, 1], out = target[:, :, 2])
+
+        Job.yieldThread()
+
+    del facets, source  # Release the memory map, otherwise the file stays locked on some platforms.
+
+    mesh_builder.addVertices(vertices)
+    return True
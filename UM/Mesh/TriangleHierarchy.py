@@ -0,0 +1,200 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy
+
+_leaf_size = 8  # Maximum number of triangles in a leaf of the hierarchy.
+_determinant_epsilon = 1e-12  # Rays that are more parallel to a triangle than this don't hit it.
+
+
+RayHits = NamedTuple("RayHits", [("distances", numpy.ndarray), ("face_ids", numpy.ndarray), ("barycentrics", numpy.ndarray)])
+"""Where a batch of rays hit a mesh.
+
+For every ray: the distance along the ray to the nearest hit, in units of its direction vector, the index of the face
+that was hit, and the weights of the three corners of that face for the point that was hit. For rays that don't hit
+anything, the distance is infinite, the face index is -1 and the weights are zero.
+"""
+
+
+class TriangleHierarchy:
+    """A bounding volume hierarchy over the faces of a mesh, to find where rays hit the mesh without a GPU.
+
+    The hierarchy is stored in flat arrays. Every node has a bounding box and is either a leaf, covering a range of
+    faces in ``_face_order``, or it has two children. Rays are traced in batches: all pairs of a ray and a node that
+    still need to be visited are tested at once, one level of the tree at a time.
+    """
+
+    def __init__(self, vertices: numpy.ndarray, indices: Optional[numpy.ndarray] = None) -> None:
+        """Builds the hierarchy for a mesh.
+
+        :param vertices: The vertices of the mesh, of shape (V, 3).
+        :param indices: The three vertex indices of every face, of shape (F, 3). If not given, every three consecutive
+        vertices form a face.
+        """
+
+        if indices is not None and len(indices) > 0:
+            corners = vertices[numpy.asarray(indices)]
+        else:
+            face_count = len(vertices) // 3
+            corners = numpy.asarray(vertices)[:face_count * 3].reshape((face_count, 3, 3))
+        corners = corners.astype(numpy.float64)
+
+        self._origins = corners[:, 0]
+        self._edges_1 = corners[:, 1] - corners[:, 0]
+        self._edges_2 = corners[:, 2] - corners[:, 0]
+        self._build(corners.min(axis = 1), corners.max(axis = 1))
+
+    def getFaceCount(self) -> int:
+        return len(self._origins)
+
+    def getNodeCount(self) -> int:
+        return len(self._node_minimum)
+
+    def intersectRays(self, origins: numpy.ndarray, directions: numpy.ndarray) -> RayHits:
+        """Finds where each of a batch of rays hits the mesh first.
+
+        :param origins: The start points of the rays, of shape (N, 3), in the coordinates of the mesh.
+        :param directions: The directions of the rays, of shape (N, 3). They don't need to be normalized.
+        :return: The nearest hit of every ray. Only hits in front of the origin count. Both sides of a face can be hit.
+        """
+
+        origins = numpy.asarray(origins, dtype = numpy.float64).reshape((-1, 3))
+        directions = numpy.asarray(directions, dtype = numpy.float64).reshape((-1, 3))
+        ray_count = len(origins)
+        distances = numpy.full(ray_count, numpy.inf)
+        face_ids = numpy.full(ray_count, -1, dtype = numpy.int64)
+        barycentrics = numpy.zeros((ray_count, 3))
+        if ray_count == 0 or self.getFaceCount() == 0:
+            return RayHits(distances, face_ids, barycentrics)
+
+        with numpy.errstate(divide = "ignore"):
+            inverse_directions = 1.0 / directions
+
+        # Pairs of a ray and a node that the ray still needs to be tested against.
+        rays = numpy.arange(ray_count)
+        nodes = numpy.zeros(ray_count, dtype = numpy.int64)
+        while len(rays) > 0:
+            near, far = self._slabs(origins[rays], inverse_directions[rays], nodes)
+            visit = (far >= numpy.maximum(near, 0)) & (near <= distances[rays])
+            rays = rays[visit]
+            nodes = nodes[visit]
+
+            is_leaf = self._node_left[nodes] < 0
+            if numpy.any(is_leaf):
+                self._intersectLeaves(origins, directions, rays[is_leaf], nodes[is_leaf], distances, face_ids, barycentrics)
+
+            rays = rays[~is_leaf]
+            nodes = nodes[~is_leaf]
+            rays = numpy.concatenate((rays, rays))
+            nodes = numpy.concatenate((self._node_left[nodes], self._node_right[nodes]))
+
+        return RayHits(distances, face_ids, barycentrics)
+
+    def _slabs(self, origins: numpy.ndarray, inverse_directions: numpy.ndarray, nodes: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Finds the distances along rays where they enter and exit the bounding boxes of nodes.
+
+        :return: The distances where each ray enters and exits the box of its node. They exit before they enter if
+        they miss the box.
+        """
+
+        with numpy.errstate(invalid = "ignore"):  # A ray parallel to a side, starting in its plane, gives NaN.
+            to_minimum = (self._node_minimum[nodes] - origins) * inverse_directions
+            to_maximum = (self._node_maximum[nodes] - origins) * inverse_directions
+        nearest = numpy.fmin(to_minimum, to_maximum)
+        furthest = numpy.fmax(to_minimum, to_maximum)
+        # Such a ray is right on the border of the box, so let that axis not exclude it.
+        nearest[numpy.isnan(nearest)] = -numpy.inf
+        furthest[numpy.isnan(furthest)] = numpy.inf
+        return nearest.max(axis = 1), furthest.min(axis = 1)
+
+    def _intersectLeaves(self, origins: numpy.ndarray, directions: numpy.ndarray, rays: numpy.ndarray, nodes: numpy.ndarray,
+                         distances: numpy.ndarray, face_ids: numpy.ndarray, barycentrics: numpy.ndarray) -> None:
+        """Intersects rays with all faces in the leaves they reached, and keeps the nearest hit of every ray.
+
+        This uses the Möller–Trumbore algorithm for every pair of a ray and a face at once.
+        """
+
+        counts = self._node_count[nodes]
+        pair_rays = numpy.repeat(rays, counts)
+        offsets = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        pair_faces = self._face_order[numpy.repeat(self._node_start[nodes], counts) + offsets]
+
+        direction = directions[pair_rays]
+        edge_1 = self._edges_1[pair_faces]
+        edge_2 = self._edges_2[pair_faces]
+        p = numpy.cross(direction, edge_2)
+        determinant = numpy.einsum("ij,ij->i", edge_1, p)
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            inverse_determinant = 1.0 / determinant
+            s = origins[pair_rays] - self._origins[pair_faces]
+            u = numpy.einsum("ij,ij->i", s, p) * inverse_determinant
+            q = numpy.cross(s, edge_1)
+            v = numpy.einsum("ij,ij->i", direction, q) * inverse_determinant
+            t = numpy.einsum("ij,ij->i", edge_2, q) * inverse_determinant
+            hit = (numpy.abs(determinant) > _determinant_epsilon) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t < distances[pair_rays])
+        if not numpy.any(hit):
+            return
+
+        pair_rays, pair_faces, t, u, v = pair_rays[hit], pair_faces[hit], t[hit], u[hit], v[hit]
+        # Keep only the nearest hit of every ray.
+        order = numpy.lexsort((t, pair_rays))
+        first = numpy.ones(len(order), dtype = numpy.bool_)
+        first[1:] = pair_rays[order[1:]] != pair_rays[order[:-1]]
+        nearest = order[first]
+
+        hit_rays = pair_rays[nearest]
+        distances[hit_rays] = t[nearest]
+        face_ids[hit_rays] = pair_faces[nearest]
+        barycentrics[hit_rays] = numpy.stack((1 - u[nearest] - v[nearest], u[nearest], v[nearest]), axis = 1)
+
+    def _build(self, face_minimum: numpy.ndarray, face_maximum: numpy.ndarray) -> None:
+        """Builds the tree from the top down, splitting the faces of every node in halves along the axis where their
+        centres are spread the most.
+        """
+
+        centres = face_minimum + face_maximum
+        self._face_order = numpy.arange(len(centres))
+        node_minimum = []  # type: List[numpy.ndarray]
+        node_maximum = []  # type: List[numpy.ndarray]
+        node_left = []  # type: List[int]
+        node_right = []  # type: List[int]
+        node_start = []  # type: List[int]
+        node_count = []  # type: List[int]
+
+        stack = [(0, len(centres), -1, False)]  # Start and end in the face order, the parent node and whether it's the right child.
+        while stack:
+            start, end, parent, is_right = stack.pop()
+            faces = self._face_order[start:end]
+            index = len(node_minimum)
+            if parent >= 0:
+                if is_right:
+                    node_right[parent] = index
+                else:
+                    node_left[parent] = index
+            node_minimum.append(face_minimum[faces].min(axis = 0) if len(faces) > 0 else numpy.zeros(3))
+            node_maximum.append(face_maximum[faces].max(axis = 0) if len(faces) > 0 else numpy.zeros(3))
+            node_start.append(start)
+            node_count.append(end - start)
+            node_left.append(-1)
+            node_right.append(-1)
+            if end - start <= _leaf_size:
+                continue
+            face_centres = centres[faces]
+            spread = face_centres.max(axis = 0) - face_centres.min(axis = 0)
+            axis = int(numpy.argmax(spread))
+            if spread[axis] <= 0:  # All faces are in the same place. They can't be split.
+                continue
+            middle = (end - start) // 2
+            self._face_order[start:end] = faces[numpy.argpartition(face_centres[:, axis], middle)]
+            node_count[index] = 0
+            stack.append((start + middle, end, index, True))
+            stack.append((start, start + middle, index, False))
+
+        self._node_minimum = numpy.array(node_minimum, dtype = numpy.float64).reshape((-1, 3))
+        self._node_maximum = numpy.array(node_maximum, dtype = numpy.float64).reshape((-1, 3))
+        self._node_left = numpy.array(node_left, dtype = numpy.int64)
+        self._node_right = numpy.array(node_right, dtype = numpy.int64)
+        self._node_start = numpy.array(node_start, dtype = numpy.int64)
+        self._node_count = numpy.array(node_count, dtype = numpy.int64)
@@ -12,15 +12,25 @@ from UM.Signal import Signal
 import math
 import time
 import numpy
+import scipy.spatial
+
+_plane_precision = 1e-3 #Triangles of the convex hull of which the plane equations are equal up to this precision form one side.
+_stability_epsilon = 1e-6 #How far outside a side the centre of mass may be projected, due to rounding errors.
 
 
 class LayFlatOperation(Operation.Operation):
     """Operation that lays a mesh flat on the scene."""
 
+    class Mode:
+        """The ways to find the side to lay an object flat on."""
+
+        LowestVertices = 1 #Lay the lowest three vertices flat. This is the original heuristic.
+        LargestStableFace = 2 #Lay the largest side of the convex hull flat that the object can stand on.
+
     progress = Signal()
     """Signal that indicates that the progress meter has changed."""
 
-    def __init__(self, node, orientation = None):
+    def __init__(self, node, orientation = None, mode = Mode.LowestVertices):
         """Creates the operation.
 
         An optional orientation may be added if the answer of this lay flat
@@ -29,10 +39,12 @@ class LayFlatOperation(Operation.Operation):
 
         :param node: The scene node to apply the operation on.
         :param orientation: A pre-calculated result orientation.
+        :param mode: How to find the side to lay the object on. One of the constants in LayFlatOperation.Mode.
         """
 
         super().__init__()
         self._node = node #Node the operation is applied on.
+        self._mode = mode #How to find the side to lay the object on.
 
         self._progress_emit_time = None #Time when the progress signal was most recently emitted.
         self._progress = 0 #Current progress. Expressed in number of vertices it has processed (ranging from 0 to n).
@@ -46,34 +58,45 @@ class LayFlatOperation(Operation.Operation):
     def process(self):
         """Computes some orientation to hopefully lay the object flat.
 
-        No promises! This algorithm finds the lowest three vertices and lays
-        them flat. This is a rather naive heuristic, but fast and practical.
+        Only the vertices of the convex hull of the mesh are used, since the object can only rest on those.
+        """
+
+        vertices, vertex_count = self._getHullVertices(self._node)
+        if vertices is None or len(vertices) == 0:
+            self._emitProgress(vertex_count * 2)
+            return
+
+        if self._mode == LayFlatOperation.Mode.LargestStableFace:
+            normal = self.findLargestStableFace(vertices)
+            if normal is not None:
+                rotation = Quaternion.rotationTo(Vector(normal[0], normal[1], normal[2]), Vector(0, -1, 0))
+                self._node.rotate(rotation, SceneNode.TransformSpace.Parent)
+                self._new_orientation = self._node.getOrientation() #Save the resulting orientation.
+            self._emitProgress(vertex_count * 2)
+            return
+
+        self._layLowestVerticesFlat(vertices, vertex_count)
+
+    def _layLowestVerticesFlat(self, transformed_vertices, vertex_count):
+        """Rotates the object such that its lowest three vertices are equally low.
+
+        No promises! This is a rather naive heuristic, but fast and practical.
+
+        :param transformed_vertices: The vertices of the convex hull, in world coordinates.
+        :param vertex_count: The number of vertices of the mesh, to report progress with.
         """
 
         # Based on https://github.com/daid/Cura/blob/SteamEngine/Cura/util/printableObject.py#L207
         # Note: Y & Z axis are swapped
 
-        #Transform mesh first to get the current positions of the vertices.
-        transformed_vertices = self._node.getMeshDataTransformedVertices()
-
         min_y_vertex = transformed_vertices[transformed_vertices.argmin(0)[1]]
-        dot_min = 1.0 #Minimum y-component of direction vector.
-        dot_v = None
-
-        #Find the second-lowest vertex.
-        for v in transformed_vertices:
-            diff = v - min_y_vertex #From this vertex to the lowest vertex.
-            length = math.sqrt(diff[0] * diff[0] + diff[1] * diff[1] + diff[2] * diff[2])
-            if length < 5: #Ignore lines smaller than half a centimetre. It's unreliable at such small distances.
-                continue
-            dot = (diff[1] / length) #Y-component of direction vector.
-            if dot_min > dot:
-                dot_min = dot
-                dot_v = diff
-            self._emitProgress(1)
+        diff = transformed_vertices - min_y_vertex #From each vertex to the lowest vertex.
+        length = numpy.sqrt(diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1] + diff[:, 2] * diff[:, 2])
+        dot_min, dot_v = self._findSteepestDirection(diff, length) #Find the second-lowest vertex.
+        self._emitProgress(vertex_count)
 
         if dot_v is None: #Couldn't find any vertex further than 5mm from the lowest vertex.
-            self._emitProgress(len(transformed_vertices))
+            self._emitProgress(vertex_count)
             return
 
         #Rotate the mesh such that the second-lowest vertex is just as low as the lowest vertex.
@@ -83,23 +106,13 @@ class LayFlatOperation(Operation.Operation):
         self._node.rotate(Quaternion.fromAngleAxis(rad, Vector.Unit_Z), SceneNode.TransformSpace.Parent)
 
         #Apply the transformation so we get new vertex coordinates.
-        transformed_vertices = self._node.getMeshDataTransformedVertices()
+        transformed_vertices, _ = self._getHullVertices(self._node)
 
         min_y_vertex = transformed_vertices[transformed_vertices.argmin(0)[1]]
-        dot_min = 1.0
-        dot_v = None
-
-        #Find the second-lowest vertex again.
-        for v in transformed_vertices:
-            diff = v - min_y_vertex #From this vertex to the lowest vertex.
-            length = math.sqrt(diff[2] * diff[2] + diff[1] * diff[1])
-            if length < 5: #Ignore lines smaller than half a centimetre. It's unreliable at such small distances.
-                continue
-            dot = (diff[1] / length) #Y-component of direction vector.
-            if dot_min > dot:
-                dot_min = dot
-                dot_v = diff
-            self._emitProgress(1)
+        diff = transformed_vertices - min_y_vertex
+        length = numpy.sqrt(diff[:, 2] * diff[:, 2] + diff[:, 1] * diff[:, 1])
+        dot_min, dot_v = self._findSteepestDirection(diff, length) #Find the second-lowest vertex again.
+        self._emitProgress(vertex_count)
 
         if dot_v is None: #Couldn't find any vertex further than 5mm from the lowest vertex.
             self._node.setOrientation(self._old_orientation)
@@ -114,6 +127,113 @@ class LayFlatOperation(Operation.Operation):
 
         self._new_orientation = self._node.getOrientation() #Save the resulting orientation.
 
+    @staticmethod
+    def _findSteepestDirection(diff, length):
+        """Finds the direction from the lowest vertex to another vertex that goes down the most.
+
+        :param diff: The vectors from the lowest vertex to each vertex.
+        :param length: The lengths of those vectors to use.
+        :return: The Y component of that direction, and the vector to that vertex. The vector is None if there is no
+        vertex that goes down more than straight up.
+        """
+
+        far_enough = numpy.flatnonzero(length >= 5) #Ignore lines smaller than half a centimetre. It's unreliable at such small distances.
+        if len(far_enough) == 0:
+            return 1.0, None
+        dots = diff[far_enough, 1] / length[far_enough] #Y-component of direction vector.
+        index = int(numpy.argmin(dots)) #The first one, if there are multiple.
+        if dots[index] >= 1.0:
+            return 1.0, None
+        return float(dots[index]), diff[far_enough[index]]
+
+    @staticmethod
+    def findLargestStableFace(vertices):
+        """Finds the side of the convex hull of a set of points that is best to stand on.
+
+        The triangles of the hull that are in the same plane form one side. The hull is stable on a side if its centre
+        of mass, projected on the plane of that side, lies inside that side. Of the stable sides, the largest is chosen.
+
+        :param vertices: :type{numpy.ndarray} The points, with one row of X, Y and Z coordinates per point.
+        :return: :type{numpy.ndarray} The outward normal of that side, or None if the points don't span a volume.
+        """
+
+        points = numpy.asarray(vertices, dtype = numpy.float64)
+        if len(points) < 4:
+            return None
+        try:
+            hull = scipy.spatial.ConvexHull(points)
+        except scipy.spatial.QhullError: #The points are all in one plane, or on one line.
+            return None
+
+        corners = points[hull.simplices]
+        edges_1 = corners[:, 1] - corners[:, 0]
+        edges_2 = corners[:, 2] - corners[:, 0]
+        areas = numpy.linalg.norm(numpy.cross(edges_1, edges_2), axis = 1) / 2
+        normals = hull.equations[:, 0:3]
+
+        #Centre of mass of the solid hull, from the tetrahedra between a point inside and every triangle.
+        inside_point = points[hull.vertices].mean(axis = 0)
+        volumes = numpy.abs(numpy.einsum("ij,ij->i", corners[:, 0] - inside_point, numpy.cross(corners[:, 1] - inside_point, corners[:, 2] - inside_point)))
+        if volumes.sum() <= 0:
+            return None
+        centre = (volumes[:, numpy.newaxis] * (corners.sum(axis = 1) + inside_point)).sum(axis = 0) / (4 * volumes.sum())
+
+        #Check for every triangle whether the projection of the centre on its plane lies inside the triangle.
+        to_centre = centre - normals * (normals.dot(centre) + hull.equations[:, 3])[:, numpy.newaxis] - corners[:, 0]
+        dot_11 = numpy.einsum("ij,ij->i", edges_1, edges_1)
+        dot_12 = numpy.einsum("ij,ij->i", edges_1, edges_2)
+        dot_22 = numpy.einsum("ij,ij->i", edges_2, edges_2)
+        dot_1c = numpy.einsum("ij,ij->i", edges_1, to_centre)
+        dot_2c = numpy.einsum("ij,ij->i", edges_2, to_centre)
+        denominator = dot_11 * dot_22 - dot_12 * dot_12
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            u = (dot_22 * dot_1c - dot_12 * dot_2c) / denominator
+            v = (dot_11 * dot_2c - dot_12 * dot_1c) / denominator
+            supported = (u >= -_stability_epsilon) & (v >= -_stability_epsilon) & (u + v <= 1 + _stability_epsilon)
+
+        #Group the triangles by their plane.
+        planes = numpy.round(hull.equations / _plane_precision).astype(numpy.int64)
+        _, sides = numpy.unique(planes, axis = 0, return_inverse = True)
+        sides = sides.reshape(-1)
+        side_areas = numpy.bincount(sides, weights = areas)
+        side_stable = numpy.bincount(sides, weights = supported.astype(numpy.float64)) > 0
+        if not numpy.any(side_stable): #Only due to rounding errors. Then pick the largest side.
+            side_stable[:] = True
+        best_side = int(numpy.argmax(numpy.where(side_stable, side_areas, -1)))
+
+        in_side = sides == best_side
+        normal = (normals[in_side] * areas[in_side, numpy.newaxis]).sum(axis = 0)
+        return normal / numpy.linalg.norm(normal)
+
+    @staticmethod
+    def _getHullVertices(node):
+        """Gets the vertices of the convex hull of the mesh of a node, in world coordinates.
+
+        If the node is a group, the hull vertices of all of its children are combined.
+
+        :return: The vertices, or None if there is no mesh, and the number of vertices of the meshes themselves.
+        """
+
+        if node.callDecoration("isGroup"):
+            all_vertices = []
+            vertex_count = 0
+            for child in node.getChildren():
+                child_vertices, child_vertex_count = LayFlatOperation._getHullVertices(child)
+                if child_vertices is not None:
+                    all_vertices.append(child_vertices)
+                vertex_count += child_vertex_count
+            if not all_vertices:
+                return None, vertex_count
+            return numpy.concatenate(all_vertices, axis = 0), vertex_count
+
+        mesh_data = node.getMeshData()
+        if mesh_data is None:
+            return None, 0
+        vertices = mesh_data.getConvexHullTransformedVertices(node.getWorldTransformation(copy = False))
+        if vertices is None: #No hull could be made, e.g. if there are too few vertices.
+            vertices = node.getMeshDataTransformedVertices()
+        return vertices, mesh_data.getVertexCount()
+
     def _emitProgress(self, progress):
         """Increments the progress.
 
@@ -167,7 +287,7 @@ class LayFlatOperation(Operation.Operation):
         if other._new_orientation is None or self._new_orientation is None: #Both must have been valid operations (completed computation).
             return False
 
-        op = LayFlatOperation(self._node, self._new_orientation) #Use the same new orientation as this one.
+        op = LayFlatOperation(self._node, self._new_orientation, self._mode) #Use the same new orientation as this one.
         op._old_orientation = other._old_orientation #But use the old orientation of the other one.
         return op
 
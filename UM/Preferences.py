@@ -158,7 +158,8 @@ class Preferences:
             Logger.log("e", "Failed to write preferences to %s: %s", file, str(e))
 
     # A lot of things listen in on the preference changed signal, so always queue it for the next frame.
-    preferenceChanged = Signal(Signal.Queued)
+    # Changing the same preference multiple times before then only needs to notify them once.
+    preferenceChanged = Signal(Signal.Queued, coalesce = True)
 
     def _splitKey(self, key: str) -> Tuple[str, str]:
         group = "general"
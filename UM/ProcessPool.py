@@ -0,0 +1,356 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import concurrent.futures
+import concurrent.futures.process
+import functools
+import itertools
+import multiprocessing
+import os
+import pickle
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+
+import numpy
+
+from UM.Logger import Logger
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Shared memory needs Python 3.8. Arrays are pickled instead.
+    resource_tracker = None  # type: ignore
+    shared_memory = None  # type: ignore
+
+# Arrays that are smaller than this (in bytes) are cheaper to pickle than to put in shared memory.
+SHARED_MEMORY_MINIMUM_SIZE = 64 * 1024
+
+# On Windows a block of shared memory is freed as soon as no process has it open any more, so a worker process can't
+# hand a block over to this process after it's done. The results are pickled there.
+_share_results = os.name == "posix"
+
+# The state of a worker process.
+_progress_queue = None  # type: Optional[multiprocessing.SimpleQueue]
+_local = threading.local()
+
+
+class ProcessPool:
+    """A pool of worker processes to run CPU-bound work in.
+
+    Python code that runs in a thread holds the global interpreter lock, so the other threads (including the one that
+    draws the interface) can hardly run at the same time. Functions that are run by the ProcessPool run in another
+    process, so they run on another processor core without holding up this process. A Job can use this for the part
+    of its work that takes a lot of processing, with Job.runInProcess.
+
+    The functions and their arguments and results are transferred to and from the worker processes, so they have to
+    be picklable. In particular the functions need to be defined at module level, or be methods of picklable objects.
+    Large NumPy arrays in the arguments and results (also in tuples, lists and dictionaries) are transferred through
+    shared memory, which is much faster than pickling them. If the worker processes can't be used, the functions are
+    run in the calling thread instead. The same happens for a single function that a worker process can't import, like
+    the functions of plugins when the worker processes are spawned rather than forked.
+    """
+
+    def __init__(self, process_count: Union[str, int] = "auto", start_method: Optional[str] = None) -> None:
+        """Initialize.
+
+        :param process_count: The amount of worker processes to use. Can be a positive integer or `auto`.
+        When `auto`, the number of processes is based on the number of processors and cores on the machine.
+        :param start_method: How to start the worker processes: `fork`, `spawn` or `forkserver`. When None,
+        `forkserver` is used where it's available, and the default of the platform otherwise. Forking the application
+        itself would copy all of its threads and memory, while they may be in an inconsistent state.
+        """
+
+        if process_count == "auto":
+            process_count = os.cpu_count() or 1
+        self._process_count = max(1, cast(int, process_count))
+        if start_method is None and "forkserver" in multiprocessing.get_all_start_methods():
+            start_method = "forkserver"
+        self._start_method = start_method
+
+        self._lock = threading.Lock()
+        self._executor = None  # type: Optional[concurrent.futures.ProcessPoolExecutor]
+        self._disabled = False  # Set when the worker processes can't be used, to run everything in this process.
+        self._progress_queue = None  # type: Optional[multiprocessing.SimpleQueue]
+        self._task_ids = itertools.count()
+        self._progress_callbacks = {}  # type: Dict[int, Tuple[Callable[[Any], None], threading.Event]]
+
+    def run(self, function: Callable[..., Any], *args: Any, progress_callback: Optional[Callable[[Any], None]] = None) -> Any:
+        """Run a function in one of the worker processes, and wait for it to finish.
+
+        The calling thread doesn't hold the global interpreter lock while it waits, so other threads can process. This
+        blocks though, so it should be called from a Job rather than from the main thread.
+
+        :param function: The function to run.
+        :param args: The arguments to call the function with.
+        :param progress_callback: Called in this process with the amounts that the function passes to
+        ProcessPool.reportProgress, from a different thread.
+        :return: The result of the function. Exceptions that the function raises are raised again here.
+        """
+
+        executor = self._getExecutor()
+        if executor is None:
+            return self._runHere(function, args, progress_callback)
+
+        blocks = []  # type: List[shared_memory.SharedMemory]
+        task_id = next(self._task_ids)
+        try:
+            shared_args = _share(args, blocks)
+            try:
+                # Only the descriptions of shared arrays, so this is cheap. The worker process unpickles this itself, so
+                # that a function that it can't import fails only this task, rather than breaking the whole pool.
+                task = pickle.dumps((function, shared_args))
+            except (pickle.PicklingError, AttributeError, TypeError):
+                Logger.logException("w", "Unable to transfer %s to a worker process. Running it in this process instead.", function)
+                return self._runHere(function, args, progress_callback)
+
+            done = threading.Event()
+            if progress_callback is not None:
+                with self._lock:
+                    self._progress_callbacks[task_id] = (progress_callback, done)
+            try:
+                future = executor.submit(_runTask, task_id, task)
+                try:
+                    result = future.result()
+                finally:
+                    if progress_callback is not None and not isinstance(future.exception(), concurrent.futures.process.BrokenProcessPool):
+                        done.wait()  # The worker sent all progress before the result. Let it arrive first.
+            finally:
+                with self._lock:
+                    self._progress_callbacks.pop(task_id, None)
+        except _TaskTransferError as e:
+            Logger.log("w", "Unable to transfer %s to a worker process (%s). Running it in this process instead.", function, e)
+            return self._runHere(function, args, progress_callback)
+        except concurrent.futures.process.BrokenProcessPool:
+            Logger.logException("w", "The worker processes stopped unexpectedly. Running everything in this process from now on.")
+            self._disable()
+            return self._runHere(function, args, progress_callback)
+        finally:
+            _releaseBlocks(blocks, unlink = True)
+
+        result_blocks = []  # type: List[shared_memory.SharedMemory]
+        try:
+            return _unshare(result, result_blocks, copy = True)
+        finally:
+            _releaseBlocks(result_blocks, unlink = True)
+
+    @staticmethod
+    def reportProgress(amount: Any) -> None:
+        """Report the progress of a function that is run by the ProcessPool.
+
+        The amount is passed to the progress callback that was given to ProcessPool.run. This does nothing when it's
+        not called from such a function.
+
+        :param amount: The amount of progress made. For jobs this is a number from 0 to 100.
+        """
+
+        callback = getattr(_local, "progress_callback", None)
+        if callback is not None:
+            callback(amount)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes. They are started again when another function needs to run."""
+
+        with self._lock:
+            executor = self._executor
+            progress_queue = self._progress_queue
+            self._executor = None
+            self._progress_queue = None
+        if executor is not None:
+            executor.shutdown(wait = True)
+        if progress_queue is not None:
+            progress_queue.put(None)  # Stops the thread that relays the progress.
+
+    def _getExecutor(self) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is not None or self._disabled:
+                return self._executor
+            try:
+                if resource_tracker is not None:
+                    # Let the worker processes share the resource tracker of this process, which removes shared
+                    # memory that is left behind. Otherwise they each start their own, which can't keep track of the
+                    # blocks that they hand over to this process.
+                    resource_tracker.ensure_running()
+                context = multiprocessing.get_context(self._start_method)
+                self._progress_queue = context.SimpleQueue()
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers = self._process_count, mp_context = context, initializer = _initializeProcess, initargs = (self._progress_queue, ))
+            except Exception:  # E.g. the platform doesn't support the synchronisation that the pool needs.
+                Logger.logException("w", "Unable to start worker processes. Running everything in this process instead.")
+                self._disabled = True
+                return None
+
+            thread = threading.Thread(target = self._relayProgress, args = (self._progress_queue, ), daemon = True)
+            thread.start()
+            return self._executor
+
+    def _disable(self) -> None:
+        with self._lock:
+            self._disabled = True
+        self.shutdown()
+
+    def _relayProgress(self, progress_queue: multiprocessing.SimpleQueue) -> None:
+        """Pass the progress that the worker processes report on to the progress callbacks."""
+
+        while True:
+            message = progress_queue.get()
+            if message is None:
+                return
+            task_id, amount = message
+            with self._lock:
+                callbacks = self._progress_callbacks.get(task_id)
+            if callbacks is None:
+                continue
+            callback, done = callbacks
+            if amount is None:  # The task has finished.
+                done.set()
+                continue
+            try:
+                callback(amount)
+            except Exception:
+                Logger.logException("e", "Exception while reporting the progress of task %s.", task_id)
+
+    @staticmethod
+    def _runHere(function: Callable[..., Any], args: Tuple[Any, ...], progress_callback: Optional[Callable[[Any], None]]) -> Any:
+        previous_callback = getattr(_local, "progress_callback", None)
+        _local.progress_callback = progress_callback
+        try:
+            return function(*args)
+        finally:
+            _local.progress_callback = previous_callback
+
+    __instance = None  # type: Optional[ProcessPool]
+    __instance_lock = threading.Lock()
+
+    @classmethod
+    def getInstance(cls) -> "ProcessPool":
+        """Get the process pool of the application. It is created when it's first needed."""
+
+        with cls.__instance_lock:
+            if cls.__instance is None:
+                cls.__instance = cls()
+            return cls.__instance
+
+    @classmethod
+    def shutdownInstance(cls) -> None:
+        """Stop the worker processes of the process pool of the application, if it was created."""
+
+        with cls.__instance_lock:
+            instance = cls.__instance
+        if instance is not None:
+            instance.shutdown()
+
+
+class _TaskTransferError(Exception):
+    """Raised in a worker process when it can't unpickle a task, e.g. because it can't import the function."""
+
+    pass
+
+
+class _SharedArray:
+    """Describes a NumPy array that is stored in a block of shared memory, to transfer it to another process."""
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name: str, shape: Tuple[int, ...], dtype: numpy.dtype) -> None:
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+
+def _share(value: Any, blocks: List["shared_memory.SharedMemory"]) -> Any:
+    """Put the large arrays in a value in shared memory, replacing them by their descriptions.
+
+    :param value: The value to transfer. Arrays in tuples, lists and dictionaries are found as well.
+    :param blocks: The blocks of shared memory that are created are added to this list.
+    :return: The value to pickle instead.
+    """
+
+    if isinstance(value, numpy.ndarray):
+        if shared_memory is None or value.nbytes < SHARED_MEMORY_MINIMUM_SIZE or value.dtype.hasobject:
+            return value
+        block = shared_memory.SharedMemory(create = True, size = value.nbytes)
+        blocks.append(block)
+        numpy.ndarray(value.shape, dtype = value.dtype, buffer = block.buf)[...] = value
+        return _SharedArray(block.name, value.shape, value.dtype)
+    if type(value) in (tuple, list):
+        return type(value)(_share(item, blocks) for item in value)
+    if type(value) is dict:
+        return {key: _share(item, blocks) for key, item in value.items()}
+    return value
+
+
+def _unshare(value: Any, blocks: List["shared_memory.SharedMemory"], copy: bool) -> Any:
+    """Get the arrays back that were put in shared memory by _share.
+
+    :param value: The value that was transferred.
+    :param blocks: The blocks of shared memory that are opened are added to this list.
+    :param copy: Whether to copy the arrays out of the shared memory. If not, the arrays use the shared memory, and
+    they may only be used until the blocks are closed.
+    :return: The original value.
+    """
+
+    if isinstance(value, _SharedArray):
+        block = shared_memory.SharedMemory(name = value.name)
+        blocks.append(block)
+        array = numpy.ndarray(value.shape, dtype = value.dtype, buffer = block.buf)
+        return array.copy() if copy else array
+    if type(value) in (tuple, list):
+        return type(value)(_unshare(item, blocks, copy) for item in value)
+    if type(value) is dict:
+        return {key: _unshare(item, blocks, copy) for key, item in value.items()}
+    return value
+
+
+def _releaseBlocks(blocks: List["shared_memory.SharedMemory"], unlink: bool) -> None:
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:  # Something still uses an array in it. The block is closed when that is garbage collected.
+            pass
+        if unlink:
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _initializeProcess(progress_queue: multiprocessing.SimpleQueue) -> None:
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _sendProgress(task_id: int, amount: Any) -> None:
+    if _progress_queue is not None:
+        _progress_queue.put((task_id, amount))
+
+
+def _runTask(task_id: int, task: bytes) -> Any:
+    """Run a function in a worker process.
+
+    :param task: The pickled function and its arguments. The arguments are used directly from shared memory. The
+    large arrays in the result are put in new blocks of shared memory, which the calling process removes after it got
+    them.
+    """
+
+    blocks = []  # type: List[shared_memory.SharedMemory]
+    result = None
+    _local.progress_callback = functools.partial(_sendProgress, task_id)
+    try:
+        try:
+            function, args = pickle.loads(task)
+        except Exception as e:
+            raise _TaskTransferError(repr(e)) from None
+        result = function(*_unshare(args, blocks, copy = False))
+        if not _share_results:
+            return result
+        result_blocks = []  # type: List[shared_memory.SharedMemory]
+        try:
+            return _share(result, result_blocks)
+        except Exception:
+            _releaseBlocks(result_blocks, unlink = True)
+            raise
+        finally:
+            _releaseBlocks(result_blocks, unlink = False)
+    finally:
+        _local.progress_callback = None
+        _sendProgress(task_id, None)  # Tells the calling process that all progress of this task was sent.
+        result = None  # The result may use the memory of the arguments.
+        _releaseBlocks(blocks, unlink = False)
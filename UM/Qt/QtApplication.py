@@ -33,6 +33,7 @@ from UM.Message import Message #For typing.
 from UM.i18n import i18nCatalog
 from UM.Job import Job #For typing.
 from UM.JobQueue import JobQueue
+from UM.ProcessPool import ProcessPool
 from UM.VersionUpgradeManager import VersionUpgradeManager
 from UM.View.GL.OpenGLContext import OpenGLContext
 from UM.Version import Version
@@ -489,6 +490,11 @@ class QtApplication(QApplication, Application):
         except Exception as e:
             Logger.log("e", "Exception while closing backend: %s", repr(e))
 
+        try:
+            ProcessPool.shutdownInstance()
+        except Exception as e:
+            Logger.log("e", "Exception while stopping the worker processes: %s", repr(e))
+
         if self._tray_icon_widget:
             self._tray_icon_widget.deleteLater()
 
@@ -0,0 +1,345 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import functools
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy
+
+from UM.Math.AxisAlignedBox import AxisAlignedBox
+from UM.Math.Ray import Ray
+from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.Scene.SceneNode import SceneNode
+
+Box = Tuple[float, float, float, float, float, float]  # Minimum x, y and z, then maximum x, y and z.
+
+
+def _union(a: Box, b: Box) -> Box:
+    return min(a[0], b[0]), min(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3]), max(a[4], b[4]), max(a[5], b[5])
+
+
+class _Entry:
+    """A node of the hierarchy, with a box around everything below it."""
+
+    __slots__ = ("box", "parent")
+
+    def __init__(self, box: Box) -> None:
+        self.box = box
+        self.parent = None  # type: Optional[_Branch]
+
+
+class _Leaf(_Entry):
+    """An entry that holds a scene node."""
+
+    __slots__ = ("scene_node", )
+
+    def __init__(self, box: Box, scene_node: SceneNode) -> None:
+        super().__init__(box)
+        self.scene_node = scene_node
+
+
+class _Branch(_Entry):
+    """An entry with two children. It becomes the parent of both."""
+
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: _Entry, right: _Entry) -> None:
+        super().__init__(_union(left.box, right.box))
+        self.left = left
+        self.right = right
+        left.parent = self
+        right.parent = self
+
+
+class BoundingVolumeHierarchy:
+    """A tree of the bounding boxes of all nodes in a scene, to find nodes by their position or their ID without
+    visiting every node.
+
+    The hierarchy follows the ``childrenChanged`` signal of the root to add and remove nodes, and the
+    ``boundingBoxChanged`` signal of every node to refit the boxes of the nodes that changed. Refitting is postponed
+    until the next query, and only touches the entries of the nodes that changed and their ancestors in the tree.
+
+    Nodes that don't calculate a bounding box, like the root, can be found by ID but not by position.
+    """
+
+    def __init__(self, root: Optional[SceneNode] = None) -> None:
+        self._root = None  # type: Optional[SceneNode]
+        self._tree = None  # type: Optional[_Entry]
+        self._leaves = {}  # type: Dict[int, _Leaf]  # By ID of the scene node.
+        self._nodes = {}  # type: Dict[int, SceneNode]  # All nodes in the scene, by ID.
+        self._children = {}  # type: Dict[int, List[SceneNode]]  # The children of every node, as far as we know.
+        self._bounding_box_listeners = {}  # type: Dict[int, Callable[[], None]]
+        self._dirty = set()  # type: Set[int]  # IDs of nodes of which the bounding box changed.
+        if root is not None:
+            self.setRoot(root)
+
+    def setRoot(self, root: Optional[SceneNode]) -> None:
+        """Changes the scene that the hierarchy is built for.
+
+        :param root: The root of the scene, or None to clear the hierarchy.
+        """
+
+        if self._root is not None:
+            self._root.childrenChanged.disconnect(self._onChildrenChanged)
+            for node in list(self._nodes.values()):
+                self._forgetNode(node)
+        self._tree = None
+        self._leaves.clear()
+        self._dirty.clear()
+
+        self._root = root
+        if root is None:
+            return
+        root.childrenChanged.connect(self._onChildrenChanged)
+        leaves = []  # type: List[_Leaf]
+        for node in DepthFirstIterator(root):  # type: ignore
+            self._trackNode(node)
+            box = self._getBox(node)
+            if box is not None:
+                leaves.append(_Leaf(box, node))
+        self._leaves = {id(leaf.scene_node): leaf for leaf in leaves}
+        self._tree = self._build(leaves) if leaves else None
+
+    def findNode(self, object_id: int) -> Optional[SceneNode]:
+        """Finds a node in the scene by its ID.
+
+        :param object_id: The ID of the node, as returned by Python's ``id()``.
+        :return: The node, or None if it is not in the scene.
+        """
+
+        node = self._nodes.get(object_id)
+        if node is None:
+            return None
+        # Make sure that it wasn't removed from the scene without us noticing.
+        ancestor = node  # type: Optional[SceneNode]
+        while ancestor is not None and ancestor is not self._root:
+            ancestor = ancestor.getParent()
+        return node if ancestor is not None else None
+
+    def findIntersectingRay(self, ray: Ray) -> List[Tuple[SceneNode, float, float]]:
+        """Finds all nodes of which the bounding box is hit by a ray.
+
+        :param ray: The ray to cast.
+        :return: The nodes that are hit and the distances along the ray where it enters and exits their bounding box,
+        sorted by the distance where it enters, nearest first.
+        """
+
+        self._refit()
+        origin = numpy.array([ray.origin.x, ray.origin.y, ray.origin.z], dtype = numpy.float64)
+        inverse_direction = numpy.array([ray.inverseDirection.x, ray.inverseDirection.y, ray.inverseDirection.z], dtype = numpy.float64)
+
+        result = []  # type: List[Tuple[SceneNode, float, float]]
+        stack = [self._tree] if self._tree is not None else []
+        while stack:
+            entry = stack.pop()
+            if not self._rayHitsBox(entry.box, origin, inverse_direction):
+                continue
+            if isinstance(entry, _Leaf):
+                bounding_box = entry.scene_node.getBoundingBox()  # Use exactly the same test as without the hierarchy.
+                intersection = bounding_box.intersectsRay(ray) if bounding_box is not None else False
+                if isinstance(intersection, tuple):
+                    result.append((entry.scene_node, intersection[0], intersection[1]))
+            elif isinstance(entry, _Branch):
+                stack.append(entry.left)
+                stack.append(entry.right)
+        result.sort(key = lambda hit: hit[1])
+        return result
+
+    def findIntersectingBox(self, box: AxisAlignedBox) -> List[SceneNode]:
+        """Finds all nodes of which the bounding box intersects or touches a box.
+
+        :param box: The box to find the nodes in.
+        :return: The nodes that intersect it, in no particular order.
+        """
+
+        self._refit()
+        query = (box.left, box.bottom, box.back, box.right, box.top, box.front)
+        result = []  # type: List[SceneNode]
+        stack = [self._tree] if self._tree is not None else []
+        while stack:
+            entry = stack.pop()
+            if not self._boxesIntersect(entry.box, query):
+                continue
+            if isinstance(entry, _Leaf):
+                result.append(entry.scene_node)
+            elif isinstance(entry, _Branch):
+                stack.append(entry.left)
+                stack.append(entry.right)
+        return result
+
+    def _onChildrenChanged(self, node: SceneNode) -> None:
+        """Adds and removes the entries of children that were added to or removed from a node."""
+
+        if id(node) not in self._nodes:
+            return  # Not in the scene (any more).
+        children = node.getChildren()
+        known_children = self._children.get(id(node), [])
+        for child in known_children:
+            if child not in children:
+                self._forgetSubtree(child)
+        for child in children:
+            if child not in known_children:
+                for descendant in DepthFirstIterator(child):  # type: ignore
+                    self._trackNode(descendant)
+                    self._dirty.add(id(descendant))
+        self._children[id(node)] = list(children)
+
+    def _trackNode(self, node: SceneNode) -> None:
+        self._nodes[id(node)] = node
+        self._children[id(node)] = list(node.getChildren())
+        if id(node) not in self._bounding_box_listeners:
+            listener = functools.partial(self._onBoundingBoxChanged, id(node))
+            self._bounding_box_listeners[id(node)] = listener
+            node.boundingBoxChanged.connect(listener)
+
+    def _forgetSubtree(self, node: SceneNode) -> None:
+        """Removes a node and all its descendants, as far as we know them, from the hierarchy."""
+
+        for child in self._children.get(id(node), []):
+            self._forgetSubtree(child)
+        self._removeLeaf(node)
+        self._forgetNode(node)
+
+    def _forgetNode(self, node: SceneNode) -> None:
+        self._nodes.pop(id(node), None)
+        self._children.pop(id(node), None)
+        self._dirty.discard(id(node))
+        listener = self._bounding_box_listeners.pop(id(node), None)
+        if listener is not None:
+            node.boundingBoxChanged.disconnect(listener)
+
+    def _onBoundingBoxChanged(self, node_id: int) -> None:
+        self._dirty.add(node_id)
+
+    def _refit(self) -> None:
+        """Updates the entries of the nodes of which the bounding box changed since the last query."""
+
+        dirty = self._dirty
+        self._dirty = set()
+        for node_id in dirty:
+            node = self._nodes.get(node_id)
+            if node is None:
+                continue
+            box = self._getBox(node)
+            leaf = self._leaves.get(node_id)
+            if box is None:
+                self._removeLeaf(node)
+            elif leaf is None:
+                self._insertLeaf(_Leaf(box, node))
+            elif leaf.box != box:
+                leaf.box = box
+                self._refitAncestors(leaf)
+
+    def _insertLeaf(self, leaf: _Leaf) -> None:
+        """Inserts a leaf next to the entry where it makes the total surface of the boxes grow the least."""
+
+        self._leaves[id(leaf.scene_node)] = leaf
+        if self._tree is None:
+            self._tree = leaf
+            return
+
+        sibling = self._tree
+        while isinstance(sibling, _Branch):
+            left_growth = self._surface(_union(sibling.left.box, leaf.box)) - self._surface(sibling.left.box)
+            right_growth = self._surface(_union(sibling.right.box, leaf.box)) - self._surface(sibling.right.box)
+            sibling = sibling.left if left_growth <= right_growth else sibling.right
+
+        grandparent = sibling.parent
+        parent = _Branch(sibling, leaf)
+        parent.parent = grandparent
+        if grandparent is None:
+            self._tree = parent
+        elif grandparent.left is sibling:
+            grandparent.left = parent
+        else:
+            grandparent.right = parent
+        self._refitAncestors(grandparent)  # The new parent already fits, but the entries above it may have to grow.
+
+    def _removeLeaf(self, node: SceneNode) -> None:
+        """Removes the leaf of a node, replacing its parent by its sibling."""
+
+        leaf = self._leaves.pop(id(node), None)
+        if leaf is None:
+            return
+        parent = leaf.parent
+        if parent is None:
+            self._tree = None
+            return
+        sibling = parent.right if parent.left is leaf else parent.left
+        sibling.parent = parent.parent
+        if parent.parent is None:
+            self._tree = sibling
+            return
+        if parent.parent.left is parent:
+            parent.parent.left = sibling
+        else:
+            parent.parent.right = sibling
+        self._refitAncestors(sibling.parent)
+
+    def _refitAncestors(self, entry: Optional[_Entry]) -> None:
+        """Fits the boxes of an entry and its ancestors around their children again, as far as they change."""
+
+        if isinstance(entry, _Leaf):
+            entry = entry.parent
+        while isinstance(entry, _Branch):
+            box = _union(entry.left.box, entry.right.box)
+            if box == entry.box:
+                return  # The boxes further up don't change either.
+            entry.box = box
+            entry = entry.parent
+
+    @classmethod
+    def _build(cls, leaves: List[_Leaf]) -> _Entry:
+        """Builds a tree from scratch, by splitting the leaves in halves along the axis where their centres are spread
+        the most.
+
+        :param leaves: The leaves to build the tree of. There must be at least one.
+        :return: The root of the new tree.
+        """
+
+        if len(leaves) == 1:
+            leaves[0].parent = None
+            return leaves[0]
+        centres = numpy.array([leaf.box for leaf in leaves], dtype = numpy.float64)
+        centres = centres[:, :3] + centres[:, 3:]
+        axis = int(numpy.argmax(centres.max(axis = 0) - centres.min(axis = 0)))
+        order = numpy.argsort(centres[:, axis], kind = "stable")
+        half = len(leaves) // 2
+        return _Branch(cls._build([leaves[index] for index in order[:half]]), cls._build([leaves[index] for index in order[half:]]))
+
+    @staticmethod
+    def _getBox(node: SceneNode) -> Optional[Box]:
+        bounding_box = node.getBoundingBox()
+        if bounding_box is None:
+            return None
+        return bounding_box.left, bounding_box.bottom, bounding_box.back, bounding_box.right, bounding_box.top, bounding_box.front
+
+    @staticmethod
+    def _surface(box: Box) -> float:
+        width, height, depth = box[3] - box[0], box[4] - box[1], box[5] - box[2]
+        return width * height + height * depth + depth * width
+
+    @staticmethod
+    def _boxesIntersect(a: Box, b: Box) -> bool:
+        # Like AxisAlignedBox.intersectsBox, boxes that touch intersect.
+        return a[0] <= b[3] and b[0] <= a[3] and a[1] <= b[4] and b[1] <= a[4] and a[2] <= b[5] and b[2] <= a[5]
+
+    @staticmethod
+    def _rayHitsBox(box: Box, origin: numpy.ndarray, inverse_direction: numpy.ndarray) -> bool:
+        """Whether a ray could hit anything inside a box.
+
+        This is the same test as ``AxisAlignedBox.intersectsRay``, but it errs on the side of a hit so that it never
+        skips a box that the exact test would hit.
+        """
+
+        with numpy.errstate(invalid = "ignore"):  # A ray parallel to a side, starting in its plane, gives NaN.
+            near = inverse_direction * (numpy.array(box[:3]) - origin)
+            far = inverse_direction * (numpy.array(box[3:]) - origin)
+        lowest = numpy.fmin(near, far)
+        highest = numpy.fmax(near, far)
+        # Don't let an axis that gave NaN exclude the box.
+        lowest[numpy.isnan(lowest)] = -numpy.inf
+        highest[numpy.isnan(highest)] = numpy.inf
+        largest_min = lowest.max()
+        smallest_max = highest.min()
+        return bool(smallest_max >= largest_min - 1e-6 * max(1.0, abs(largest_min)))
@@ -129,11 +129,17 @@ class Camera(SceneNode.SceneNode):
             self._cached_view_projection_matrix = self._projection_matrix.multiply(inverted_transformation, copy = True)
         return self._cached_view_projection_matrix
 
-    def _updateWorldTransformation(self) -> None:
+    def _updateWorldTransformation(self) -> Matrix:
         self._cached_view_projection_matrix = None
         self._cached_inversed_world_transformation = None
         self._camera_light_position = None
-        super()._updateWorldTransformation()
+        return super()._updateWorldTransformation()
+
+    def _invalidateWorldTransformation(self) -> None:
+        self._cached_view_projection_matrix = None
+        self._cached_inversed_world_transformation = None
+        self._camera_light_position = None
+        super()._invalidateWorldTransformation()
 
     def getViewportHeight(self) -> int:
         return self._viewport_height
@@ -197,8 +203,8 @@ class Camera(SceneNode.SceneNode):
         view_x = (window_x / self._viewport_width) * 2 - 1
         view_y = (window_y / self._viewport_height) * 2 - 1
 
-        inverted_projection = numpy.linalg.inv(self._projection_matrix.getData().copy())
-        transformation = self.getWorldTransformation().getData()
+        inverted_projection = numpy.linalg.inv(self._projection_matrix.getData(copy = False))
+        transformation = self.getWorldTransformation(copy = False).getData(copy = False)
 
         near = numpy.array([view_x, -view_y, -1.0, 1.0], dtype = numpy.float32)
         near = numpy.dot(inverted_projection, near)
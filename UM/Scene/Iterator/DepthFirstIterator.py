@@ -10,4 +10,4 @@ class DepthFirstIterator(Iterator.Iterator):
 
     def _fillStack(self) -> None:
         self._node_stack.append(self._scene_node)
-        self._node_stack.extend(self._scene_node.getAllChildren())
+        self._node_stack.extend(self._scene_node._getAllChildren())
@@ -0,0 +1,84 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import typing
+from typing import Callable, List, Optional
+
+from UM.Scene.SceneNode import SceneNode
+from . import Iterator
+
+
+class LazyDepthFirstIterator(Iterator.Iterator):
+    """Visits the same nodes in the same order as the DepthFirstIterator, but only finds them while iterating.
+
+    No list of all nodes is made in advance, so a loop that stops early doesn't visit the rest of the scene. The
+    children of a node are looked up when the iteration gets to it, so changes to the scene during the iteration are
+    seen for the nodes that weren't visited yet.
+
+    Only the nodes that pass all of the given filters are returned, and the descendants of nodes can be skipped
+    entirely. If no descendants are skipped and the scene node already has a valid cache of all its descendants, the
+    iterator goes through that cache instead.
+    """
+
+    def __init__(self, scene_node: SceneNode, has_mesh: bool = False, visible: bool = False, selectable: bool = False,
+                 decoration: Optional[str] = None, prune: Optional[Callable[[SceneNode], bool]] = None) -> None:
+        """Creates the iterator.
+
+        :param scene_node: The node to start at. It is returned itself as well, if it passes the filters.
+        :param has_mesh: Only return nodes that have mesh data.
+        :param visible: Only return nodes that are visible.
+        :param selectable: Only return nodes that are selectable.
+        :param decoration: Only return nodes that have a decorator with this function.
+        :param prune: A function that returns True for nodes of which the descendants must not be visited. Those
+        nodes themselves are still returned if they pass the filters.
+        """
+
+        self._has_mesh = has_mesh
+        self._visible = visible
+        self._selectable = selectable
+        self._decoration = decoration
+        self._prune = prune
+        super().__init__(scene_node)
+
+    def _fillStack(self) -> None:
+        pass  # The nodes are only found while iterating.
+
+    def __iter__(self) -> typing.Iterator[SceneNode]:
+        return self._traverse()
+
+    def _traverse(self) -> typing.Iterator[SceneNode]:
+        if self._accepts(self._scene_node):
+            yield self._scene_node
+        if self._prune is not None and self._prune(self._scene_node):
+            return
+
+        if self._prune is None:
+            all_children = self._scene_node._all_children
+            if all_children is not None:  # The cache isn't changed, only replaced, so it's safe to go through it.
+                for node in all_children:
+                    if self._accepts(node):
+                        yield node
+                return
+
+        # Like SceneNode.getAllChildren: all children of a node, followed by the descendants of each child.
+        stack = [self._scene_node]  # type: List[SceneNode]  # Nodes of which the children still need to be visited.
+        while stack:
+            node = stack.pop()
+            children = list(node.getChildren())  # The loop that uses this iterator could change the children.
+            for child in children:
+                if self._accepts(child):
+                    yield child
+            for child in reversed(children):
+                if self._prune is None or not self._prune(child):
+                    stack.append(child)
+
+    def _accepts(self, node: SceneNode) -> bool:
+        if self._has_mesh and node.getMeshData() is None:
+            return False
+        if self._visible and not node.isVisible():
+            return False
+        if self._selectable and not node.isSelectable():
+            return False
+        if self._decoration is not None and not node.hasDecoration(self._decoration):
+            return False
+        return True
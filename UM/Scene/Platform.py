@@ -8,7 +8,7 @@ from UM.Logger import Logger
 from UM.Resources import Resources
 from UM.Math.Vector import Vector
 from UM.Job import Job
-from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.Scene.Iterator.LazyDepthFirstIterator import LazyDepthFirstIterator
 
 from UM.View.GL.OpenGL import OpenGL
 
@@ -107,7 +107,7 @@ class Platform(SceneNode.SceneNode):
 
         node = job.getResult()
         if isinstance(node, list):  # Some model readers return lists of models. Some (e.g. STL) return a list SOMETIMES but not always.
-            nodelist = [actual_node for subnode in node for actual_node in DepthFirstIterator(subnode) if actual_node.getMeshData()]
+            nodelist = [actual_node for subnode in node for actual_node in LazyDepthFirstIterator(subnode, has_mesh = True)]
             node = max(nodelist, key = lambda n: n.getMeshData().getFaceCount())  # Select the node with the most faces. Sometimes the actual node is a child node of something. We can only have one node as platform mesh.
         if node.getMeshData():
             self.setMeshData(node.getMeshData())
@@ -12,8 +12,10 @@ from UM.Decorators import deprecated
 from UM.Logger import Logger
 from UM.Mesh.ReadMeshJob import ReadMeshJob  # To reload a mesh when its file was changed.
 from UM.Message import Message  # To display a message for reloading files that were changed.
+from UM.Scene.BoundingVolumeHierarchy import BoundingVolumeHierarchy
 from UM.Scene.Camera import Camera
 from UM.Scene.Iterator.BreadthFirstIterator import BreadthFirstIterator
+from UM.Scene.Iterator.LazyDepthFirstIterator import LazyDepthFirstIterator
 from UM.Scene.SceneNode import SceneNode
 from UM.Signal import Signal, signalemitter
 from UM.i18n import i18nCatalog
@@ -36,6 +38,7 @@ class Scene:
         self._root = SceneNode(name = "Root")
         self._root.setCalculateBoundingBox(False)
         self._connectSignalsRoot()
+        self._bounding_volume_hierarchy = BoundingVolumeHierarchy(self._root)
         self._active_camera = None  # type: Optional[Camera]
         self._ignore_scene_changes = False
         self._lock = threading.Lock()
@@ -83,10 +86,16 @@ class Scene:
             self._root = node
             if not self._ignore_scene_changes:
                 self._connectSignalsRoot()
+            self._bounding_volume_hierarchy.setRoot(node)
             self.rootChanged.emit()
 
     rootChanged = Signal()
 
+    def getBoundingVolumeHierarchy(self) -> BoundingVolumeHierarchy:
+        """Get the hierarchy of bounding boxes of the nodes in the scene, to find nodes by their position."""
+
+        return self._bounding_volume_hierarchy
+
     def getActiveCamera(self) -> Optional[Camera]:
         """Get the camera that should be used for rendering."""
 
@@ -128,13 +137,17 @@ class Scene:
         :return: The object if found, or None if not.
         """
 
-        for node in BreadthFirstIterator(self._root):
+        node = self._bounding_volume_hierarchy.findNode(object_id)
+        if node is not None:
+            return node
+        # The hierarchy could miss nodes if signals can't be delivered, e.g. before the application has started.
+        for node in LazyDepthFirstIterator(self._root):
             if id(node) == object_id:
                 return node
         return None
 
     def findCamera(self, name: str) -> Optional[Camera]:
-        for node in BreadthFirstIterator(self._root):
+        for node in LazyDepthFirstIterator(self._root):
             if isinstance(node, Camera) and node.getName() == name:
                 return node
         return None
@@ -1,8 +1,9 @@
 # Copyright (c) 2019 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import threading
 from copy import deepcopy
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, TYPE_CHECKING, Tuple, cast
 
 import numpy
 
@@ -16,6 +17,10 @@ from UM.Mesh.MeshData import MeshData
 from UM.Scene.SceneNodeDecorator import SceneNodeDecorator
 from UM.Signal import Signal, signalemitter
 
+if TYPE_CHECKING:
+    import weakref
+    from UM.Scene.TransformStore import TransformStore
+
 
 @signalemitter
 class SceneNode:
@@ -35,6 +40,12 @@ class SceneNode:
         Parent = 2 #type: int
         World = 3 #type: int
 
+    # When transformations are updated lazily, nodes of which the transformation changed, by ID. Their signals are
+    # emitted once, the next time the event loop runs.
+    __lazy_transformation_updates = False  # type: bool
+    __pending_transformation_changes = {}  # type: Dict[int, SceneNode]
+    __pending_transformation_changes_lock = threading.Lock()
+
     def __init__(self, parent: Optional["SceneNode"] = None, visible: bool = True, name: str = "", node_id: str = "") -> None:
         """Construct a scene node.
 
@@ -46,29 +57,37 @@ class SceneNode:
         super().__init__()  # Call super to make multiple inheritance work.
 
         self._children = []     # type: List[SceneNode]
+        self._all_children = None  # type: Optional[List[SceneNode]]  # Cached result of getAllChildren, if still valid.
         self._mesh_data = None  # type: Optional[MeshData]
 
         # Local transformation (from parent to local)
         self._transformation = Matrix()  # type: Matrix
 
-        # Convenience "components" of the transformation
+        # Convenience "components" of the transformation, decomposed from it when they're needed.
+        self._local_components_dirty = False  # type: bool
         self._position = Vector()  # type: Vector
         self._scale = Vector(1.0, 1.0, 1.0)  # type: Vector
         self._shear = Vector(0.0, 0.0, 0.0)  # type: Vector
         self._mirror = Vector(1.0, 1.0, 1.0)  # type: Vector
         self._orientation = Quaternion()  # type: Quaternion
 
-        # World transformation (from root to local)
-        self._world_transformation = Matrix()  # type: Matrix
+        # World transformation (from root to local). None if it needs to be computed again.
+        self._world_transformation = Matrix()  # type: Optional[Matrix]
 
         # This is used for rendering. Since we don't want to recompute it every time, we cache it in the node
-        self._cached_normal_matrix = Matrix()
+        self._cached_normal_matrix = Matrix()  # type: Optional[Matrix]
 
-        # Convenience "components" of the world_transformation
+        # Convenience "components" of the world_transformation, decomposed from it when they're needed.
+        self._derived_components_dirty = False  # type: bool
         self._derived_position = Vector()  # type: Vector
         self._derived_orientation = Quaternion()  # type: Quaternion
         self._derived_scale = Vector()  # type: Vector
 
+        # The store that keeps the transformations of this node in a batch with other nodes, if any.
+        self._transform_store = None  # type: Optional[TransformStore]
+        self._transform_store_index = -1  # type: int
+        self._transform_store_finalizer = None  # type: Optional[weakref.finalize]
+
         self._parent = parent  # type: Optional[SceneNode]
 
         # Can this SceneNode be modified in any way?
@@ -82,6 +101,8 @@ class SceneNode:
         # The AxisAligned bounding box.
         self._aabb = None  # type: Optional[AxisAlignedBox]
         self._bounding_box_mesh = None  # type: Optional[MeshData]
+        # The extents of the mesh alone in world space, with the rotation and scale and the translation they were computed for.
+        self._mesh_extents = None  # type: Optional[Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]
 
         self._visible = visible  # type: bool
         self._name = name  # type: str
@@ -123,6 +144,7 @@ class SceneNode:
             m = Matrix()
             m.setByTranslation(-center)
             self._mesh_data = self._mesh_data.getTransformed(m).set(center_position=center)
+            self._mesh_extents = None
         for child in self._children:
             child.setCenterPosition(center)
 
@@ -421,6 +443,7 @@ class SceneNode:
         """
 
         self._mesh_data = mesh_data
+        self._mesh_extents = None
         self._resetAABB()
         self.meshDataChanged.emit(self)
 
@@ -444,6 +467,7 @@ class SceneNode:
         scene_node.meshDataChanged.connect(self.meshDataChanged)
 
         self._children.append(scene_node)
+        self._invalidateAllChildren()
         self._resetAABB()
         self.childrenChanged.emit(self)
 
@@ -452,6 +476,9 @@ class SceneNode:
             scene_node._transformChanged()
             scene_node.parentChanged.emit(self)
 
+        if self._transform_store is not None and scene_node._transform_store is None:
+            self._transform_store.addSubtree(scene_node)
+
     def removeChild(self, child: "SceneNode") -> None:
         """remove a single child
 
@@ -466,6 +493,7 @@ class SceneNode:
         child.meshDataChanged.disconnect(self.meshDataChanged)
 
         self._children.remove(child)
+        self._invalidateAllChildren()
         child._parent = None
         child._transformChanged()
         child.parentChanged.emit(self)
@@ -499,11 +527,28 @@ class SceneNode:
         :returns: list ALl children in this 'tree'
         """
 
-        children = []
-        children.extend(self._children)
-        for child in self._children:
-            children.extend(child.getAllChildren())
-        return children
+        return list(self._getAllChildren())
+
+    def _getAllChildren(self) -> List["SceneNode"]:
+        """Gets the cached list of all children, in the same order as getAllChildren. Don't modify it.
+
+        The list is computed again after children were added to or removed from this node or any of its descendants.
+        Changing the list returned by getChildren directly is not noticed.
+        """
+
+        if self._all_children is None:
+            children = list(self._children)
+            for child in self._children:
+                children.extend(child._getAllChildren())
+            self._all_children = children
+        return self._all_children
+
+    def _invalidateAllChildren(self) -> None:
+        # If the cache of a node is outdated, so are the caches of its ancestors, since they include it.
+        node = self  # type: Optional[SceneNode]
+        while node is not None and node._all_children is not None:
+            node._all_children = None
+            node = node._parent
 
     childrenChanged = Signal()
     """Emitted whenever the list of children of this object or any child object changes.
@@ -511,17 +556,20 @@ class SceneNode:
     :param object: The object that triggered the change.
     """
 
-    def _updateCachedNormalMatrix(self) -> None:
-        self._cached_normal_matrix = Matrix(self.getWorldTransformation(copy=False).getData())
-        self._cached_normal_matrix.setRow(3, [0, 0, 0, 1])
-        self._cached_normal_matrix.setColumn(3, [0, 0, 0, 1])
-        self._cached_normal_matrix.invert()
-        self._cached_normal_matrix.transpose()
+    def _updateCachedNormalMatrix(self) -> Matrix:
+        normal_matrix = self.getWorldTransformation()
+        normal_matrix.setRow(3, [0, 0, 0, 1])
+        normal_matrix.setColumn(3, [0, 0, 0, 1])
+        normal_matrix.invert()
+        normal_matrix.transpose()
+        self._cached_normal_matrix = normal_matrix
+        return normal_matrix
 
     def getCachedNormalMatrix(self) -> Matrix:
-        if self._cached_normal_matrix is None:
-            self._updateCachedNormalMatrix()
-        return self._cached_normal_matrix
+        normal_matrix = self._cached_normal_matrix
+        if normal_matrix is None:
+            normal_matrix = self._updateCachedNormalMatrix()
+        return normal_matrix
 
     def getWorldTransformation(self, copy = True) -> Matrix:
         """Computes and returns the transformation from world to local space.
@@ -529,11 +577,13 @@ class SceneNode:
         :returns: 4x4 transformation matrix
         """
 
-        if self._world_transformation is None:
-            self._updateWorldTransformation()
+        # Another thread may invalidate the transformation in the meantime, so don't read it from the node again.
+        world_transformation = self._world_transformation
+        if world_transformation is None:
+            world_transformation = self._updateWorldTransformation()
         if copy:
-            return self._world_transformation.copy()
-        return self._world_transformation
+            return world_transformation.copy()
+        return world_transformation
 
     def getLocalTransformation(self, copy = True) -> Matrix:
         """Returns the local transformation with respect to its parent. (from parent to local)
@@ -554,10 +604,12 @@ class SceneNode:
     def getOrientation(self) -> Quaternion:
         """Get the local orientation value."""
 
-        return deepcopy(self._orientation)
+        self._updateLocalComponents()
+        return self._orientation.copy()
 
     def getWorldOrientation(self) -> Quaternion:
-        return deepcopy(self._derived_orientation)
+        self._updateDerivedComponents()
+        return self._derived_orientation.copy()
 
     def rotate(self, rotation: Quaternion, transform_space: int = TransformSpace.Local) -> None:
         """Rotate the scene object (and thus its children) by given amount
@@ -575,9 +627,10 @@ class SceneNode:
         elif transform_space == SceneNode.TransformSpace.Parent:
             self._transformation.preMultiply(orientation_matrix)
         elif transform_space == SceneNode.TransformSpace.World:
-            self._transformation.multiply(self._world_transformation.getInverse())
+            world_transformation = self.getWorldTransformation(copy = False)
+            self._transformation.multiply(world_transformation.getInverse())
             self._transformation.multiply(orientation_matrix)
-            self._transformation.multiply(self._world_transformation)
+            self._transformation.multiply(world_transformation)
 
         self._transformChanged()
 
@@ -588,6 +641,7 @@ class SceneNode:
         :param transform_space: The space relative to which to rotate. Can be Local or World from SceneNode::TransformSpace.
         """
 
+        self._updateLocalComponents()
         if not self._enabled or orientation == self._orientation:
             return
 
@@ -608,9 +662,11 @@ class SceneNode:
     def getScale(self) -> Vector:
         """Get the local scaling value."""
 
+        self._updateLocalComponents()
         return self._scale
 
     def getWorldScale(self) -> Vector:
+        self._updateDerivedComponents()
         return self._derived_scale
 
     def scale(self, scale: Vector, transform_space: int = TransformSpace.Local) -> None:
@@ -630,9 +686,10 @@ class SceneNode:
         elif transform_space == SceneNode.TransformSpace.Parent:
             self._transformation.preMultiply(scale_matrix)
         elif transform_space == SceneNode.TransformSpace.World:
-            self._transformation.multiply(self._world_transformation.getInverse())
+            world_transformation = self.getWorldTransformation(copy = False)
+            self._transformation.multiply(world_transformation.getInverse())
             self._transformation.multiply(scale_matrix)
-            self._transformation.multiply(self._world_transformation)
+            self._transformation.multiply(world_transformation)
 
         self._transformChanged()
 
@@ -643,6 +700,7 @@ class SceneNode:
         :param transform_space: The space relative to which to rotate. Can be Local or World from SceneNode::TransformSpace.
         """
 
+        self._updateLocalComponents()
         if not self._enabled or scale == self._scale:
             return
         if transform_space == SceneNode.TransformSpace.Local:
@@ -657,11 +715,13 @@ class SceneNode:
     def getPosition(self) -> Vector:
         """Get the local position."""
 
+        self._updateLocalComponents()
         return self._position
 
     def getWorldPosition(self) -> Vector:
         """Get the position of this scene node relative to the world."""
 
+        self._updateDerivedComponents()
         return self._derived_position
 
     def translate(self, translation: Vector, transform_space: int = TransformSpace.Local) -> None:
@@ -680,8 +740,8 @@ class SceneNode:
         elif transform_space == SceneNode.TransformSpace.Parent:
             self._transformation.preMultiply(translation_matrix)
         elif transform_space == SceneNode.TransformSpace.World:
-            world_transformation = self._world_transformation.copy()
-            self._transformation.multiply(self._world_transformation.getInverse())
+            world_transformation = self.getWorldTransformation()
+            self._transformation.multiply(world_transformation.getInverse())
             self._transformation.multiply(translation_matrix)
             self._transformation.multiply(world_transformation)
         self._transformChanged()
@@ -693,6 +753,7 @@ class SceneNode:
         :param transform_space: The space relative to which to rotate. Can be Local or World from SceneNode::TransformSpace.
         """
 
+        self._updateLocalComponents()
         if not self._enabled or position == self._position:
             return
         if transform_space == SceneNode.TransformSpace.Local:
@@ -700,7 +761,7 @@ class SceneNode:
         if transform_space == SceneNode.TransformSpace.World:
             if self.getWorldPosition() == position:
                 return
-            self.translate(position - self._derived_position, SceneNode.TransformSpace.World)
+            self.translate(position - self.getWorldPosition(), SceneNode.TransformSpace.World)
 
     transformationChanged = Signal()
     """Signal. Emitted whenever the transformation of this object or any child object changes.
@@ -798,6 +859,7 @@ class SceneNode:
     boundingBoxChanged = Signal()
 
     def getShear(self) -> Vector:
+        self._updateLocalComponents()
         return self._shear
 
     def getSetting(self, key: str, default_value: str = "") -> str:
@@ -812,27 +874,130 @@ class SceneNode:
         if self._mesh_data:
             self._mesh_data.invertNormals()
 
+    @classmethod
+    def setLazyTransformationUpdates(cls, lazy: bool) -> None:
+        """Set whether changes to transformations are propagated lazily.
+
+        Normally, when the transformation of a node changes, ``transformationChanged`` and ``boundingBoxChanged`` are
+        emitted right away for the node and for every one of its descendants. When propagating lazily, the
+        descendants are only marked as changed, and the signals of the node are emitted once, the next time the
+        event loop runs, however often it changed in the meantime. ``transformationChanged`` is then only emitted for
+        the node that was changed, not for its descendants, so listeners to a descendant need to listen to its
+        ancestors as well.
+
+        The world transformations, their components, the normal matrices and the bounding boxes are computed again
+        when they are needed, in either case.
+
+        :param lazy: True to propagate changes lazily, False to emit all signals right away.
+        """
+
+        SceneNode.__lazy_transformation_updates = lazy
+        if not lazy:
+            SceneNode.flushTransformationChanges()
+
+    @classmethod
+    def getLazyTransformationUpdates(cls) -> bool:
+        return SceneNode.__lazy_transformation_updates
+
+    @classmethod
+    def flushTransformationChanges(cls) -> None:
+        """Emit the signals of the nodes of which the transformation changed lazily since the last time."""
+
+        with SceneNode.__pending_transformation_changes_lock:
+            pending = SceneNode.__pending_transformation_changes
+            SceneNode.__pending_transformation_changes = {}
+        for node in pending.values():
+            node.transformationChanged.emit(node)
+            for descendant in node.getAllChildren():
+                descendant.boundingBoxChanged.emit()
+
     def _transformChanged(self) -> None:
-        self._updateTransformation()
+        self._local_components_dirty = True
+        if self._transform_store is not None:
+            self._transform_store.updateNode(self)
+        if SceneNode.__lazy_transformation_updates:
+            self._invalidateWorldTransformation()
+            self._invalidateDescendants()
+            self._resetAABB()
+            self._postponeTransformationChanged()
+            return
+
+        self._invalidateWorldTransformation()
         self._resetAABB()
         self.transformationChanged.emit(self)
 
         for child in self._children:
             child._transformChanged()
 
+    def _invalidateWorldTransformation(self) -> None:
+        """Marks the world transformation and everything derived from it to be computed again when it's needed."""
+
+        self._world_transformation = None
+        self._derived_components_dirty = True
+        self._cached_normal_matrix = None
+
+    def _invalidateDescendants(self) -> None:
+        """Marks the world transformations and bounding boxes of all descendants to be computed again, without
+        emitting any signals.
+        """
+
+        for child in self._children:
+            if child._world_transformation is None:
+                continue  # Then its descendants weren't computed again either, since that computes their ancestors.
+            child._invalidateWorldTransformation()
+            child._aabb = None
+            child._bounding_box_mesh = None
+            child._invalidateDescendants()
+
+    def _postponeTransformationChanged(self) -> None:
+        with SceneNode.__pending_transformation_changes_lock:
+            schedule = not SceneNode.__pending_transformation_changes
+            SceneNode.__pending_transformation_changes[id(self)] = self
+        if not schedule:
+            return  # Already scheduled.
+
+        from UM.Application import Application
+        application = Application.getInstance()
+        if application is None:
+            SceneNode.flushTransformationChanges()
+        else:
+            application.callLater(SceneNode.flushTransformationChanges)
+
+    def _updateLocalComponents(self) -> None:
+        if self._local_components_dirty:
+            self._local_components_dirty = False
+            self._updateLocalTransformation()
+
+    def _updateDerivedComponents(self) -> None:
+        if self._derived_components_dirty:
+            self._derived_components_dirty = False
+            world_transformation = self.getWorldTransformation(copy = False)
+            self._derived_position, world_euler_angle_matrix, self._derived_scale, world_shear = world_transformation.decompose()
+            self._derived_orientation.setByMatrix(world_euler_angle_matrix)
+
     def _updateLocalTransformation(self) -> None:
         self._position, euler_angle_matrix, self._scale, self._shear = self._transformation.decompose()
 
         self._orientation.setByMatrix(euler_angle_matrix)
 
-    def _updateWorldTransformation(self) -> None:
+    def _updateWorldTransformation(self) -> Matrix:
+        if self._transform_store is not None:
+            world_transformation = self._transform_store.getWorldTransformation(self)
+            if world_transformation is not None:
+                if self._parent:
+                    # Descendants are only invalidated below nodes of which the world transformation is known, so the
+                    # ancestors need to be known too. They come from the store as well, so that's cheap.
+                    self._parent.getWorldTransformation(copy = False)
+                self._world_transformation = world_transformation
+                self._derived_components_dirty = True
+                return world_transformation
         if self._parent:
-            self._world_transformation = self._parent.getWorldTransformation().multiply(self._transformation)
+            world_transformation = self._parent.getWorldTransformation().multiply(self._transformation)
         else:
-            self._world_transformation = self._transformation
-
-        self._derived_position, world_euler_angle_matrix, self._derived_scale, world_shear = self._world_transformation.decompose()
-        self._derived_orientation.setByMatrix(world_euler_angle_matrix)
+            world_transformation = self._transformation
+        self._world_transformation = world_transformation
+        self._derived_components_dirty = True
+        return world_transformation
 
     def _updateTransformation(self) -> None:
         self._updateLocalTransformation()
@@ -849,18 +1014,66 @@ class SceneNode:
         self.boundingBoxChanged.emit()
 
     def _calculateAABB(self) -> None:
+        minimum = None  # type: Optional[List[float]]
+        maximum = None  # type: Optional[List[float]]
         if self._mesh_data:
-            aabb = self._mesh_data.getExtents(self.getWorldTransformation(copy = False))
+            extents = self._calculateMeshExtents()
+            if extents is not None:
+                minimum, maximum = extents.tolist()
         else:  # If there is no mesh_data, use a boundingbox that encompasses the local (0,0,0)
             position = self.getWorldPosition()
-            aabb = AxisAlignedBox(minimum = position, maximum = position)
+            minimum = [position.x, position.y, position.z]
+            maximum = [position.x, position.y, position.z]
 
+        # The bounding boxes of the children are cached, so only the ones that changed are computed again.
+        # Their union is computed on plain numbers, to create only one AxisAlignedBox.
         for child in self._children:
-            if aabb is None:
-                aabb = child.getBoundingBox()
-            else:
-                aabb = aabb + child.getBoundingBox()
-        self._aabb = aabb
+            child_aabb = child.getBoundingBox()
+            if child_aabb is None:
+                continue
+            if minimum is None or maximum is None:
+                minimum = [child_aabb.left, child_aabb.bottom, child_aabb.back]
+                maximum = [child_aabb.right, child_aabb.top, child_aabb.front]
+            elif child_aabb.isValid():  # Same as adding AxisAlignedBoxes, which ignores invalid boxes.
+                minimum = [min(minimum[0], child_aabb.left), min(minimum[1], child_aabb.bottom), min(minimum[2], child_aabb.back)]
+                maximum = [max(maximum[0], child_aabb.right), max(maximum[1], child_aabb.top), max(maximum[2], child_aabb.front)]
+
+        if minimum is None or maximum is None:
+            self._aabb = None
+        else:
+            self._aabb = AxisAlignedBox(minimum = Vector(minimum[0], minimum[1], minimum[2]), maximum = Vector(maximum[0], maximum[1], maximum[2]))
+
+    def _calculateMeshExtents(self) -> Optional[numpy.ndarray]:
+        """Gets the extents of the mesh of this node alone, in world space.
+
+        When only the translation or the uniform scale of the node changed since they were last computed, the new
+        extents are derived from the old ones, without transforming the convex hull of the mesh again.
+
+        :return: A 2x3 array with the minimum and the maximum corner, or None if the mesh has no hull.
+        """
+
+        if self._mesh_data is None:
+            return None
+        world_transformation = self.getWorldTransformation(copy = False)
+        matrix = world_transformation.getData().astype(numpy.float64)
+        linear = matrix[0:3, 0:3]
+        translation = matrix[0:3, 3]
+
+        if self._mesh_extents is not None:
+            cached_linear, cached_translation, cached_extents = self._mesh_extents
+            if numpy.array_equal(linear, cached_linear):
+                return cached_extents - cached_translation + translation
+            # Scaling everything by the same positive factor scales the extents around the origin by that factor.
+            cached_norm = numpy.vdot(cached_linear, cached_linear)
+            factor = numpy.vdot(linear, cached_linear) / cached_norm if cached_norm > 0 else 0
+            if factor > 0 and numpy.allclose(linear, cached_linear * factor, rtol = 0, atol = 1e-5 * numpy.abs(linear).max()):
+                return (cached_extents - cached_translation) * factor + translation
+
+        extents = self._mesh_data.getExtentsData(world_transformation)
+        if extents is None:
+            return None
+        self._mesh_extents = (linear, translation, extents)
+        return extents
 
     def __str__(self) -> str:
         """String output for debugging."""
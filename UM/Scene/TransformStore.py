@@ -0,0 +1,189 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import threading
+import weakref
+from typing import List, Optional, TYPE_CHECKING
+
+import numpy
+
+from UM.Math.Matrix import Matrix
+
+if TYPE_CHECKING:
+    from UM.Scene.SceneNode import SceneNode
+
+
+class TransformStore:
+    """Stores the local and world transformations of many scene nodes in contiguous arrays.
+
+    Every node in the store gets an index in an N×4×4 array of local transformations and one of world
+    transformations, and the index of its parent. When any transformation changed, all world transformations are
+    computed again at once, with one batched matrix multiplication per level of the scene graph.
+
+    Using a store is optional, and doesn't change the API of ``SceneNode``. Nodes that are added to a node in the store
+    are added to the store as well. Nodes are removed from the store when they are deleted. Nodes of which an ancestor
+    is not in the store compute their world transformation by themselves, as if they weren't in the store.
+    """
+
+    def __init__(self) -> None:
+        self._local = numpy.zeros((0, 4, 4), dtype = numpy.float64)
+        self._world = numpy.zeros((0, 4, 4), dtype = numpy.float64)
+        self._parents = numpy.zeros((0, ), dtype = numpy.int64)  # -1 for nodes without a parent in the store.
+        self._rooted = numpy.zeros((0, ), dtype = numpy.bool_)  # Whether the node has no parent at all.
+        self._complete = numpy.zeros((0, ), dtype = numpy.bool_)  # Whether all ancestors of the node are in the store.
+        self._used = numpy.zeros((0, ), dtype = numpy.bool_)
+        self._free = []  # type: List[int]
+        self._levels = []  # type: List[numpy.ndarray]  # Indices of the nodes at every depth in the graph.
+
+        self._transformations_changed = False
+        self._structure_changed = False
+        self._lock = threading.RLock()  # Re-entrant, since nodes can be released by the garbage collector at any time.
+
+    def addSubtree(self, node: "SceneNode") -> None:
+        """Adds a node and all of its descendants to the store.
+
+        :param node: The node to add.
+        """
+
+        self.addNode(node)
+        for child in node.getChildren():
+            self.addSubtree(child)
+
+    def addNode(self, node: "SceneNode") -> None:
+        """Adds a node to the store. Nodes can only be in one store at the same time.
+
+        :param node: The node to add.
+        """
+
+        if node._transform_store is self:
+            return
+        if node._transform_store is not None:
+            node._transform_store.removeNode(node)
+
+        with self._lock:
+            if not self._free:
+                self._grow()
+            index = self._free.pop()
+            self._used[index] = True
+        node._transform_store = self
+        node._transform_store_index = index
+        node._transform_store_finalizer = weakref.finalize(node, self._release, index)
+        self.updateNode(node)
+
+    def removeNode(self, node: "SceneNode") -> None:
+        """Removes a node from the store. Its descendants stay in the store, without a parent.
+
+        :param node: The node to remove.
+        """
+
+        if node._transform_store is not self:
+            return
+        if node._transform_store_finalizer is not None:
+            node._transform_store_finalizer.detach()
+        self._release(node._transform_store_index)
+        node._transform_store = None
+        node._transform_store_index = -1
+        node._transform_store_finalizer = None
+
+    def getNodeCount(self) -> int:
+        return int(numpy.count_nonzero(self._used))
+
+    def updateNode(self, node: "SceneNode") -> None:
+        """Copies the local transformation and the parent of a node into the store, after they changed.
+
+        :param node: A node in this store.
+        """
+
+        parent = node.getParent()
+        parent_index = parent._transform_store_index if parent is not None and parent._transform_store is self else -1
+        with self._lock:
+            index = node._transform_store_index
+            self._local[index] = node.getLocalTransformation(copy = False).getData(copy = False)
+            if self._parents[index] != parent_index or self._rooted[index] != (parent is None):
+                self._parents[index] = parent_index
+                self._rooted[index] = parent is None
+                self._structure_changed = True
+            self._transformations_changed = True
+
+    def getWorldTransformation(self, node: "SceneNode") -> Optional[Matrix]:
+        """Gets the world transformation of a node in the store, computing all of them if anything changed.
+
+        :param node: A node in this store.
+        :return: A copy of its world transformation, or None if not all of its ancestors are in the store.
+        """
+
+        self.update()
+        index = node._transform_store_index
+        if not self._complete[index]:
+            return None
+        return Matrix(self._world[index])
+
+    def getWorldTransformations(self) -> numpy.ndarray:
+        """Gets the world transformations of all nodes in the store, computing them if anything changed.
+
+        :return: An N×4×4 array, indexed by the index of every node in the store. Don't modify it. The rows of nodes
+        of which not all ancestors are in the store are not valid.
+        """
+
+        self.update()
+        return self._world
+
+    def update(self) -> None:
+        """Computes all world transformations again if any local transformation or parent changed."""
+
+        with self._lock:
+            if not self._transformations_changed:
+                return
+            if self._structure_changed:
+                self._levels = self._computeLevels()
+                self._complete[:] = False
+                for level, nodes in enumerate(self._levels):
+                    self._complete[nodes] = self._rooted[nodes] if level == 0 else self._complete[self._parents[nodes]]
+                self._structure_changed = False
+            for level, nodes in enumerate(self._levels):
+                if level == 0:
+                    self._world[nodes] = self._local[nodes]
+                else:
+                    self._world[nodes] = numpy.matmul(self._world[self._parents[nodes]], self._local[nodes])
+            self._transformations_changed = False
+
+    def _computeLevels(self) -> List[numpy.ndarray]:
+        """Sorts the nodes by their depth in the graph, so that parents are computed before their children."""
+
+        used = numpy.flatnonzero(self._used)
+        has_parent = self._parents >= 0
+        depths = numpy.zeros(len(self._parents), dtype = numpy.int64)
+        while True:  # Once for every level of the graph.
+            new_depths = numpy.where(has_parent, depths[self._parents] + 1, 0)
+            if numpy.array_equal(new_depths, depths):
+                break
+            depths = new_depths
+        depths = depths[used]
+        order = numpy.argsort(depths, kind = "stable")
+        boundaries = numpy.flatnonzero(numpy.diff(depths[order])) + 1
+        return numpy.split(used[order], boundaries) if len(used) > 0 else []
+
+    def _grow(self) -> None:
+        """Makes room for more nodes. The lock must be held when calling this."""
+
+        old_size = len(self._parents)
+        new_size = max(16, old_size * 2)
+        self._local = numpy.concatenate((self._local, numpy.tile(numpy.identity(4), (new_size - old_size, 1, 1))))
+        self._world = numpy.concatenate((self._world, numpy.tile(numpy.identity(4), (new_size - old_size, 1, 1))))
+        self._parents = numpy.concatenate((self._parents, numpy.full(new_size - old_size, -1, dtype = numpy.int64)))
+        self._rooted = numpy.concatenate((self._rooted, numpy.zeros(new_size - old_size, dtype = numpy.bool_)))
+        self._complete = numpy.concatenate((self._complete, numpy.zeros(new_size - old_size, dtype = numpy.bool_)))
+        self._used = numpy.concatenate((self._used, numpy.zeros(new_size - old_size, dtype = numpy.bool_)))
+        self._free.extend(range(new_size - 1, old_size - 1, -1))  # Use the lowest indices first.
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._used[index] = False
+            self._local[index] = numpy.identity(4)
+            # Children of the released node don't have a parent in the store any more.
+            self._parents[self._parents == index] = -1
+            self._parents[index] = -1
+            self._rooted[index] = False
+            self._free.append(index)
+            self._structure_changed = True
+            self._transformations_changed = True
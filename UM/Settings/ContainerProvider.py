@@ -1,7 +1,9 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
-from typing import Any, cast, Dict, Iterable, Optional
+import functools
+import traceback
+from typing import Any, cast, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type
 
 from UM.Logger import Logger
 from UM.PluginObject import PluginObject #We're implementing this.
@@ -150,6 +152,16 @@ class ContainerProvider(PluginObject):
 
         raise NotImplementedError("The container provider {class_name} doesn't properly implement loadMetadata.".format(class_name = self.__class__.__name__))
 
+    def preloadMetadata(self, container_ids: Sequence[str]) -> None:
+        """Prepares the metadata of many containers at once, before loadMetadata is called for each of them.
+
+        Providers can implement this to load the metadata in parallel. By default this does nothing.
+
+        :param container_ids: The IDs of the containers of which the metadata will be requested, in order.
+        """
+
+        pass
+
     def metadata(self) -> Dict[str, Dict[str, Any]]:
         """Gets a dictionary of metadata of all containers, indexed by ID."""
 
@@ -164,3 +176,69 @@ class ContainerProvider(PluginObject):
         """
 
         raise NotImplementedError("The container provider {class_name} doesn't properly implement removeContainer.".format(class_name = self.__class__.__name__))
+
+
+@functools.lru_cache(maxsize = None)
+def canDeserializeCurrentMetadata(container_class: Type[ContainerInterface]) -> bool:
+    """Returns whether a container class implements deserializeCurrentMetadata for its own file format.
+
+    A subclass that reads a different format may override deserializeMetadata but not deserializeCurrentMetadata.
+    Then the inherited deserializeCurrentMetadata can't be used.
+    """
+
+    def definingClass(method_name: str) -> type:
+        return next(clazz for clazz in container_class.__mro__ if method_name in clazz.__dict__)
+
+    current_class = definingClass("deserializeCurrentMetadata")
+    return current_class is not ContainerInterface and issubclass(current_class, definingClass("deserializeMetadata"))
+
+
+def deserializeCurrentMetadata(container_class: Type[ContainerInterface], serialized: str, container_id: str, current_versions: FrozenSet[Tuple[str, int]]) -> Optional[List[Dict[str, Any]]]:
+    """Deserializes the metadata of a container if that can be done without the application.
+
+    That is the case if the serialized data doesn't need to be upgraded and the container class can deserialize it
+    without other containers. The metadata then only depends on the serialized data.
+
+    :param container_class: The container class to deserialize with.
+    :param serialized: The serialized container.
+    :param container_id: The ID of the container, as obtained from the file name.
+    :param current_versions: The configuration types and versions that don't need to be upgraded.
+    :return: The metadata of all containers in the serialized data, or None if that needs the application.
+    """
+
+    if not canDeserializeCurrentMetadata(container_class):  # type: ignore  # Classes are hashable, but mypy doesn't see that for this one.
+        return None
+    configuration_type = container_class.getConfigurationTypeFromSerialized(serialized)
+    version = container_class.getVersionFromSerialized(serialized)
+    if configuration_type is not None and version is not None and (configuration_type, version) not in current_versions:
+        return None  # Needs to be upgraded first.
+    return container_class.deserializeCurrentMetadata(serialized, container_id)
+
+
+MetadataFileResult = NamedTuple("MetadataFileResult", [("metadata", Optional[List[Dict[str, Any]]]), ("error", Optional[str])])
+"""The metadata deserialized from a file by deserializeMetadataFromFile.
+
+If the metadata is None and there is no error, it has to be deserialized with the application instead.
+"""
+
+
+def deserializeMetadataFromFile(task: Tuple[Type[ContainerInterface], str, str], current_versions: FrozenSet[Tuple[str, int]]) -> MetadataFileResult:
+    """Reads a container file and deserializes its metadata, without using the application.
+
+    This is meant to be run in worker processes, so it is importable from here rather than from a plug-in. It
+    doesn't raise, but reports any error in its result.
+
+    :param task: The container class to deserialize with, the ID of the container and the path to its file.
+    :param current_versions: The configuration types and versions that don't need to be upgraded.
+    """
+
+    container_class, container_id, file_name = task
+    try:
+        with open(file_name, "r", encoding = "utf-8") as f:
+            serialized = f.read()
+    except IOError as e:
+        return MetadataFileResult(None, "Unable to load metadata from file {filename}: {error_msg}".format(filename = file_name, error_msg = str(e)))
+    try:
+        return MetadataFileResult(deserializeCurrentMetadata(container_class, serialized, container_id, current_versions), None)
+    except Exception as e:
+        return MetadataFileResult(None, "Unable to deserialize metadata for container {filename}: {container_id}: {error_msg}\n{traceback}".format(filename = file_name, container_id = container_id, error_msg = str(e), traceback = traceback.format_exc()))
@@ -25,6 +25,7 @@ from UM.Settings.ContainerStack import ContainerStack
 from UM.Settings.DefinitionContainer import DefinitionContainer
 from UM.Settings.InstanceContainer import InstanceContainer
 from UM.Settings.Interfaces import ContainerInterface, ContainerRegistryInterface, DefinitionContainerInterface
+from UM.Settings.SettingChangeBatch import SettingChangeBatch
 from UM.Signal import Signal, signalemitter
 
 if TYPE_CHECKING:
@@ -71,6 +72,8 @@ class ContainerRegistry(ContainerRegistryInterface):
 
         self._explicit_read_only_container_ids = set()  # type: Set[str]
 
+        self._parallel_metadata_loading = False  # type: bool
+
     containerAdded = Signal()
     containerRemoved = Signal()
     containerMetaDataChanged = Signal()
@@ -339,7 +342,10 @@ class ContainerRegistry(ContainerRegistryInterface):
         gc.disable()
         resource_start_time = time.time()
         for provider in self._providers:  # Automatically sorted by the priority queue.
-            for container_id in list(provider.getAllIds()):  # Make copy of all IDs since it might change during iteration.
+            container_ids = list(provider.getAllIds())  # Make copy of all IDs since it might change during iteration.
+            if self._parallel_metadata_loading:
+                provider.preloadMetadata([container_id for container_id in container_ids if container_id not in self.metadata])
+            for container_id in container_ids:
                 if container_id not in self.metadata:
                     self._application.processEvents()  # Update the user interface because loading takes a while. Specifically the loading screen.
                     metadata = provider.loadMetadata(container_id)
@@ -354,6 +360,14 @@ class ContainerRegistry(ContainerRegistryInterface):
         gc.enable()
         ContainerRegistry.allMetadataLoaded.emit()
 
+    def setParallelMetadataLoading(self, parallel: bool) -> None:
+        """Set whether loadAllMetadata lets the providers parse the metadata of their containers in parallel.
+
+        The metadata is still added to the registry in the same order, and errors are still reported per container.
+        """
+
+        self._parallel_metadata_loading = parallel
+
     @UM.FlameProfiler.profile
     def load(self) -> None:
         """Load all available definition containers, instance containers and
@@ -385,6 +399,15 @@ class ContainerRegistry(ContainerRegistryInterface):
         gc.enable()
         Logger.log("d", "Loading data into container registry took %s seconds", time.time() - resource_start_time)
 
+    def batchPropertyChanges(self) -> SettingChangeBatch:
+        """Start a batch of changes to settings, to notify the listeners only once when the batch ends.
+
+        Use the result as context manager, for instance while changing the settings of many containers. See
+        SettingChangeBatch for details.
+        """
+
+        return SettingChangeBatch()
+
     @UM.FlameProfiler.profile
     def addContainer(self, container: ContainerInterface) -> bool:
         container_id = container.getId()
@@ -3,7 +3,7 @@
 
 import configparser
 import io
-from typing import Any, cast, Dict, List, Optional, Set, Tuple
+from typing import Any, cast, Dict, Iterable, List, Optional, Set, Tuple
 
 from PyQt5.QtCore import QObject, pyqtProperty, pyqtSignal
 
@@ -18,7 +18,9 @@ from UM.MimeTypeDatabase import MimeTypeDatabase, MimeType
 from UM.Settings.ContainerFormatError import ContainerFormatError
 from UM.Settings.DefinitionContainer import DefinitionContainer #For getting all definitions in this stack.
 from UM.Settings.Interfaces import ContainerInterface, ContainerRegistryInterface
+from UM.Settings.PropertyEvaluationCache import PropertyEvaluationCache
 from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext
+from UM.Settings.SettingChangeBatch import SettingChangeBatch
 from UM.Settings.SettingDefinition import SettingDefinition
 from UM.Settings.SettingFunction import SettingFunction
 from UM.Settings.Validator import ValidatorState
@@ -48,6 +50,9 @@ MimeTypeDatabase.addMimeType(
     )
 )
 
+# The properties that instance containers can change, so that they're looked up in the property index.
+_INDEXED_PROPERTY_NAMES = ("value", "state", "validationState")
+
 
 @signalemitter
 class ContainerStack(QObject, ContainerInterface, PluginObject):
@@ -80,6 +85,13 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         self._property_changes = {}  # type: Dict[str, Set[str]]
         self._emit_property_changed_queued = False  # type: bool
 
+        self._evaluation_cache = PropertyEvaluationCache(self)  # type: PropertyEvaluationCache
+
+        # For every setting property that was looked up, the index of the container that supplies it, or -1 if none of
+        # the containers in this stack have it.
+        self._property_index = {}  # type: Dict[Tuple[str, str], int]
+        self._use_property_index = True  # type: bool
+
     def __getnewargs__(self) -> Tuple[str]:
         """For pickle support"""
 
@@ -88,12 +100,19 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
     def __getstate__(self) -> Dict[str, Any]:
         """For pickle support"""
 
-        return self.__dict__
+        state = self.__dict__.copy()
+        del state["_evaluation_cache"]  # Evaluated values are not stored, since they can't be kept up to date.
+        return state
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
         """For pickle support"""
 
         self.__dict__.update(state)
+        self.__dict__.setdefault("_property_index", {})
+        self.__dict__.setdefault("_use_property_index", True)
+        self._evaluation_cache = PropertyEvaluationCache(self)
+        if self._next_stack is not None and hasattr(self._next_stack, "_evaluation_cache"):
+            self._evaluation_cache.setNextCache(self._next_stack.getEvaluationCache(), None)
 
     def getId(self) -> str:
         """:copydoc ContainerInterface::getId
@@ -226,10 +245,17 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         Note that if the property value is a function, this method will return the
         result of evaluating that property with the current stack. If you need the
         actual function, use getRawProperty()
+
+        The results are cached until a property that they depend on changes. See PropertyEvaluationCache.
         """
 
+        return self._evaluation_cache.getProperty(key, property_name, context, self._evaluateProperty)
+
+    def _evaluateProperty(self, key: str, property_name: str, context: Optional[PropertyEvaluationContext]) -> Any:
         value = self.getRawProperty(key, property_name, context = context)
         if isinstance(value, SettingFunction):
+            if not value.isCacheable():
+                PropertyEvaluationCache.markUncacheable()
             if context is not None:
                 context.pushContainer(self)
             value = value(self, context)
@@ -265,12 +291,16 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
             if start_index >= len(self._containers):
                 return None
             containers = self._containers[start_index:]
-        if property_name not in ["value", "state", "validationState"]:
+        if property_name not in _INDEXED_PROPERTY_NAMES:
             # Value, state & validationState can be changed by instanceContainer, the rest cant. Ask the definition
             # right away
             value = containers[-1].getProperty(key, property_name, context)
             if value is not None:
                 return value
+        elif self._use_property_index and not skip_until_container:
+            value = self._getIndexedProperty(key, property_name, context)
+            if value is not None:
+                return value
         else:
             for container in containers:
                 if skip_until_container and container.getId() != skip_until_container:
@@ -287,6 +317,67 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         else:
             return None
 
+    def _getIndexedProperty(self, key: str, property_name: str, context: Optional[PropertyEvaluationContext]) -> Any:
+        """Get a raw property from the container of this stack that supplies it, according to the property index.
+
+        The index is filled in as properties are requested, and entries are removed when the containers report that a
+        property changed, directly through PropertyEvaluationCache as well as through their signals. Which container
+        supplies a property doesn't depend on the context, but the context may indicate that the first containers of
+        the stack need to be skipped.
+
+        :return: The raw property value, or None if none of the containers of this stack (after the skipped ones) has
+        it.
+        """
+
+        start_index = context.context.get("evaluate_from_container_index", 0) if context is not None else 0
+        index = self._property_index.get((key, property_name))
+        if index is not None:
+            if index < 0:
+                return None
+            if index >= start_index:  # Otherwise the value has to come from a container below the indexed one.
+                value = self._containers[index].getProperty(key, property_name, context)
+                if value is not None:
+                    return value
+                # The container lost the property, but didn't report that (yet).
+
+        value = None
+        found_index = -1
+        for index in range(start_index, len(self._containers)):
+            value = self._containers[index].getProperty(key, property_name, context)
+            if value is not None:
+                found_index = index
+                break
+        if start_index == 0:  # Otherwise it's unknown whether the skipped containers have it.
+            self._property_index[(key, property_name)] = found_index
+        return value
+
+    def removeFromPropertyIndex(self, keys: Iterable[str], property_names: Optional[Iterable[str]] = None) -> None:
+        """Forget which containers supply some properties, so that they are looked up again the next time.
+
+        :param keys: The keys of the settings of which the properties changed.
+        :param property_names: The names of the properties that changed, or None if any property may have changed.
+        """
+
+        if property_names is None:
+            property_names = _INDEXED_PROPERTY_NAMES
+        for key in keys:
+            for property_name in property_names:
+                self._property_index.pop((key, property_name), None)
+
+    def setUsePropertyIndex(self, use_property_index: bool) -> None:
+        """Set whether raw properties are looked up in an index of the containers that supply them.
+
+        Without the index, all containers are asked for a property in turn every time it's requested.
+        """
+
+        self._use_property_index = use_property_index
+        self._property_index.clear()
+
+    def getEvaluationCache(self) -> PropertyEvaluationCache:
+        """Get the cache of evaluated properties of this stack, e.g. to see its statistics."""
+
+        return self._evaluation_cache
+
     def hasProperty(self, key: str, property_name: str) -> bool:
         """:copydoc ContainerInterface::hasProperty
 
@@ -311,6 +402,26 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
     propertyChanged = Signal(Signal.Queued)
     propertiesChanged = Signal(Signal.Queued)
 
+    collectedPropertiesChanged = Signal(Signal.Queued)
+    """Emitted once for all property changes that were collected, on the next run of the event loop or at the end of a
+    SettingChangeBatch.
+
+    This is emitted after propertiesChanged and propertyChanged have been emitted for the same changes. Listeners that
+    are interested in many settings can use this to handle all changes at once.
+
+    :param changes: :type{Dict[str, Set[str]]} For the key of every setting that changed, the names of the properties
+    that changed.
+    """
+
+    def batchPropertyChanges(self) -> SettingChangeBatch:
+        """Start a batch of changes to settings, to notify the listeners only once when the batch ends.
+
+        Use the result as context manager. See SettingChangeBatch for details. The batch applies to all settings that
+        are changed in this thread, not only the ones of this stack.
+        """
+
+        return SettingChangeBatch()
+
     def serialize(self, ignored_metadata_keys: Optional[Set[str]] = None) -> str:
         """:copydoc ContainerInterface::serialize
 
@@ -408,6 +519,8 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
 
         self._containers = []
         self._metadata = {}
+        self._evaluation_cache.clear()
+        self._property_index.clear()
 
         if "metadata" in parser:
             self._metadata = dict(parser["metadata"])
@@ -465,6 +578,15 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         """
 
         serialized = cls._updateSerialized(serialized)  # Update to most recent version.
+        return cls.deserializeCurrentMetadata(serialized, container_id)
+
+    @classmethod
+    def deserializeCurrentMetadata(cls, serialized: str, container_id: str) -> List[Dict[str, Any]]:
+        """:copydoc ContainerInterface::deserializeCurrentMetadata
+
+        Reimplemented from ContainerInterface
+        """
+
         parser = configparser.ConfigParser(interpolation = None)
         parser.read_string(serialized)
 
@@ -644,12 +766,16 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
 
         container.propertyChanged.connect(self._collectPropertyChanges)
         self._containers.insert(index, container)
+        self._evaluation_cache.clear()
+        self._property_index.clear()
         self.containersChanged.emit(container)
         self._dirty = True
 
     def replaceContainer(self, index: int, container: ContainerInterface, postpone_emit: bool = False) -> None:
         """Replace a container in the stack.
 
+        The settings that the listeners of containersChanged change are notified once, after all of them handled it.
+
         :param index: :type{int} The index of the container to replace.
         :param container: The container to replace the existing entry with.
         :param postpone_emit:  During stack manipulation you may want to emit later.
@@ -666,12 +792,15 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         self._containers[index].propertyChanged.disconnect(self._collectPropertyChanges)
         container.propertyChanged.connect(self._collectPropertyChanges)
         self._containers[index] = container
+        self._evaluation_cache.clear()
+        self._property_index.clear()
         self._dirty = True
         if postpone_emit:
             # send it using sendPostponedEmits
             self._postponed_emits.append((self.containersChanged, container))
         else:
-            self.containersChanged.emit(container)
+            with SettingChangeBatch():
+                self.containersChanged.emit(container)
 
     def removeContainer(self, index: int = 0) -> None:
         """Remove a container from the stack.
@@ -688,6 +817,8 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
             self._dirty = True
             container.propertyChanged.disconnect(self._collectPropertyChanges)
             del self._containers[index]
+            self._evaluation_cache.clear()
+            self._property_index.clear()
             self.containersChanged.emit(container)
         except TypeError:
             raise IndexError("Can't delete container with index %s" % index)
@@ -719,6 +850,9 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         if self._next_stack:
             self._next_stack.propertyChanged.disconnect(self._collectPropertyChanges)
             self.containersChanged.disconnect(self._next_stack.containersChanged)
+        # Other kinds of containers can be the next stack as well, but they don't have an evaluation cache.
+        self._evaluation_cache.setNextCache(stack.getEvaluationCache() if isinstance(stack, ContainerStack) else None,
+                                            self._next_stack.getEvaluationCache() if isinstance(self._next_stack, ContainerStack) else None)
         self._next_stack = stack
         if self._next_stack and connect_signals:
             self._next_stack.propertyChanged.connect(self._collectPropertyChanges)
@@ -728,11 +862,13 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         """Send postponed emits
         These emits are collected from the option postpone_emit.
         Note: the option can be implemented for all functions modifying the stack.
+        The changes to settings that these emits cause are batched, see SettingChangeBatch.
         """
 
-        while self._postponed_emits:
-            signal, signal_arg = self._postponed_emits.pop(0)
-            signal.emit(signal_arg)
+        with SettingChangeBatch():
+            while self._postponed_emits:
+                signal, signal_arg = self._postponed_emits.pop(0)
+                signal.emit(signal_arg)
 
     @UM.FlameProfiler.profile
     def hasErrors(self) -> bool:
@@ -783,12 +919,19 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
     # In addition, it allows us to emit a single signal that reports all properties that
     # have changed.
     def _collectPropertyChanges(self, key: str, property_name: str) -> None:
+        # The cache needs to be updated right away, since the values can be requested before the signals get emitted.
+        self._evaluation_cache.invalidate(key, property_name)
+        self._property_index.pop((key, property_name), None)
+
         if key not in self._property_changes:
             self._property_changes[key] = set()
 
         self._property_changes[key].add(property_name)
 
-        if not self._emit_property_changed_queued:
+        batch = SettingChangeBatch.getActive()
+        if batch is not None:
+            batch.addStack(self)  # Emits the changes when the batch ends, even if an emit was queued before it started.
+        elif not self._emit_property_changed_queued:
             from UM.Application import Application
             Application.getInstance().callLater(self._emitCollectedPropertyChanges)
             self._emit_property_changed_queued = True
@@ -801,6 +944,8 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
             for property_name in property_names:
                 self.propertyChanged.emit(key, property_name)
 
+        if self._property_changes:
+            self.collectedPropertiesChanged.emit(self._property_changes)
         self._property_changes = {}
         self._emit_property_changed_queued = False
 
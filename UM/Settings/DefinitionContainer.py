@@ -363,6 +363,28 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         except json.JSONDecodeError as e:
             Logger.log("d", "Could not parse definition: %s", e)
             return []
+        return [cls._parseMetadata(parsed, container_id)]
+
+    @classmethod
+    def deserializeCurrentMetadata(cls, serialized: str, container_id: str) -> Optional[List[Dict[str, Any]]]:
+        """:copydoc ContainerInterface::deserializeCurrentMetadata
+
+        Reimplemented from ContainerInterface
+        """
+
+        try:
+            parsed = json.loads(serialized, object_pairs_hook = collections.OrderedDict)
+        except json.JSONDecodeError as e:
+            Logger.log("d", "Could not parse definition: %s", e)
+            return []
+        if "inherits" in parsed:
+            return None  # Needs the metadata of the parent, which is in the container registry.
+        return [cls._parseMetadata(parsed, container_id)]
+
+    @classmethod
+    def _parseMetadata(cls, parsed: Dict[str, Any], container_id: str) -> Dict[str, Any]:
+        """Gets the metadata of a definition container from its parsed JSON document."""
+
         metadata = {} #type: Dict[str, Any]
         if "inherits" in parsed:
             import UM.Settings.ContainerRegistry #To find the definitions we're inheriting from.
@@ -383,7 +405,7 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
             raise InvalidDefinitionError("Missing required fields: {error_msg}".format(error_msg = str(e)))
         if "metadata" in parsed:
             metadata.update(parsed["metadata"])
-        return [metadata]
+        return metadata
 
     def findDefinitions(self, **kwargs: Any) -> List[SettingDefinition]:
         """Find definitions matching certain criteria.
@@ -14,7 +14,9 @@ from UM.FastConfigParser import FastConfigParser
 from UM.Trust import Trust
 from UM.Decorators import override
 from UM.Settings.Interfaces import DefinitionContainerInterface
+from UM.Settings.PropertyEvaluationCache import PropertyEvaluationCache
 from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext #For typing.
+from UM.Settings.SettingChangeBatch import SettingChangeBatch
 from UM.Signal import Signal, signalemitter
 from UM.PluginObject import PluginObject
 from UM.Logger import Logger
@@ -156,7 +158,9 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
 
     def setCachedValues(self, cached_values: Dict[str, Any]) -> None:
         if not self._instances:
+            old_keys = set((self._cached_values or {}).keys())
             self._cached_values = cached_values
+            PropertyEvaluationCache.notifySettingsChanged(old_keys | set(cached_values.keys()))
         else:
             Logger.log("w", "Unable set values to be lazy loaded when values are already loaded ")
 
@@ -352,7 +356,8 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
         :param container: The container to use for retrieving values when changing the property triggers property
         updates. Defaults to None, which means use the current container.
         :param set_from_cache: Flag to indicate that the property was set from cache. This triggers the behavior that
-        the read_only and setDirty are ignored.
+        the read_only and setDirty are ignored. The change isn't reported, not even to the caches of evaluated
+        properties, since cached values were already visible through this container.
 
         :note If no definition container is set for this container, new instances cannot be created and this method
         will do nothing.
@@ -389,13 +394,17 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
     propertyChanged = Signal()
 
     def clear(self) -> None:
-        """Remove all instances from this container."""
+        """Remove all instances from this container.
+
+        The settings that depend on the removed settings are notified once, when all of them have been removed.
+        """
 
         self._instantiateCachedValues()
-        all_keys = self._instances.copy()
-        for key in all_keys:
-            self.removeInstance(key, postpone_emit=True)
-        self.sendPostponedEmits()
+        with SettingChangeBatch():
+            all_keys = self._instances.copy()
+            for key in all_keys:
+                self.removeInstance(key, postpone_emit=True)
+            self.sendPostponedEmits()
 
     def getAllKeys(self) -> Set[str]:
         """Get all the keys of the instances of this container
@@ -578,6 +587,7 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
 
         # Reset old data
         old_id = self.getId()
+        old_keys = set(self._instances.keys()) | set((self._cached_values or {}).keys())
         self._metadata = {}
         self._instances = {}
 
@@ -592,6 +602,7 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
 
         if "values" in parser:
             self._cached_values = dict(parser["values"])
+        PropertyEvaluationCache.notifySettingsChanged(old_keys | set((self._cached_values or {}).keys()))
 
         self._dirty = False
 
@@ -611,6 +622,15 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
         """
 
         serialized = cls._updateSerialized(serialized)  # Update to most recent version.
+        return cls.deserializeCurrentMetadata(serialized, container_id)
+
+    @classmethod
+    def deserializeCurrentMetadata(cls, serialized: str, container_id: str) -> List[Dict[str, Any]]:
+        """:copydoc ContainerInterface::deserializeCurrentMetadata
+
+        Reimplemented from ContainerInterface
+        """
+
         parser = FastConfigParser(serialized)
 
         metadata = {
@@ -677,6 +697,7 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
         instance.propertyChanged.connect(self.propertyChanged)
         instance.propertyChanged.emit(key, "value")
         self._instances[key] = instance
+        PropertyEvaluationCache.notifySettingsChanged([key])
 
     def removeInstance(self, key: str, postpone_emit: bool = False) -> None:
         """Remove an instance from this container.
@@ -690,6 +711,7 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
 
         instance = self._instances[key]
         del self._instances[key]
+        PropertyEvaluationCache.notifySettingsChanged([key])
         if postpone_emit:
             # postpone, call sendPostponedEmits later. The order matters.
             self._postponed_emits.append((instance.propertyChanged, (key, "validationState")))
@@ -160,6 +160,22 @@ class ContainerInterface:
         Logger.log("w", "Class {class_name} hasn't implemented deserializeMetadata!".format(class_name = cls.__name__))
         return []
 
+    @classmethod
+    def deserializeCurrentMetadata(cls, serialized: str, container_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Deserialize just the metadata from a string representation that is already at the current version.
+
+        Unlike deserializeMetadata, this may not use the application, the version upgrades or other containers, so
+        that it can be done in a separate process.
+
+        :param serialized: A string representing one or more containers that should be deserialized.
+        :param container_id: The ID of the (base) container is already known and provided here.
+
+        :return: A list of the metadata of all containers found in the document, or None if the metadata can't be
+        deserialized without the application. Then deserializeMetadata needs to be used instead.
+        """
+
+        return None
+
     @classmethod
     def _updateSerialized(cls, serialized: str, file_name: Optional[str] = None) -> str:
         """Updates the given serialized data to the latest version."""
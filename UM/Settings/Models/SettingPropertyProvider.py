@@ -1,6 +1,6 @@
 # Copyright (c) 2017 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
-from typing import Optional, List, Set, Any
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from PyQt5.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal
 from PyQt5.QtQml import QQmlPropertyMap
@@ -57,13 +57,13 @@ class SettingPropertyProvider(QObject):
             return  # Nothing to do, attempting to set stack to the same value.
 
         if self._stack:
-            self._stack.propertiesChanged.disconnect(self._onPropertiesChanged)
+            self._stack.collectedPropertiesChanged.disconnect(self._onCollectedPropertiesChanged)
             self._stack.containersChanged.disconnect(self._containersChanged)
 
         self._stack = stack
 
         if self._stack:
-            self._stack.propertiesChanged.connect(self._onPropertiesChanged)
+            self._stack.collectedPropertiesChanged.connect(self._onCollectedPropertiesChanged)
             self._stack.containersChanged.connect(self._containersChanged)
 
         self._validator = None
@@ -319,7 +319,21 @@ class SettingPropertyProvider(QObject):
         self._value_used = relation_count == 0 or (relation_count > 0 and value_used_count != 0)
         return self._value_used
 
-    def _onPropertiesChanged(self, key: str, property_names: List[str]) -> None:
+    def _onCollectedPropertiesChanged(self, changes: Dict[str, Set[str]]) -> None:
+        """Handle all property changes of the stack at once, instead of a signal for every setting that changed."""
+
+        if any(key != self._key and key in changes for key in self._relations):
+            self._value_used = None
+            try:
+                self.isValueUsedChanged.emit()
+            except RuntimeError:
+                # QtObject has been destroyed, no need to handle the signals anymore.
+                return
+
+        if self._key in changes:
+            self._onPropertiesChanged(self._key, changes[self._key])
+
+    def _onPropertiesChanged(self, key: str, property_names: Iterable[str]) -> None:
         if key != self._key:
             if key in self._relations:
                 self._value_used = None
@@ -0,0 +1,288 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import itertools
+import threading
+import weakref
+from collections import defaultdict
+from time import perf_counter
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext
+
+if TYPE_CHECKING:
+    from UM.Settings.ContainerStack import ContainerStack
+
+_Uncacheable = object()
+"""Context key for contexts in which a property can't be cached."""
+
+# Guards the cached values and the dependencies between them, over all caches. Invalidations spread over caches, so a
+# lock per cache would make it possible to deadlock.
+_lock = threading.RLock()
+
+# The properties that are currently being evaluated by each thread.
+_evaluating = threading.local()
+
+# All caches that exist, so that containers can report their changes without knowing which stacks they are in.
+_all_caches = weakref.WeakSet()  # type: weakref.WeakSet[PropertyEvaluationCache]
+
+
+class _Evaluation:
+    """A property that is currently being evaluated, so that properties that it uses can be recorded."""
+
+    __slots__ = ("cache", "key", "property_name", "cacheable")
+
+    def __init__(self, cache: "PropertyEvaluationCache", key: str, property_name: str) -> None:
+        self.cache = cache
+        self.key = key
+        self.property_name = property_name
+        self.cacheable = True
+
+
+def _getEvaluations() -> List[_Evaluation]:
+    try:
+        return _evaluating.evaluations
+    except AttributeError:
+        _evaluating.evaluations = []
+        return _evaluating.evaluations
+
+
+class PropertyEvaluationCache:
+    """Remembers the evaluated properties of a container stack, so that setting functions aren't evaluated again and
+    again with the same input.
+
+    While a property is evaluated, every property that it requests from a stack is recorded as a dependency. When a
+    property changes, the cached values of all properties that depend on it are removed too, also in other stacks. The
+    container stack reports changes through its ``propertyChanged`` connections to its containers, which include the
+    changes that ``SettingInstance`` spreads through the ``SettingRelation`` graph. Since those signals are not always
+    delivered right away, or at all, the containers also report their changes directly to all caches.
+
+    Properties are not cached when they are evaluated with operators that can look at anything other than the stack,
+    such as operators registered with ``SettingFunction.registerOperator``, or when the context can't be compared.
+    """
+
+    def __init__(self, stack: "ContainerStack") -> None:
+        self._stack = weakref.ref(stack)
+
+        self._values = {}  # type: Dict[Tuple[str, str], Dict[Hashable, Any]]
+        # For every property, the properties (in any cache) that used it during their evaluation. The caches are weak
+        # references, so that stacks that used a property of this stack can still be deleted.
+        self._dependents = {}  # type: Dict[Tuple[str, str], Set[Tuple[weakref.ReferenceType[PropertyEvaluationCache], str, str]]]
+        # Caches of stacks that have this stack as their next stack, and so also get their raw values from this stack.
+        self._previous_caches = weakref.WeakSet()  # type: weakref.WeakSet[PropertyEvaluationCache]
+        # Changes whenever something is invalidated, so that evaluations that were running at that time are not stored.
+        self._generation = 0
+
+        self._hits = defaultdict(int)  # type: Dict[str, int]
+        self._misses = defaultdict(int)  # type: Dict[str, int]
+        self._evaluation_times = defaultdict(float)  # type: Dict[str, float]
+
+        with _lock:
+            _all_caches.add(self)
+
+    def getProperty(self, key: str, property_name: str, context: Optional[PropertyEvaluationContext], evaluate: Callable[[str, str, Optional[PropertyEvaluationContext]], Any]) -> Any:
+        """Get a property from the cache, or evaluate it if it's not cached.
+
+        :param key: The key of the setting.
+        :param property_name: The name of the property.
+        :param context: The context to evaluate the property in.
+        :param evaluate: The function that evaluates the property in the stack, if it's not cached.
+        :return: The value of the property.
+        """
+
+        evaluations = _getEvaluations()
+        if evaluations:
+            evaluation = evaluations[-1]
+            with _lock:
+                self._dependents.setdefault((key, property_name), set()).add((weakref.ref(evaluation.cache), evaluation.key, evaluation.property_name))
+
+        context_key = self._getContextKey(context)
+        if context_key is not _Uncacheable:
+            try:
+                value = self._values[(key, property_name)][context_key]
+            except KeyError:
+                pass
+            else:
+                self._hits[key] += 1
+                return value
+        self._misses[key] += 1
+
+        generation = self._generation
+        evaluation = _Evaluation(self, key, property_name)
+        evaluations.append(evaluation)
+        start_time = perf_counter()
+        try:
+            value = evaluate(key, property_name, context)
+        finally:
+            evaluations.pop()
+            self._evaluation_times[key] += perf_counter() - start_time
+
+        if context_key is _Uncacheable or not evaluation.cacheable:
+            if evaluations:
+                evaluations[-1].cacheable = False  # Whatever used this value can't be cached either.
+            return value
+        with _lock:
+            if generation == self._generation:
+                self._values.setdefault((key, property_name), {})[context_key] = value
+        return value
+
+    @staticmethod
+    def markUncacheable() -> None:
+        """Indicate that the property that is currently being evaluated, and anything that uses it, can't be cached."""
+
+        evaluations = _getEvaluations()
+        if evaluations:
+            evaluations[-1].cacheable = False
+
+    def invalidate(self, key: str, property_name: str) -> None:
+        """Remove a property from the cache, along with everything that depends on it.
+
+        :param key: The key of the setting that changed.
+        :param property_name: The name of the property that changed.
+        """
+
+        with _lock:
+            to_invalidate = [(self, key, property_name)]
+            visited = set()  # type: Set[Tuple[PropertyEvaluationCache, str, str]]
+            while to_invalidate:
+                item = to_invalidate.pop()
+                if item in visited:
+                    continue
+                visited.add(item)
+
+                cache, key, property_name = item
+                cache._generation += 1
+                cache._values.pop((key, property_name), None)
+                for dependent_reference, dependent_key, dependent_property_name in cache._dependents.pop((key, property_name), ()):
+                    dependent = dependent_reference()
+                    if dependent is not None:  # Otherwise its stack was deleted.
+                        to_invalidate.append((dependent, dependent_key, dependent_property_name))
+                to_invalidate.extend((previous_cache, key, property_name) for previous_cache in cache._previous_caches)
+
+    @staticmethod
+    def notifyPropertyChanged(key: str, property_name: str) -> None:
+        """Remove a property from all caches that have it or depend on it.
+
+        Containers call this whenever one of their properties changes, since their ``propertyChanged`` signals are
+        not delivered without an application, are delayed while signals are postponed and are not emitted at all when
+        values are set from the cache.
+
+        :param key: The key of the setting that changed.
+        :param property_name: The name of the property that changed.
+        """
+
+        with _lock:
+            for cache in list(_all_caches):
+                cache._forgetPropertySources([key], [property_name])
+                if (key, property_name) in cache._values or (key, property_name) in cache._dependents:
+                    cache.invalidate(key, property_name)
+
+    @staticmethod
+    def notifySettingsChanged(keys: Iterable[str]) -> None:
+        """Remove all properties of some settings from all caches, along with everything that depends on them.
+
+        :param keys: The keys of the settings of which any property may have changed.
+        """
+
+        keys = set(keys)
+        if not keys:
+            return
+        with _lock:
+            for cache in list(_all_caches):
+                cache._forgetPropertySources(keys, None)
+                changed = {item for item in itertools.chain(cache._values.keys(), cache._dependents.keys()) if item[0] in keys}
+                for key, property_name in changed:
+                    cache.invalidate(key, property_name)
+
+    def _forgetPropertySources(self, keys: Iterable[str], property_names: Optional[Iterable[str]]) -> None:
+        """Remove properties from the index of the stack of which container supplies them, since that may have changed.
+
+        The stack also does that when its containers report their changes, but those reports may be delayed.
+
+        :param keys: The keys of the settings that changed.
+        :param property_names: The names of the properties that changed, or None if any property may have changed.
+        """
+
+        stack = self._stack()
+        if stack is not None:
+            stack.removeFromPropertyIndex(keys, property_names)
+
+    def clear(self) -> None:
+        """Remove everything from the cache, along with everything in other caches that depends on it."""
+
+        with _lock:
+            to_clear = [self]
+            visited = set()  # type: Set[PropertyEvaluationCache]
+            while to_clear:
+                cache = to_clear.pop()
+                if cache in visited:
+                    continue
+                visited.add(cache)
+
+                for key, property_name in list(cache._values.keys()) + list(cache._dependents.keys()):
+                    cache.invalidate(key, property_name)
+                cache._generation += 1
+                cache._values.clear()
+                to_clear.extend(cache._previous_caches)
+
+    def setNextCache(self, next_cache: Optional["PropertyEvaluationCache"], previous_next_cache: Optional["PropertyEvaluationCache"]) -> None:
+        """Follow the changes of the cache of the next stack, since raw values may come from there.
+
+        :param next_cache: The cache of the new next stack.
+        :param previous_next_cache: The cache of the old next stack.
+        """
+
+        with _lock:
+            if previous_next_cache is not None:
+                previous_next_cache._previous_caches.discard(self)
+            if next_cache is not None:
+                next_cache._previous_caches.add(self)
+        self.clear()
+
+    def getStatistics(self) -> Dict[str, Dict[str, Any]]:
+        """Get how often the properties of each setting were found in the cache, and how long their evaluation took.
+
+        :return: For every setting key, the number of ``hits`` and ``misses``, and the ``evaluation_time`` in seconds
+        spent on evaluating its properties when they were not cached. The evaluation time includes the time spent on
+        other settings that were needed for the evaluation.
+        """
+
+        result = {}
+        for key in set(self._hits.keys()) | set(self._misses.keys()):
+            result[key] = {
+                "hits": self._hits.get(key, 0),
+                "misses": self._misses.get(key, 0),
+                "evaluation_time": self._evaluation_times.get(key, 0.0)
+            }
+        return result
+
+    def getHitRate(self) -> float:
+        """Get the fraction of the requested properties that were found in the cache."""
+
+        hits = sum(self._hits.values())
+        total = hits + sum(self._misses.values())
+        return hits / total if total else 0.0
+
+    def resetStatistics(self) -> None:
+        self._hits.clear()
+        self._misses.clear()
+        self._evaluation_times.clear()
+
+    def _getContextKey(self, context: Optional[PropertyEvaluationContext]) -> Hashable:
+        """Get something to identify a context by, so that properties evaluated in the same circumstances are shared.
+
+        :return: A hashable representation of the context, or ``_Uncacheable`` if the properties evaluated in this
+        context can't be cached.
+        """
+
+        if context is None:
+            return None
+        root_stack = context.rootStack()
+        if root_stack is not None and root_stack is not self._stack():
+            return _Uncacheable  # The functions get evaluated with the root stack, whose changes are not followed here.
+        if "override_operators" in context.context:
+            return _Uncacheable
+        try:
+            return frozenset(context.context.items())
+        except TypeError:  # Values that can't be hashed can't be compared reliably either.
+            return _Uncacheable
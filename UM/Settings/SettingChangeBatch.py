@@ -0,0 +1,127 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from UM.Settings.Interfaces import ContainerInterface
+from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings.SettingRelation import RelationType
+
+if TYPE_CHECKING:
+    from UM.Settings.ContainerStack import ContainerStack
+    from UM.Settings.SettingRelation import SettingRelation
+
+# When a relation with one of these roles is affected, the validation state of its target needs to be re-evaluated.
+_VALIDATED_ROLES = {"value", "minimum_value", "maximum_value", "minimum_value_warning", "maximum_value_warning"}
+
+
+class SettingChangeBatch:
+    """Combines the notifications of a batch of changes to settings.
+
+    Changing a setting normally notifies all settings that depend on it right away, by following its relations, and
+    container stacks report the changes on the next run of the event loop. When many settings are changed at once,
+    such as when changing a profile, that means following the relations hundreds of times, and notifying the same
+    dependent settings over and over.
+
+    Use a batch as a context manager, usually through ContainerStack.batchPropertyChanges() or
+    ContainerRegistry.batchPropertyChanges():
+
+        with stack.batchPropertyChanges():
+            for key in keys:
+                user_changes.removeInstance(key)
+
+    When the batch ends, the relations of all settings that were changed are followed once, and every affected setting
+    is notified once. The container stacks then report all their changes at once, including through their
+    collectedPropertiesChanged signal, which gets all changed properties of all settings together.
+
+    A batch only collects the changes of the thread that started it. Batches can be nested, in which case the changes
+    are reported when the outermost batch ends.
+    """
+
+    __local = threading.local()
+
+    def __init__(self) -> None:
+        # For every container that needs to notify the settings related to changed settings, the changed settings.
+        self._relation_updates = {}  # type: Dict[int, Tuple[ContainerInterface, Dict[str, SettingDefinition]]]
+        self._stacks = {}  # type: Dict[int, ContainerStack]  # The stacks that have changes to report.
+
+    @classmethod
+    def getActive(cls) -> Optional["SettingChangeBatch"]:
+        """Get the batch that collects the changes of the current thread, if any."""
+
+        return getattr(cls.__local, "batch", None)
+
+    def __enter__(self) -> "SettingChangeBatch":
+        if self.getActive() is None:
+            SettingChangeBatch.__local.batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self.getActive() is not self:
+            return  # A nested batch. The outermost batch reports the changes.
+        try:
+            self._finish()
+        finally:
+            SettingChangeBatch.__local.batch = None
+
+    def addRelationsUpdate(self, container: ContainerInterface, definition: SettingDefinition) -> None:
+        """Notify the settings that depend on a setting when the batch ends.
+
+        :param container: The container that should report the changes of the related settings.
+        :param definition: The definition of the setting that was changed.
+        """
+
+        _, definitions = self._relation_updates.setdefault(id(container), (container, {}))
+        definitions[definition.key] = definition
+
+    def addStack(self, stack: "ContainerStack") -> None:
+        """Let a stack report the property changes that it collected when the batch ends."""
+
+        self._stacks[id(stack)] = stack
+
+    def _finish(self) -> None:
+        # Notifying the related settings makes the stacks collect more changes, so that goes first.
+        relation_updates = self._relation_updates
+        self._relation_updates = {}
+        for container, definitions in relation_updates.values():
+            changes = set()  # type: Set[Tuple[str, str]]
+            for relation in self.findAffectedRelations(definitions.values()):
+                changes.add((relation.target.key, relation.role))
+                if relation.role in _VALIDATED_ROLES:
+                    changes.add((relation.target.key, "validationState"))
+            for key, property_name in changes:
+                container.propertyChanged.emit(key, property_name)
+
+        stacks = self._stacks
+        self._stacks = {}
+        for stack in stacks.values():
+            stack._emitCollectedPropertyChanges()
+
+    @staticmethod
+    def findAffectedRelations(definitions: Iterable[SettingDefinition]) -> Set["SettingRelation"]:
+        """Find the relations of all settings that are affected by changes to some settings, directly or indirectly.
+
+        This follows the relations of the changed settings, and then those of the settings they point at, and so on.
+        Like when a setting is changed on its own, relations that lead back to the changed setting are skipped. The
+        relations that several of the changed settings lead to are only included once.
+
+        :param definitions: The definitions of the settings that changed.
+        :return: The relations to the affected settings, with the properties that are affected as their role.
+        """
+
+        property_names = set(SettingDefinition.getPropertyNames())
+        writable_property_names = {property_name for property_name in property_names if not SettingDefinition.isReadOnlyProperty(property_name)}
+
+        relations = set()  # type: Set[SettingRelation]
+        for definition in definitions:
+            followed = set()  # type: Set[SettingRelation]
+            to_follow = [relation for relation in definition.relations if relation.role in writable_property_names]  # type: List[SettingRelation]
+            while to_follow:
+                relation = to_follow.pop()
+                if relation.type == RelationType.RequiresTarget or relation.target.key == definition.key or relation in followed:
+                    continue
+                followed.add(relation)
+                to_follow.extend(target_relation for target_relation in relation.target.relations if target_relation.role in property_names)
+            relations.update(followed)
+        return relations
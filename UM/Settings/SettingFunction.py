@@ -50,6 +50,8 @@ class SettingFunction:
         #  Keys of all settings that are referenced to in this function.
         self._used_keys = frozenset()  # type: FrozenSet[str]
         self._used_values = frozenset()  # type: FrozenSet[str]
+        #  All names in this function, including those of operators.
+        self._used_names = frozenset()  # type: FrozenSet[str]
 
         self._compiled = None  # type: Optional[CodeType] #Actually an Optional['code'] object, but Python doesn't properly expose this 'code' object via any library.
         self._valid = False  # type: bool
@@ -60,6 +62,7 @@ class SettingFunction:
             result = _SettingExpressionVisitor().visit(tree)
             self._used_keys = frozenset(result.keys)
             self._used_values = frozenset(result.values)
+            self._used_names = _findNames(tree)
 
             self._compiled = compile(self._code, repr(self), "eval")
             self._valid = True
@@ -94,12 +97,11 @@ class SettingFunction:
 
             locals[name] = value
 
-        g = {}  # type: Dict[str, Any]
-        g.update(globals())
-        g.update(self.__operators)
+        g = self._getGlobals()
         # Override operators if there is any in the context
-        if context is not None:
-            g.update(context.context.get("override_operators", {}))
+        if context is not None and "override_operators" in context.context:
+            g = g.copy()
+            g.update(context.context["override_operators"])
 
         try:
             if self._compiled:
@@ -127,6 +129,16 @@ class SettingFunction:
 
         return self._valid
 
+    def isCacheable(self) -> bool:
+        """Returns whether the result of this function only depends on the settings it uses.
+
+        That is not the case if it uses registered operators, since those may get their values from anywhere.
+
+        :return: True if the result of this function may be cached until the settings it uses change.
+        """
+
+        return not (self._used_names & self.__operators.keys())
+
     def getUsedSettingKeys(self) -> FrozenSet[str]:
         """Retrieve a set of the keys (strings) of all the settings used in this function.
 
@@ -155,6 +167,8 @@ class SettingFunction:
     def __setstate__(self, state: Dict[str, Any]) -> None:
         self.__dict__.update(state)
         self._compiled = compile(self._code, repr(self), "eval")
+        if "_used_names" not in state:  # Pickled by an older version.
+            self._used_names = _findNames(ast.parse(self._code, "eval")) if self._valid else frozenset()
 
     @classmethod
     def registerOperator(cls, name: str, operator: Callable) -> None:
@@ -165,11 +179,31 @@ class SettingFunction:
         """
 
         cls.__operators[name] = operator
+        cls.__globals = None
         _SettingExpressionVisitor._knownNames.add(name)
 
+    @classmethod
+    def _getGlobals(cls) -> Dict[str, Any]:
+        """Get the global variables to evaluate the functions with, including the operators.
+
+        These are the same for every function, so they are only put together once.
+        """
+
+        if cls.__globals is None:
+            g = {}  # type: Dict[str, Any]
+            g.update(globals())
+            g.update(cls.__operators)
+            cls.__globals = g
+        return cls.__globals
+
     __operators = {
         "debug": _debug_value
     }
+    __globals = None  # type: Optional[Dict[str, Any]]
+
+
+def _findNames(tree: ast.AST) -> FrozenSet[str]:
+    return frozenset(node.id for node in ast.walk(tree) if isinstance(node, ast.Name))
 
 
 _VisitResult = NamedTuple("_VisitResult", [("values", Set[str]), ("keys", Set[str])])
@@ -7,6 +7,8 @@ import os
 from typing import Any, cast, Dict, Iterable, List, Optional, Set, TYPE_CHECKING
 
 from UM.Settings.Interfaces import ContainerInterface
+from UM.Settings.PropertyEvaluationCache import PropertyEvaluationCache
+from UM.Settings.SettingChangeBatch import SettingChangeBatch
 from UM.Signal import Signal, signalemitter
 from UM.Logger import Logger
 from UM.Decorators import call_if_enabled
@@ -162,6 +164,8 @@ class SettingInstance:
                     value = SettingFunction.SettingFunction(value[1:])
 
                 self.__property_values[name] = value
+                if emit_signals:  # Otherwise the value was already visible, like when it was loaded lazily.
+                    PropertyEvaluationCache.notifyPropertyChanged(self._definition.key, name)
                 if name == "value":
                     if not container:
                         container = self._container
@@ -169,6 +173,7 @@ class SettingInstance:
                     if self._state != InstanceState.User:
                         self._state = InstanceState.User
                         if emit_signals:
+                            PropertyEvaluationCache.notifyPropertyChanged(self._definition.key, "state")
                             self.propertyChanged.emit(self._definition.key, "state")
 
                     self.updateRelations(container, emit_signals = emit_signals)
@@ -188,6 +193,7 @@ class SettingInstance:
                     if self._state != InstanceState.Calculated:
                         self._state = InstanceState.Calculated
                         if emit_signals:
+                            PropertyEvaluationCache.notifyPropertyChanged(self._definition.key, "state")
                             self.propertyChanged.emit(self._definition.key, "state")
             else:
                 raise AttributeError("No property {0} defined".format(name))
@@ -229,7 +235,18 @@ class SettingInstance:
 
     @call_if_enabled(_traceRelations, _isTraceEnabled())
     def updateRelations(self, container: ContainerInterface, emit_signals: bool = True) -> None:
-        """protected:"""
+        """protected:
+
+        Notify the settings that depend on this one of a change. If a SettingChangeBatch is active, they are notified
+        when the batch ends, together with the ones of the other settings that changed.
+        """
+
+        if not emit_signals:
+            return  # Following the relations is only needed to notify the related settings.
+        batch = SettingChangeBatch.getActive()
+        if batch is not None:
+            batch.addRelationsUpdate(container, self._definition)
+            return
 
         property_names = SettingDefinition.getPropertyNames()
         property_names.remove("value")  # Move "value" to the front of the list so we always update that first.
@@ -242,14 +259,11 @@ class SettingInstance:
             changed_relations = set()   # type: Set[SettingRelation]
             self._addRelations(changed_relations, self._definition.relations, [property_name])
 
-            # TODO: We should send this as a single change event instead of several of them.
-            # That would increase performance by reducing the amount of updates.
-            if emit_signals:
-                for relation in changed_relations:
-                    container.propertyChanged.emit(relation.target.key, relation.role)
-                    # If the value/minimum value/etc state is updated, the validation state must be re-evaluated
-                    if relation.role in {"value", "minimum_value", "maximum_value", "minimum_value_warning", "maximum_value_warning"}:
-                        container.propertyChanged.emit(relation.target.key, "validationState")
+            for relation in changed_relations:
+                container.propertyChanged.emit(relation.target.key, relation.role)
+                # If the value/minimum value/etc state is updated, the validation state must be re-evaluated
+                if relation.role in {"value", "minimum_value", "maximum_value", "minimum_value_warning", "maximum_value_warning"}:
+                    container.propertyChanged.emit(relation.target.key, "validationState")
 
     def _addRelations(self, relations_set: Set["SettingRelation"], relations: List["SettingRelation"], roles: List[str]) -> None:
         """Recursive function to put all settings that require eachother for changes of a property value in a list
@@ -10,7 +10,7 @@ import threading
 import os
 import weakref
 from weakref import ReferenceType
-from typing import Any, Union, Callable, TypeVar, Generic, List, Tuple, Iterable, cast, Optional
+from typing import Any, Union, Callable, TypeVar, Generic, List, Set, Tuple, Iterable, cast, Optional
 import contextlib
 import traceback
 
@@ -74,6 +74,10 @@ def _recordSignalNames() -> bool:
     return FlameProfiler.enabled()
 
 
+# Whether emits need to check if a profile is being recorded. Profiles can only be recorded if the profiler is enabled.
+_profiling_enabled = FlameProfiler.enabled()
+
+
 def profileEmit(func):
     if FlameProfiler.enabled():
         @functools.wraps(func)
@@ -128,10 +132,14 @@ class Signal:
     Auto = 2
     Queued = 3
 
-    def __init__(self, type: int = Auto) -> None:
+    def __init__(self, type: int = Auto, coalesce: bool = False) -> None:
         """Initialize the instance.
 
         :param type: The signal type. Defaults to Auto.
+        :param coalesce: Whether to combine emits with equal arguments that are pushed onto the event loop. While such
+        an emit is waiting on the event loop, emitting the signal again with equal arguments has no effect. This is
+        only suitable for signals of which the slots don't depend on how often they are called, like notifications
+        that something changed.
         """
 
         # These collections must be treated as immutable otherwise we lose thread safety.
@@ -141,6 +149,12 @@ class Signal:
 
         self.__lock = threading.Lock()  # Guards access to the fields above.
         self.__type = type
+        self.__coalesce = coalesce
+        self.__coalesced_emits = set()  # type: Set[Any]  # The arguments of the emits that are waiting on the event loop.
+
+        # References to the slots of the three collections above, which is what emit() works with. This is replaced
+        # as a whole whenever a slot is connected or disconnected, so it's always a consistent snapshot.
+        self.__connections = ((), (), ())  # type: Tuple[Tuple[ReferenceType, ...], Tuple[Tuple[ReferenceType, ReferenceType], ...], Tuple[ReferenceType, ...]]
 
         self._postpone_emit = False
         self._postpone_thread = None    # type: Optional[threading.Thread]
@@ -174,6 +188,11 @@ class Signal:
 
         return self.__type
 
+    def isCoalescing(self) -> bool:
+        """Get whether emits with equal arguments that are pushed onto the event loop are combined."""
+
+        return self.__coalesce
+
     @call_if_enabled(_traceEmit, _isTraceEnabled())
     @profileEmit
     def emit(self, *args: Any, **kwargs: Any) -> None:
@@ -184,7 +203,8 @@ class Signal:
 
         :note If the Signal type is Queued and this is not called from the application thread
         the call will be posted as an event to the application main thread, which means the
-        function will be called on the next application event loop tick.
+        function will be called on the next application event loop tick. If the signal is
+        coalescing and an emit with equal arguments is already waiting there, nothing happens.
         """
 
         # Check to see if we need to postpone emits
@@ -207,11 +227,11 @@ class Signal:
 
         try:
             if self.__type == Signal.Queued:
-                Signal._app.functionEvent(CallFunctionEvent(self.__performEmit, args, kwargs))
+                self.__postEmit(args, kwargs)
                 return
             if self.__type == Signal.Auto:
                 if threading.current_thread() is not Signal._app.getMainThread():
-                    Signal._app.functionEvent(CallFunctionEvent(self.__performEmit, args, kwargs))
+                    self.__postEmit(args, kwargs)
                     return
         except AttributeError: # If Signal._app is not set
             return
@@ -244,6 +264,7 @@ class Signal:
                 #     Logger.log('d', "Connector function qual name: " + connector.__qualname__)
 
                 self.__functions = self.__functions.append(connector)
+            self.__updateConnections()
 
     @call_if_enabled(_traceDisconnect, _isTraceEnabled())
     def disconnect(self, connector):
@@ -263,6 +284,7 @@ class Signal:
                 self.__methods = self.__methods.remove(connector.__self__, connector.__func__)
             else:
                 self.__functions = self.__functions.remove(connector)
+            self.__updateConnections()
 
     def disconnectAll(self):
         """Disconnect all connected slots."""
@@ -275,6 +297,7 @@ class Signal:
             self.__functions = WeakImmutableList()      # type: "WeakImmutableList"
             self.__methods = WeakImmutablePairList()    # type: "WeakImmutablePairList"
             self.__signals = WeakImmutableList()        # type: "WeakImmutableList"
+            self.__updateConnections()
 
     def __getstate__(self):
         """To support Pickle
@@ -298,10 +321,11 @@ class Signal:
             methods = self.__methods
             signals = self.__signals
 
-        signal = Signal(type = self.__type)
+        signal = Signal(type = self.__type, coalesce = self.__coalesce)
         signal.__functions = functions
         signal.__methods = methods
         signal.__signals = signals
+        signal.__updateConnections()
         return signal
 
     _app = None  # type: Application
@@ -311,42 +335,91 @@ class Signal:
 
     _signalQueue = None  # type: Application
 
+    def __updateConnections(self) -> None:
+        """Take a new snapshot of the connected slots for emit(). The lock must be held for this."""
+
+        self.__connections = (self.__functions.getReferences(), self.__methods.getReferences(), self.__signals.getReferences())
+
+    def __postEmit(self, args: Tuple[Any, ...], kwargs: Any) -> None:
+        """Push an emit onto the event loop, unless it's combined with an emit that is already waiting there."""
+
+        if self.__coalesce:
+            key = (args, tuple(kwargs.items()))
+            try:
+                hash(key)
+            except TypeError:  # Emits with arguments that can't be compared this way are never combined.
+                pass
+            else:
+                with self.__lock:
+                    if key in self.__coalesced_emits:
+                        return
+                    self.__coalesced_emits.add(key)
+                try:
+                    Signal._app.functionEvent(CallFunctionEvent(self.__performCoalescedEmit, (key, ), {}))
+                except Exception:
+                    with self.__lock:
+                        self.__coalesced_emits.discard(key)
+                    raise
+                return
+
+        Signal._app.functionEvent(CallFunctionEvent(self.__performEmit, args, kwargs))
+
+    def __performCoalescedEmit(self, key: Tuple[Tuple[Any, ...], Tuple[Tuple[str, Any], ...]]) -> None:
+        with self.__lock:
+            self.__coalesced_emits.discard(key)  # Emitting again from now on needs another call.
+        args, kwargs = key
+        self.__performEmit(*args, **dict(kwargs))
+
     # Private implementation of the actual emit.
     # This is done to make it possible to freely push function events without needing to maintain state.
     def __performEmit(self, *args, **kwargs) -> None:
-        # Quickly make some private references to the collections we need to process.
-        # Although the these fields are always safe to use read and use with regards to threading,
-        # we want to operate on a consistent snapshot of the whole set of fields.
-        with self.__lock:
-            functions = self.__functions
-            methods = self.__methods
-            signals = self.__signals
+        # The snapshot of the slots is replaced as a whole when they change, so it's safe to use without the lock.
+        functions, methods, signals = self.__connections
+
+        if _profiling_enabled and FlameProfiler.isRecordingProfile():
+            self.__performProfiledEmit(functions, methods, signals, args, kwargs)
+            return
 
-        if not FlameProfiler.isRecordingProfile():
-            # Call handler functions
-            for func in functions:
+        # Call handler functions
+        for function_ref in functions:
+            func = function_ref()
+            if func is not None:
                 func(*args, **kwargs)
 
-            # Call handler methods
-            for dest, func in methods:
+        # Call handler methods
+        for dest_ref, function_ref in methods:
+            dest = dest_ref()
+            func = function_ref()
+            if dest is not None and func is not None:
                 func(dest, *args, **kwargs)
 
-            # Emit connected signals
-            for signal in signals:
+        # Emit connected signals
+        for signal_ref in signals:
+            signal = signal_ref()
+            if signal is not None:
                 signal.emit(*args, **kwargs)
-        else:
-            # Call handler functions
-            for func in functions:
+
+    @staticmethod
+    def __performProfiledEmit(functions, methods, signals, args, kwargs) -> None:
+        # Call handler functions
+        for function_ref in functions:
+            func = function_ref()
+            if func is not None:
                 with FlameProfiler.profileCall(func.__qualname__):
                     func(*args, **kwargs)
 
-            # Call handler methods
-            for dest, func in methods:
+        # Call handler methods
+        for dest_ref, function_ref in methods:
+            dest = dest_ref()
+            func = function_ref()
+            if dest is not None and func is not None:
                 with FlameProfiler.profileCall(func.__qualname__):
                     func(dest, *args, **kwargs)
 
-            # Emit connected signals
-            for signal in signals:
+        # Emit connected signals
+        for signal_ref in signals:
+            signal = signal_ref()
+            if signal is not None:
                 with FlameProfiler.profileCall("[SIG]" + signal.getName()):
                     signal.emit(*args, **kwargs)
 
@@ -445,7 +518,7 @@ def signalemitter(cls):
             sub = old_new(subclass, *args, **kwargs)
 
         for key, value in inspect.getmembers(cls, lambda i: isinstance(i, Signal)):
-            setattr(sub, key, Signal(type = value.getType()))
+            setattr(sub, key, Signal(type = value.getType(), coalesce = value.isCoalescing()))
 
         return sub
 
@@ -497,6 +570,11 @@ class WeakImmutableList(Generic[T], Iterable):
         else:
             return self  # No changes needed
 
+    def getReferences(self) -> "Tuple[ReferenceType[Optional[T]], ...]":
+        """Get the weak references to the items, including the ones of which the item has disappeared."""
+
+        return tuple(self.__list)
+
     # Create a new list with the missing values removed.
     def __cleanList(self) -> "List[ReferenceType[Optional[T]]]":
         return [item_ref for item_ref in self.__list if item_ref() is not None]
@@ -567,6 +645,11 @@ class WeakImmutablePairList(Generic[T, U], Iterable):
         else:
             return self # No changes needed
 
+    def getReferences(self) -> Tuple[Tuple[ReferenceType, ReferenceType], ...]:
+        """Get the pairs of weak references, including the ones of which an item has disappeared."""
+
+        return tuple(self.__list)
+
     # Create a new list with the missing values removed.
     def __cleanList(self) -> List[Tuple[ReferenceType,ReferenceType]]:
         return [pair for pair in self.__list if pair[0]() is not None and pair[1]() is not None]
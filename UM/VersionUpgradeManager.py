@@ -135,6 +135,15 @@ class VersionUpgradeManager:
 
         return self._storage_paths[configuration_type]
 
+    def getCurrentVersions(self) -> Dict[Tuple[str, int], Any]:
+        """Gets the target versions to upgrade to.
+
+        :return: A dictionary of tuples of configuration types and their versions currently in use, and with each of
+        these a tuple of where to store this type of file and its MIME type.
+        """
+
+        return self._current_versions
+
     def setCurrentVersions(self, current_versions: Dict[Tuple[str, int], Any]) -> None:
         """Changes the target versions to upgrade to.
 
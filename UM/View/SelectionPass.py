@@ -12,7 +12,7 @@ from UM.Math.Color import Color
 
 from UM.Scene.Selection import Selection
 from UM.Scene.ToolHandle import ToolHandle
-from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.Scene.Iterator.LazyDepthFirstIterator import LazyDepthFirstIterator
 
 from UM.View.RenderPass import RenderPass
 from UM.View.RenderBatch import RenderBatch
@@ -96,7 +96,7 @@ class SelectionPass(RenderPass):
         batch = RenderBatch(self._shader)
         tool_handle = RenderBatch(self._tool_handle_shader, type = RenderBatch.RenderType.Overlay)
         selectable_objects = False
-        for node in DepthFirstIterator(self._scene.getRoot()):
+        for node in LazyDepthFirstIterator(self._scene.getRoot()):
             if isinstance(node, ToolHandle):
                 tool_handle.addItem(node.getWorldTransformation(copy = False), mesh = node.getSelectionMesh())
                 continue
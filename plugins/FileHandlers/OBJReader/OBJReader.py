@@ -3,6 +3,10 @@
 # Uranium is released under the terms of the LGPLv3 or higher.
 
 import os
+import re
+from typing import Dict, List, Tuple
+
+import numpy
 
 from UM.Job import Job
 from UM.Logger import Logger
@@ -10,116 +14,302 @@ from UM.Mesh.MeshReader import MeshReader
 from UM.Mesh.MeshBuilder import MeshBuilder
 from UM.Scene.SceneNode import SceneNode
 
+# Number of bytes of an OBJ file that are parsed at once.
+CHUNK_SIZE = 1 << 22
+
+_comment_regex = re.compile(rb"#[^\n]*")
+_line_continuation_regex = re.compile(rb"\\[ \t]*\r?\n")
+_leading_whitespace_regex = re.compile(rb"(?m)^[ \t]+")
+
+# The lines with coordinates we are interested in, with the number of coordinates we use from them.
+_coordinate_types = {
+    "v": 3,
+    "vn": 3,
+    "vt": 2
+}
+# The indices of a face corner are in this order, separated by slashes.
+_corner_fields = ("v", "vt", "vn")
+# The keywords of the lines we parse. Keywords that are two characters long come last.
+_element_types = ["v", "f", "vn", "vt"]
+
 
 class OBJReader(MeshReader):
     def __init__(self) -> None:
         super().__init__()
         self._supported_extensions = [".obj"]
 
-    def _toAbsoluteIndex(self, max, data):
-        """ Handle negative indices (those are relative to the position, so -2 is the second one before the face). """
-        return [index if index > 0 else 1 + max + index for index in data]
-
     def _read(self, file_name):
         scene_node = None
 
         extension = os.path.splitext(file_name)[1]
         if extension.lower() in self._supported_extensions:
-            vertex_list = []
-            normal_list = []
-            uv_list = []
-            face_list = []
             scene_node = SceneNode()
 
             mesh_builder = MeshBuilder()
             mesh_builder.setFileName(file_name)
-            previous_line_parts = []
-            f = open(file_name, "rt", encoding = "utf-8")
-            for line in f:
-                parts = previous_line_parts + line.split()
-                previous_line_parts = []
-                if len(parts) < 1:
-                    continue
-                if parts[-1] == "\\":
-                    del parts[-1]
-                    previous_line_parts = parts
-                    continue
-                if parts[0] == "f":
-                    parts = [i for i in map(lambda p: p.split("/"), parts)]
-                    for idx in range(1, len(parts) - 2):
-                        data = self._toAbsoluteIndex(len(vertex_list), [int(parts[1][0]), int(parts[idx + 1][0]), int(parts[idx + 2][0])])
-                        if len(parts[1]) > 1:
-                            if parts[1][1] and parts[idx + 1][1] and parts[idx + 2][1]:
-                                data += self._toAbsoluteIndex(len(normal_list), [int(parts[1][1]), int(parts[idx + 1][1]), int(parts[idx + 2][1])])
-
-                            if len(parts[1]) > 2:
-                                data += self._toAbsoluteIndex(len(uv_list), [int(parts[1][2]), int(parts[idx + 1][2]), int(parts[idx + 2][2])])
-                        face_list.append(data)
-                elif parts[0] == "v":
-                    vertex_list.append([float(parts[1]), float(parts[3]), -float(parts[2])])
-                elif parts[0] == "vn":
-                    normal_list.append([float(parts[1]), float(parts[3]), -float(parts[2])])
-                elif parts[0] == "vt":
-                    uv_list.append([float(parts[1]), float(parts[2])])
-                Job.yieldThread()
-            f.close()
-
-            mesh_builder.reserveVertexCount(3 * len(face_list))
-            num_vertices = len(vertex_list)
-
-            for face in face_list:
-                # Substract 1 from index, as obj starts counting at 1 instead of 0
-                i = face[0] - 1
-                j = face[1] - 1
-                k = face[2] - 1
-
-                if len(face) > 3:
-                    ui = face[3] - 1
-                    uj = face[4] - 1
-                    uk = face[5] - 1
-                else:
-                    ui = -1
-                    uj = -1
-                    uk = -1
-
-                if len(face) > 6:
-                    ni = face[6] - 1
-                    nj = face[7] - 1
-                    nk = face[8] - 1
-                else:
-                    ni = -1
-                    nj = -1
-                    nk = -1
-
-                if i < 0 or i >= num_vertices:
-                    i = 0
-                if j < 0 or j >= num_vertices:
-                    j = 0
-                if k < 0 or k >= num_vertices:
-                    k = 0
-                if ni != -1 and nj != -1 and nk != -1:
-                    mesh_builder.addFaceWithNormals(vertex_list[i][0], vertex_list[i][1], vertex_list[i][2], normal_list[ni][0], normal_list[ni][1], normal_list[ni][2], vertex_list[j][0], vertex_list[j][1], vertex_list[j][2], normal_list[nj][0], normal_list[nj][1], normal_list[nj][2], vertex_list[k][0], vertex_list[k][1], vertex_list[k][2],normal_list[nk][0], normal_list[nk][1], normal_list[nk][2])
-                else:
-                    mesh_builder.addFaceByPoints(vertex_list[i][0], vertex_list[i][1], vertex_list[i][2], vertex_list[j][0], vertex_list[j][1], vertex_list[j][2], vertex_list[k][0], vertex_list[k][1], vertex_list[k][2])
-
-                if ui != -1 and len(uv_list) > ui:
-                    mesh_builder.setVertexUVCoordinates(mesh_builder.getVertexCount() - 3, uv_list[ui][0], uv_list[ui][1])
-
-                if uj != -1 and len(uv_list) > uj:
-                    mesh_builder.setVertexUVCoordinates(mesh_builder.getVertexCount() - 2, uv_list[uj][0], uv_list[uj][1])
-
-                if uk != -1 and len(uv_list) > uk:
-                    mesh_builder.setVertexUVCoordinates(mesh_builder.getVertexCount() - 1, uv_list[uk][0], uv_list[uk][1])
-
-                Job.yieldThread()
-            if not mesh_builder.hasNormals():
-                mesh_builder.calculateNormals(fast = True)
+
+            parser = _OBJParser()
+            with open(file_name, "rb") as f:
+                remainder = b""
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if b"\r" in chunk:  # Lines may end in \r\n or \r as well. Splitting a \r\n only adds an empty line.
+                        chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+                    data = remainder + chunk
+                    if chunk:
+                        # Keep the last (possibly incomplete or continued) line for the next chunk.
+                        line_end = data.rfind(b"\n") + 1
+                        while line_end > 0 and data[:line_end].rstrip(b" \t\r\n").endswith(b"\\"):
+                            line_end = data.rfind(b"\n", 0, line_end - 1) + 1
+                        remainder = data[line_end:]
+                        data = data[:line_end]
+                    parser.parse(data)
+                    Job.yieldThread()
+                    if not chunk:
+                        break
+
+            parser.build(mesh_builder)
 
             # make sure that the mesh data is not empty
-            if mesh_builder.getVertexCount() == 0:
+            if mesh_builder.getVertexCount() == 0 or mesh_builder.getFaceCount() == 0:
                 Logger.log("d", "File did not contain valid data, unable to read.")
                 return None  # We didn't load anything.
 
             scene_node.setMeshData(mesh_builder.build())
 
         return scene_node
+
+
+class _OBJParser:
+    """Parses the text of an OBJ file into typed arrays.
+
+    The text is fed in chunks that consist of complete lines. Every chunk is tokenized with array operations on its
+    bytes, so there is no Python code that runs per line, per vertex or per face. Faces are split into triangle fans
+    and their (possibly negative) indices are resolved with index arithmetic. The resulting arrays take about as much
+    memory as the mesh that is built from them.
+    """
+
+    def __init__(self) -> None:
+        self._chunks = {element_type: [] for element_type in _coordinate_types}  # type: Dict[str, List[numpy.ndarray]]
+        self._counts = {element_type: 0 for element_type in _coordinate_types}  # type: Dict[str, int]
+        self._corners = []  # type: List[numpy.ndarray]
+        self._triangles = []  # type: List[numpy.ndarray]
+        self._corner_count = 0
+
+    def parse(self, data: bytes) -> None:
+        """Parse a chunk of text that only contains complete lines."""
+
+        if b"\\" in data:
+            data = _line_continuation_regex.sub(b" ", data)
+        if b"#" in data:
+            data = _comment_regex.sub(b"", data)
+        if not data.endswith(b"\n"):
+            data += b"\n"
+        buffer, line_starts, line_ends = _splitLines(data)
+        first_characters = buffer[line_starts]
+        if numpy.any((first_characters == ord(" ")) | (first_characters == ord("\t"))):
+            buffer, line_starts, line_ends = _splitLines(_leading_whitespace_regex.sub(b"", data))
+        is_whitespace = buffer <= ord(" ")  # Treat all control characters as whitespace.
+
+        # Find out which kind of element each line defines from the keyword at the start of the line.
+        line_types = numpy.zeros(len(line_starts), dtype = numpy.int8)
+        line_characters = [buffer.take(line_starts + offset, mode = "clip") for offset in range(3)]
+        is_separator = [characters <= ord(" ") for characters in line_characters]
+        for line_type, keyword in enumerate(_element_types, start = 1):
+            is_line_of_type = is_separator[len(keyword)].copy()
+            for offset, character in enumerate(keyword.encode()):
+                is_line_of_type &= line_characters[offset] == character
+            line_types[is_line_of_type] = line_type
+
+        # Only the characters after the keyword of the lines we are interested in can be part of a number.
+        is_element_line = line_types > 0
+        line_markers = numpy.zeros(len(buffer) + 1, dtype = numpy.int8)
+        line_markers[line_starts[is_element_line]] = 1
+        line_markers[line_ends[is_element_line]] = -1
+        is_number = numpy.cumsum(line_markers[:-1], dtype = numpy.int8).view(numpy.bool_)
+        is_number &= ~is_whitespace
+        is_number &= buffer != ord("/")  # Slashes separate the vertex, texture and normal indices of a face corner.
+        is_number[line_starts] = False
+        is_number[line_starts[line_types >= _element_types.index("vn") + 1] + 1] = False
+
+        # Parse all numbers at once. Face indices are parsed as floats as well, which is exact for any realistic index.
+        text = buffer.copy()
+        text[~is_number] = ord(" ")
+        token_starts = numpy.flatnonzero(is_number[1:] & ~is_number[:-1]) + 1
+        values = numpy.fromstring(text.tobytes(), dtype = numpy.float64, sep = " ") if len(token_starts) > 0 else numpy.zeros(0)
+        if len(values) != len(token_starts):
+            raise ValueError("Unable to parse the numbers in the OBJ file.")
+        token_lines = numpy.searchsorted(line_ends, token_starts)
+        token_types = line_types[token_lines]
+
+        # Number of vertices, normals and texture coordinates that were defined before each line, for negative indices.
+        defined_before = {}  # type: Dict[str, numpy.ndarray]
+        for element_type, coordinate_count in _coordinate_types.items():
+            is_of_type = token_types == _element_types.index(element_type) + 1
+            rows, element_lines = _firstTokensPerLine(values[is_of_type], token_lines[is_of_type], coordinate_count)
+            defines_element = numpy.zeros(len(line_starts), dtype = numpy.int32)
+            defines_element[element_lines] = 1
+            defined_before[element_type] = self._counts[element_type] + numpy.cumsum(defines_element) - defines_element
+            self._chunks[element_type].append(rows.astype(numpy.float32))
+            self._counts[element_type] += len(rows)
+
+        is_face_token = token_types == _element_types.index("f") + 1
+        if not numpy.any(is_face_token):
+            return
+        values = values[is_face_token].astype(numpy.int64)
+        token_starts = token_starts[is_face_token]
+        token_lines = token_lines[is_face_token]
+
+        # Find out which index of a corner each number is: the number of slashes since the start of the corner.
+        is_corner_start = is_whitespace[token_starts - 1]
+        slashes_before = numpy.searchsorted(numpy.flatnonzero(buffer == ord("/")), token_starts)
+        corner_start_token = numpy.maximum.accumulate(numpy.where(is_corner_start, numpy.arange(len(token_starts)), 0))
+        fields = slashes_before - slashes_before[corner_start_token]
+        corner_of_token = numpy.cumsum(is_corner_start) - 1
+
+        # Numbers that are not preceded by the start of a corner on the same line are invalid.
+        valid = is_corner_start[corner_start_token] & (token_lines[corner_start_token] == token_lines) & (fields <= 2)
+        values, token_lines, fields, corner_of_token = values[valid], token_lines[valid], fields[valid], corner_of_token[valid]
+
+        corner_count = int(numpy.count_nonzero(fields == 0))
+        corner_lines = token_lines[fields == 0]
+        corners = numpy.full((corner_count, 3), -1, dtype = numpy.int32)
+        for field, element_type in enumerate(_corner_fields):
+            is_field = fields == field
+            indices = values[is_field]
+            before = defined_before[element_type][token_lines[is_field]]
+            # OBJ indices start counting at 1. Negative indices are relative to the last element defined before the face.
+            resolved = numpy.where(indices < 0, before + indices, indices - 1)
+            resolved[indices == 0] = -1
+            corners[corner_of_token[is_field], field] = resolved
+
+        # Split every polygon into a fan of triangles around its first corner.
+        face_starts = numpy.flatnonzero(numpy.concatenate(([True], corner_lines[1:] != corner_lines[:-1])))
+        corners_per_face = numpy.diff(numpy.append(face_starts, corner_count))
+        triangles_per_face = numpy.maximum(corners_per_face - 2, 0)
+        triangle_count = int(triangles_per_face.sum())
+        first_corner = numpy.repeat(face_starts, triangles_per_face)
+        fan_offset = numpy.arange(triangle_count) - numpy.repeat(numpy.cumsum(triangles_per_face) - triangles_per_face, triangles_per_face)
+        first_corner += self._corner_count
+        triangles = numpy.stack((first_corner, first_corner + fan_offset + 1, first_corner + fan_offset + 2), axis = 1)
+
+        self._corners.append(corners)
+        self._triangles.append(triangles.astype(numpy.int32))
+        self._corner_count += corner_count
+
+    def build(self, mesh_builder: MeshBuilder) -> None:
+        """Put the parsed mesh into a mesh builder as an indexed mesh.
+
+        Corners that share a vertex but have a different normal or texture coordinate get separate vertices.
+        """
+
+        coordinates = {element_type: _concatenate(self._chunks[element_type], (0, coordinate_count), numpy.float32) for element_type, coordinate_count in _coordinate_types.items()}
+        corners = _concatenate(self._corners, (0, 3), numpy.int32)
+        triangles = _concatenate(self._triangles, (0, 3), numpy.int32)
+        # Release the intermediate data.
+        for chunks in self._chunks.values():
+            chunks.clear()
+        self._corners.clear()
+        self._triangles.clear()
+
+        # Swap the Y and Z axis and invert the new Z axis (We have a different coordinate system)
+        for element_type in ("v", "vn"):
+            coordinates[element_type] = coordinates[element_type][:, [0, 2, 1]]
+            coordinates[element_type][:, 2] *= -1
+
+        positions = coordinates["v"]
+        if len(positions) == 0 or len(triangles) == 0:
+            return
+
+        # Indices that point outside of the arrays are invalid. Texture coordinates and normals are left out then, and
+        # faces with an invalid vertex are dropped.
+        for field, element_type in enumerate(_corner_fields[1:], start = 1):
+            invalid = (corners[:, field] >= len(coordinates[element_type])) | (corners[:, field] < -1)
+            corners[invalid, field] = -1
+        invalid_vertex = (corners[:, 0] < 0) | (corners[:, 0] >= len(positions))
+        if numpy.any(invalid_vertex):
+            valid_triangles = ~numpy.any(invalid_vertex[triangles], axis = 1)
+            Logger.log("w", "Dropped %s faces with invalid vertex indices.", len(triangles) - int(numpy.count_nonzero(valid_triangles)))
+            triangles = triangles[valid_triangles]
+            used = numpy.zeros(len(corners), dtype = numpy.bool_)
+            used[triangles] = True
+            corners = corners[used]
+            triangles = (numpy.cumsum(used, dtype = numpy.int32) - 1)[triangles]
+            if len(triangles) == 0:
+                return
+
+        # Only use normals if all corners have one, otherwise we'd get a mix of given and missing normals.
+        use_normals = len(coordinates["vn"]) > 0 and bool(numpy.all(corners[:, 2] >= 0))
+        use_uvs = bool(numpy.any(corners[:, 1] >= 0))
+        used_fields = [0] + ([1] if use_uvs else []) + ([2] if use_normals else [])
+
+        # For each vertex of the result, the index of its position, texture coordinate and normal.
+        if all(numpy.array_equal(corners[:, field], corners[:, 0]) for field in used_fields):
+            # Each vertex always has the same normal and texture coordinate index, so the vertices can be used as-is.
+            vertex_fields = numpy.full((len(positions), 3), -1, dtype = numpy.int32)
+            vertex_fields[:, 0] = numpy.arange(len(positions))
+            vertex_fields[corners[:, 0], 1:] = corners[:, 1:]
+            vertices = positions
+            corner_vertices = corners[:, 0]
+        else:
+            unique_fields, corner_vertices = numpy.unique(corners[:, used_fields], axis = 0, return_inverse = True)
+            vertex_fields = numpy.full((len(unique_fields), 3), -1, dtype = numpy.int32)
+            vertex_fields[:, used_fields] = unique_fields
+            vertices = positions[vertex_fields[:, 0]]
+            corner_vertices = corner_vertices.reshape(-1).astype(numpy.int32)
+        indices = corner_vertices[triangles]
+        del corners, triangles, corner_vertices
+
+        mesh_builder.setVertices(vertices)
+        mesh_builder.setIndices(indices)
+        if use_uvs:
+            mesh_builder.setUVCoordinates(_gather(coordinates["vt"], vertex_fields[:, 1]))
+        if use_normals:
+            mesh_builder.setNormals(_gather(coordinates["vn"], vertex_fields[:, 2]))
+        else:
+            mesh_builder.calculateNormals()
+
+
+def _splitLines(data: bytes) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Get the characters of a text that ends with a newline, and the positions where its lines start and end."""
+
+    buffer = numpy.frombuffer(data, dtype = numpy.uint8)
+    line_ends = numpy.flatnonzero(buffer == ord("\n"))
+    line_starts = numpy.concatenate(([0], line_ends[:-1] + 1))
+    return buffer, line_starts, line_ends
+
+
+def _firstTokensPerLine(values: numpy.ndarray, token_lines: numpy.ndarray, count: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Take the first numbers of every line that has enough of them.
+
+    :param values: The numbers in the text.
+    :param token_lines: The line that each of the numbers is on, in ascending order.
+    :param count: The number of values to take from each line.
+    :return: An array with a row of numbers per line, and the lines that these rows came from.
+    """
+
+    if len(values) == 0:
+        return numpy.zeros((0, count), dtype = values.dtype), numpy.zeros(0, dtype = numpy.int32)
+
+    first_token_of_line = numpy.searchsorted(token_lines, token_lines)
+    index_in_line = numpy.arange(len(values)) - first_token_of_line
+    lines = token_lines[index_in_line == count - 1]  # The lines that have enough numbers.
+    has_enough = numpy.zeros(token_lines[-1] + 1, dtype = numpy.bool_)
+    has_enough[lines] = True
+    selected = (index_in_line < count) & has_enough[token_lines]
+    return values[selected].reshape((-1, count)), lines
+
+
+def _concatenate(arrays: List[numpy.ndarray], empty_shape: Tuple[int, int], dtype: type) -> numpy.ndarray:
+    if not arrays:
+        return numpy.zeros(empty_shape, dtype = dtype)
+    return numpy.concatenate(arrays)
+
+
+def _gather(values: numpy.ndarray, indices: numpy.ndarray) -> numpy.ndarray:
+    """Take the rows of values at the given indices, using zeros for negative (missing) indices."""
+
+    result = values[indices]
+    result[indices < 0] = 0
+    return result
+
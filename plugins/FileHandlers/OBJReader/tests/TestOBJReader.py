@@ -1,5 +1,6 @@
 import os.path
 
+import numpy
 import sys
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 from unittest.mock import patch
@@ -16,6 +17,102 @@ def test_readOBJ():
 
     assert result  # It must return a node
     assert result.getMeshData()  # It should have mesh data
-    assert result.getMeshData().getVertexCount() == 3840
+    assert result.getMeshData().getVertexCount() == 642  # The vertices are shared between the faces.
     assert result.getMeshData().getFaceCount() == 1280
-    assert result.getMeshData().hasNormals()  # It should have normals.
\ No newline at end of file
+    assert result.getMeshData().hasNormals()  # It should have normals.
+
+
+def test_readOBJSmallChunks():
+    sphere_file = os.path.join(test_path, "sphere.obj")
+    expected = OBJReader.OBJReader()._read(sphere_file).getMeshData()
+
+    # Chunks that end in the middle of lines must give the same result.
+    with patch.object(OBJReader, "CHUNK_SIZE", 100):
+        result = OBJReader.OBJReader()._read(sphere_file).getMeshData()
+
+    assert numpy.array_equal(result.getVertices(), expected.getVertices())
+    assert numpy.array_equal(result.getIndices(), expected.getIndices())
+    assert numpy.array_equal(result.getNormals(), expected.getNormals())
+
+
+def test_readOBJPolygonsAndRelativeIndices(tmp_path):
+    file_name = str(tmp_path / "polygons.obj")
+    with open(file_name, "w") as f:
+        f.write("""# A quad and a triangle that uses relative indices.
+v 0 0 0
+v 1 0 0
+v 1 1 0  # Comments at the end of a line are ignored.
+v 0 1 0
+f 1 2 3 4
+v 0 0 1
+v 1 0 \\
+  1
+v 1 1 1
+f -3 -2 -1
+""")
+
+    mesh = OBJReader.OBJReader()._read(file_name).getMeshData()
+
+    # The Y and Z axis are swapped and Z is inverted.
+    assert numpy.array_equal(mesh.getVertices(), [[0, 0, 0], [1, 0, 0], [1, 0, -1], [0, 0, -1], [0, 1, 0], [1, 1, 0], [1, 1, -1]])
+    assert numpy.array_equal(mesh.getIndices(), [[0, 1, 2], [0, 2, 3], [4, 5, 6]])
+    assert mesh.getNormals().shape == (7, 3)
+
+
+def test_readOBJSeparateAttributeIndices(tmp_path):
+    file_name = str(tmp_path / "attributes.obj")
+    with open(file_name, "w") as f:
+        f.write("""v 0 0 0
+v 1 0 0
+v 0 1 0
+vt 0 0
+vt 1 0
+vt 0 1
+vt 0.5 0.5
+vn 0 0 1
+vn 0 0 -1
+f 1/1/1 2/2/1 3/3/1
+f 1/4/2 3/3/2 2/2/2
+""")
+
+    mesh = OBJReader.OBJReader()._read(file_name).getMeshData()
+
+    # Vertices that are used with a different texture coordinate or normal are duplicated.
+    assert mesh.getVertexCount() == 6
+    assert mesh.getFaceCount() == 2
+    corners = mesh.getIndices().reshape(-1)
+    assert numpy.array_equal(mesh.getVertices()[corners], [[0, 0, 0], [1, 0, 0], [0, 0, -1], [0, 0, 0], [0, 0, -1], [1, 0, 0]])
+    assert numpy.array_equal(mesh.getNormals()[corners], [[0, 1, 0]] * 3 + [[0, -1, 0]] * 3)
+    assert numpy.array_equal(mesh.getUVCoordinates()[corners], [[0, 0], [1, 0], [0, 1], [0.5, 0.5], [0, 1], [1, 0]])
+
+
+def test_readOBJLineEndings(tmp_path):
+    lines = ["v 0 0 0", "v 1 0 0", "v 1 1 0", "f 1 2 3"]
+    for name, line_ending in (("unix", "\n"), ("windows", "\r\n"), ("mac", "\r")):
+        file_name = str(tmp_path / (name + ".obj"))
+        with open(file_name, "w", newline = "") as f:
+            f.write(line_ending.join(lines) + line_ending)
+
+        mesh = OBJReader.OBJReader()._read(file_name).getMeshData()
+
+        assert numpy.array_equal(mesh.getVertices(), [[0, 0, 0], [1, 0, 0], [1, 0, -1]])
+        assert numpy.array_equal(mesh.getIndices(), [[0, 1, 2]])
+
+
+def test_readOBJInvalidIndices(tmp_path):
+    file_name = str(tmp_path / "invalid.obj")
+    with open(file_name, "w") as f:
+        f.write("""v 0 0 0
+v 1 0 0
+v 1 1 0
+vn 0 0 1
+f 1 2 9
+f 1//1 2//7 3//1
+f 0 1 2
+""")
+
+    mesh = OBJReader.OBJReader()._read(file_name).getMeshData()
+
+    # Faces with vertices that don't exist are dropped. Normals that don't exist are calculated instead.
+    assert numpy.array_equal(mesh.getVertices()[mesh.getIndices()], [[[0, 0, 0], [1, 0, 0], [1, 0, -1]]])
+    assert mesh.getNormals().shape == (3, 3)
@@ -4,7 +4,10 @@
 
 import time
 
+import numpy
+
 from UM.Logger import Logger
+from UM.Mesh.MeshData import transformVertices
 from UM.Mesh.MeshWriter import MeshWriter
 from UM.i18n import i18nCatalog
 
@@ -36,33 +39,22 @@ class OBJWriter(MeshWriter):
 
         face_offset = 1
         for node in MeshWriter._meshNodes(nodes):
-            mesh_data = node.getMeshData().getTransformed(node.getWorldTransformation())
+            mesh_data = node.getMeshData()
             verts = mesh_data.getVertices()
             if verts is None:
                 continue   # No mesh data, nothing to do.
 
+            verts = transformVertices(verts, node.getWorldTransformation())
             stream.write("# {0}\n# Vertices\n".format(node.getName()))
+            MeshWriter._writeRows(stream, "v %.9g %.9g %.9g\n", numpy.stack((verts[:, 0], -verts[:, 2], verts[:, 1]), axis = 1))
 
+            stream.write("# Faces\n")
             if mesh_data.hasIndices():
-                for face in mesh_data.getIndices():
-                    v1 = verts[face[0]]
-                    v2 = verts[face[1]]
-                    v3 = verts[face[2]]
-                    stream.write("v {0} {1} {2}\n".format(v1[0], -v1[2], v1[1]))
-                    stream.write("v {0} {1} {2}\n".format(v2[0], -v2[2], v2[1]))
-                    stream.write("v {0} {1} {2}\n".format(v3[0], -v3[2], v3[1]))
-
-                stream.write("# Faces\n")
-                for face in mesh_data.getIndices():
-                    stream.write("f {0} {1} {2}\n".format(face[0] + face_offset, face[1] + face_offset, face[2] + face_offset))
+                faces = mesh_data.getIndices()
             else:
-                for vertex in verts:
-                    stream.write("v {0} {1} {2}\n".format(vertex[0], -vertex[2], vertex[1]))
-
-                stream.write("# Faces\n")
-                for face in range(face_offset, face_offset + len(verts) - 1, 3):
-                    stream.write("f {0} {1} {2}\n".format(face, face + 1, face + 2))
+                faces = numpy.arange(len(verts) // 3 * 3).reshape((-1, 3))
+            MeshWriter._writeRows(stream, "f %d %d %d\n", faces + face_offset)
 
-            face_offset += mesh_data.getVertexCount()
+            face_offset += len(verts)
 
         return True
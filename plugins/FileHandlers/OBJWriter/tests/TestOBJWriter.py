@@ -0,0 +1,35 @@
+import io
+import os.path
+
+import numpy
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import OBJWriter
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Scene.SceneNode import SceneNode
+
+
+def createNode(indexed):
+    builder = MeshBuilder()
+    builder.setVertices(numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype = numpy.float32))
+    if indexed:
+        builder.setIndices(numpy.array([[0, 1, 2], [0, 2, 3]], dtype = numpy.int32))
+    node = SceneNode()
+    node.setMeshData(builder.build())
+    node.setSelectable(True)
+    node.setPosition(Vector(10, 20, 30))
+    return node
+
+
+def test_write():
+    stream = io.StringIO()
+    assert OBJWriter.OBJWriter().write(stream, [createNode(indexed = True), createNode(indexed = False)])
+
+    lines = stream.getvalue().splitlines()
+    vertices = [list(map(float, line.split()[1:])) for line in lines if line.startswith("v ")]
+    faces = [list(map(int, line.split()[1:])) for line in lines if line.startswith("f ")]
+
+    # Vertices are moved and swapped to the coordinate system of OBJ. Indices start at 1 and continue between meshes.
+    assert numpy.allclose(vertices, [[10, -30, 20], [11, -30, 20], [10, -30, 21], [10, -31, 20]] * 2)
+    assert faces == [[1, 2, 3], [1, 3, 4], [5, 6, 7]]
@@ -1,9 +1,12 @@
 import os.path
+import struct
 
+import numpy
 import sys
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 from unittest.mock import patch
 import STLReader
+from UM.Mesh import STLParser
 from UM.Mesh.MeshBuilder import MeshBuilder
 
 test_path = os.path.join(os.path.dirname(STLReader.__file__), "tests")
@@ -16,11 +19,11 @@ def test_readASCII():
         result = reader.read(ascii_path)
     assert result
 
-    if STLReader.use_numpystl:
+    if STLParser.use_numpystl:
         # If the system the test runs on supports numpy stl, we should also check the non numpy stl option.
         f = open(ascii_path, "rt", encoding = "utf-8")
         mesh_builder = MeshBuilder()
-        reader._loadAscii(mesh_builder, f)
+        STLParser.loadAscii(mesh_builder, f)
         mesh_builder.calculateNormals(fast=True)
 
         assert mesh_builder.getVertexCount() != 0
@@ -32,13 +35,101 @@ def test_readBinary():
     with patch("UM.Application.Application.getInstance"):
         result = reader.read(binary_path)
 
-    if STLReader.use_numpystl:
+    if STLParser.use_numpystl:
         # If the system the test runs on supporst numpy stl, we should also check the non numpy stl option.
         f = open(binary_path, "rb")
         mesh_builder = MeshBuilder()
-        reader._loadBinary(mesh_builder, f)
+        STLParser.loadBinary(mesh_builder, f)
         mesh_builder.calculateNormals(fast=True)
 
         assert mesh_builder.getVertexCount() != 0
     assert result
 
+
+def test_readLargeInProcessPool():
+    reader = STLReader.STLReader()
+    binary_path = os.path.join(test_path, "simpleTestCubeBinary.stl")
+    with patch("UM.ProcessPool.ProcessPool.getInstance") as get_pool:
+        get_pool.return_value.run.side_effect = lambda function, *args: function(*args)
+        with patch("UM.Application.Application.getInstance"):
+            assert reader.read(binary_path)
+            get_pool.return_value.run.assert_not_called()  # Small files are read in this process.
+
+            with patch.object(STLReader, "PROCESS_POOL_MINIMUM_FILE_SIZE", 0):
+                assert reader.read(binary_path)
+            get_pool.return_value.run.assert_called_once_with(STLParser.loadArrays, binary_path)
+
+
+def test_loadBinaryVertices():
+    binary_path = os.path.join(test_path, "simpleTestCubeBinary.stl")
+
+    # Decode the file the slow way, facet by facet, to have something to compare with.
+    expected = []
+    with open(binary_path, "rb") as f:
+        f.read(80)
+        num_faces = struct.unpack("<I", f.read(4))[0]
+        for _ in range(num_faces):
+            data = struct.unpack(b"<ffffffffffffH", f.read(50))
+            for vertex in range(3):
+                x, y, z = data[3 + vertex * 3: 6 + vertex * 3]
+                expected.append([x, z, -y])
+
+    mesh_builder = MeshBuilder()
+    with open(binary_path, "rb") as f:
+        assert STLParser.loadBinary(mesh_builder, f)
+
+    assert mesh_builder.getVertexCount() == num_faces * 3
+    assert numpy.array_equal(mesh_builder.getVertices(), numpy.array(expected, dtype = numpy.float32))
+
+
+def test_loadBinaryRejectsAscii():
+    ascii_path = os.path.join(test_path, "simpleTestCubeASCII.stl")
+
+    mesh_builder = MeshBuilder()
+    with open(ascii_path, "rb") as f:
+        assert not STLParser.loadBinary(mesh_builder, f)
+    assert mesh_builder.getVertexCount() == 0
+
+
+def _loadAsciiVertices(path):
+    mesh_builder = MeshBuilder()
+    with open(path, "rt", encoding = "utf-8") as f:
+        STLParser.loadAscii(mesh_builder, f)
+    return mesh_builder.getVertices()
+
+
+def test_loadAsciiVertices():
+    ascii_path = os.path.join(test_path, "simpleTestCubeASCII.stl")
+
+    # Decode the file the slow way, line by line, to have something to compare with.
+    expected = []
+    with open(ascii_path, "rt", encoding = "utf-8") as f:
+        for line in f:
+            if "vertex" in line:
+                x, y, z = map(float, line.split()[1:])
+                expected.append([x, z, -y])
+
+    assert numpy.array_equal(_loadAsciiVertices(ascii_path), numpy.array(expected, dtype = numpy.float32))
+
+
+def test_loadAsciiSmallChunks():
+    ascii_path = os.path.join(test_path, "simpleTestCubeASCII.stl")
+    expected = _loadAsciiVertices(ascii_path)
+
+    # Chunks that end in the middle of lines and buffers that need to grow many times must give the same result.
+    with patch.object(STLParser, "ASCII_CHUNK_SIZE", 7):
+        with patch.object(STLParser, "ASCII_INITIAL_VERTEX_COUNT", 1):
+            assert numpy.array_equal(_loadAsciiVertices(ascii_path), expected)
+
+
+def test_loadAsciiMultipleSolids(tmp_path):
+    ascii_path = os.path.join(test_path, "simpleTestCubeASCII.stl")
+    expected = _loadAsciiVertices(ascii_path)
+
+    with open(ascii_path, "rt", encoding = "utf-8") as f:
+        solid = f.read()
+    multi_solid_path = str(tmp_path / "multiSolid.stl")
+    with open(multi_solid_path, "wt", encoding = "utf-8") as f:
+        f.write(solid.replace("\n", "\r\n") + "\n" + solid.replace("solid cube", "solid other_cube"))
+
+    assert numpy.array_equal(_loadAsciiVertices(multi_solid_path), numpy.concatenate((expected, expected)))
@@ -5,12 +5,17 @@
 import struct
 import time
 
+import numpy
+
 from UM.Logger import Logger
 from UM.Mesh.MeshWriter import MeshWriter
+from UM.Mesh.STLParser import BINARY_FACET_DTYPE
 from UM.i18n import i18nCatalog
 
 catalog = i18nCatalog("uranium")
 
+_ascii_facet_format = "facet normal 0.0 0.0 0.0\n  outer loop\n" + "    vertex %.9g %.9g %.9g\n" * 3 + "  endloop\nendfacet\n"
+
 class STLWriter(MeshWriter):
     def write(self, stream, nodes, mode = MeshWriter.OutputMode.TextMode):
         """Write the specified sequence of nodes to a stream in the STL format.
@@ -45,39 +50,8 @@ class STLWriter(MeshWriter):
         stream.write("solid {0}\n".format(name))
 
         for node in nodes:
-            mesh_data = node.getMeshData().getTransformed(node.getWorldTransformation())
-            verts = mesh_data.getVertices()
-            if verts is None:
-                continue  # No mesh data, nothing to do.
-
-            if mesh_data.hasIndices():
-                for face in mesh_data.getIndices():
-                    stream.write("facet normal 0.0 0.0 0.0\n")
-                    stream.write("  outer loop\n")
-
-                    v1 = verts[face[0]]
-                    v2 = verts[face[1]]
-                    v3 = verts[face[2]]
-                    stream.write("    vertex {0} {1} {2}\n".format(v1[0], -v1[2], v1[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v2[0], -v2[2], v2[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v3[0], -v3[2], v3[1]))
-
-                    stream.write("  endloop\n")
-                    stream.write("endfacet\n")
-            else:
-                num_verts = mesh_data.getVertexCount()
-                for index in range(0, num_verts - 2, 3):
-                    stream.write("facet normal 0.0 0.0 0.0\n")
-                    stream.write("  outer loop\n")
-                    v1 = verts[index]
-                    v2 = verts[index + 1]
-                    v3 = verts[index + 2]
-                    stream.write("    vertex {0} {1} {2}\n".format(v1[0], -v1[2], v1[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v2[0], -v2[2], v2[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v3[0], -v3[2], v3[1]))
-
-                    stream.write("  endloop\n")
-                    stream.write("endfacet\n")
+            faces = self._toSTLCoordinates(MeshWriter._transformedFaces(node))
+            MeshWriter._writeRows(stream, _ascii_facet_format, faces)
 
         stream.write("endsolid {0}\n".format(name))
 
@@ -90,33 +64,20 @@ class STLWriter(MeshWriter):
             if node.getMeshData().hasIndices():
                 face_count += node.getMeshData().getFaceCount()
             else:
-                face_count += node.getMeshData().getVertexCount() / 3
+                face_count += node.getMeshData().getVertexCount() // 3
 
         stream.write(struct.pack("<I", int(face_count))) #Write number of faces to STL
 
         for node in nodes:
-            mesh_data = node.getMeshData().getTransformed(node.getWorldTransformation())
-
-            if mesh_data.hasIndices():
-                verts = mesh_data.getVertices()
-                for face in mesh_data.getIndices():
-                    v1 = verts[face[0]]
-                    v2 = verts[face[1]]
-                    v3 = verts[face[2]]
-                    stream.write(struct.pack("<fff", 0.0, 0.0, 0.0))
-                    stream.write(struct.pack("<fff", v1[0], -v1[2], v1[1]))
-                    stream.write(struct.pack("<fff", v2[0], -v2[2], v2[1]))
-                    stream.write(struct.pack("<fff", v3[0], -v3[2], v3[1]))
-                    stream.write(struct.pack("<H", 0))
-            else:
-                num_verts = mesh_data.getVertexCount()
-                verts = mesh_data.getVertices()
-                for index in range(0, num_verts - 1, 3):
-                    v1 = verts[index]
-                    v2 = verts[index + 1]
-                    v3 = verts[index + 2]
-                    stream.write(struct.pack("<fff", 0.0, 0.0, 0.0))
-                    stream.write(struct.pack("<fff", v1[0], -v1[2], v1[1]))
-                    stream.write(struct.pack("<fff", v2[0], -v2[2], v2[1]))
-                    stream.write(struct.pack("<fff", v3[0], -v3[2], v3[1]))
-                    stream.write(struct.pack("<H", 0))
\ No newline at end of file
+            faces = MeshWriter._transformedFaces(node)
+            facets = numpy.zeros(len(faces), dtype = BINARY_FACET_DTYPE)  # The normals and attributes stay 0.
+            facets["vertices"] = self._toSTLCoordinates(faces)
+            stream.write(facets.tobytes())
+
+    @staticmethod
+    def _toSTLCoordinates(faces: numpy.ndarray) -> numpy.ndarray:
+        """Convert the vertices of faces to the coordinate system of STL, which has the Z axis pointing up."""
+
+        result = faces[:, :, [0, 2, 1]]
+        result[:, :, 1] *= -1
+        return result
@@ -0,0 +1,58 @@
+import io
+import os.path
+import struct
+
+import numpy
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import STLWriter
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshWriter import MeshWriter
+from UM.Scene.SceneNode import SceneNode
+
+
+def createNode(indexed):
+    builder = MeshBuilder()
+    builder.setVertices(numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype = numpy.float32))
+    if indexed:
+        builder.setIndices(numpy.array([[0, 1, 2], [0, 2, 3]], dtype = numpy.int32))
+    node = SceneNode()
+    node.setMeshData(builder.build())
+    node.setSelectable(True)
+    node.setPosition(Vector(10, 20, 30))
+    return node
+
+
+# Vertices of the faces of the nodes above, after moving them and swapping to the coordinate system of STL.
+expected_indexed_faces = [[10, -30, 20], [11, -30, 20], [10, -30, 21], [10, -30, 20], [10, -30, 21], [10, -31, 20]]
+expected_faces = [[10, -30, 20], [11, -30, 20], [10, -30, 21]]
+
+
+def test_writeBinary():
+    stream = io.BytesIO()
+    assert STLWriter.STLWriter().write(stream, [createNode(indexed = True), createNode(indexed = False)], MeshWriter.OutputMode.BinaryMode)
+
+    data = stream.getvalue()
+    assert struct.unpack("<I", data[80:84])[0] == 3
+    assert len(data) == 84 + 3 * 50
+
+    vertices = []
+    for face in range(3):
+        facet = struct.unpack("<ffffffffffffH", data[84 + face * 50: 84 + (face + 1) * 50])
+        assert facet[0:3] == (0, 0, 0)
+        assert facet[12] == 0
+        vertices.extend(numpy.array(facet[3:12]).reshape((3, 3)).tolist())
+    assert numpy.allclose(vertices, expected_indexed_faces + expected_faces)
+
+
+def test_writeAscii():
+    stream = io.StringIO()
+    assert STLWriter.STLWriter().write(stream, [createNode(indexed = True), createNode(indexed = False)], MeshWriter.OutputMode.TextMode)
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0].startswith("solid ")
+    assert lines[-1].startswith("endsolid ")
+    assert sum(1 for line in lines if line == "facet normal 0.0 0.0 0.0") == 3
+    vertices = [list(map(float, line.split()[1:])) for line in lines if line.strip().startswith("vertex")]
+    assert numpy.allclose(vertices, expected_indexed_faces + expected_faces)
@@ -1,11 +1,13 @@
 # Copyright (c) 2020 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import concurrent.futures  # For loading metadata in parallel.
+import functools
 import os  # For getting the IDs from a filename.
 import pickle  # For caching definitions.
 import re  # To detect back-up files in the ".../old/#/..." folders.
 import urllib.parse  # For interpreting escape characters using unquote_plus.
-from typing import Any, Dict, Iterable, Optional, Set
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
 from UM.Application import Application  # To get the current version for finding the cache directory.
 from UM.ConfigurationErrorMessage import ConfigurationErrorMessage
@@ -14,9 +16,10 @@ from UM.MimeTypeDatabase import MimeTypeDatabase, MimeType  # To get the type of
 from UM.Platform import Platform
 from UM.Resources import Resources
 from UM.SaveFile import SaveFile
-from UM.Settings.ContainerProvider import ContainerProvider  # The class we're implementing.
+from UM.Settings.ContainerProvider import ContainerProvider, canDeserializeCurrentMetadata, deserializeCurrentMetadata, deserializeMetadataFromFile, MetadataFileResult  # The class we're implementing.
 from UM.Settings.ContainerRegistry import ContainerRegistry  # To get the resource types for containers.
 from UM.Settings.DefinitionContainer import DefinitionContainer  # To check if we need to cache this container.
+from UM.VersionUpgradeManager import VersionUpgradeManager  # To know which files don't need to be upgraded.
 
 MYPY = False
 if MYPY:  # Things to import for type checking only.
@@ -26,6 +29,9 @@ if MYPY:  # Things to import for type checking only.
 class LocalContainerProvider(ContainerProvider):
     """Provides containers from the local installation."""
 
+    MetadataIndexVersion = 1  # type: int
+    """Version of the format of the metadata index. Index files of other versions are ignored."""
+
     def __init__(self):
         """Creates the local container provider.
 
@@ -39,6 +45,15 @@ class LocalContainerProvider(ContainerProvider):
 
         self._is_read_only_cache = {}  # type: Dict[str, bool]
 
+        self._preloaded_metadata = {}  # type: Dict[str, MetadataFileResult] # Metadata deserialized in parallel, waiting to be requested.
+
+        # For every file path, the modification time and size of the file, the ID and MIME type of the container in
+        # it, and the metadata of its containers if that only depends on the file. Stored in the cache directory.
+        self._metadata_index = None  # type: Optional[Dict[str, Dict[str, Any]]]
+        self._metadata_index_changed = False
+        self._file_stats = {}  # type: Dict[str, Tuple[int, int]] # Modification time and size of the files as they were found.
+        ContainerRegistry.allMetadataLoaded.connect(self._saveMetadataIndex)
+
         self._storage_path = ""
 
     def getContainerFilePathById(self, container_id: str) -> Optional[str]:
@@ -109,6 +124,7 @@ class LocalContainerProvider(ContainerProvider):
             except OSError as e:
                 Logger.log("e", "Unable to store local container to path {path}: {err}".format(path = path, err = str(e)))
                 return
+            self._file_stats.pop(path, None)  # The metadata in the index is outdated now.
             container.setPath(path)
             # Register it internally as being saved
             self._id_to_path[container.getId()] = path
@@ -146,17 +162,37 @@ class LocalContainerProvider(ContainerProvider):
         clazz = ContainerRegistry.mime_type_map[self._id_to_mime[container_id].name]
 
         requested_metadata = {}  # type: Dict[str, Any]
-        try:
-            with open(filename, "r", encoding = "utf-8") as f:
-                result_metadatas = clazz.deserializeMetadata(f.read(), container_id) #pylint: disable=no-member
-        except IOError as e:
-            Logger.log("e", "Unable to load metadata from file {filename}: {error_msg}".format(filename = filename, error_msg = str(e)))
-            ConfigurationErrorMessage.getInstance().addFaultyContainers(container_id)
-            return {}
-        except Exception as e:
-            Logger.logException("e", "Unable to deserialize metadata for container {filename}: {container_id}: {error_msg}".format(filename = filename, container_id = container_id, error_msg = str(e)))
+        preloaded = self._preloaded_metadata.pop(container_id, None)
+        if preloaded is not None and preloaded.error is not None:
+            Logger.log("e", preloaded.error)
             ConfigurationErrorMessage.getInstance().addFaultyContainers(container_id)
             return {}
+        index_entry = self._getMetadataIndex().get(filename)
+        if index_entry is not None and index_entry["metadata"] is not None and index_entry["stat"] == self._file_stats.get(filename):
+            result_metadatas = index_entry["metadata"]
+        elif preloaded is not None and preloaded.metadata is not None:
+            result_metadatas = preloaded.metadata
+            self._indexMetadata(filename, result_metadatas)
+        else:
+            try:
+                with open(filename, "r", encoding = "utf-8") as f:
+                    serialized = f.read()
+                result_metadatas = None  # type: Optional[List[Dict[str, Any]]]
+                current_versions = self._getCurrentVersions()
+                if current_versions is not None:
+                    result_metadatas = deserializeCurrentMetadata(clazz, serialized, container_id, current_versions)
+                if result_metadatas is not None:  # Only depends on the file, so it can be stored.
+                    self._indexMetadata(filename, result_metadatas)
+                else:
+                    result_metadatas = clazz.deserializeMetadata(serialized, container_id) #pylint: disable=no-member
+            except IOError as e:
+                Logger.log("e", "Unable to load metadata from file {filename}: {error_msg}".format(filename = filename, error_msg = str(e)))
+                ConfigurationErrorMessage.getInstance().addFaultyContainers(container_id)
+                return {}
+            except Exception as e:
+                Logger.logException("e", "Unable to deserialize metadata for container {filename}: {container_id}: {error_msg}".format(filename = filename, container_id = container_id, error_msg = str(e)))
+                ConfigurationErrorMessage.getInstance().addFaultyContainers(container_id)
+                return {}
 
         for metadata in result_metadatas:
             if "id" not in metadata:
@@ -172,6 +208,47 @@ class LocalContainerProvider(ContainerProvider):
                 registry.source_provider[metadata["id"]] = self
         return requested_metadata
 
+    def preloadMetadata(self, container_ids: Sequence[str]) -> None:
+        """Deserializes the metadata of the container files in a pool of worker processes.
+
+        The results are kept until loadMetadata requests them, so that they get added to the registry in the same
+        order as without the pool. Files that need a version upgrade or other containers, or whose container class
+        can't deserialize them on its own, are left to loadMetadata.
+
+        :param container_ids: The IDs of the containers of which the metadata will be requested.
+        """
+
+        current_versions = self._getCurrentVersions()
+        if current_versions is None:
+            return
+        self._preloaded_metadata = {}
+        index = self._getMetadataIndex()
+
+        tasks = []
+        for container_id in container_ids:
+            if container_id not in self._id_to_path:
+                continue
+            index_entry = index.get(self._id_to_path[container_id])
+            if index_entry is not None and index_entry["metadata"] is not None and index_entry["stat"] == self._file_stats.get(self._id_to_path[container_id]):
+                continue  # Unchanged since it was stored in the index.
+            clazz = ContainerRegistry.mime_type_map[self._id_to_mime[container_id].name]
+            if not canDeserializeCurrentMetadata(clazz):
+                continue  # It would always fall back to loadMetadata.
+            tasks.append((clazz, container_id, self._id_to_path[container_id]))
+        if not tasks:
+            return
+
+        worker_count = os.cpu_count() or 1
+        chunk_size = max(1, len(tasks) // (worker_count * 4))  # Large enough chunks to limit the communication, small enough to spread the work evenly.
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers = worker_count) as executor:
+                results = executor.map(functools.partial(deserializeMetadataFromFile, current_versions = current_versions), tasks, chunksize = chunk_size)
+                for (clazz, container_id, file_name), result in zip(tasks, results):
+                    self._preloaded_metadata[container_id] = result
+                    Application.getInstance().processEvents()  # Update the user interface because loading takes a while.
+        except Exception:  # E.g. the worker processes couldn't be started, or a container class couldn't be transferred to them.
+            Logger.logException("w", "Unable to load metadata in parallel. The rest will be loaded one by one.")
+
     def isReadOnly(self, container_id: str) -> bool:
         """Returns whether a container is read-only or not.
 
@@ -304,6 +381,9 @@ class LocalContainerProvider(ContainerProvider):
 
         self._id_to_path = {}  # Clear cache first.
         self._id_to_mime = {}
+        self._file_stats = {}
+        index = self._getMetadataIndex()
+        mime_types = {}  # type: Dict[str, MimeType] # The MIME types of the index by name, to only have to look them up once.
 
         old_file_expression = re.compile(r"\{sep}old\{sep}\d+\{sep}".format(sep = os.sep))  # To detect files that are back-ups. Matches on .../old/#/...
 
@@ -314,15 +394,92 @@ class LocalContainerProvider(ContainerProvider):
             if re.search(old_file_expression, filename):
                 continue  # This is a back-up file from an old version.
 
-            container_id = self._pathToId(filename)
-            if not container_id:
-                continue
-            mime = self._pathToMime(filename)
-            if not mime:
-                continue
+            try:
+                file_stat = os.stat(filename)
+                self._file_stats[filename] = (file_stat.st_mtime_ns, file_stat.st_size)
+            except OSError:
+                pass
+            index_entry = index.get(filename)
+            if index_entry is not None and index_entry["stat"] == self._file_stats.get(filename) and index_entry["mime"] in ContainerRegistry.mime_type_map:
+                container_id = index_entry["id"]
+                if index_entry["mime"] not in mime_types:
+                    mime_types[index_entry["mime"]] = MimeTypeDatabase.getMimeType(index_entry["mime"])
+                mime = mime_types[index_entry["mime"]]
+            else:
+                container_id = self._pathToId(filename)
+                if not container_id:
+                    continue
+                mime = self._pathToMime(filename)
+                if not mime:
+                    continue
+                if filename in self._file_stats:
+                    index[filename] = {"stat": self._file_stats[filename], "id": container_id, "mime": mime.name, "metadata": None}
+                    self._metadata_index_changed = True
             self._id_to_path[container_id] = filename
             self._id_to_mime[container_id] = mime
 
+        for filename in list(index.keys()):
+            if filename not in self._file_stats:  # Removed since the index was stored.
+                del index[filename]
+                self._metadata_index_changed = True
+
+    def _getMetadataIndex(self) -> Dict[str, Dict[str, Any]]:
+        """Gets the index of container files and their metadata, reading it from the cache directory if necessary."""
+
+        if self._metadata_index is not None:
+            return self._metadata_index
+        self._metadata_index = {}
+        try:
+            index_path = Resources.getPath(Resources.Cache, "metadata", Application.getInstance().getVersion(), "index")
+        except FileNotFoundError:  # No index stored yet.
+            return self._metadata_index
+
+        try:
+            with ContainerRegistry.getInstance().lockCache():
+                with open(index_path, "rb") as f:
+                    stored = pickle.load(f)
+        except Exception as e:  # Could be any error from the file system or from unpickling classes that no longer exist.
+            Logger.log("w", "Failed to load the metadata index from {path}: {error_msg}".format(path = index_path, error_msg = str(e)))
+            return self._metadata_index
+        if not isinstance(stored, dict) or stored.get("version") != self.MetadataIndexVersion:
+            Logger.log("d", "Ignoring metadata index {path} of a different version.".format(path = index_path))
+            return self._metadata_index
+        self._metadata_index = stored["files"]
+        return self._metadata_index
+
+    def _indexMetadata(self, filename: str, metadata: List[Dict[str, Any]]) -> None:
+        """Stores the metadata of the containers in a file in the index, if the file is in the index."""
+
+        index_entry = self._getMetadataIndex().get(filename)
+        if index_entry is not None and index_entry["stat"] == self._file_stats.get(filename):
+            index_entry["metadata"] = metadata
+            self._metadata_index_changed = True
+
+    def _saveMetadataIndex(self) -> None:
+        """Stores the index of container files and their metadata in the cache directory, if it changed."""
+
+        if not self._metadata_index_changed or self._metadata_index is None:
+            return
+        index_path = Resources.getStoragePath(Resources.Cache, "metadata", Application.getInstance().getVersion(), "index")
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok = True)
+            with ContainerRegistry.getInstance().lockCache():
+                with SaveFile(index_path, "wb", encoding = None) as f:
+                    pickle.dump({"version": self.MetadataIndexVersion, "files": self._metadata_index}, f, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:  # Not being able to store the index only makes the next start slower.
+            Logger.log("w", "Failed to save the metadata index to {path}: {error_msg}".format(path = index_path, error_msg = str(e)))
+            return
+        self._metadata_index_changed = False
+
+    @staticmethod
+    def _getCurrentVersions() -> Optional[FrozenSet[Tuple[str, int]]]:
+        """Gets the configuration types and versions that don't need to be upgraded, if the upgrade manager exists."""
+
+        version_upgrade_manager = VersionUpgradeManager.getInstance()
+        if version_upgrade_manager is None:
+            return None
+        return frozenset(version_upgrade_manager.getCurrentVersions().keys())
+
     @staticmethod
     def _pathToMime(path: str) -> Optional[MimeType]:
         """Converts a file path to the MIME type of the container it represents.
@@ -342,10 +342,12 @@ class RotateTool(Tool):
 
         Selection.applyOperation(SetTransformOperation, None, Quaternion(), None)
 
-    def layFlat(self):
+    def layFlat(self, mode = LayFlatOperation.Mode.LowestVertices):
         """Initialise and start a LayFlatOperation
 
         Note: The LayFlat functionality is mostly used for 3d printing and should probably be moved into the Cura project
+
+        :param mode: How to find the side to lay the objects on. One of the constants in LayFlatOperation.Mode.
         """
 
         self.operationStarted.emit(self)
@@ -358,7 +360,7 @@ class RotateTool(Tool):
             self._layObjectFlat(selected_object)
         self._progress_message.show()
 
-        operations = Selection.applyOperation(LayFlatOperation)
+        operations = Selection.applyOperation(LayFlatOperation, mode = mode)
         for op in operations:
             op.progress.connect(self._layFlatProgress)
 
@@ -366,6 +368,14 @@ class RotateTool(Tool):
         job.finished.connect(self._layFlatFinished)
         job.start()
 
+    def layFlatOnLargestStableFace(self):
+        """Lays the selected objects flat on the largest side of their convex hull that they can stand on.
+
+        This is a separate action, so that it can be triggered from QML, which calls actions without arguments.
+        """
+
+        self.layFlat(LayFlatOperation.Mode.LargestStableFace)
+
     def _layObjectFlat(self, selected_object):
         """Lays the given object flat. The given object can be a group or not."""
 
@@ -46,4 +46,12 @@ def test_getAndSet(data, rotate_tool):
     # Attempt to set the value again
     getattr(rotate_tool, "set" + attribute)(data["value"])
     # The signal should not fire again
-    assert rotate_tool.propertyChanged.emit.call_count == 1
\ No newline at end of file
+    assert rotate_tool.propertyChanged.emit.call_count == 1
+
+
+def test_layFlatOnLargestStableFace(rotate_tool):
+    rotate_tool.layFlat = MagicMock()
+
+    rotate_tool.layFlatOnLargestStableFace()
+
+    rotate_tool.layFlat.assert_called_once_with(RotateTool.LayFlatOperation.Mode.LargestStableFace)
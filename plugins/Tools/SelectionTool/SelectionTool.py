@@ -6,7 +6,7 @@ from PyQt5 import QtCore, QtWidgets
 from UM.Application import Application
 from UM.Event import MouseEvent
 from UM.Logger import Logger
-from UM.Scene.Iterator.BreadthFirstIterator import BreadthFirstIterator
+from UM.Scene.Iterator.LazyDepthFirstIterator import LazyDepthFirstIterator
 from UM.Scene.Selection import Selection
 from UM.Tool import Tool
 
@@ -85,20 +85,14 @@ class SelectionTool(Tool):
         :param event: type(Event) passed from self.event()
         """
 
-        root = self._scene.getRoot()
-
         ray = self._scene.getActiveCamera().getRay(event.x, event.y)
 
         intersections = []
-        for node in BreadthFirstIterator(root):
+        for node, near, far in self._scene.getBoundingVolumeHierarchy().findIntersectingRay(ray):  # Sorted by distance.
             if node.isEnabled() and not node.isLocked():
-                intersection = node.getBoundingBox().intersectsRay(ray)
-                if intersection:
-                    intersections.append((node, intersection[0], intersection[1]))
+                intersections.append((node, near, far))
 
         if intersections:
-            intersections.sort(key=lambda k: k[1])
-
             node = intersections[0][0]
             if not Selection.isSelected(node):
                 if not self._shift_is_active:
@@ -131,7 +125,7 @@ class SelectionTool(Tool):
             return False  # Nothing was selected before and the user didn't click on an object.
 
         # Find the scene-node which matches the node-id
-        for node in BreadthFirstIterator(self._scene.getRoot()):
+        for node in LazyDepthFirstIterator(self._scene.getRoot()):
             if id(node) != item_id:
                 continue
 
@@ -2,7 +2,7 @@
 # Uranium is released under the terms of the LGPLv3 or higher.
 
 from UM.Resources import Resources
-from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.Scene.Iterator.LazyDepthFirstIterator import LazyDepthFirstIterator
 from UM.View.GL.OpenGL import OpenGL
 from UM.View.View import View
 
@@ -22,7 +22,7 @@ class SimpleView(View):
         if not self._shader:
             self._shader = OpenGL.getInstance().createShaderProgram(Resources.getPath(Resources.Shaders, "object.shader"))
 
-        for node in DepthFirstIterator(scene.getRoot()):
+        for node in LazyDepthFirstIterator(scene.getRoot()):
             if not node.render(renderer):
                 if node.getMeshData() and node.isVisible():
                     renderer.queueNode(node, shader = self._shader)
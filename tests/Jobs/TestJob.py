@@ -45,4 +45,13 @@ def test_cancel():
 
 def test_isRunning():
     job = Job()
-    assert not job.isRunning()
\ No newline at end of file
+    assert not job.isRunning()
+
+def test_cancelRunningJob():
+    job = Job()
+    assert not job.isCancelled()
+    with patch("UM.JobQueue.JobQueue.getInstance", MagicMock(return_value = MagicMock())):
+        job.cancel()
+        assert job.isCancelled()  # A running job can see this and stop.
+        job.start()
+    assert not job.isCancelled()
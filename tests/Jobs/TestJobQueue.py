@@ -70,4 +70,112 @@ class TestJobQueue:
             assert job.getResult() == "TestJob"
 
     def test_remove(self):
-        pass
+        JobQueue._JobQueue__instance = None
+        job_queue = JobQueue(1)
+        blocking_job = BlockingTestJob()
+        blocking_job.start()
+        assert blocking_job.started.wait(1)
+
+        job = ShortTestJob()
+        job.start()
+        job.cancel()
+        assert job not in job_queue._jobs
+        assert job.isCancelled()
+
+        blocking_job.release.set()
+        time.sleep(0.1)
+        assert blocking_job.isFinished()
+        assert not job.isFinished()
+
+    def test_priorities(self):
+        JobQueue._JobQueue__instance = None
+        job_queue = JobQueue(1)
+        blocking_job = BlockingTestJob()
+        blocking_job.start()
+        assert blocking_job.started.wait(1)
+
+        order = []
+        jobs = []
+        for name, priority in [("low", JobQueue.Priority.Low), ("normal 1", JobQueue.Priority.Normal), ("high", JobQueue.Priority.High), ("normal 2", JobQueue.Priority.Normal)]:
+            job = RecordingTestJob(name, order)
+            job.setPriority(priority)
+            job.start()
+            jobs.append(job)
+
+        blocking_job.release.set()
+        time.sleep(0.1)
+        assert order == ["high", "normal 1", "normal 2", "low"]
+
+        statistics = job_queue.getStatistics()
+        assert statistics["RecordingTestJob"]["count"] == 4
+        assert statistics["BlockingTestJob"]["count"] == 1
+        assert jobs[0].getQueueWaitTime() >= jobs[2].getQueueWaitTime()  # The low priority job had to wait longest.
+        assert blocking_job.getRunTime() > 0
+
+    def test_workerLimit(self):
+        JobQueue._JobQueue__instance = None
+        job_queue = JobQueue(2)
+        job_queue.setWorkerLimit(BlockingTestJob, 1)
+
+        first_job = BlockingTestJob()
+        second_job = BlockingTestJob()
+        first_job.start()
+        second_job.start()
+        assert first_job.started.wait(1)
+        short_job = ShortTestJob()
+        short_job.start()
+        time.sleep(0.1)
+
+        assert short_job.isFinished()  # The other thread skipped the second blocking job.
+        assert not second_job.started.is_set()
+
+        first_job.release.set()
+        assert second_job.started.wait(1)
+        second_job.release.set()
+        time.sleep(0.1)
+        assert second_job.isFinished()
+
+    def test_workerLimitWhileRunning(self):
+        JobQueue._JobQueue__instance = None
+        job_queue = JobQueue(2)
+        first_job = BlockingTestJob()
+        first_job.start()
+        assert first_job.started.wait(1)
+
+        job_queue.setWorkerLimit(BlockingTestJob, 1)  # The job that is already running counts too.
+        second_job = BlockingTestJob()
+        second_job.start()
+        time.sleep(0.1)
+        assert not second_job.started.is_set()
+
+        first_job.release.set()
+        assert second_job.started.wait(1)
+        third_job = BlockingTestJob()
+        third_job.start()
+        time.sleep(0.1)
+        assert not third_job.started.is_set()  # Finishing the first job didn't count the second one away.
+
+        second_job.release.set()
+        assert third_job.started.wait(1)
+        third_job.release.set()
+
+
+class BlockingTestJob(Job):
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def run(self):
+        self.started.set()
+        self.release.wait(5)
+
+
+class RecordingTestJob(Job):
+    def __init__(self, name, order):
+        super().__init__()
+        self._name = name
+        self._order = order
+
+    def run(self):
+        self._order.append(self._name)
@@ -0,0 +1,110 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+import types
+
+import numpy
+import pytest
+
+from UM.Job import Job
+from UM.ProcessPool import ProcessPool, SHARED_MEMORY_MINIMUM_SIZE
+
+
+def double(array):
+    return array * 2
+
+
+def describe(arrays):
+    return {"sums": [float(array.sum()) for array in arrays["arrays"]], "pid": os.getpid(), "first": arrays["arrays"][0]}
+
+
+def countTo(count):
+    for i in range(count):
+        ProcessPool.reportProgress(i)
+    return count
+
+
+def fail():
+    raise ValueError("Expected failure")
+
+
+class ProcessJob(Job):
+    def run(self):
+        self.setResult(self.runInProcess(countTo, 5))
+
+
+@pytest.fixture
+def process_pool():
+    pool = ProcessPool(process_count = 2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.parametrize("size", [10, SHARED_MEMORY_MINIMUM_SIZE])  # Pickled and in shared memory.
+def test_runArray(process_pool, size):
+    array = numpy.arange(size, dtype = numpy.float32).reshape((-1, 2))
+
+    result = process_pool.run(double, array)
+
+    assert result.dtype == numpy.float32
+    assert result.shape == array.shape
+    assert numpy.array_equal(result, array * 2)
+    result[0, 0] = 10  # The result doesn't depend on shared memory that is gone.
+
+
+def test_runNested(process_pool):
+    arrays = [numpy.ones((SHARED_MEMORY_MINIMUM_SIZE, 3)), numpy.zeros(3)]
+
+    result = process_pool.run(describe, {"arrays": arrays})
+
+    assert result["sums"] == [SHARED_MEMORY_MINIMUM_SIZE * 3, 0]
+    assert result["pid"] != os.getpid()
+    assert numpy.array_equal(result["first"], arrays[0])
+
+
+def test_runException(process_pool):
+    with pytest.raises(ValueError):
+        process_pool.run(fail)
+
+
+def test_runProgress(process_pool):
+    progress = []
+
+    assert process_pool.run(countTo, 3, progress_callback = progress.append) == 3
+    assert progress == [0, 1, 2]
+
+
+def test_runUnpicklable(process_pool):
+    progress = []
+
+    assert process_pool.run(lambda: countTo(2), progress_callback = progress.append) == 2  # Runs in this process instead.
+    assert progress == [0, 1]
+
+
+def test_runUnimportable():
+    # Like the functions of plugins, this function is in a module that the spawned worker processes can't import.
+    module = types.ModuleType("unimportable_module")
+    exec("import os\ndef getPid():\n    return os.getpid()", module.__dict__)
+    sys.modules[module.__name__] = module
+    process_pool = ProcessPool(process_count = 1, start_method = "spawn")
+    try:
+        assert process_pool.run(module.getPid) == os.getpid()  # Runs in this process instead.
+        assert process_pool.run(describe, {"arrays": [numpy.zeros(3)]})["pid"] != os.getpid()  # The pool still works.
+    finally:
+        process_pool.shutdown()
+        del sys.modules[module.__name__]
+
+
+def test_jobRunInProcess(process_pool):
+    job = ProcessJob()
+    progress = []
+    job.progress.emit = lambda emitting_job, amount: progress.append(amount)
+
+    with pytest.MonkeyPatch().context() as patch:
+        patch.setattr(ProcessPool, "getInstance", lambda: process_pool)
+        job.run()
+
+    assert job.getResult() == 5
+    assert progress == [0, 1, 2, 3, 4]
@@ -210,3 +210,44 @@ class TestPolygon:
         assert polygon.isInside((0, 0))
 
         assert not polygon.isInside((9001, 9001))
+
+    ##  The individual test cases for the convexity tests.
+    test_isConvex_data = [
+        ({ "polygon": [[0, 0], [10, 0], [10, 10], [0, 10]], "answer": True, "label": "Square" }),
+        ({ "polygon": [[0, 0], [0, 10], [10, 10], [10, 0]], "answer": True, "label": "Clockwise" }),
+        ({ "polygon": [[0, 0], [5, 0], [10, 0], [10, 10], [10, 10], [0, 10]], "answer": True, "label": "Collinear and duplicate points" }),
+        ({ "polygon": [[0, 0], [10, 0], [5, 2], [10, 10], [0, 10]], "answer": False, "label": "Concave" }),
+        ({ "polygon": [[0, 0], [10, 10], [10, 0], [0, 10]], "answer": False, "label": "Self-intersecting" }),
+        ({ "polygon": [[0, 10], [6, -8], [-9.5, 3], [9.5, 3], [-6, -8]], "answer": False, "label": "Pentagram" }),
+        ({ "polygon": [[0, 0], [5, 0], [10, 0]], "answer": False, "label": "Line" }),
+        ({ "polygon": [[0, 0], [5, 0]], "answer": False, "label": "Invalid" })
+    ]
+
+    @pytest.mark.parametrize("data", test_isConvex_data)
+    def test_isConvex(self, data):
+        assert Polygon(numpy.array(data["polygon"], numpy.float32)).isConvex() == data["answer"]
+
+    ##  Tests the polygons that are ruled out by their bounding boxes.
+    def test_intersectsPolygonBoundingBoxes(self):
+        square = Polygon(numpy.array([[0, 0], [10, 0], [10, 10], [0, 10]], numpy.float32))
+
+        assert square.intersectsPolygon(square.translate(10, 0)) is None  # Only touching.
+        assert square.intersectsPolygon(square.translate(0, -20)) is None
+        assert square.intersectsPolygon(square.translate(20, 20)) is None
+        result = square.intersectsPolygon(square.translate(5, -2))
+        assert Float.fuzzyCompare(result[0], 5)
+        assert Float.fuzzyCompare(result[1], 8)
+
+    def test_getPenetration(self):
+        square = Polygon(numpy.array([[0, 0], [10, 0], [10, 10], [0, 10]], numpy.float32))
+
+        penetration = square.translate(8, 1).getPenetration(square)
+        assert Float.fuzzyCompare(penetration[0], 2)  # Move 2 further to the right.
+        assert Float.fuzzyCompare(penetration[1], 0)
+
+        penetration = square.translate(1, -7).getPenetration(square)
+        assert Float.fuzzyCompare(penetration[0], 0)
+        assert Float.fuzzyCompare(penetration[1], -3)  # Move 3 further down.
+
+        assert square.translate(10, 0).getPenetration(square) is None  # Only touching.
+        assert square.translate(20, 0).getPenetration(square) is None
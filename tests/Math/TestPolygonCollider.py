@@ -0,0 +1,66 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import numpy
+import pytest
+
+from UM.Math.Float import Float
+from UM.Math.Polygon import Polygon
+from UM.Math.PolygonCollider import PolygonCollider
+
+
+def createSquare(x, y, size = 10):
+    return Polygon(numpy.array([[x, y], [x + size, y], [x + size, y + size], [x, y + size]], numpy.float32))
+
+
+def createRandomHulls(count, seed = 1337):
+    random = numpy.random.RandomState(seed)
+    hulls = []
+    for position in random.uniform(0, 200, (count, 2)):
+        hulls.append(Polygon.approximatedCircle(random.uniform(1, 10)).translate(position[0], position[1]))
+    return hulls
+
+
+def test_findCollisions():
+    collider = PolygonCollider([createSquare(0, 0), createSquare(5, 5), createSquare(10, 0), createSquare(50, 50), Polygon()])
+
+    collisions = collider.findCollisions()
+
+    # The third square only touches the first one, so they don't collide.
+    assert [(a, b) for a, b, _ in collisions] == [(0, 1), (1, 2)]
+    assert Float.fuzzyCompare(collisions[0][2][0], 5)
+    assert Float.fuzzyCompare(collisions[0][2][1], 5)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_findCollisionsLikeIntersectsPolygon(seed):
+    hulls = createRandomHulls(50, seed)
+    collider = PolygonCollider(hulls)
+
+    expected = []
+    for a in range(len(hulls)):
+        for b in range(a + 1, len(hulls)):
+            extents = hulls[a].intersectsPolygon(hulls[b])
+            if extents is not None:
+                expected.append((a, b, extents))
+    collisions = collider.findCollisions()
+
+    assert [(a, b) for a, b, _ in collisions] == [(a, b) for a, b, _ in expected]
+    for (_, _, extents), (_, _, expected_extents) in zip(collisions, expected):
+        assert Float.fuzzyCompare(extents[0], expected_extents[0])
+        assert Float.fuzzyCompare(extents[1], expected_extents[1])
+
+
+def test_setPolygon():
+    collider = PolygonCollider([createSquare(0, 0), createSquare(50, 50)])
+    assert collider.findCollisions() == []
+
+    collider.setPolygon(1, createSquare(5, 0))
+    assert [(a, b) for a, b, _ in collider.findCollisions()] == [(0, 1)]
+
+
+def test_findCollisionsWith():
+    collider = PolygonCollider([createSquare(0, 0), createSquare(50, 50), createSquare(8, 8)])
+
+    assert [index for index, _ in collider.findCollisionsWith(createSquare(5, 5))] == [0, 2]
+    assert collider.findCollisionsWith(Polygon()) == []
@@ -0,0 +1,72 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import warnings
+
+import numpy
+
+from UM.Math import SeparatingAxis
+from UM.Math import ShapelyUtil
+from UM.Math.Polygon import Polygon
+
+
+def createRandomHulls(count, seed):
+    random = numpy.random.RandomState(seed)
+    hulls = []
+    for position in random.uniform(0, 50, (count, 2)):
+        points = random.uniform(-10, 10, (random.randint(3, 12), 2))
+        hulls.append(Polygon(points).getConvexHull().translate(position[0], position[1]))
+    return hulls
+
+
+def test_stackPolygons():
+    stacked = SeparatingAxis.stackPolygons([numpy.array([[0, 0], [0, 1], [1, 0]]), numpy.array([[0, 0], [1, 0], [1, 1], [0, 1]])])
+
+    assert stacked.shape == (2, 4, 2)
+    assert numpy.array_equal(stacked[0], [[1, 0], [0, 1], [0, 0], [0, 0]])  # Made counter-clockwise and padded.
+
+
+def test_intersectionExtentsLikeShapely():
+    hulls_a = createRandomHulls(100, 1)
+    hulls_b = createRandomHulls(100, 2)
+
+    extents = SeparatingAxis.intersectionExtents(SeparatingAxis.stackPolygons([hull.getPoints() for hull in hulls_a]),
+                                                 SeparatingAxis.stackPolygons([hull.getPoints() for hull in hulls_b]))
+
+    for index, (hull_a, hull_b) in enumerate(zip(hulls_a, hulls_b)):
+        intersection = ShapelyUtil.polygon2ShapelyPolygon(hull_a).intersection(ShapelyUtil.polygon2ShapelyPolygon(hull_b))
+        if intersection.area == 0:
+            assert numpy.isnan(extents[index][0])
+        else:
+            bounds = intersection.bounds
+            assert numpy.allclose(extents[index], [bounds[2] - bounds[0], bounds[3] - bounds[1]], atol = 1e-4)
+
+
+def test_penetrations():
+    square = numpy.array([[0, 0], [10, 0], [10, 10], [0, 10]])
+    polygons_a = SeparatingAxis.stackPolygons([square + [8, 1], square + [1, -7], square + [30, 0]])
+    polygons_b = SeparatingAxis.stackPolygons([square, square, square])
+
+    result = SeparatingAxis.penetrations(polygons_a, polygons_b)
+
+    assert numpy.allclose(result[0], [2, 0])
+    assert numpy.allclose(result[1], [0, -3])
+    assert numpy.all(numpy.isnan(result[2]))
+
+    moved = polygons_a + result[:, numpy.newaxis, :]
+    assert numpy.all(numpy.isnan(SeparatingAxis.intersectionExtents(moved[:2], polygons_b[:2])))  # No longer overlapping.
+
+
+def test_parallelEdgesDontWarn():
+    square = Polygon(numpy.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype = numpy.float32))
+    moved = square.translate(0.5, 0)  # The edges are parallel to those of the square.
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with numpy.errstate(all = "warn"):  # Some modules ignore floating point errors for the whole process.
+            assert square.intersectsPolygon(moved) is not None
+            extents = SeparatingAxis.intersectionExtents(SeparatingAxis.stackPolygons([square.getPoints()]), SeparatingAxis.stackPolygons([moved.getPoints()]))
+            penetration = SeparatingAxis.penetrations(SeparatingAxis.stackPolygons([square.getPoints()]), SeparatingAxis.stackPolygons([moved.getPoints()]))
+
+    assert numpy.allclose(extents, [[1.5, 2]])
+    assert numpy.allclose(penetration, [[-1.5, 0]])
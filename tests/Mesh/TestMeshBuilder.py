@@ -195,3 +195,23 @@ def test_getSetFilename():
     builder.setFileName("HERPDERP")
 
     assert builder.getFileName() == "HERPDERP"
+
+
+def test_calculateNormalsSmoothAndFlat():
+    builder = MeshBuilder()
+    builder.setVertices(numpy.array([[0, 0, 0], [10, 0, 0], [0, 10, 0], [0, 0, 10]], dtype = numpy.float32))
+    builder.setIndices(numpy.array([[0, 1, 2], [0, 3, 1]], dtype = numpy.int32))
+    builder.setColors(numpy.array([[1, 0, 0, 1], [0, 1, 0, 1], [0, 0, 1, 1], [1, 1, 1, 1]], dtype = numpy.float32))
+
+    builder.calculateNormals()
+    smooth = builder.getNormals()
+    assert len(smooth) == 4  # A normal for each vertex, blending the faces that share vertices 0 and 1.
+    assert numpy.allclose(smooth[0], [0, 0.70710677, 0.70710677])
+    assert numpy.allclose(smooth[2], [0, 0, 1])
+
+    builder.calculateNormals(flat = True)
+    assert not builder.hasIndices()
+    assert builder.getVertexCount() == 6
+    assert numpy.array_equal(builder.getNormals(), numpy.array([[0, 0, 1]] * 3 + [[0, 1, 0]] * 3, dtype = numpy.float32))
+    assert numpy.array_equal(builder.getColors()[3], [1, 0, 0, 1])
+    assert numpy.array_equal(builder.getVertices()[4], [0, 0, 10])
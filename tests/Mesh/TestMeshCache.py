@@ -0,0 +1,211 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+import time
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshCache import MeshCache, MINIMUM_FACE_COUNT
+from UM.Mesh.MeshData import MeshData
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MeshCache(str(tmp_path / "meshes"))
+
+
+@pytest.fixture
+def global_cache(cache):
+    original = MeshCache.getInstance()
+    MeshCache.setInstance(cache)
+    yield cache
+    MeshCache.setInstance(original)
+
+
+def test_putAndGet(cache):
+    assert cache.get("abc", "hull") is None
+    assert not os.path.exists(cache.getPath())  # Nothing is written until something is stored.
+
+    cache.put("abc", "hull", {"vertices": numpy.arange(12, dtype = numpy.float32).reshape((4, 3)), "extents": numpy.zeros((2, 3))})
+
+    entry = cache.get("abc", "hull")
+    assert numpy.array_equal(entry["vertices"], numpy.arange(12, dtype = numpy.float32).reshape((4, 3)))
+    assert entry["vertices"].dtype == numpy.float32
+    assert entry["extents"].shape == (2, 3)
+    assert cache.get("abc", "normals") is None  # Different kind.
+    assert cache.get("abd", "hull") is None  # Different key.
+
+    statistics = cache.getStatistics()
+    assert statistics["hits"] == 1
+    assert statistics["misses"] == 3
+    assert statistics["stores"] == 1
+    assert statistics["entries"] == 1
+    assert statistics["size"] > 0
+
+
+def test_leastRecentlyUsedEviction(tmp_path):
+    data = {"values": numpy.zeros(1000, dtype = numpy.float64)}
+    cache = MeshCache(str(tmp_path), maximum_size = 1)
+    cache.put("measure", "hull", data)
+    entry_size = cache.getStatistics()["size"]
+    cache.invalidate()
+
+    cache = MeshCache(str(tmp_path), maximum_size = entry_size * 3)
+    cache.put("a", "hull", data)
+    cache.put("b", "hull", data)
+    cache.put("c", "hull", data)
+    assert cache.get("a", "hull") is not None  # Now b is the least recently used.
+    cache.put("d", "hull", data)
+
+    assert cache.get("b", "hull") is None
+    assert cache.get("a", "hull") is not None
+    assert cache.get("c", "hull") is not None
+    assert cache.get("d", "hull") is not None
+    statistics = cache.getStatistics()
+    assert statistics["evictions"] == 1
+    assert statistics["entries"] == 3
+    assert statistics["size"] == entry_size * 3
+
+
+def test_persistent(tmp_path):
+    data = {"values": numpy.zeros(1000, dtype = numpy.float64)}
+    cache = MeshCache(str(tmp_path))
+    cache.put("old", "hull", data)
+    cache.put("new", "hull", data)
+    entry_size = cache.getStatistics()["size"] // 2
+    # Make sure that the entry of "old" is the least recently used one, regardless of the resolution of the file times.
+    past = time.time() - 100
+    os.utime(os.path.join(str(tmp_path), "old.hull.npz"), (past, past))
+
+    cache = MeshCache(str(tmp_path), maximum_size = entry_size * 2)
+    assert cache.getStatistics()["entries"] == 2
+    cache.put("newest", "hull", data)
+
+    assert cache.get("old", "hull") is None
+    assert cache.get("new", "hull") is not None
+
+
+def test_invalidate(cache):
+    cache.put("a", "hull", {"values": numpy.zeros(3)})
+    cache.put("a", "normals", {"values": numpy.zeros(3)})
+    cache.put("b", "hull", {"values": numpy.zeros(3)})
+
+    cache.invalidate("a")
+    assert cache.get("a", "hull") is None
+    assert cache.get("a", "normals") is None
+    assert cache.get("b", "hull") is not None
+
+    cache.invalidate()
+    assert cache.get("b", "hull") is None
+    assert cache.getStatistics()["size"] == 0
+    assert os.listdir(cache.getPath()) == []
+
+
+def test_corruptEntry(cache):
+    cache.put("a", "hull", {"values": numpy.zeros(3)})
+    with open(os.path.join(cache.getPath(), "a.hull.npz"), "wb") as f:
+        f.write(b"Not a zip file.")
+
+    assert cache.get("a", "hull") is None
+    assert not os.path.exists(os.path.join(cache.getPath(), "a.hull.npz"))
+
+
+def test_hashArrays():
+    vertices = numpy.arange(9, dtype = numpy.float32).reshape((3, 3))
+
+    assert MeshCache.hashArrays(vertices) == MeshCache.hashArrays(vertices.copy())
+    assert MeshCache.hashArrays(vertices) != MeshCache.hashArrays(vertices.reshape((9, 1)))
+    assert MeshCache.hashArrays(vertices) != MeshCache.hashArrays(vertices.astype(numpy.float64))
+    assert MeshCache.hashArrays(vertices, None) != MeshCache.hashArrays(vertices, numpy.zeros((0, 3)))
+
+
+def test_meshDataConvexHull(global_cache):
+    builder = createLoadedMeshBuilder()
+    mesh_data = builder.build()
+    extents = mesh_data.getExtents()
+    hull_vertices = mesh_data.getConvexHullVertices()
+    assert global_cache.getStatistics()["stores"] == 1
+
+    # Loading the same mesh again doesn't compute the convex hull again.
+    reloaded = MeshData(vertices = builder.getVertices(), indices = builder.getIndices(), file_name = "loaded.obj")
+    with patch("UM.Mesh.MeshData.approximateConvexHull") as approximate:
+        assert reloaded.getExtents().minimum == extents.minimum
+        assert reloaded.getExtents().maximum == extents.maximum
+        assert numpy.array_equal(reloaded.getConvexHullVertices(), hull_vertices)
+        assert numpy.array_equal(reloaded.getConvexHull().points[reloaded.getConvexHull().vertices], hull_vertices)
+        approximate.assert_not_called()
+    assert global_cache.getStatistics()["hits"] == 1
+
+    # After invalidating, it is computed again.
+    global_cache.invalidate(mesh_data.getHash())
+    assert MeshData(vertices = builder.getVertices(), indices = builder.getIndices(), file_name = "loaded.obj").getExtents().maximum == extents.maximum
+    assert global_cache.getStatistics()["stores"] == 2
+
+
+def createLoadedMeshBuilder():
+    """Create a mesh builder like a reader would, for a mesh that is large enough to cache its data."""
+
+    random = numpy.random.RandomState(1337)
+    builder = MeshBuilder()
+    builder.setVertices(random.uniform(-100, 100, (MINIMUM_FACE_COUNT, 3)).astype(numpy.float32))
+    builder.setIndices(random.randint(0, MINIMUM_FACE_COUNT, (MINIMUM_FACE_COUNT, 3)).astype(numpy.int32))
+    builder.setFileName("loaded.obj")
+    return builder
+
+
+def test_meshBuilderNormals(global_cache):
+    builder = createLoadedMeshBuilder()
+    builder.calculateNormals()
+    normals = builder.getNormals()
+
+    with patch("UM.Mesh.MeshBuilder.calculateNormalsFromIndexedVertices") as calculate:
+        builder.calculateNormals()
+        calculate.assert_not_called()
+    assert numpy.array_equal(builder.getNormals(), normals)
+    assert global_cache.getStatistics()["hits"] == 1
+
+    # The hash that was computed for the normals is reused for the mesh data.
+    expected_hash = MeshData(vertices = builder.getVertices()).getHash()
+    with patch("UM.Mesh.MeshData.hashVertices") as hash_vertices:
+        assert builder.build().getHash() == expected_hash
+        hash_vertices.assert_not_called()
+
+    # Connecting the vertices differently gives different normals.
+    builder.setIndices(builder.getIndices()[:, [1, 0, 2]])
+    builder.calculateNormals()
+    assert not numpy.array_equal(builder.getNormals(), normals)
+    assert global_cache.getStatistics()["stores"] == 2
+
+
+def test_notCached(global_cache):
+    builder = MeshBuilder()
+    builder.addCube(10, 20, 30)  # Generated and small.
+    builder.calculateNormals()
+    builder.build().getExtents()
+
+    builder = MeshBuilder()
+    builder.addCube(10, 20, 30)
+    builder.setFileName("small.obj")  # Small.
+    builder.build().getExtents()
+
+    builder = createLoadedMeshBuilder()
+    builder.setFileName(None)  # Not from a file.
+    builder.calculateNormals()
+    builder.build().getExtents()
+
+    statistics = global_cache.getStatistics()
+    assert statistics["misses"] == 0
+    assert statistics["stores"] == 0
+
+
+def test_getHashMemoized():
+    mesh_data = MeshData(vertices = numpy.arange(9, dtype = numpy.float32).reshape((3, 3)))
+
+    with patch("hashlib.sha256", wraps = __import__("hashlib").sha256) as sha256:
+        first = mesh_data.getHash()
+        assert mesh_data.getHash() == first
+        assert sha256.call_count == 1
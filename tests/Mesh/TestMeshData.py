@@ -1,9 +1,13 @@
+import os
+
 import numpy
+import pytest
 
 from UM.Math.AxisAlignedBox import AxisAlignedBox
+from UM.Math.Ray import Ray
 from UM.Math.Vector import Vector
 from UM.Mesh.MeshBuilder import MeshBuilder
-from UM.Mesh.MeshData import MeshData, MeshType
+from UM.Mesh.MeshData import MeshData, MeshType, calculateNormalsFromIndexedVertices, calculateNormalsFromVertices
 from UM.Math.Matrix import Matrix
 
 
@@ -54,6 +58,25 @@ def test_getExtentsTransposed():
     assert extents.minimum == Vector(0, 0, 0)
 
 
+def test_getExtentsScaledAndRotated():
+    builder = MeshBuilder()
+    builder.addCube(20, 10, 30, Vector(5, 0, 0))
+    mesh_data = builder.build()
+
+    scaled = Matrix()
+    scaled.setByScaleVector(Vector(-2, 1, 3))
+    scaled.translate(Vector(1, 2, 3))
+    rotated = Matrix()
+    rotated.setByRotationAxis(0.5, Vector.Unit_Y)
+    rotated.translate(Vector(1, 2, 3))
+
+    for transformation in (scaled, rotated):  # Scaling doesn't transform the hull, rotating does.
+        vertices = mesh_data.getConvexHullTransformedVertices(transformation)
+        extents = mesh_data.getExtentsData(transformation)
+        assert extents[0] == pytest.approx(vertices.min(axis = 0), abs = 1e-4)
+        assert extents[1] == pytest.approx(vertices.max(axis = 0), abs = 1e-4)
+
+
 def test_attributes():
     attributes = { "test": {
                 "value": [10],
@@ -100,4 +123,159 @@ def test_getPositionAndType():
     mesh_data = MeshData(zero_position=Vector(0, 12, 13), center_position=Vector(10, 20, 30), type = MeshType.pointcloud)
     assert mesh_data.getZeroPosition() == Vector(0, 12, 13)
     assert mesh_data.getCenterPosition() == Vector(10, 20, 30)
-    assert mesh_data.getType() == MeshType.pointcloud
\ No newline at end of file
+    assert mesh_data.getType() == MeshType.pointcloud
+
+def oldCalculateNormalsFromIndexedVertices(vertices, indices, face_count):
+    # The loop that calculateNormalsFromIndexedVertices used, which gives every vertex the normal of its last face.
+    normals = numpy.zeros((len(vertices), 3), dtype = numpy.float32)
+    for face in indices[0:face_count]:
+        normals[face[0]] = numpy.cross(vertices[face[0]] - vertices[face[1]], vertices[face[0]] - vertices[face[2]])
+        normals[face[0]] /= numpy.linalg.norm(normals[face[0]])
+        normals[face[1]] = normals[face[0]]
+        normals[face[2]] = normals[face[0]]
+    return normals
+
+
+def areaWeightedNormals(vertices, indices):
+    normals = numpy.zeros((len(vertices), 3), dtype = numpy.float64)
+    for face in indices:
+        face_normal = numpy.cross(vertices[face[1]] - vertices[face[0]], vertices[face[2]] - vertices[face[0]])
+        for index in face:
+            normals[index] += face_normal
+    return normals / numpy.linalg.norm(normals, axis = 1)[:, numpy.newaxis]
+
+
+def test_calculateNormalsFromIndexedVerticesUnsharedVertices():
+    builder = MeshBuilder()
+    builder.addCube(20, 10, 30)
+    builder.addPyramid(10, 20, 10, center = Vector(50, 0, 0))
+    # Give each face its own vertices.
+    vertices = builder.getVertices()[builder.getIndices().reshape(-1)]
+    indices = numpy.arange(len(vertices), dtype = numpy.int32).reshape((-1, 3))
+
+    normals = calculateNormalsFromIndexedVertices(vertices, indices, len(indices))
+
+    # Without shared vertices, every vertex keeps the normal of its only face, like it used to.
+    assert normals.shape == vertices.shape
+    assert normals.dtype == numpy.float32
+    assert numpy.allclose(normals, oldCalculateNormalsFromIndexedVertices(vertices, indices, len(indices)), atol = 1e-6)
+
+
+def test_calculateNormalsFromIndexedVerticesSharedVertices():
+    # A tetrahedron with one large face, so that the area weighing matters.
+    vertices = numpy.array([[0, 0, 0], [10, 0, 0], [0, 10, 0], [0, 0, 1]], dtype = numpy.float32)
+    indices = numpy.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]], dtype = numpy.int32)
+
+    normals = calculateNormalsFromIndexedVertices(vertices, indices, len(indices))
+
+    assert normals.shape == (4, 3)  # One normal per vertex, not per corner.
+    assert numpy.allclose(normals, areaWeightedNormals(vertices, indices), atol = 1e-6)
+    assert numpy.allclose(normals[3], [0, 0, 1])  # The small side faces cancel out the tilt of the large face.
+
+
+def test_calculateNormalsFromIndexedVerticesSphere():
+    sphere_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins", "FileHandlers", "OBJReader", "tests", "sphere.obj")
+    vertices = []
+    indices = []
+    with open(sphere_path) as f:
+        for line in f:
+            parts = line.split()
+            if parts and parts[0] == "v":
+                vertices.append([float(value) for value in parts[1:4]])
+            elif parts and parts[0] == "f":
+                indices.append([int(corner.split("/")[0]) - 1 for corner in parts[1:4]])
+    vertices = numpy.array(vertices, dtype = numpy.float32)
+    indices = numpy.array(indices, dtype = numpy.int32)
+
+    normals = calculateNormalsFromIndexedVertices(vertices, indices, len(indices))
+
+    assert numpy.allclose(normals, areaWeightedNormals(vertices, indices), atol = 1e-5)
+    # The normals of a sphere point away from its center.
+    directions = vertices - vertices.mean(axis = 0)
+    directions /= numpy.linalg.norm(directions, axis = 1)[:, numpy.newaxis]
+    assert numpy.all(numpy.sum(normals * directions, axis = 1) > 0.99)
+
+
+def test_calculateNormalsFromIndexedVerticesFlat():
+    vertices = numpy.array([[0, 0, 0], [10, 0, 0], [0, 10, 0], [0, 0, 10]], dtype = numpy.float32)
+    indices = numpy.array([[0, 1, 2], [0, 3, 1], [4, 4, 4]], dtype = numpy.int32)
+
+    # Only the faces up to the face count are used.
+    normals = calculateNormalsFromIndexedVertices(vertices, indices, 2, flat = True)
+
+    assert numpy.array_equal(normals, numpy.array([[0, 0, 1]] * 3 + [[0, 1, 0]] * 3, dtype = numpy.float32))
+    assert numpy.array_equal(normals, calculateNormalsFromVertices(vertices[indices[0:2].reshape(-1)], 6))
+
+
+def test_calculateNormalsFromIndexedVerticesDegenerate():
+    vertices = numpy.array([[0, 0, 0], [1, 0, 0], [2, 0, 0], [5, 5, 5]], dtype = numpy.float32)
+    indices = numpy.array([[0, 1, 2]], dtype = numpy.int32)
+
+    normals = calculateNormalsFromIndexedVertices(vertices, indices, 1)
+
+    # Neither the 0-area face nor the unused vertex get a valid normal, but they don't produce NaN either.
+    assert numpy.array_equal(normals, numpy.zeros((4, 3), dtype = numpy.float32))
+
+
+def test_invertNormalsIndexed():
+    builder = MeshBuilder()
+    builder.addCube(10, 10, 10)
+    builder.calculateNormals()
+    mesh_data = builder.build()
+    indices = mesh_data.getIndices()
+
+    mesh_data.invertNormals()
+
+    assert numpy.array_equal(mesh_data.getIndices(), indices[:, [1, 0, 2]])
+    assert numpy.allclose(mesh_data.getNormals(), -builder.getNormals())
+    assert not mesh_data.getIndices().flags.writeable
+
+
+def test_invertNormalsUnindexed():
+    vertices = numpy.arange(27, dtype = numpy.float32).reshape((9, 3))
+    colors = numpy.arange(36, dtype = numpy.float32).reshape((9, 4))
+    mesh_data = MeshData(vertices = vertices, colors = colors)
+    mesh_data.getHash()
+
+    mesh_data.invertNormals()
+
+    order = [1, 0, 2, 4, 3, 5, 7, 6, 8]
+    assert numpy.array_equal(mesh_data.getVertices(), vertices[order])
+    assert mesh_data.getHash() == MeshData(vertices = vertices[order]).getHash()  # The vertices changed.
+    assert numpy.array_equal(mesh_data.getColors(), colors[order])  # Colors stay with their vertex.
+    assert mesh_data.getNormals() is None
+
+
+def test_intersectRay():
+    builder = MeshBuilder()
+    builder.addCube(20, 20, 20)
+    mesh_data = builder.build()
+
+    distance, face_id, barycentric = mesh_data.intersectRay(Ray(Vector(1, 100, 2), Vector(0, -1, 0)))
+    assert distance == pytest.approx(90)
+    assert sum(barycentric) == pytest.approx(1)
+    corners = numpy.array(mesh_data.getFaceNodes(face_id))
+    assert numpy.allclose(barycentric.dot(corners), [1, 10, 2], atol = 1e-5)
+
+    assert mesh_data.intersectRay(Ray(Vector(0, 100, 0), Vector(0, 1, 0))) is None  # Pointing away.
+    assert mesh_data.intersectRay(Ray(Vector(50, 100, 0), Vector(0, -1, 0))) is None  # Passing by.
+
+    transformation = Matrix()
+    transformation.setByTranslation(Vector(100, 0, 0))
+    assert mesh_data.intersectRay(Ray(Vector(1, 100, 2), Vector(0, -1, 0)), transformation) is None
+    distance, _, _ = mesh_data.intersectRay(Ray(Vector(101, 100, 2), Vector(0, -2, 0)), transformation)
+    assert distance == pytest.approx(45)  # In units of the direction of the ray.
+
+
+def test_intersectRays():
+    builder = MeshBuilder()
+    builder.addCube(20, 20, 20)
+    mesh_data = builder.build()
+
+    origins = numpy.array([[x, 100, 0] for x in range(-15, 16)], dtype = numpy.float64)
+    hits = mesh_data.intersectRays(origins, numpy.tile([0, -1, 0], (len(origins), 1)))
+    inside = numpy.abs(origins[:, 0]) < 10
+    assert numpy.allclose(hits.distances[inside], 90)
+    assert numpy.all(hits.face_ids[inside] >= 0)
+    assert numpy.all(numpy.isinf(hits.distances[numpy.abs(origins[:, 0]) > 10]))
+    assert numpy.all(hits.face_ids[numpy.abs(origins[:, 0]) > 10] == -1)
@@ -0,0 +1,59 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import numpy
+import pytest
+
+from UM.Mesh.TriangleHierarchy import TriangleHierarchy
+
+
+def bruteForceIntersect(corners, origin, direction):
+    """Intersects a ray with every triangle, one by one."""
+
+    nearest = (numpy.inf, -1)
+    for face_id, (a, b, c) in enumerate(corners):
+        normal = numpy.cross(b - a, c - a)
+        denominator = normal.dot(direction)
+        if abs(denominator) < 1e-12:
+            continue
+        distance = normal.dot(a - origin) / denominator
+        if distance < 0 or distance >= nearest[0]:
+            continue
+        point = origin + distance * direction
+        # The point is inside if it's on the same side of every edge as the normal.
+        if all(numpy.cross(end - start, point - start).dot(normal) >= 0 for start, end in ((a, b), (b, c), (c, a))):
+            nearest = (distance, face_id)
+    return nearest
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_intersectRaysLikeBruteForce(indexed):
+    random = numpy.random.RandomState(1337)
+    corners = random.uniform(-50, 50, (300, 1, 3)) + random.uniform(-5, 5, (300, 3, 3))  # Small triangles in a large volume.
+    if indexed:
+        hierarchy = TriangleHierarchy(corners.reshape((-1, 3)), numpy.arange(900).reshape((-1, 3)))
+    else:
+        hierarchy = TriangleHierarchy(corners.reshape((-1, 3)))
+    assert hierarchy.getFaceCount() == 300
+    assert hierarchy.getNodeCount() > 1
+
+    origins = random.uniform(-60, 60, (200, 3))
+    directions = random.uniform(-1, 1, (200, 3))
+    directions[:20] = [0, -1, 0]  # Some rays along an axis.
+    hits = hierarchy.intersectRays(origins, directions)
+
+    for origin, direction, distance, face_id, barycentric in zip(origins, directions, *hits):
+        expected_distance, expected_face_id = bruteForceIntersect(corners, origin, direction)
+        assert face_id == expected_face_id
+        if face_id >= 0:
+            assert distance == pytest.approx(expected_distance)
+            assert barycentric.dot(corners[face_id]) == pytest.approx(origin + distance * direction)
+        else:
+            assert numpy.isinf(distance)
+
+
+def test_intersectRaysEmpty():
+    hierarchy = TriangleHierarchy(numpy.zeros((0, 3)))
+    hits = hierarchy.intersectRays(numpy.zeros((2, 3)), numpy.ones((2, 3)))
+    assert list(hits.face_ids) == [-1, -1]
+    assert numpy.all(numpy.isinf(hits.distances))
@@ -0,0 +1,56 @@
+import math
+
+import numpy
+import pytest
+
+from UM.Math.Quaternion import Quaternion
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Operations.LayFlatOperation import LayFlatOperation
+from UM.Scene.SceneNode import SceneNode
+
+
+def createTiltedBlockNode():
+    builder = MeshBuilder()
+    builder.addCube(40, 20, 30)
+    node = SceneNode()
+    node.setMeshData(builder.build())
+    node.rotate(Quaternion.fromAngleAxis(math.radians(20), Vector.Unit_Z))
+    node.rotate(Quaternion.fromAngleAxis(math.radians(10), Vector.Unit_X))
+    return node
+
+
+def lowestVertices(node, count):
+    heights = numpy.sort(node.getMeshDataTransformedVertices()[:, 1])
+    return heights[:count]
+
+
+@pytest.mark.parametrize("mode", [LayFlatOperation.Mode.LowestVertices, LayFlatOperation.Mode.LargestStableFace])
+def test_layFlat(mode):
+    node = createTiltedBlockNode()
+    operation = LayFlatOperation(node, mode = mode)
+    operation.process()
+    assert lowestVertices(node, 4) == pytest.approx([lowestVertices(node, 1)[0]] * 4, abs = 1e-3)  # A whole side is flat.
+
+    operation.undo()
+    assert lowestVertices(node, 4)[3] - lowestVertices(node, 4)[0] > 1  # Tilted again.
+
+
+def test_largestStableFaceBlock():
+    vertices = numpy.array([[x, y, z] for x in (0, 40) for y in (0, 20) for z in (0, 30)], dtype = numpy.float64)
+    normal = LayFlatOperation.findLargestStableFace(vertices)
+    assert numpy.abs(normal) == pytest.approx([0, 1, 0])  # The 40 by 30 sides.
+
+
+def test_largestStableFaceSkipsUnstableSide():
+    # A prism of which the longest side of the cross section, from (4, 19) to (8, 8), can't be stood on: the centre of
+    # mass lies beyond the end of it at (8, 8). The next largest side, from (8, 8) to (13, 0), is stable.
+    cross_section = [(13, 0), (17, 7), (11, 13), (4, 19), (8, 8)]
+    vertices = numpy.array([[x, y, z] for x, y in cross_section for z in (0, 50)], dtype = numpy.float64)
+    normal = LayFlatOperation.findLargestStableFace(vertices)
+    assert normal == pytest.approx(numpy.array([-8, -5, 0]) / math.sqrt(8 * 8 + 5 * 5))
+
+
+def test_largestStableFaceFlat():
+    vertices = numpy.array([[x, 0, z] for x in (0, 10) for z in (0, 10)], dtype = numpy.float64)
+    assert LayFlatOperation.findLargestStableFace(vertices) is None  # No volume to stand on.
@@ -0,0 +1,114 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from UM.Math.AxisAlignedBox import AxisAlignedBox
+from UM.Math.Ray import Ray
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Scene.BoundingVolumeHierarchy import BoundingVolumeHierarchy
+from UM.Scene.Scene import Scene
+from UM.Scene.SceneNode import SceneNode
+
+
+def createCubeNode(x, z, parent = None):
+    builder = MeshBuilder()
+    builder.addCube(10, 10, 10)
+    node = SceneNode(parent = parent)
+    node.setMeshData(builder.build())
+    node.setPosition(Vector(x, 5, z))
+    return node
+
+
+@pytest.fixture
+def scene(application):  # The application is needed to deliver the signals.
+    return Scene()
+
+
+def bruteForceRay(root, ray):
+    result = []
+    for node in root.getAllChildren():
+        intersection = node.getBoundingBox().intersectsRay(ray)
+        if intersection:
+            result.append(node)
+    return result
+
+
+def test_findIntersectingRay(scene):
+    nodes = [createCubeNode(x * 20, z * 20, parent = scene.getRoot()) for x in range(10) for z in range(10)]
+    hierarchy = scene.getBoundingVolumeHierarchy()
+
+    ray = Ray(Vector(40, 100, 60), Vector(0, -1, 0))  # Straight down onto the cube at (40, 60).
+    hits = hierarchy.findIntersectingRay(ray)
+    assert [hit[0] for hit in hits] == [nodes[2 * 10 + 3]]
+    assert hits[0][1] == pytest.approx(90)
+
+    ray = Ray(Vector(-100, 5, 41), Vector(1, 0, 0.001))  # Along a row of cubes.
+    assert {hit[0] for hit in hierarchy.findIntersectingRay(ray)} == set(bruteForceRay(scene.getRoot(), ray))
+    distances = [hit[1] for hit in hierarchy.findIntersectingRay(ray)]
+    assert distances == sorted(distances)
+
+
+def test_findIntersectingBox(scene):
+    nodes = [createCubeNode(x * 20, 0, parent = scene.getRoot()) for x in range(10)]
+    hierarchy = scene.getBoundingVolumeHierarchy()
+
+    found = hierarchy.findIntersectingBox(AxisAlignedBox(Vector(15, 0, -1), Vector(45, 1, 1)))
+    assert set(found) == {nodes[1], nodes[2]}
+    assert hierarchy.findIntersectingBox(AxisAlignedBox(Vector(500, 0, 0), Vector(600, 1, 1))) == []
+
+
+def test_refitMovedNode(scene):
+    nodes = [createCubeNode(x * 20, 0, parent = scene.getRoot()) for x in range(10)]
+    hierarchy = scene.getBoundingVolumeHierarchy()
+    hierarchy._build = MagicMock()  # Moving a node must not rebuild the tree.
+
+    nodes[0].setPosition(Vector(500, 5, 500))
+
+    ray = Ray(Vector(500, 100, 500), Vector(0, -1, 0))
+    assert [hit[0] for hit in hierarchy.findIntersectingRay(ray)] == [nodes[0]]
+    ray = Ray(Vector(0, 100, 0), Vector(0, -1, 0))
+    assert hierarchy.findIntersectingRay(ray) == []
+    assert hierarchy._build.call_count == 0
+
+
+def test_addAndRemoveNodes(scene):
+    node = createCubeNode(0, 0, parent = scene.getRoot())
+    child = createCubeNode(100, 0, parent = node)
+    hierarchy = scene.getBoundingVolumeHierarchy()
+    ray = Ray(Vector(100, 100, 0), Vector(0, -1, 0))
+
+    assert {hit[0] for hit in hierarchy.findIntersectingRay(ray)} == {node, child}  # The box of the parent includes the child.
+    assert scene.findObject(id(child)) is child
+
+    node.removeChild(child)
+    assert [hit[0] for hit in hierarchy.findIntersectingRay(ray)] == []
+    assert hierarchy.findNode(id(child)) is None
+
+    scene.getRoot().removeChild(node)
+    assert hierarchy.findIntersectingBox(AxisAlignedBox(Vector(-100, -100, -100), Vector(100, 100, 100))) == []
+    assert hierarchy.findNode(id(node)) is None
+
+
+def test_setRoot(scene):
+    old_node = createCubeNode(0, 0, parent = scene.getRoot())
+    new_root = SceneNode()
+    new_root.setCalculateBoundingBox(False)
+    new_node = createCubeNode(0, 0, parent = new_root)
+
+    scene.setRoot(new_root)
+    ray = Ray(Vector(0, 100, 0), Vector(0, -1, 0))
+    assert [hit[0] for hit in scene.getBoundingVolumeHierarchy().findIntersectingRay(ray)] == [new_node]
+    assert scene.findObject(id(old_node)) is None
+
+
+def test_findNodeOutdated():
+    root = SceneNode()
+    node = SceneNode(parent = root)
+    hierarchy = BoundingVolumeHierarchy(root)
+    assert hierarchy.findNode(id(node)) is node
+    assert hierarchy.findNode(id(root)) is root
+
+    root._children.remove(node)  # Without emitting any signal.
+    node._parent = None
+    assert hierarchy.findNode(id(node)) is None
@@ -91,11 +91,19 @@ def test_getRayOrthographic(coordinates, direction, camera):
 
 
 def test_project(camera):
-    assert camera.project(Vector(10, 10, 10)) == (-10.000000372529039, -10.000000372529039)
+    assert camera.project(Vector(10, 10, 10)) == pytest.approx((-10, -10))
 
 
 def test_getViewProjectionMatrix(camera):
     assert camera.getViewProjectionMatrix() == Matrix([[0.2, 0, 0, 0],
                                                       [0, 0.2, 0, 0],
                                                       [0, 0, -0.01, 0],
-                                                      [0, 0, 0, 1]])
\ No newline at end of file
+                                                      [0, 0, 0, 1]])
+
+
+def test_getWorldTransformation(camera):
+    camera.setPosition(Vector(1, 2, 3))  # Invalidates the world transformation.
+
+    world_transformation = camera.getWorldTransformation()
+    assert world_transformation is not None
+    assert world_transformation.getTranslation() == Vector(1, 2, 3)
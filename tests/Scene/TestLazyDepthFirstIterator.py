@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from UM.Mesh.MeshData import MeshData
+from UM.Scene.GroupDecorator import GroupDecorator
+from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.Scene.Iterator.LazyDepthFirstIterator import LazyDepthFirstIterator
+from UM.Scene.SceneNode import SceneNode
+
+
+@pytest.fixture
+def root():
+    root = SceneNode(name = "root")
+    group = SceneNode(root, name = "group")
+    group.addDecorator(GroupDecorator())
+    for index in range(3):
+        child = SceneNode(group, name = "child {}".format(index))
+        child.setMeshData(MeshData())
+        SceneNode(child, name = "grandchild {}".format(index))
+    hidden = SceneNode(root, name = "hidden")
+    hidden.setVisible(False)
+    hidden.setMeshData(MeshData())
+    return root
+
+
+def test_sameOrderAsDepthFirstIterator(root):
+    root._all_children = None  # Without the cache.
+    assert list(LazyDepthFirstIterator(root)) == list(DepthFirstIterator(root))
+    assert root._all_children is not None  # Filled in by the DepthFirstIterator.
+    assert list(LazyDepthFirstIterator(root)) == list(DepthFirstIterator(root))
+
+
+def test_filters(root):
+    assert [node.getName() for node in LazyDepthFirstIterator(root, has_mesh = True)] == ["hidden", "child 0", "child 1", "child 2"]
+    assert [node.getName() for node in LazyDepthFirstIterator(root, has_mesh = True, visible = True)] == ["child 0", "child 1", "child 2"]
+    assert [node.getName() for node in LazyDepthFirstIterator(root, decoration = "isGroup")] == ["group"]
+
+
+def test_prune(root):
+    nodes = LazyDepthFirstIterator(root, prune = lambda node: node.callDecoration("isGroup") is not None)
+    assert [node.getName() for node in nodes] == ["root", "group", "hidden"]
+
+
+def test_stopEarly(root):
+    root._all_children = None
+    group = root.getChildren()[0]
+    for child in group.getChildren():
+        child.getChildren = MagicMock(return_value = [])
+
+    for node in LazyDepthFirstIterator(root):
+        if node.getName() == "child 0":
+            break
+    for child in group.getChildren():
+        assert child.getChildren.call_count == 0  # Never got to visit the grandchildren.
+
+
+def test_allChildrenCache(root):
+    group = root.getChildren()[0]
+    assert len(root.getAllChildren()) == 8
+
+    new_child = SceneNode(group.getChildren()[1])
+    assert new_child in root.getAllChildren()
+    assert new_child in group.getAllChildren()
+
+    group.removeChild(group.getChildren()[0])
+    assert len(root.getAllChildren()) == 7
+    assert len(group.getAllChildren()) == 5
@@ -14,7 +14,7 @@ import unittest
 import math
 
 from copy import deepcopy
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 class SceneNodeTest(unittest.TestCase):
     def setUp(self):
@@ -370,6 +370,92 @@ class SceneNodeTest(unittest.TestCase):
 
         child_node.setCenterPosition.assert_called_once_with(Vector(-10, 0, 0))
 
+    def test_worldTransformationComputedWhenNeeded(self):
+        group = SceneNode()
+        child = SceneNode(group)
+        child.setPosition(Vector(10, 0, 0))
+        child.getWorldPosition()
+
+        group.translate(Vector(0, 0, 10))
+        assert child._world_transformation is None
+        assert child.getCachedNormalMatrix() is not None
+        assert child.getWorldPosition() == Vector(10, 0, 10)
+        assert group.getPosition() == Vector(0, 0, 10)
+
+    def test_lazyTransformationUpdates(self):
+        application = MagicMock()
+        group = SceneNode()
+        children = [SceneNode(group) for _ in range(10)]
+        for index, child in enumerate(children):
+            child.setPosition(Vector(index, 0, 0))
+            child.getWorldPosition()
+        group.transformationChanged.emit = MagicMock()
+        children[0].transformationChanged.emit = MagicMock()
+
+        SceneNode.setLazyTransformationUpdates(True)
+        try:
+            with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)):
+                group.translate(Vector(0, 0, 10))
+                group.translate(Vector(0, 0, 10))
+                group.translate(Vector(0, 0, 10))
+
+            assert group.transformationChanged.emit.call_count == 0  # Not until the next time the event loop runs.
+            assert application.callLater.call_count == 1
+            for index, child in enumerate(children):
+                assert child.getWorldPosition() == Vector(index, 0, 30)
+
+            application.callLater.call_args[0][0]()  # The event loop runs.
+            group.transformationChanged.emit.assert_called_once_with(group)
+            assert children[0].transformationChanged.emit.call_count == 0
+        finally:
+            SceneNode.setLazyTransformationUpdates(False)
+
+    def test_boundingBoxDerivedFromCachedExtents(self):
+        builder = MeshBuilder()
+        builder.addCube(10, 20, 30)
+        node = SceneNode()
+        node.setMeshData(builder.build())
+        node.rotate(Quaternion.fromAngleAxis(math.pi / 5, Vector.Unit_Y))
+        node.getBoundingBox()
+        mesh_data = node.getMeshData()
+        mesh_data.getExtentsData = MagicMock(wraps = mesh_data.getExtentsData)
+
+        node.translate(Vector(10, 20, 30))
+        node.scale(Vector(2, 2, 2))
+        bounding_box = node.getBoundingBox()
+        assert mesh_data.getExtentsData.call_count == 0  # Only the translation and uniform scale changed.
+        expected = mesh_data.getExtents(node.getWorldTransformation())
+        assert bounding_box.minimum.equals(expected.minimum, epsilon = 1e-3)
+        assert bounding_box.maximum.equals(expected.maximum, epsilon = 1e-3)
+
+        node.rotate(Quaternion.fromAngleAxis(math.pi / 5, Vector.Unit_X))
+        mesh_data.getExtentsData.reset_mock()
+        bounding_box = node.getBoundingBox()
+        assert mesh_data.getExtentsData.call_count == 1
+        expected = mesh_data.getExtents(node.getWorldTransformation())
+        assert bounding_box.minimum.equals(expected.minimum, epsilon = 1e-3)
+        assert bounding_box.maximum.equals(expected.maximum, epsilon = 1e-3)
+
+    def test_boundingBoxOfChildren(self):
+        builder = MeshBuilder()
+        builder.addCube(10, 10, 10)
+        group = SceneNode()
+        group.setPosition(Vector(0, 5, 0))
+        first = SceneNode(group)
+        first.setMeshData(builder.build())
+        first.setPosition(Vector(-20, 0, 0))
+        second = SceneNode(group)
+        second.setMeshData(builder.build())
+        second.setPosition(Vector(20, 0, 0))
+        SceneNode(group).setPosition(Vector(0, 100, 0))  # Empty nodes have an invalid box, which doesn't count.
+
+        assert group.getBoundingBox().minimum == Vector(-25, 0, -5)
+        assert group.getBoundingBox().maximum == Vector(25, 10, 5)
+
+        second.translate(Vector(0, 0, 20))
+        assert group.getBoundingBox().minimum == Vector(-25, 0, -5)
+        assert group.getBoundingBox().maximum == Vector(25, 10, 25)
+
 
 if __name__ == "__main__":
     unittest.main()
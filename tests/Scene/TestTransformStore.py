@@ -0,0 +1,104 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import gc
+import math
+
+import numpy
+
+from UM.Math.Quaternion import Quaternion
+from UM.Math.Vector import Vector
+from UM.Scene.SceneNode import SceneNode
+from UM.Scene.TransformStore import TransformStore
+
+
+def createTree():
+    """Creates a small tree of nodes with different transformations."""
+
+    root = SceneNode()
+    group = SceneNode(root)
+    group.setPosition(Vector(10, 0, 0))
+    group.rotate(Quaternion.fromAngleAxis(math.pi / 2, Vector.Unit_Y))
+    children = []
+    for index in range(5):
+        child = SceneNode(group)
+        child.setPosition(Vector(0, index, 5))
+        child.scale(Vector(2, 2, 2))
+        children.append(child)
+    grandchild = SceneNode(children[0])
+    grandchild.setPosition(Vector(1, 1, 1))
+    return root, group, children, grandchild
+
+
+def assertSameWorldTransformations(nodes, expected_nodes):
+    for node, expected_node in zip(nodes, expected_nodes):
+        assert numpy.allclose(node.getWorldTransformation().getData(), expected_node.getWorldTransformation().getData(), atol = 1e-5)
+
+
+def test_worldTransformations():
+    root, group, children, grandchild = createTree()
+    expected_root, expected_group, expected_children, expected_grandchild = createTree()
+    store = TransformStore()
+    store.addSubtree(root)
+    assert store.getNodeCount() == 8
+
+    assertSameWorldTransformations([root, group, grandchild] + children, [expected_root, expected_group, expected_grandchild] + expected_children)
+
+    for node in (group, expected_group):
+        node.translate(Vector(0, 0, 3))
+    for node in (children[2], expected_children[2]):
+        node.rotate(Quaternion.fromAngleAxis(math.pi / 4, Vector.Unit_X))
+    assertSameWorldTransformations([root, group, grandchild] + children, [expected_root, expected_group, expected_grandchild] + expected_children)
+    assert grandchild.getWorldPosition() == expected_grandchild.getWorldPosition()
+
+
+def test_addAndRemoveChildren():
+    root, group, children, grandchild = createTree()
+    store = TransformStore()
+    store.addSubtree(root)
+
+    new_child = SceneNode()
+    new_child.setPosition(Vector(1, 2, 3))
+    group.addChild(new_child)
+    assert new_child._transform_store is store
+    assert store.getNodeCount() == 9
+    group.translate(Vector(5, 0, 0))
+    expected = group.getWorldTransformation().multiply(new_child.getLocalTransformation())
+    assert numpy.allclose(new_child.getWorldTransformation().getData(), expected.getData(), atol = 1e-5)
+
+    group.removeChild(children[1])  # Stays in the store, without a parent.
+    assert children[1].getWorldPosition() == children[1].getPosition()
+
+    group.removeChild(new_child)
+    del new_child
+    gc.collect()
+    assert store.getNodeCount() == 8  # Deleted nodes are released.
+
+
+def test_ancestorNotInStore():
+    root, group, children, grandchild = createTree()
+    store = TransformStore()
+    store.addSubtree(group)  # The root is not in the store.
+    root.translate(Vector(0, 100, 0))
+
+    assert group.getWorldPosition().y == 100
+    assert grandchild.getWorldPosition().y > 100
+
+
+def test_lazyTransformationUpdates():
+    root = SceneNode()
+    a = SceneNode(root)
+    b = SceneNode(a)
+    c = SceneNode(b)
+    store = TransformStore()
+    store.addSubtree(root)
+
+    SceneNode.setLazyTransformationUpdates(True)
+    try:
+        a.translate(Vector(10, 0, 0))
+        assert c.getWorldPosition() == Vector(10, 0, 0)  # Read from the store, without reading b first.
+        a.translate(Vector(10, 0, 0))
+        assert c.getWorldPosition() == Vector(20, 0, 0)
+        assert b.getWorldPosition() == Vector(20, 0, 0)
+    finally:
+        SceneNode.setLazyTransformationUpdates(False)
@@ -14,8 +14,11 @@ from UM.Settings.ContainerStack import IncorrectVersionError
 from UM.Settings.ContainerStack import InvalidContainerStackError
 from UM.Settings.DefinitionContainer import DefinitionContainer
 from UM.Settings.InstanceContainer import InstanceContainer
+from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext
+from UM.Settings.SettingDefinition import SettingDefinition
 from UM.Settings.Validator import ValidatorState
 from UM.Resources import Resources
+from UM.Signal import postponeSignals
 
 from .MockContainer import MockContainer
 
@@ -453,6 +456,66 @@ def test_getValue(container_stack, data):
     assert answer == data["result"]
 
 
+##  Tests that the property index follows changes to the containers.
+#
+#   \param container_stack A new container stack from a fixture.
+def test_getRawPropertyIndex(container_stack, application):
+    top = MockContainer()
+    top.items = {}
+    bottom = MockContainer()
+    bottom.items = {"foo": "bottom"}
+    container_stack.addContainer(bottom)
+    container_stack.insertContainer(0, top)
+
+    assert container_stack.getRawProperty("foo", "value") == "bottom"
+    assert container_stack.getRawProperty("bar", "value") is None
+
+    top.items["foo"] = "top"
+    top.items["bar"] = "top"
+    top.propertyChanged.emit("foo", "value")
+    top.propertyChanged.emit("bar", "value")
+    assert container_stack.getRawProperty("foo", "value") == "top"
+    assert container_stack.getRawProperty("bar", "value") == "top"
+
+    context = PropertyEvaluationContext(container_stack)
+    context.context["evaluate_from_container_index"] = 1
+    assert container_stack.getRawProperty("foo", "value", context = context) == "bottom"
+    assert container_stack.getRawProperty("bar", "value", context = context) is None
+    assert container_stack.getRawProperty("foo", "value") == "top"
+
+    del top.items["foo"]  # Without reporting it.
+    assert container_stack.getRawProperty("foo", "value") == "bottom"
+
+    container_stack.removeContainer(0)
+    assert container_stack.getRawProperty("bar", "value") is None
+
+    container_stack.setUsePropertyIndex(False)
+    assert container_stack.getRawProperty("foo", "value") == "bottom"
+
+
+##  Tests that the property index follows changes whose signals are postponed.
+#
+#   \param container_stack A new container stack from a fixture.
+def test_getPropertyIndexPostponedSignals(container_stack, application):
+    definitions = DefinitionContainer("definitions")
+    definition = SettingDefinition("x", definitions)
+    definition.deserialize({"label": "X", "type": "int", "description": "A Test Setting", "default_value": 10})
+    definitions.addDefinition(definition)
+    user = InstanceContainer("user")
+    user.getDefinition = MagicMock(return_value = definitions)
+    container_stack.addContainer(definitions)
+    container_stack.insertContainer(0, user)
+    assert container_stack.getProperty("x", "value") == 10
+
+    with postponeSignals(user.propertyChanged):
+        user.setProperty("x", "value", 12345)
+        assert container_stack.getProperty("x", "value") == 12345
+
+    with postponeSignals(user.propertyChanged):
+        user.removeInstance("x")
+        assert container_stack.getProperty("x", "value") == 10
+
+
 ##  Tests removing containers from the stack.
 #
 #   \param container_stack A new container stack from a fixture.
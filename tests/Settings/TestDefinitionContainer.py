@@ -92,6 +92,20 @@ def test_deserializeMetadata(file, expected, definition_container, upgrade_manag
         assert metadata[0][key] == value
 
 
+##  Tests deserialising the metadata without the version upgrades and the registry.
+@pytest.mark.parametrize("file,expected", test_deserialize_data)
+def test_deserializeCurrentMetadata(file, expected, definition_container, upgrade_manager: VersionUpgradeManager):
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", file), encoding = "utf-8") as data:
+        json = data.read()
+
+    metadata = definition_container.deserializeCurrentMetadata(json, file)
+
+    if file == "inherits.def.json":
+        assert metadata is None  # Needs the registry to get the metadata of the parent.
+    else:
+        assert metadata == definition_container.deserializeMetadata(json, file)
+
+
 ##  Tests deserialising bad definition container JSONs.
 #
 #   \param definition_container A definition container from a fixture.
@@ -5,6 +5,8 @@ import unittest.mock #For MagicMock and patch.
 import pytest
 import os
 
+import UM.Settings.ContainerProvider
+import UM.Settings.DefinitionContainer
 import UM.Settings.InstanceContainer
 import UM.Settings.SettingInstance
 import UM.Settings.SettingDefinition
@@ -20,6 +22,18 @@ def test_create():
     assert container.getId() == "test"
 
 
+class OtherFormatContainer(UM.Settings.InstanceContainer.InstanceContainer):
+    @classmethod
+    def deserializeMetadata(cls, serialized, container_id):
+        return [{"id": container_id}]
+
+
+##  Subclasses that read another file format can't use the inherited deserializeCurrentMetadata.
+def test_canDeserializeCurrentMetadata():
+    assert UM.Settings.ContainerProvider.canDeserializeCurrentMetadata(UM.Settings.InstanceContainer.InstanceContainer)
+    assert not UM.Settings.ContainerProvider.canDeserializeCurrentMetadata(OtherFormatContainer)
+
+
 ##  Test whether setting a property on an instance correctly updates dependencies.
 #
 #   This test primarily tests the SettingInstance but requires some functionality
@@ -362,4 +376,18 @@ def test_hasPropertyValueCached():
     # We special cased the value property if it's in the cache.
     instance_container = UM.Settings.InstanceContainer.InstanceContainer("test")
     instance_container.setCachedValues({"beep": "yay"})
-    assert instance_container.hasProperty("beep", "value")
\ No newline at end of file
+    assert instance_container.hasProperty("beep", "value")
+
+##  Applying lazily loaded values doesn't flush the caches of evaluated properties, since nothing changed.
+def test_instantiateCachedValuesDoesNotNotify():
+    definition_container = UM.Settings.DefinitionContainer.DefinitionContainer("definitions")
+    definition = UM.Settings.SettingDefinition.SettingDefinition("beep", definition_container)
+    definition.deserialize({"label": "Beep", "type": "str", "description": "A Test Setting", "default_value": "nay"})
+    definition_container.addDefinition(definition)
+    instance_container = UM.Settings.InstanceContainer.InstanceContainer("test")
+    instance_container.getDefinition = MagicMock(return_value = definition_container)
+    instance_container.setCachedValues({"beep": "yay"})
+
+    with unittest.mock.patch("UM.Settings.PropertyEvaluationCache.PropertyEvaluationCache.notifyPropertyChanged") as notify:
+        assert instance_container.getProperty("beep", "value") == "yay"
+        notify.assert_not_called()
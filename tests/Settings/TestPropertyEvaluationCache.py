@@ -0,0 +1,154 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import gc
+import weakref
+
+from UM.Settings.PropertyEvaluationCache import PropertyEvaluationCache
+from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext
+
+
+class MockStack:
+    """Evaluates properties from a dictionary of values and functions, counting how often they are evaluated."""
+
+    def __init__(self, values, next_stack = None):
+        self.values = values
+        self.next_stack = next_stack
+        self.evaluation_count = 0
+        self.cache = PropertyEvaluationCache(self)
+        if next_stack is not None:
+            self.cache.setNextCache(next_stack.cache, None)
+
+    def getProperty(self, key, property_name, context = None):
+        return self.cache.getProperty(key, property_name, context, self._evaluate)
+
+    def _evaluate(self, key, property_name, context):
+        self.evaluation_count += 1
+        value = self.values.get(key)
+        if value is None and self.next_stack is not None:
+            return self.next_stack.getProperty(key, property_name, context)
+        if callable(value):
+            return value(self)
+        return value
+
+    def removeFromPropertyIndex(self, keys, property_names = None):
+        pass  # Doesn't have a property index.
+
+
+def test_cachedValue():
+    stack = MockStack({"a": 3, "b": lambda s: s.getProperty("a", "value") * 2})
+
+    assert stack.getProperty("b", "value") == 6
+    assert stack.getProperty("b", "value") == 6
+    assert stack.evaluation_count == 2  # Both a and b once.
+
+    statistics = stack.cache.getStatistics()
+    assert statistics["b"]["hits"] == 1
+    assert statistics["b"]["misses"] == 1
+    assert statistics["a"]["misses"] == 1
+    assert stack.cache.getHitRate() == 1 / 3
+
+
+def test_invalidateDependents():
+    stack = MockStack({"a": 3, "b": lambda s: s.getProperty("a", "value") * 2, "c": lambda s: s.getProperty("b", "value") + 1, "d": 10})
+    assert stack.getProperty("c", "value") == 7
+    assert stack.getProperty("d", "value") == 10
+
+    stack.values["a"] = 4
+    stack.cache.invalidate("a", "value")
+    stack.evaluation_count = 0
+    assert stack.getProperty("c", "value") == 9  # Invalidated through b.
+    assert stack.getProperty("d", "value") == 10
+    assert stack.evaluation_count == 3  # But d is still cached.
+
+
+def test_invalidateOtherProperty():
+    stack = MockStack({"a": 3})
+    stack.getProperty("a", "value")
+    stack.cache.invalidate("a", "enabled")
+    stack.values["a"] = 4
+    assert stack.getProperty("a", "value") == 3  # Only the value of changed properties is evaluated again.
+
+
+def test_nextStack():
+    next_stack = MockStack({"a": 3})
+    stack = MockStack({"b": lambda s: s.getProperty("a", "value") * 2}, next_stack)
+    assert stack.getProperty("b", "value") == 6
+
+    next_stack.values["a"] = 5
+    next_stack.cache.invalidate("a", "value")
+    assert stack.getProperty("b", "value") == 10
+
+
+def test_clear():
+    next_stack = MockStack({"a": 3})
+    stack = MockStack({"b": lambda s: s.getProperty("a", "value")}, next_stack)
+    assert stack.getProperty("b", "value") == 3
+
+    next_stack.values["a"] = 4
+    next_stack.cache.clear()
+    assert stack.getProperty("b", "value") == 4
+
+
+def test_uncacheable():
+    def uncacheable(s):
+        PropertyEvaluationCache.markUncacheable()
+        return s.getProperty("a", "value")
+    stack = MockStack({"a": 3, "b": uncacheable, "c": lambda s: s.getProperty("b", "value")})
+
+    stack.getProperty("c", "value")
+    stack.getProperty("c", "value")
+    assert stack.cache.getStatistics()["c"]["misses"] == 2  # Since it used something that can't be cached.
+    assert stack.cache.getStatistics()["a"]["hits"] == 1
+
+
+def test_context():
+    stack = MockStack({"a": 3})
+    context = PropertyEvaluationContext(stack)
+    context.context["some_option"] = True
+    stack.getProperty("a", "value")
+    stack.getProperty("a", "value", context)
+    stack.getProperty("a", "value", context)
+    assert stack.evaluation_count == 2  # Once without and once with the context.
+
+    context.context["override_operators"] = {}
+    stack.getProperty("a", "value", context)
+    assert stack.evaluation_count == 3  # Not cached with overridden operators.
+
+    other_context = PropertyEvaluationContext(MockStack({}))
+    stack.getProperty("a", "value", other_context)
+    stack.getProperty("a", "value", other_context)
+    assert stack.evaluation_count == 5  # Not cached when evaluated for another stack.
+
+
+def test_notifyChanged():
+    stack = MockStack({"a": 3, "b": lambda s: s.getProperty("a", "value") * 2, "c": 10})
+    other_stack = MockStack({"a": 5})
+    assert stack.getProperty("b", "value") == 6
+    assert stack.getProperty("c", "value") == 10
+    assert other_stack.getProperty("a", "value") == 5
+
+    stack.values["a"] = 4
+    other_stack.values["a"] = 6
+    PropertyEvaluationCache.notifyPropertyChanged("a", "value")  # Without knowing which stacks have this setting.
+    assert stack.getProperty("b", "value") == 8
+    assert other_stack.getProperty("a", "value") == 6
+
+    stack.values["c"] = 11
+    PropertyEvaluationCache.notifySettingsChanged(["c"])
+    assert stack.getProperty("c", "value") == 11
+
+
+def test_dependentStackDeleted():
+    stack = MockStack({"a": 3})
+    other_stack = MockStack({"b": lambda s: stack.getProperty("a", "value") * 2})
+    assert other_stack.getProperty("b", "value") == 6
+
+    other_cache = weakref.ref(other_stack.cache)
+    del other_stack
+    gc.collect()
+    assert other_cache() is None  # Using a property of the stack doesn't keep the other stack alive.
+
+    stack.values["a"] = 4
+    stack.cache.invalidate("a", "value")
+    assert stack.getProperty("a", "value") == 4
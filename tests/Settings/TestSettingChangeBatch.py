@@ -0,0 +1,173 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from UM.Settings.ContainerStack import ContainerStack
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.InstanceContainer import InstanceContainer
+from UM.Settings.SettingChangeBatch import SettingChangeBatch
+from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings.SettingInstance import SettingInstance
+
+
+class Receiver:
+    """Records the arguments of the signals it is connected to. Signals only keep weak references to their slots."""
+
+    def __init__(self):
+        self.calls = []
+
+    def slot(self, *args):
+        self.calls.append(args)
+
+
+def createDefinitions():
+    """Create a definition container where "middle" depends on "base", and "top" and "other" depend on "middle"."""
+
+    definition_container = DefinitionContainer("definitions")
+    for key, value in [("base", None), ("middle", "base * 2"), ("top", "middle + 1"), ("other", "middle + 2")]:
+        definition = SettingDefinition(key, definition_container)
+        properties = {"label": key, "description": key, "type": "float", "default_value": 1.0}
+        if value is not None:
+            properties["value"] = value
+        definition.deserialize(properties)
+        definition_container.addDefinition(definition)
+    return definition_container
+
+
+@pytest.fixture
+def stack(application):
+    definition_container = createDefinitions()
+    user_changes = InstanceContainer("user_changes")
+    user_changes.setDefinition(definition_container.getId())
+    stack = ContainerStack("stack")
+    stack.addContainer(definition_container)
+    stack.insertContainer(0, user_changes)
+    return stack
+
+
+def setValue(stack, key, value):
+    user_changes = stack.getTop()
+    instance = user_changes.getInstance(key)
+    if instance is None:
+        instance = SettingInstance(stack.getBottom().findDefinitions(key = key)[0], user_changes)
+        user_changes.addInstance(instance)
+    instance.setProperty("value", value)
+
+
+def test_findAffectedRelations():
+    definition_container = createDefinitions()
+    base = definition_container.findDefinitions(key = "base")[0]
+
+    relations = SettingChangeBatch.findAffectedRelations([base])
+
+    assert {(relation.owner.key, relation.target.key, relation.role) for relation in relations} == {("base", "middle", "value"), ("middle", "top", "value"), ("middle", "other", "value")}
+
+
+def test_findAffectedRelationsSkipsChangedSetting(upgrade_manager):
+    # Two settings that depend on each other. Changing one doesn't notify itself through the other.
+    definition_container = DefinitionContainer("definitions")
+    settings = {key: {"label": key, "description": key, "type": "float", "default_value": 1.0, "value": value} for key, value in [("first", "second"), ("second", "first")]}
+    definition_container.deserialize(json.dumps({"version": 2, "name": "Cycle", "metadata": {}, "settings": settings}))  # Creates the relations once both exist.
+    first = definition_container.findDefinitions(key = "first")[0]
+
+    relations = SettingChangeBatch.findAffectedRelations([first])
+
+    assert {(relation.owner.key, relation.target.key, relation.role) for relation in relations} == {("first", "second", "value")}
+
+
+def test_batchRelations(stack):
+    receiver = Receiver()
+    stack.getTop().propertyChanged.connect(receiver.slot)
+    changes = receiver.calls
+
+    with stack.batchPropertyChanges():
+        setValue(stack, "base", 2.0)
+        setValue(stack, "middle", 3.0)
+        assert ("top", "value") not in changes  # Related settings are only notified when the batch ends.
+        change_count = len(changes)
+
+    batch_changes = changes[change_count:]
+    assert sorted(batch_changes) == sorted(set(batch_changes))  # Every related setting is notified once.
+    assert {("middle", "value"), ("top", "value"), ("other", "value"), ("top", "validationState")} <= set(batch_changes)
+    assert stack.getProperty("top", "value") == 4.0
+
+
+def test_batchStack(stack):
+    receiver = Receiver()
+    stack.collectedPropertiesChanged.connect(receiver.slot)
+    collected_changes = receiver.calls
+
+    with stack.batchPropertyChanges():
+        setValue(stack, "base", 2.0)
+        setValue(stack, "other", 5.0)
+        assert collected_changes == []
+
+    assert len(collected_changes) == 1
+    assert {"base", "middle", "top", "other"} <= collected_changes[0][0].keys()
+    assert "value" in collected_changes[0][0]["top"]
+
+
+def test_nestedBatch(stack):
+    receiver = Receiver()
+    stack.collectedPropertiesChanged.connect(receiver.slot)
+    collected_changes = receiver.calls
+
+    with SettingChangeBatch() as outer_batch:
+        with stack.batchPropertyChanges():
+            setValue(stack, "base", 2.0)
+        assert collected_changes == []  # The outer batch hasn't ended yet.
+        assert SettingChangeBatch.getActive() is outer_batch
+        setValue(stack, "other", 5.0)
+
+    assert SettingChangeBatch.getActive() is None
+    assert len(collected_changes) == 1
+    assert {"base", "other"} <= collected_changes[0][0].keys()
+
+
+def test_batchException(stack):
+    receiver = Receiver()
+    stack.collectedPropertiesChanged.connect(receiver.slot)
+    collected_changes = receiver.calls
+
+    with pytest.raises(ValueError):
+        with stack.batchPropertyChanges():
+            setValue(stack, "base", 2.0)
+            raise ValueError("Expected failure")
+
+    assert SettingChangeBatch.getActive() is None
+    assert len(collected_changes) == 1  # The changes that were made are still reported.
+
+
+def test_batchFinishException(stack, application, monkeypatch):
+    def failingFinish(batch):
+        raise ValueError("Expected failure")
+    monkeypatch.setattr(SettingChangeBatch, "_finish", failingFinish)
+    call_later = MagicMock()
+    monkeypatch.setattr(application, "callLater", call_later)
+
+    with pytest.raises(ValueError):
+        with stack.batchPropertyChanges():
+            setValue(stack, "base", 2.0)
+    assert not call_later.called
+
+    setValue(stack, "other", 5.0)  # The changes are still reported later on, once there is no batch.
+    call_later.assert_called_once_with(stack._emitCollectedPropertyChanges)
+
+def test_clearInstanceContainer(stack):
+    setValue(stack, "base", 2.0)
+    setValue(stack, "middle", 3.0)
+    receiver = Receiver()
+    stack.getTop().propertyChanged.connect(receiver.slot)
+    collected_receiver = Receiver()
+    stack.collectedPropertiesChanged.connect(collected_receiver.slot)
+
+    stack.getTop().clear()
+
+    assert receiver.calls.count(("top", "value")) == 1  # Not once for every removed setting.
+    assert len(collected_receiver.calls) == 1  # Reported right away, all together.
+    assert {"base", "middle", "top", "other"} <= collected_receiver.calls[0][0].keys()
+    assert stack.getProperty("top", "value") == 3.0
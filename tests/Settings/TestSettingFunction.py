@@ -168,3 +168,10 @@ def test_str():
     assert str(function) == "=3.14156"
     function = SettingFunction("")  # Also the edge case.
     assert str(function) == "="
+
+
+##  Tests whether functions that use registered operators are not cached.
+def test_isCacheable():
+    assert SettingFunction("foo * zoo").isCacheable()
+    assert SettingFunction("math.sqrt(4)").isCacheable()
+    assert not SettingFunction("debug(foo)").isCacheable()  # Registered operators may get their values from anywhere.
@@ -0,0 +1,136 @@
+import logging
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from UM.Logger import Logger, LogOutput, PythonLogOutput
+
+
+class RecordingLogOutput(LogOutput):
+    def __init__(self, enabled_types = "dicwe"):
+        super().__init__()
+        self.enabled_types = enabled_types
+        self.messages = []
+        self.times = []
+        self.flush_count = 0
+
+    def log(self, log_type, message):
+        self.messages.append((log_type, message, threading.current_thread()))
+
+    def logAt(self, log_type, message, created):
+        self.times.append(created)
+        super().logAt(log_type, message, created)
+
+    def isEnabledFor(self, log_type):
+        return log_type[0] in self.enabled_types
+
+    def flush(self):
+        self.flush_count += 1
+
+
+class Unformattable:
+    def __format__(self, format_spec):
+        raise AssertionError("The message shouldn't be formatted.")
+
+
+@pytest.fixture
+def output():
+    output = RecordingLogOutput()
+    Logger.addLogger(output)
+    yield output
+    Logger.removeLogger(output)
+
+
+def test_log(output):
+    Logger.log("i", "Loaded {count} meshes", count = 3)
+    line = test_log.__code__.co_firstlineno + 1
+    Logger.flush()
+
+    assert len(output.messages) == 1
+    log_type, message, thread = output.messages[0]
+    assert log_type == "i"
+    assert message == "[{thread}] {module}.test_log [{line}]: Loaded 3 meshes".format(thread = threading.current_thread().name, module = __name__, line = line)
+    assert thread is not threading.current_thread()  # Written in the background.
+    assert output.flush_count >= 1
+
+
+def test_logPercentFormatting(output):
+    Logger.warning("%s of %s", 1, 2)
+    line = test_logPercentFormatting.__code__.co_firstlineno + 1
+    Logger.flush()
+
+    assert output.messages[0][0] == "w"
+    assert output.messages[0][1].endswith("{module}.test_logPercentFormatting [{line}]: 1 of 2".format(module = __name__, line = line))  # Reports the caller, not the convenience method.
+
+
+def test_logTime(output):
+    with patch("time.time", return_value = 1234.5):
+        Logger.log("i", "Logged at a fixed time")
+    Logger.flush()  # Written at a later time.
+
+    assert output.times == [1234.5]
+
+
+def test_logErrorWritten(output):
+    Logger.log("i", "Written in the background")
+    Logger.log("e", "Written right away")
+
+    assert [log_type for log_type, _, _ in output.messages] == ["i", "e"]  # Without flushing.
+    assert output.flush_count >= 1
+
+
+def test_logOrder(output):
+    for i in range(2500):
+        Logger.log("d", "Message %s", i)
+    Logger.flush()
+
+    assert [message.rsplit(" ", 1)[1] for _, message, _ in output.messages] == [str(i) for i in range(2500)]
+
+
+def test_logDisabledType(output):
+    output.enabled_types = "we"
+
+    Logger.log("d", "{value}", value = Unformattable())
+    Logger.log("e", "Something went wrong")
+    Logger.flush()
+
+    assert [log_type for log_type, _, _ in output.messages] == ["e"]
+
+
+def test_removeLogger():
+    output = RecordingLogOutput()
+    Logger.addLogger(output)
+    Logger.log("i", "Written")
+    Logger.removeLogger(output)  # Still writes what was logged.
+    Logger.log("i", "Not written")
+    Logger.flush()
+
+    assert len(output.messages) == 1
+    assert output not in Logger.getLoggers()
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_pythonLogOutput():
+    output = PythonLogOutput()
+    handler = RecordingHandler()
+    output._logger.addHandler(handler)
+    try:
+        output.logAt("w", "Warning", 1000.25)
+        output.logAt("i_once", "Once", 1001)
+        output.logAt("i_once", "Once", 1002)
+        output.logAt("x", "Unknown type", 1003)
+    finally:
+        output._logger.removeHandler(handler)
+
+    assert [(record.levelno, record.getMessage(), record.created) for record in handler.records] == [(logging.WARNING, "Warning", 1000.25), (logging.INFO, "Once", 1001)]
+    assert handler.records[0].msecs == 250
+    assert output.isEnabledFor("d_once")
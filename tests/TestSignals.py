@@ -170,3 +170,83 @@ def test_signalemitter():
 
     with pytest.raises(TypeError):
         declare_bad_signalemitter()
+
+
+class EventLoop:
+    """Collects the function events of queued emits, to process them when the test wants to."""
+
+    def __init__(self):
+        self.events = []
+
+    def functionEvent(self, event):
+        self.events.append(event)
+
+    def getMainThread(self):
+        return None
+
+    def processEvents(self):
+        events = self.events
+        self.events = []
+        for event in events:
+            event.call()
+
+
+@pytest.mark.parametrize("coalesce, expected_calls", [
+    (False, [("a", ), ("a", ), ("b", ), ("a", )]),
+    (True, [("a", ), ("b", )])
+])
+def test_queuedEmit(coalesce, expected_calls):
+    calls = []
+    def slot(*args):
+        calls.append(args)
+
+    signal = Signal(type = Signal.Queued, coalesce = coalesce)
+    signal.connect(slot)
+    event_loop = EventLoop()
+    with patch("UM.Signal.Signal._app", event_loop):
+        signal.emit("a")
+        signal.emit("a")
+        signal.emit("b")
+        signal.emit("a")
+        assert calls == []  # Only called when the event loop gets to it.
+
+        event_loop.processEvents()
+        assert calls == expected_calls
+
+        signal.emit("a")  # Not combined with the emits that were already processed.
+        event_loop.processEvents()
+        assert calls == expected_calls + [("a", )]
+
+
+def test_coalesceUnhashableArguments():
+    test = SignalReceiver()
+    signal = Signal(type = Signal.Queued, coalesce = True)
+    signal.connect(test.slot)
+    event_loop = EventLoop()
+    with patch("UM.Signal.Signal._app", event_loop):
+        signal.emit(["a"])
+        signal.emit(["a"])
+        event_loop.processEvents()
+
+    assert test.getEmitCount() == 2
+
+
+def test_coalesceSignalemitter():
+    @signalemitter
+    class Test:
+        coalescingSignal = Signal(type = Signal.Queued, coalesce = True)
+
+    assert Test().coalescingSignal.isCoalescing()
+    assert deepcopy(Test().coalescingSignal).isCoalescing()
+
+
+def test_emitAfterSlotDeleted():
+    test = SignalReceiver()
+    other = SignalReceiver()
+    signal = Signal(type = Signal.Direct)
+    signal.connect(test.slot)
+    signal.connect(other.slot)
+    del test
+
+    signal.emit()  # Slots of deleted objects are skipped.
+    assert other.getEmitCount() == 1
@@ -0,0 +1,56 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import logging
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins", "FileLogger"))
+import FileLogger
+from UM.Logger import Logger
+
+# Every round logs this many messages, so the number of messages per second is this many times the rounds per second.
+MESSAGE_COUNT = 1000
+
+
+@pytest.fixture
+def file_logger(tmp_path):
+    with patch("UM.Resources.Resources.getStoragePath", MagicMock(return_value = str(tmp_path / "benchmark.log"))):
+        with patch("UM.VersionUpgradeManager.VersionUpgradeManager.getInstance"):
+            output = FileLogger.FileLogger("benchmark.log")
+    Logger.addLogger(output)
+    yield output
+    Logger.removeLogger(output)
+    for handler in list(output._logger.handlers):
+        output._logger.removeHandler(handler)
+        handler.close()
+
+
+def logMessages(log_type):
+    for i in range(MESSAGE_COUNT):
+        Logger.log(log_type, "Loaded a mesh with %s vertices", i)
+
+
+def benchmark_log(benchmark, file_logger):
+    """How fast messages can be logged, while they are written in the background."""
+
+    benchmark(logMessages, "d")
+
+
+def benchmark_logAndWrite(benchmark, file_logger):
+    """How fast messages can be written to the log file."""
+
+    def logAndFlush():
+        logMessages("d")
+        Logger.flush()
+    benchmark(logAndFlush)
+
+
+def benchmark_logDisabledType(benchmark, file_logger):
+    """How fast messages of a type that is not logged are skipped."""
+
+    file_logger._logger.setLevel(logging.INFO)
+    benchmark(logMessages, "d")
@@ -0,0 +1,81 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import patch
+
+import pytest
+
+from UM.Signal import Signal
+
+# Every round emits this many times, so the number of emits per second is this many times the rounds per second.
+EMIT_COUNT = 1000
+
+
+class Receiver:
+    def __init__(self):
+        self.count = 0
+
+    def slot(self, *args):
+        self.count += 1
+
+
+class EventLoop:
+    """Collects the function events of queued emits, to process them all at once like an event loop tick."""
+
+    def __init__(self):
+        self.events = []
+
+    def functionEvent(self, event):
+        self.events.append(event)
+
+    def getMainThread(self):
+        return None
+
+    def processEvents(self):
+        events = self.events
+        self.events = []
+        for event in events:
+            event.call()
+
+
+def emitMany(signal, *args):
+    for _ in range(EMIT_COUNT):
+        signal.emit(*args)
+
+
+@pytest.mark.parametrize("slot_count", [0, 1, 10])
+def benchmark_emitDirect(benchmark, slot_count):
+    receivers = [Receiver() for _ in range(slot_count)]
+    signal = Signal(type = Signal.Direct)
+    for receiver in receivers:
+        signal.connect(receiver.slot)
+
+    benchmark(emitMany, signal, "key", "value")
+
+
+def benchmark_emitToSignal(benchmark):
+    receiver = Receiver()
+    signal = Signal(type = Signal.Direct)
+    connected_signal = Signal(type = Signal.Direct)
+    signal.connect(connected_signal)
+    connected_signal.connect(receiver.slot)
+
+    benchmark(emitMany, signal, "key", "value")
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+def benchmark_emitQueued(benchmark, coalesce):
+    """Emitting the same change many times from another thread, until the event loop processes them."""
+
+    receiver = Receiver()
+    signal = Signal(type = Signal.Queued, coalesce = coalesce)
+    signal.connect(receiver.slot)
+    event_loop = EventLoop()
+
+    def emitAndProcess():
+        emitMany(signal, "key", "value")
+        event_loop.processEvents()
+
+    with patch("UM.Signal.Signal._app", event_loop):
+        benchmark(emitAndProcess)
+    assert receiver.count > 0
@@ -0,0 +1,33 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+
+import numpy
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "plugins", "FileHandlers", "OBJReader"))
+import OBJReader
+
+
+def writeGridOBJ(path, size):
+    """Write an OBJ file with a grid of size by size quads, with a normal per vertex."""
+
+    x, y = numpy.meshgrid(numpy.arange(size + 1), numpy.arange(size + 1))
+    vertices = numpy.stack((x.reshape(-1), y.reshape(-1), numpy.sin(x.reshape(-1) * 0.1)), axis = 1)
+    corner = (numpy.arange(size)[:, numpy.newaxis] * (size + 1) + numpy.arange(size)).reshape(-1) + 1
+    quads = numpy.stack((corner, corner + 1, corner + size + 2, corner + size + 1), axis = 1)
+    with open(path, "w") as f:
+        numpy.savetxt(f, vertices, fmt = "v %.6f %.6f %.6f")
+        numpy.savetxt(f, vertices, fmt = "vn %.6f %.6f %.6f")
+        numpy.savetxt(f, numpy.repeat(quads, 2, axis = 1), fmt = "f %d//%d %d//%d %d//%d %d//%d")
+
+
+@pytest.mark.parametrize("size", [100, 1000])
+def benchmark_read(benchmark, tmp_path, size):
+    path = str(tmp_path / "benchmark.obj")
+    writeGridOBJ(path, size)
+
+    node = benchmark(OBJReader.OBJReader()._read, path)
+    assert node.getMeshData().getFaceCount() == size * size * 2
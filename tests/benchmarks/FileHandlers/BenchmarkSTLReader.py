@@ -0,0 +1,126 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+import struct
+
+import numpy
+import pytest
+
+from UM.Job import Job
+from UM.Mesh import STLParser
+from UM.Mesh.MeshBuilder import MeshBuilder
+
+
+def writeBinarySTL(path, face_count):
+    """Write a binary STL file with random facets to the given path."""
+
+    facets = numpy.zeros(face_count, dtype = STLParser.BINARY_FACET_DTYPE)
+    facets["vertices"] = numpy.random.uniform(-100, 100, (face_count, 3, 3))
+    with open(path, "wb") as f:
+        f.write(b"\0" * 80)
+        f.write(struct.pack("<I", face_count))
+        f.write(facets.tobytes())
+
+
+def loadBinaryPerFace(mesh_builder, f):
+    """The original implementation, which decodes and adds the facets one by one."""
+
+    f.read(80)
+    num_faces = struct.unpack("<I", f.read(4))[0]
+    mesh_builder.reserveFaceCount(num_faces)
+    for idx in range(0, num_faces):
+        data = struct.unpack(b"<ffffffffffffH", f.read(50))
+        mesh_builder.addFaceByPoints(
+            data[3], data[5], -data[4],
+            data[6], data[8], -data[7],
+            data[9], data[11], -data[10]
+        )
+        Job.yieldThread()
+    return True
+
+
+def loadBinaryVectorized(mesh_builder, f):
+    return STLParser.loadBinary(mesh_builder, f)
+
+
+@pytest.mark.parametrize("face_count", [10000, 100000])
+@pytest.mark.parametrize("load_function", [loadBinaryPerFace, loadBinaryVectorized])
+def benchmark_loadBinary(benchmark, tmp_path, face_count, load_function):
+    path = str(tmp_path / "benchmark.stl")
+    writeBinarySTL(path, face_count)
+
+    def load():
+        mesh_builder = MeshBuilder()
+        with open(path, "rb") as f:
+            load_function(mesh_builder, f)
+        return mesh_builder
+
+    mesh_builder = benchmark(load)
+    assert mesh_builder.getVertexCount() == face_count * 3
+
+
+def writeAsciiSTL(path, face_count):
+    """Write an ASCII STL file with random facets to the given path."""
+
+    with open(path, "wt", encoding = "utf-8") as f:
+        f.write("solid benchmark\n")
+        for face in numpy.random.uniform(-100, 100, (face_count, 3, 3)):
+            f.write("  facet normal 0 0 0\n    outer loop\n")
+            for vertex in face:
+                f.write("      vertex %e %e %e\n" % tuple(vertex))
+            f.write("    endloop\n  endfacet\n")
+        f.write("endsolid benchmark\n")
+
+
+def loadAsciiTwoPass(mesh_builder, f):
+    """The original implementation, which counts the vertices first and then parses the file line by line."""
+
+    num_verts = 0
+    for lines in f:
+        for line in lines.split("\r"):
+            if "vertex" in line:
+                num_verts += 1
+
+    mesh_builder.reserveFaceCount(num_verts / 3)
+    f.seek(0, os.SEEK_SET)
+    vertex = 0
+    face = [None, None, None]
+    for lines in f:
+        for line in lines.split("\r"):
+            if "vertex" in line:
+                face[vertex] = line.split()[1:]
+                vertex += 1
+                if vertex == 3:
+                    mesh_builder.addFaceByPoints(
+                        float(face[0][0]), float(face[0][2]), -float(face[0][1]),
+                        float(face[1][0]), float(face[1][2]), -float(face[1][1]),
+                        float(face[2][0]), float(face[2][2]), -float(face[2][1])
+                    )
+                    vertex = 0
+
+            Job.yieldThread()
+
+
+def loadAsciiStreaming(mesh_builder, f):
+    STLParser.loadAscii(mesh_builder, f)
+
+
+# The legacy loop is only measured for the smaller file, since it takes very long for the larger one.
+@pytest.mark.parametrize("load_function, face_count", [
+    (loadAsciiTwoPass, 10000),
+    (loadAsciiStreaming, 10000),
+    (loadAsciiStreaming, 100000)
+])
+def benchmark_loadAscii(benchmark, tmp_path, face_count, load_function):
+    path = str(tmp_path / "benchmark.stl")
+    writeAsciiSTL(path, face_count)
+
+    def load():
+        mesh_builder = MeshBuilder()
+        with open(path, "rt", encoding = "utf-8") as f:
+            load_function(mesh_builder, f)
+        return mesh_builder
+
+    mesh_builder = benchmark(load)
+    assert mesh_builder.getVertexCount() == face_count * 3
@@ -0,0 +1,79 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import math
+
+import pytest
+
+from UM.Math.Matrix import Matrix
+from UM.Math.Quaternion import Quaternion
+from UM.Math.Vector import Vector
+from UM.Scene.SceneNode import SceneNode
+
+
+def createTransformation():
+    return Matrix.fromPositionOrientationScale(Vector(10, 20, 30), Quaternion.fromAngleAxis(math.radians(30), Vector(1, 2, 3)), Vector(1, 2, 3))
+
+
+def benchmark_vectorAdd(benchmark):
+    a = Vector(1, 2, 3)
+    b = Vector(4, 5, 6)
+
+    result = benchmark(lambda: a + b)
+    assert result == Vector(5, 7, 9)
+
+
+def benchmark_vectorCross(benchmark):
+    result = benchmark(Vector.Unit_X.cross, Vector.Unit_Y)
+    assert result == Vector.Unit_Z
+
+
+def benchmark_vectorNormalized(benchmark):
+    vector = Vector(3, 0, 4)
+
+    result = benchmark(vector.normalized)
+    assert result == Vector(0.6, 0, 0.8)
+
+
+def benchmark_vectorGetData(benchmark):
+    vector = Vector(1, 2, 3)
+
+    result = benchmark(vector.getData, copy = False)
+    assert list(result) == [1, 2, 3]
+
+
+def benchmark_vectorMultiplyMatrix(benchmark):
+    vector = Vector(1, 2, 3)
+    matrix = createTransformation()
+
+    benchmark(vector.preMultiply, matrix)
+
+
+def benchmark_matrixMultiply(benchmark):
+    a = createTransformation()
+    b = createTransformation()
+
+    benchmark(a.multiply, b, copy = True)
+
+
+def benchmark_matrixDecompose(benchmark):
+    matrix = createTransformation()
+
+    translation, rotation, scale, shear = benchmark(matrix.decompose)
+    assert translation == Vector(10, 20, 30)
+    assert scale == Vector(1, 2, 3)
+
+
+def benchmark_quaternionMultiply(benchmark):
+    a = Quaternion.fromAngleAxis(math.radians(30), Vector.Unit_Y)
+    b = Quaternion.fromAngleAxis(math.radians(60), Vector.Unit_Y)
+
+    result = benchmark(lambda: a * b)
+    assert result == Quaternion.fromAngleAxis(math.radians(90), Vector.Unit_Y)
+
+
+def benchmark_getOrientation(benchmark):
+    node = SceneNode()
+    node.rotate(Quaternion.fromAngleAxis(math.radians(30), Vector.Unit_Y))
+
+    benchmark(node.getOrientation)
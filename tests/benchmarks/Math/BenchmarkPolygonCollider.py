@@ -0,0 +1,50 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import numpy
+import pytest
+
+from UM.Math.Polygon import Polygon
+from UM.Math.PolygonCollider import PolygonCollider
+
+
+def createHulls(count):
+    """Creates hulls spread over a build plate that is about as crowded for every count."""
+
+    random = numpy.random.RandomState(1337)
+    plate_size = 10 * numpy.sqrt(count)
+    hulls = []
+    for position in random.uniform(0, plate_size, (count, 2)):
+        hulls.append(Polygon.approximatedCircle(random.uniform(2, 6)).translate(position[0], position[1]))
+    return hulls
+
+
+@pytest.mark.parametrize("count", [100, 500, 2000])
+def benchmark_findCollisions(benchmark, count):
+    collider = PolygonCollider(createHulls(count))
+
+    collisions = benchmark(collider.findCollisions)
+    assert collisions
+
+
+@pytest.mark.parametrize("count", [500, 2000])
+def benchmark_findCollisionsAfterMove(benchmark, count):
+    hulls = createHulls(count)
+    collider = PolygonCollider(hulls)
+
+    def moveAndFind():
+        collider.setPolygon(0, hulls[0].translate(1, 0))
+        return collider.findCollisions()
+
+    benchmark(moveAndFind)
+
+
+# Testing every pair is quadratic, so this is only done for a small scene to compare against.
+@pytest.mark.parametrize("count", [100])
+def benchmark_intersectsPolygonPairwise(benchmark, count):
+    hulls = createHulls(count)
+
+    def findCollisions():
+        return [(a, b) for a in range(count) for b in range(a + 1, count) if hulls[a].intersectsPolygon(hulls[b]) is not None]
+
+    benchmark(findCollisions)
@@ -0,0 +1,55 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+
+import numpy
+import pytest
+
+from UM.Mesh.MeshData import MeshData, calculateNormalsFromIndexedVertices
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Mesh"))
+from TestMeshData import oldCalculateNormalsFromIndexedVertices
+
+
+def createGrid(size):
+    """Create an indexed grid of size by size quads, where every inner vertex is shared by six triangles."""
+
+    x, y = numpy.meshgrid(numpy.arange(size + 1), numpy.arange(size + 1))
+    vertices = numpy.stack((x.reshape(-1), numpy.sin(x.reshape(-1) * 0.1), y.reshape(-1)), axis = 1).astype(numpy.float32)
+    corner = (numpy.arange(size)[:, numpy.newaxis] * (size + 1) + numpy.arange(size)).reshape(-1)
+    indices = numpy.concatenate((numpy.stack((corner, corner + size + 1, corner + 1), axis = 1),
+                                 numpy.stack((corner + 1, corner + size + 1, corner + size + 2), axis = 1))).astype(numpy.int32)
+    return vertices, indices
+
+
+@pytest.mark.parametrize("size", [10, 100, 1000])
+def benchmark_calculateNormalsFromIndexedVertices(benchmark, size):
+    vertices, indices = createGrid(size)
+
+    normals = benchmark(calculateNormalsFromIndexedVertices, vertices, indices, len(indices))
+    assert normals.shape == vertices.shape
+
+
+@pytest.mark.parametrize("size", [10, 100, 1000])
+def benchmark_calculateNormalsFromIndexedVerticesFlat(benchmark, size):
+    vertices, indices = createGrid(size)
+
+    normals = benchmark(calculateNormalsFromIndexedVertices, vertices, indices, len(indices), flat = True)
+    assert normals.shape == (len(indices) * 3, 3)
+
+
+@pytest.mark.parametrize("size", [10, 100])
+def benchmark_oldCalculateNormalsFromIndexedVertices(benchmark, size):
+    vertices, indices = createGrid(size)
+
+    benchmark(oldCalculateNormalsFromIndexedVertices, vertices, indices, len(indices))
+
+
+@pytest.mark.parametrize("size", [100, 1000])
+def benchmark_invertNormals(benchmark, size):
+    vertices, indices = createGrid(size)
+    mesh_data = MeshData(vertices = vertices, normals = vertices, indices = indices)
+
+    benchmark(mesh_data.invertNormals)
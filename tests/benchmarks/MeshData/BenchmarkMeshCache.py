@@ -0,0 +1,41 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import numpy
+import pytest
+
+from UM.Mesh.MeshCache import MeshCache
+from UM.Mesh.MeshData import MeshData
+
+
+@pytest.fixture
+def cache(tmp_path):
+    original = MeshCache.getInstance()
+    cache = MeshCache(str(tmp_path))
+    MeshCache.setInstance(cache)
+    yield cache
+    MeshCache.setInstance(original)
+
+
+def createVertices(count):
+    random = numpy.random.RandomState(1337)
+    return (random.uniform(-100, 100, (count, 3))).astype(numpy.float32)
+
+
+# Only meshes from files with enough faces are cached.
+@pytest.mark.parametrize("count", [300000, 1000000])
+def benchmark_getExtentsUncached(benchmark, count):
+    vertices = createVertices(count)
+
+    extents = benchmark(lambda: MeshData(vertices = vertices, file_name = "benchmark.stl").getExtents())
+    assert extents is not None
+
+
+@pytest.mark.parametrize("count", [300000, 1000000])
+def benchmark_getExtentsCached(benchmark, cache, count):
+    vertices = createVertices(count)
+    MeshData(vertices = vertices, file_name = "benchmark.stl").getExtents()
+
+    extents = benchmark(lambda: MeshData(vertices = vertices, file_name = "benchmark.stl").getExtents())
+    assert extents is not None
+    assert cache.getStatistics()["misses"] == 1
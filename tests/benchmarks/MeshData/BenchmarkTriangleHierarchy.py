@@ -0,0 +1,42 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import numpy
+import pytest
+
+from UM.Mesh.MeshData import MeshData
+from UM.Mesh.TriangleHierarchy import TriangleHierarchy
+
+
+def createGrid(size):
+    """Create an indexed, wavy grid of size by size quads."""
+
+    x, y = numpy.meshgrid(numpy.arange(size + 1), numpy.arange(size + 1))
+    vertices = numpy.stack((x.reshape(-1), numpy.sin(x.reshape(-1) * 0.1), y.reshape(-1)), axis = 1).astype(numpy.float32)
+    corner = (numpy.arange(size)[:, numpy.newaxis] * (size + 1) + numpy.arange(size)).reshape(-1)
+    indices = numpy.concatenate((numpy.stack((corner, corner + size + 1, corner + 1), axis = 1),
+                                 numpy.stack((corner + 1, corner + size + 1, corner + size + 2), axis = 1))).astype(numpy.int32)
+    return vertices, indices
+
+
+@pytest.mark.parametrize("size", [100, 500])
+def benchmark_buildTriangleHierarchy(benchmark, size):
+    vertices, indices = createGrid(size)
+
+    hierarchy = benchmark(TriangleHierarchy, vertices, indices)
+    assert hierarchy.getFaceCount() == 2 * size * size
+
+
+@pytest.mark.parametrize("size,ray_count", [(100, 1), (500, 1), (500, 10000)])
+def benchmark_intersectRays(benchmark, size, ray_count):
+    """Drops points onto the grid from above."""
+
+    vertices, indices = createGrid(size)
+    mesh_data = MeshData(vertices = vertices, indices = indices)
+    mesh_data.getTriangleHierarchy()  # Only the queries are measured.
+    random = numpy.random.RandomState(1337)
+    origins = numpy.stack((random.uniform(0, size, ray_count), numpy.full(ray_count, 10), random.uniform(0, size, ray_count)), axis = 1)
+    directions = numpy.tile([0, -1, 0], (ray_count, 1))
+
+    hits = benchmark(mesh_data.intersectRays, origins, directions)
+    assert numpy.all(hits.face_ids >= 0)
@@ -0,0 +1,72 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import pytest
+
+from UM.Math.Quaternion import Quaternion
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Scene.SceneNode import SceneNode
+from UM.Scene.TransformStore import TransformStore
+
+
+def createGroup(child_count):
+    builder = MeshBuilder()
+    builder.addCube(10, 10, 10)
+    mesh_data = builder.build()
+
+    group = SceneNode()
+    for index in range(child_count):
+        child = SceneNode(group)
+        child.setMeshData(mesh_data)
+        child.setPosition(Vector(index % 20 * 15, 0, index // 20 * 15))
+    group.getBoundingBox()
+    return group
+
+
+def dragGroup(group, frames, moves_per_frame):
+    """Moves a group with the mouse: a few moves per frame, after which the scene is rendered and the positions and
+    bounding boxes are read.
+    """
+
+    for _ in range(frames):
+        for _ in range(moves_per_frame):
+            group.translate(Vector(0.1, 0, 0))
+        SceneNode.flushTransformationChanges()
+        for child in group.getChildren():
+            child.getWorldTransformation(copy = False)
+            child.getCachedNormalMatrix()
+        group.getBoundingBox()
+
+
+@pytest.mark.parametrize("lazy,store", [(False, False), (True, False), (True, True)])
+@pytest.mark.parametrize("child_count", [100, 500])
+def benchmark_dragGroup(benchmark, child_count, lazy, store):
+    group = createGroup(child_count)
+    if store:
+        TransformStore().addSubtree(group)
+    SceneNode.setLazyTransformationUpdates(lazy)
+    try:
+        benchmark(dragGroup, group, 10, 3)
+    finally:
+        SceneNode.setLazyTransformationUpdates(False)
+
+
+@pytest.mark.parametrize("child_count", [100, 500])
+def benchmark_translateRotatedNodes(benchmark, child_count):
+    builder = MeshBuilder()
+    builder.addDonut(10, 20, 5, sections = 64)  # A round mesh, so that its hull has many vertices.
+    mesh_data = builder.build()
+    nodes = []
+    for index in range(child_count):
+        node = SceneNode()
+        node.setMeshData(mesh_data)
+        node.rotate(Quaternion.fromAngleAxis(0.1 * index, Vector.Unit_Y))
+        node.getBoundingBox()
+        nodes.append(node)
+
+    def translateAll():
+        for node in nodes:
+            node.translate(Vector(0.1, 0, 0))
+            node.getBoundingBox()
+    benchmark(translateAll)
@@ -0,0 +1,39 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import pytest
+
+from UM.Scene.Iterator.BreadthFirstIterator import BreadthFirstIterator
+from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.Scene.Iterator.LazyDepthFirstIterator import LazyDepthFirstIterator
+from UM.Scene.SceneNode import SceneNode
+
+
+def createScene(group_count, children_per_group):
+    root = SceneNode()
+    for _ in range(group_count):
+        group = SceneNode(root)
+        for _ in range(children_per_group):
+            SceneNode(group)
+    return root
+
+
+@pytest.mark.parametrize("iterator", [BreadthFirstIterator, DepthFirstIterator, LazyDepthFirstIterator])
+@pytest.mark.parametrize("cached", [False, True])
+def benchmark_findFirstNode(benchmark, iterator, cached):
+    root = createScene(100, 100)
+    target = root.getChildren()[0].getChildren()[0]
+
+    def find():
+        if not cached:
+            root._all_children = None
+        for node in iterator(root):
+            if node is target:
+                return node
+    assert benchmark(find) is target
+
+
+@pytest.mark.parametrize("iterator", [BreadthFirstIterator, DepthFirstIterator, LazyDepthFirstIterator])
+def benchmark_visitAllNodes(benchmark, iterator):
+    root = createScene(100, 100)
+    benchmark(lambda: sum(1 for _ in iterator(root)))
@@ -0,0 +1,89 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+import pytest
+
+from UM.MimeTypeDatabase import MimeType, MimeTypeDatabase
+from UM.PluginRegistry import PluginRegistry
+from UM.Resources import Resources
+from UM.Settings.ContainerRegistry import ContainerRegistry
+
+container_count = 10000
+
+profile_template = """[general]
+version = 4
+name = Profile {index}
+definition = machine_{machine}
+
+[metadata]
+type = quality
+quality_type = layer_{layer}
+material = material_{material}
+variant = nozzle_{variant}
+
+[values]
+layer_height = 0.{layer}
+"""
+
+
+@pytest.fixture(scope = "module")
+def profile_tree(tmp_path_factory):
+    """Creates a synthetic tree of profiles, spread over subdirectories like the material, quality and variant profiles."""
+
+    root = tmp_path_factory.mktemp("profiles")
+    for index in range(container_count):
+        directory = os.path.join(str(root), "instances", "machine_{0}".format(index % 50))
+        os.makedirs(directory, exist_ok = True)
+        with open(os.path.join(directory, "profile_{0}.inst.cfg".format(index)), "w", encoding = "utf-8") as f:
+            f.write(profile_template.format(index = index, machine = index % 50, layer = index % 4 + 1, material = index % 30, variant = index % 5))
+    return str(root)
+
+
+@pytest.fixture
+def container_registry(application, upgrade_manager, profile_tree):
+    MimeTypeDatabase.addMimeType(
+        MimeType(
+            name = "application/x-uranium-instancecontainer",
+            comment = "Uranium Instance Container",
+            suffixes = [ "inst.cfg" ]
+        )
+    )
+    upgrade_manager.registerCurrentVersion(("quality", 4000000), None)
+
+    ContainerRegistry._ContainerRegistry__instance = None  # Start with an empty registry every time.
+    registry = ContainerRegistry(application)
+    registry.addResourceType(Resources.InstanceContainers, "quality")
+
+    root_plugin_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "plugins")
+    PluginRegistry.getInstance().addPluginLocation(root_plugin_dir)
+    PluginRegistry.getInstance().loadPlugin("LocalContainerProvider")
+    registry.addProvider(PluginRegistry.getInstance().getPluginObject("LocalContainerProvider"))
+    PluginRegistry.getInstance()._plugins.clear()
+
+    Resources.addSearchPath(profile_tree)
+    yield registry
+    Resources.removeSearchPath(profile_tree)
+
+
+def _loadAllMetadata(registry, indexed):
+    for container_id in list(registry.metadata.keys()):
+        if container_id != "empty":
+            del registry.metadata[container_id]
+    for provider in registry._providers:
+        if not indexed:
+            provider._metadata_index = {}  # As if it's the first start.
+        provider._updatePathCache()
+    registry.loadAllMetadata()
+    # Other tests may have left search paths with their own containers behind, so only count the profiles made here.
+    return sum(1 for container_id in registry.metadata if container_id.startswith("profile_"))
+
+
+@pytest.mark.parametrize("parallel,indexed", [(False, False), (True, False), (False, True)])
+def benchmark_loadAllMetadata(benchmark, container_registry, parallel, indexed):
+    container_registry.setParallelMetadataLoading(parallel)
+    if indexed:
+        _loadAllMetadata(container_registry, indexed = False)  # Fill the index.
+
+    count = benchmark(_loadAllMetadata, container_registry, indexed)
+    assert count == container_count
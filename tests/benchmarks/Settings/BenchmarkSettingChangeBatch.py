@@ -0,0 +1,57 @@
+# Copyright (c) 2020 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import pytest
+
+from UM.Settings.ContainerStack import ContainerStack
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.InstanceContainer import InstanceContainer
+from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings.SettingInstance import SettingInstance
+
+# The number of settings that depend on the changed settings.
+SETTING_COUNT = 400
+# Every round changes this many settings, which all of the other settings depend on.
+SHARED_COUNT = 20
+
+
+@pytest.fixture
+def stack(application):
+    definition_container = DefinitionContainer("definitions")
+    shared_keys = ["shared_{}".format(i) for i in range(SHARED_COUNT)]
+    for key in shared_keys:
+        definition = SettingDefinition(key, definition_container)
+        definition.deserialize({"label": key, "description": key, "type": "float", "default_value": 1.0})
+        definition_container.addDefinition(definition)
+    for i in range(SETTING_COUNT):
+        key = "setting_{}".format(i)
+        definition = SettingDefinition(key, definition_container)
+        definition.deserialize({"label": key, "description": key, "type": "float", "default_value": 1.0, "value": " + ".join(shared_keys)})
+        definition_container.addDefinition(definition)
+
+    user_changes = InstanceContainer("user_changes")
+    stack = ContainerStack("stack")
+    stack.addContainer(definition_container)
+    stack.insertContainer(0, user_changes)
+    for key in shared_keys:
+        instance = SettingInstance(definition_container.findDefinitions(key = key)[0], user_changes)
+        instance.setProperty("value", 1.0)
+        user_changes.addInstance(instance)
+    return stack
+
+
+def changeSharedSettings(stack):
+    user_changes = stack.getTop()
+    for instance in user_changes.findInstances():
+        instance.setProperty("value", instance.value + 1)
+
+
+def benchmark_changeSettings(benchmark, stack):
+    benchmark(changeSharedSettings, stack)
+
+
+def benchmark_changeSettingsInBatch(benchmark, stack):
+    def changeInBatch():
+        with stack.batchPropertyChanges():
+            changeSharedSettings(stack)
+    benchmark(changeInBatch)
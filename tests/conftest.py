@@ -8,6 +8,7 @@ import pytest
 import Arcus #Prevents error: "PyCapsule_GetPointer called with incorrect name" with conflicting SIP configurations between Arcus and PyQt: Import Arcus first!
 from UM.Qt.QtApplication import QtApplication #QTApplication import is required, even though it isn't used.
 from UM.Application import Application
+from UM.Mesh.MeshCache import MeshCache
 from UM.Qt.QtRenderer import QtRenderer
 from UM.Signal import Signal
 from UM.PluginRegistry import PluginRegistry
@@ -23,6 +24,7 @@ class FixtureApplication(Application):
         super().__init__(name = "test", version = "1.0", api_version = "7.3.0")
         super().initialize()
         Signal._signalQueue = self
+        MeshCache.setInstance(None)  # Don't let the results depend on what earlier runs left in the cache of the user.
 
     def functionEvent(self, event):
         event.call()